@@ -0,0 +1,90 @@
+"""
+Benchmarks for the connection subsystem.
+
+Run with:
+    python -m benchmarks.bench_connection
+"""
+import asyncio
+import logging
+import threading
+import time
+
+from mosaic.connection import AsyncConnector, Connector, ConnectorPool, StandInServer, run_sessions
+
+# Per-call INFO/WARNING lines would dominate the timings
+logging.disable(logging.WARNING)
+
+
+class _StandInConnector(Connector):
+    """A Connector whose connection setup costs what a round trip to a local server would"""
+    SETUP_SECONDS = 0.001
+
+    def connect(self, timeout: int = 10) -> None:
+        time.sleep(self.SETUP_SECONDS)
+        super().connect(timeout)
+
+
+def _run_threads(target, workers: int) -> float:
+    """Run target(worker) on each of several threads and return the wall-clock seconds"""
+    threads = [threading.Thread(target=target, args=(worker,)) for worker in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench_pool(workers: int = 8, sessions: int = 250, agents: int = 32, max_size: int = 4) -> None:
+    """Short heartbeat sessions from several threads: a Connector per session vs a shared pool"""
+    def per_session(worker: int) -> None:
+        for n in range(sessions):
+            with _StandInConnector(f"agent-{(worker * sessions + n) % agents}") as connector:
+                connector.send_heartbeat()
+
+    def pooled(worker: int) -> None:
+        for n in range(sessions):
+            with pool.lease(f"agent-{(worker * sessions + n) % agents}") as connector:
+                connector.send_heartbeat()
+
+    print(f"connection pool ({workers} threads x {sessions} sessions, {agents} agents, "
+          f"{_StandInConnector.SETUP_SECONDS * 1e3:.0f} ms setup):")
+    elapsed = _run_threads(per_session, workers)
+    print(f"  {'per-session':14s} {workers * sessions / elapsed:9.0f} sessions/s")
+    pool = ConnectorPool(_StandInConnector, max_size=max_size)
+    elapsed = _run_threads(pooled, workers)
+    stats = pool.stats()
+    print(f"  {f'pool max={max_size}':14s} {workers * sessions / elapsed:9.0f} sessions/s    "
+          f"opened {stats['created']}, reuse {stats['reuse_ratio']:.1%}, "
+          f"mean wait {stats['mean_wait'] * 1e6:.0f} us, utilisation {stats['utilisation']:.0%}")
+    pool.close()
+
+
+async def _heartbeat_session(connector: AsyncConnector) -> None:
+    await connector.send_heartbeat()
+
+
+async def _async_sessions(latency: float, levels) -> None:
+    async with StandInServer(latency=latency) as server:
+        host, port = server.address
+        for concurrency, count in levels:
+            agents = [f"agent-{n}" for n in range(count)]
+            start = time.perf_counter()
+            await run_sessions(agents, _heartbeat_session, host, port, concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            print(f"  concurrency {concurrency:5d}  {count:6d} sessions  {count / elapsed:9.0f} sessions/s    "
+                  f"peak open {server.peak}")
+            server.peak = 0
+
+
+def bench_async_sessions(sessions: int = 5_000, latency: float = 0.002, serial_sessions: int = 200) -> None:
+    """Connect, heartbeat and disconnect sessions on one event loop against a local stand-in server"""
+    print(f"async sessions (one event loop, stand-in server with {latency * 1e3:.0f} ms reply latency):")
+    # One at a time is what a blocking connect-heartbeat-disconnect loop achieves
+    levels = [(1, serial_sessions), (100, sessions), (1_000, sessions), (5_000, sessions)]
+    asyncio.run(_async_sessions(latency, levels))
+
+
+if __name__ == "__main__":
+    bench_pool()
+    bench_async_sessions()
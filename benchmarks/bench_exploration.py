@@ -0,0 +1,446 @@
+"""
+Benchmarks for the exploration subsystem.
+
+Run with:
+    python -m benchmarks.bench_exploration
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from mosaic.exploration import (
+    Direction, ExplorationGraph, ExplorationMode, ExplorationRunner, ExplorationSession, FrontierPlanner, Inventory,
+    Item, ItemTable, ItemType, Navigator, NavigatorFleet, RandomPlanner, SpatialGrid, SymbolTable, spawn_seeds
+)
+from mosaic.exploration.runner import DEFAULT_DIRECTIONS, _drive
+from mosaic.learning import MemoryStore
+
+# Per-call INFO/WARNING lines would dominate the timings
+logging.disable(logging.WARNING)
+
+
+def _random_edges(size: int, degree: int, seed: int = 0):
+    """Edges of a sparse random map: a chain through every realm plus random shortcuts"""
+    rng = random.Random(seed)
+    names = [f"Realm {i}" for i in range(size)]
+    edges = [(names[i], names[i + 1]) for i in range(size - 1)]
+    edges.extend((names[rng.randrange(size)], names[rng.randrange(size)])
+                 for _ in range(size * (degree - 1)))
+    return names, edges
+
+
+def _dict_bfs(exploration_map: dict, source: str, target: str):
+    """Breadth-first search over the dict-of-lists map Navigator used to keep"""
+    previous = {source: None}
+    queue = deque((source,))
+    while queue:
+        location = queue.popleft()
+        for neighbor in exploration_map[location]:
+            if neighbor not in previous:
+                previous[neighbor] = location
+                if neighbor == target:
+                    path = [neighbor]
+                    while previous[path[-1]] is not None:
+                        path.append(previous[path[-1]])
+                    return path[::-1]
+                queue.append(neighbor)
+    return None
+
+
+def bench_graph_footprint(size: int = 200_000, degree: int = 3) -> None:
+    """Compare memory and build time of a dict-of-lists map with ExplorationGraph."""
+    names, edges = _random_edges(size, degree)
+    print(f"map footprint (locations={size}, edges={len(edges)})")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    exploration_map = {}
+    for source, target in edges:
+        exploration_map.setdefault(source, []).append(target)
+        exploration_map.setdefault(target, [])
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  dict of lists:     {current / 2**20:7.1f} MiB  build {elapsed:6.2f} s")
+    del exploration_map
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = ExplorationGraph()
+    for source, target in edges:
+        graph.add_edge(source, target)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  ExplorationGraph:  {current / 2**20:7.1f} MiB  build {elapsed:6.2f} s")
+
+
+def bench_route_queries(size: int = 200_000, degree: int = 3, queries: int = 20) -> None:
+    """Compare copying the map per query (the old get_exploration_map) with querying the graph."""
+    names, edges = _random_edges(size, degree)
+    exploration_map = {name: [] for name in names}
+    graph = ExplorationGraph()
+    for source, target in edges:
+        exploration_map[source].append(target)
+        graph.add_edge(source, target)
+    rng = random.Random(1)
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(queries)]
+    print(f"route queries (locations={size}, queries={queries})")
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        _dict_bfs(exploration_map.copy(), source, target)
+    print(f"  copy + dict BFS:         {(time.perf_counter() - start) / queries * 1e3:8.2f} ms/query")
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        graph.shortest_path(source, target)
+    print(f"  graph.shortest_path:     {(time.perf_counter() - start) / queries * 1e3:8.2f} ms/query")
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        graph.is_reachable(target, names[0])
+    print(f"  graph.is_reachable:      {(time.perf_counter() - start) / queries * 1e3:8.2f} ms/query")
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        graph.connected(source, target)
+    print(f"  graph.connected:         {(time.perf_counter() - start) / queries * 1e6:8.2f} us/query")
+
+    start = time.perf_counter()
+    count = len(graph.components())
+    print(f"  graph.components:        {(time.perf_counter() - start) * 1e3:8.2f} ms ({count} components)")
+
+
+def bench_weighted_search(width: int = 300, queries: int = 5) -> None:
+    """Compare Dijkstra with A* under a Manhattan heuristic on a weighted grid map."""
+    rng = random.Random(2)
+    graph = ExplorationGraph()
+    coordinates = {}
+    for x in range(width):
+        for y in range(width):
+            coordinates[f"{x},{y}"] = (x, y)
+    for x in range(width):
+        for y in range(width):
+            for nx, ny in ((x + 1, y), (x, y + 1)):
+                if nx < width and ny < width:
+                    weight = 1 + rng.random()
+                    graph.add_edge(f"{x},{y}", f"{nx},{ny}", weight)
+                    graph.add_edge(f"{nx},{ny}", f"{x},{y}", weight)
+
+    def manhattan(location: str, target: str) -> float:
+        (x1, y1), (x2, y2) = coordinates[location], coordinates[target]
+        return abs(x1 - x2) + abs(y1 - y2)
+
+    pairs = [(f"{rng.randrange(width)},{rng.randrange(width)}",
+              f"{rng.randrange(width)},{rng.randrange(width)}") for _ in range(queries)]
+    print(f"weighted search (grid {width}x{width}, queries={queries})")
+    for label, heuristic in (("dijkstra", None), ("astar", manhattan)):
+        start = time.perf_counter()
+        for source, target in pairs:
+            graph.astar(source, target, heuristic)
+        print(f"  {label:9s} {(time.perf_counter() - start) / queries * 1e3:8.2f} ms/query")
+
+
+def bench_fleet(size: int = 100_000, ticks: int = 50, objects: int = 10_000) -> None:
+    """Compare one tick of NavigatorFleet.step with explore/rest on separate Navigator objects."""
+    directions = ("north", "south", "east", "west")
+    rng = np.random.default_rng(3)
+    print(f"fleet tick (navigators={size}, ticks={ticks})")
+
+    navigators = [Navigator() for _ in range(objects)]
+    choices = rng.integers(len(directions), size=objects).tolist()
+    start = time.perf_counter()
+    for navigator, choice in zip(navigators, choices):
+        if navigator.get_energy() >= Navigator.ENERGY_COST:
+            navigator.explore(directions[choice])
+        else:
+            navigator.rest()
+    per_navigator = (time.perf_counter() - start) / objects
+    print(f"  Navigator objects:         {per_navigator * size * 1e3:8.1f} ms/tick (extrapolated from {objects})")
+
+    fleet = NavigatorFleet(size)
+    realms = np.array([fleet.realm_id(direction) for direction in directions])
+    plans = [realms[rng.integers(len(directions), size=size)] for _ in range(ticks)]
+    start = time.perf_counter()
+    for plan in plans:
+        fleet.step(plan)
+    elapsed = (time.perf_counter() - start) / ticks
+    print(f"  NavigatorFleet.step:       {elapsed * 1e3:8.1f} ms/tick ({size / elapsed / 1e6:.1f}M agent-steps/s)")
+
+    words = [[directions[i] for i in rng.integers(len(directions), size=size).tolist()] for _ in range(3)]
+    start = time.perf_counter()
+    for plan in words:
+        fleet.step(plan)
+    print(f"  step with direction names: {(time.perf_counter() - start) / len(words) * 1e3:8.1f} ms/tick")
+
+    start = time.perf_counter()
+    fleet[size // 2].get_exploration_map()
+    print(f"  one navigator's map:       {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+
+def bench_spatial_grid(steps: int = 2_000_000, queries: int = 200) -> None:
+    """Compare a dict of visited cells with SpatialGrid for footprint, nearest, radius and heatmap queries."""
+    rng = np.random.default_rng(4)
+    moves = np.array([(0, 1), (0, -1), (1, 0), (-1, 0)])[rng.integers(4, size=steps)]
+    path = np.cumsum(moves, axis=0)
+    xs, ys = path[:, 0], path[:, 1]
+    points = list(zip(rng.integers(xs.min(), xs.max(), queries).tolist(),
+                      rng.integers(ys.min(), ys.max(), queries).tolist()))
+
+    x_list, y_list = xs.tolist(), ys.tolist()
+    tracemalloc.start()
+    start = time.perf_counter()
+    cells = {}
+    for x, y in zip(x_list, y_list):
+        cells[x, y] = cells.get((x, y), 0) + 1
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"spatial grid (random walk of {steps} steps, {len(cells)} distinct cells)")
+    print(f"  dict of cells:   {current / 2**20:7.1f} MiB  build {elapsed:6.2f} s")
+
+    start = time.perf_counter()
+    grid = SpatialGrid()
+    grid.visit_many(xs, ys)
+    elapsed = time.perf_counter() - start
+    print(f"  SpatialGrid:     {grid.nbytes / 2**20:7.1f} MiB  build {elapsed:6.2f} s ({grid.chunk_count} chunks)")
+
+    sample = points[:10]
+    start = time.perf_counter()
+    for x, y in sample:
+        min(cells, key=lambda cell: (cell[0] - x) ** 2 + (cell[1] - y) ** 2)
+    print(f"  dict nearest scan:     {(time.perf_counter() - start) / len(sample) * 1e3:8.2f} ms/query")
+    start = time.perf_counter()
+    for x, y in points:
+        grid.nearest(x, y)
+    print(f"  grid.nearest:          {(time.perf_counter() - start) / queries * 1e3:8.2f} ms/query")
+    start = time.perf_counter()
+    found = sum(len(grid.within(x, y, 50)) for x, y in points)
+    print(f"  grid.within(r=50):     {(time.perf_counter() - start) / queries * 1e3:8.2f} ms/query "
+          f"({found / queries:.0f} cells)")
+    min_x, min_y, max_x, max_y = grid.bounds()
+    start = time.perf_counter()
+    grid.heatmap(min_x, min_y, max_x, max_y, cell_size=16)
+    print(f"  full heatmap (16x16):  {(time.perf_counter() - start) * 1e3:8.2f} ms")
+
+
+def _session_workload(navigator: Navigator, calls: int) -> None:
+    """A mixed exploration run with a fixed sequence of actions"""
+    directions = ("north", "south", "east", "west", None)
+    rng = np.random.default_rng(6)
+    for _ in range(calls):
+        action = rng.integers(4)
+        if action == 0 and navigator.get_energy() >= Navigator.ENERGY_COST:
+            navigator.explore(directions[rng.integers(len(directions))])
+        elif action == 1:
+            navigator.navigate(list(Direction)[rng.integers(4)], int(rng.integers(1, 20)))
+        elif action == 2:
+            navigator.navigate_to_random_location()
+        else:
+            navigator.rest()
+
+
+def bench_session_replay(calls: int = 50_000) -> None:
+    """Measure the overhead of recording a session and the cost of saving, loading and replaying it."""
+    print(f"session record/replay (calls={calls})")
+    start = time.perf_counter()
+    _session_workload(Navigator(seed=5), calls)
+    plain = time.perf_counter() - start
+    print(f"  unrecorded run:   {plain:6.2f} s")
+
+    navigator = Navigator(seed=5, record=True)
+    start = time.perf_counter()
+    _session_workload(navigator, calls)
+    print(f"  recorded run:     {time.perf_counter() - start:6.2f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.jsonl")
+        start = time.perf_counter()
+        navigator.get_session().save(path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        session = ExplorationSession.load(path)
+        loaded = time.perf_counter() - start
+        print(f"  save / load:      {saved:6.2f} s / {loaded:.2f} s ({os.path.getsize(path) / 2**20:.1f} MiB)")
+
+    start = time.perf_counter()
+    replayed, timings = Navigator.replay(session)
+    print(f"  verified replay:  {time.perf_counter() - start:6.2f} s")
+    for name, seconds in sorted(timings.items()):
+        count = sum(1 for call in session.calls() if call[0] == name)
+        print(f"    {name:28s} {seconds / count * 1e6:8.1f} us/call ({count} calls)")
+    assert replayed.get_position() == navigator.get_position()
+
+
+def bench_inventory(kinds: int = 2_000, per_kind: int = 5, draws: int = 200_000) -> None:
+    """Compare list-scan discards with the indexed Inventory, and weighted sampling methods."""
+    items = [Item(f"Relic {i}", list(ItemType)[i % len(ItemType)]) for i in range(kinds)]
+    names = [item.name.upper() for item in items]
+    print(f"inventory ({kinds} kinds x {per_kind}, {draws} draws)")
+
+    carried = [item for item in items for _ in range(per_kind)]
+    start = time.perf_counter()
+    for name in names:
+        for item in carried:
+            if item.name.lower() == name.lower():
+                carried.remove(item)
+                break
+    print(f"  list scan discard:   {(time.perf_counter() - start) / kinds * 1e6:8.2f} us/discard")
+
+    inventory = Inventory()
+    for item in items:
+        inventory.add(item, per_kind)
+    start = time.perf_counter()
+    for name in names:
+        inventory.remove(name)
+    print(f"  Inventory.remove:    {(time.perf_counter() - start) / kinds * 1e6:8.2f} us/discard")
+
+    weights = [1 + i % 7 for i in range(kinds)]
+    table = ItemTable(list(zip(items, weights)))
+    rng = np.random.default_rng(7)
+    python_rng = random.Random(7)
+    start = time.perf_counter()
+    python_rng.choices(items, weights, k=draws)
+    print(f"  random.choices:      {(time.perf_counter() - start) / draws * 1e9:8.1f} ns/draw")
+    sample = table.sample
+    start = time.perf_counter()
+    for _ in range(draws):
+        sample(rng)
+    print(f"  ItemTable.sample:    {(time.perf_counter() - start) / draws * 1e9:8.1f} ns/draw")
+    start = time.perf_counter()
+    table.sample_many(rng, draws)
+    print(f"  ItemTable.sample_many: {(time.perf_counter() - start) / draws * 1e9:6.1f} ns/draw")
+
+
+def bench_runner(navigators: int = 2_000, steps: int = 100, chunk_size: int = 50) -> None:
+    """Compare a sequential campaign that stores every navigator's finds with ExplorationRunner."""
+    workers = os.cpu_count() or 1
+    print(f"exploration runner (navigators={navigators}, steps={steps}, cpus={workers})")
+
+    store = MemoryStore(max_size=10_000)
+    graph = ExplorationGraph()
+    visits = {}
+    start = time.perf_counter()
+    for seed in spawn_seeds(9, navigators):
+        navigator = Navigator(seed=seed)
+        _drive(navigator, steps, DEFAULT_DIRECTIONS)
+        for name, count in navigator.get_exploration_history().items():
+            if name not in visits:
+                store.store_discovery(name, {'type': 'location'})
+            visits[name] = visits.get(name, 0) + count
+        for source, targets in navigator.get_exploration_map().items():
+            for target in targets:
+                graph.add_edge(source, target, Navigator.ENERGY_COST)
+    sequential = time.perf_counter() - start
+    print(f"  sequential loop:      {sequential:6.2f} s")
+
+    for num_workers in sorted({0, 2, workers}):
+        runner = ExplorationRunner(MemoryStore(max_size=10_000), num_workers=num_workers, chunk_size=chunk_size)
+        metrics = runner.run(navigators, steps, seed=9)
+        print(f"  runner, {num_workers} workers:    {metrics.elapsed:6.2f} s  "
+              f"{metrics.throughput:9.0f} calls/s  utilisation {metrics.utilisation:4.0%}  "
+              f"merge {metrics.merge_seconds * 1e3:6.1f} ms ({metrics.chunks} chunks)")
+        assert runner.get_visit_counts() == visits
+
+
+def bench_location_symbols(navigators: int = 2_000, steps: int = 40, rooms: int = 20) -> None:
+    """Compare navigators interning locations in a shared SymbolTable with one table each."""
+    directions = [f"corridor {i}" for i in range(rooms)]
+    print(f"location symbols (navigators={navigators}, steps={steps}, realms={rooms})")
+    for label, shared in (("table per navigator", False), ("shared table", True)):
+        symbols = SymbolTable()
+        tracemalloc.start()
+        start = time.perf_counter()
+        fleet = []
+        for i in range(navigators):
+            navigator = Navigator(seed=i, symbols=symbols if shared else SymbolTable())
+            for step in range(steps):
+                if navigator.get_energy() < Navigator.ENERGY_COST:
+                    navigator.rest()
+                navigator.explore(directions[(i + step) % rooms])
+            fleet.append(navigator)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label + ':':21s} {elapsed / (navigators * steps) * 1e6:6.2f} us/step  peak {peak / 2**20:6.1f} MiB")
+
+
+def bench_planners(realms: int = 500, budget: int = 5_000, trials: int = 10) -> None:
+    """Compare how many new realms planners find per unit of energy and per CPU second."""
+    directions = [f"corridor {i}" for i in range(realms)]
+    print(f"planners (realms={realms}, energy budget={budget}, trials={trials})")
+    planners = [("random", ExplorationMode.SAFE, RandomPlanner)]
+    planners += [(f"frontier {mode.name.lower()}", mode, FrontierPlanner) for mode in ExplorationMode]
+    for label, mode, planner_class in planners:
+        new_realms = rests = 0
+        energy = cpu = 0.0
+        for trial in range(trials):
+            navigator = Navigator(seed=trial, symbols=SymbolTable())
+            navigator.set_exploration_mode(mode)
+            stats = planner_class(navigator, directions, seed=trial).run(budget)
+            new_realms += stats.new_realms
+            rests += stats.rests
+            energy += stats.energy_spent
+            cpu += stats.cpu_seconds
+        print(f"  {label + ':':21s} {new_realms / trials:6.1f} new realms  {100 * new_realms / energy:5.2f}/100 energy  "
+              f"{new_realms / cpu:9.0f}/cpu s  {rests / trials:5.1f} rests")
+
+
+def bench_bounded_history(locations: int = 50_000, revisits: int = 50_000, limit: int = 1_000,
+                          snapshots: int = 200) -> None:
+    """Compare exact and bounded visit counting, and history copies with snapshot views."""
+    directions = [f"corridor {i}" for i in range(locations)]
+    realms = [f"Corridor {i} Realm" for i in range(locations)]
+    # A few hot realms take most revisits, as for a long-running agent
+    hot = (np.random.default_rng(4).zipf(1.5, size=revisits) - 1) % locations
+    expected = np.bincount(hot, minlength=locations) + 1
+    hottest = np.argsort(expected)[::-1][:100].tolist()
+    print(f"bounded history (locations={locations}, revisits={revisits}, exact limit={limit})")
+    for label, max_exact_visits in (("exact", None), ("bounded", limit)):
+        navigator = Navigator(seed=0, symbols=SymbolTable(), max_exact_visits=max_exact_visits)
+        navigator._energy = navigator.ENERGY_COST * (locations + revisits + snapshots)
+        start = time.perf_counter()
+        for index in range(locations):
+            navigator.explore(directions[index])
+        for index in hot.tolist():
+            navigator.explore(directions[index])
+        elapsed = time.perf_counter() - start
+        counts = navigator._visits
+        footprint = sys.getsizeof(counts._exact) + counts.nbytes
+        hot_error = max(navigator.get_visit_count(realms[i]) - int(expected[i]) for i in hottest)
+        cold_error = np.mean([navigator.get_visit_count(realms[i]) - int(expected[i]) for i in range(0, locations, 97)])
+        print(f"  {label + ':':9s} {elapsed / (locations + revisits) * 1e6:5.2f} us/step  counts {footprint / 2**20:5.2f} MiB  "
+              f"exact entries {counts.exact_size:6d}  compactions {counts.compactions:3d}  "
+              f"overcount hot-100 max {hot_error}, cold mean {cold_error:.2f}")
+
+        start = time.perf_counter()
+        for _ in range(snapshots // 10):
+            navigator.get_exploration_history()
+        copied = (time.perf_counter() - start) / (snapshots // 10)
+        start = time.perf_counter()
+        for _ in range(snapshots):
+            navigator.get_history_view()
+            navigator.explore(directions[0])
+        viewed = (time.perf_counter() - start) / snapshots
+        print(f"  {'':9s} history copy {copied * 1e3:6.2f} ms    view + one explore {viewed * 1e6:6.1f} us")
+
+if __name__ == "__main__":
+    bench_graph_footprint()
+    bench_route_queries()
+    bench_weighted_search()
+    bench_fleet()
+    bench_spatial_grid()
+    bench_session_replay()
+    bench_inventory()
+    bench_runner()
+    bench_location_symbols()
+    bench_planners()
+    bench_bounded_history()
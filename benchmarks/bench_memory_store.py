@@ -0,0 +1,413 @@
+"""
+Benchmarks for MemoryStore.
+
+Run with:
+    python -m benchmarks.bench_memory_store
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from mosaic.learning import (
+    ConcurrentMemoryStore, MemorySnapshot, MemoryStore, ShardedMemoryStore, WriteAheadLog
+)
+
+# Per-call INFO/WARNING lines would dominate the timings
+logging.disable(logging.WARNING)
+
+
+def bench_insert_past_capacity(max_size: int = 200_000, rounds: int = 5) -> None:
+    """
+    Measure the per-insert cost while the store is filling and after it is full.
+
+    Each round inserts ``max_size`` discoveries, so every round after the
+    first runs entirely in the eviction path. A flat cost per round shows
+    that eviction does not depend on the store size.
+    """
+    store = MemoryStore(max_size=max_size)
+    print(f"insert past capacity (max_size={max_size})")
+    for round_number in range(rounds):
+        start = time.perf_counter()
+        for i in range(max_size):
+            store.store_discovery(i, {"round": round_number})
+        elapsed = time.perf_counter() - start
+        phase = "filling" if round_number == 0 else "evicting"
+        print(f"  round {round_number} ({phase}): "
+              f"{elapsed / max_size * 1e6:.2f} us/insert")
+
+
+def bench_entry_footprint(size: int = 200_000, rounds: int = 5) -> None:
+    """Measure bytes per stored entry and the cost of retrieve_memory scans."""
+    tracemalloc.start()
+    store = MemoryStore(max_size=size)
+    for i in range(size):
+        store.store_discovery(i, {"sector": i % 97} if i % 2 else None)
+    current, _ = tracemalloc.get_traced_memory()
+    cutoff = store.retrieve_memory()[-size // 100]["timestamp"]
+    formatted, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"entry footprint (size={size})")
+    print(f"  bytes per entry:            {current / size:8.1f}")
+    print(f"  ... after reading every timestamp: {formatted / size:8.1f}")
+    scans = (
+        ("discovery filter", lambda entry: entry['discovery'] % 1000 == 0),
+        ("metadata filter", lambda entry: entry['metadata'].get('sector') == 5),
+        ("timestamp filter", lambda entry: entry['timestamp'] >= cutoff),
+        ("unfiltered", None),
+    )
+    for name, filter_func in scans:
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            store.retrieve_memory(filter_func)
+            best = min(best, time.perf_counter() - start)
+        print(f"  retrieve_memory, {name + ':':18s}{best * 1e3:8.1f} ms")
+
+
+def bench_time_range(size: int = 200_000, queries: int = 50) -> None:
+    """Compare retrieve_range with a filter_func comparing timestamp strings."""
+    store = MemoryStore(max_size=size)
+    for i in range(size):
+        store.store_discovery(i)
+    cutoff = store.retrieve_memory()[-size // 100]["timestamp"]
+
+    print(f"time range, newest 1% (size={size})")
+    start = time.perf_counter()
+    for _ in range(queries):
+        store.retrieve_memory(lambda entry: datetime.fromisoformat(entry['timestamp']) >= datetime.fromisoformat(cutoff))
+    print(f"  filter_func scan: {(time.perf_counter() - start) / queries * 1e3:9.3f} ms/query")
+    start = time.perf_counter()
+    for _ in range(queries):
+        store.retrieve_range(start=cutoff)
+    print(f"  retrieve_range:   {(time.perf_counter() - start) / queries * 1e3:9.3f} ms/query")
+    start = time.perf_counter()
+    for _ in range(queries):
+        list(store.iter_since(timedelta(seconds=1)))
+    print(f"  iter_since(1s):   {(time.perf_counter() - start) / queries * 1e3:9.3f} ms/query")
+
+
+def bench_lazy_retrieval(size: int = 200_000, queries: int = 50) -> None:
+    """Compare taking the first matches via retrieve_memory with iter_memory and page_memory."""
+    store = MemoryStore(max_size=size)
+    store.store_discoveries(range(size))
+    print(f"first 10 matches (size={size})")
+    start = time.perf_counter()
+    for _ in range(queries):
+        store.retrieve_memory(lambda entry: entry['discovery'] % 7 == 0)[:10]
+    print(f"  retrieve_memory()[:10]: {(time.perf_counter() - start) / queries * 1e3:9.3f} ms/query")
+    start = time.perf_counter()
+    for _ in range(queries):
+        list(store.iter_memory(lambda entry: entry['discovery'] % 7 == 0, limit=10))
+    print(f"  iter_memory(limit=10):  {(time.perf_counter() - start) / queries * 1e3:9.3f} ms/query")
+    _, token = store.page_memory(page_size=10)
+    for _ in range(size // 20):
+        _, token = store.page_memory(page_size=10, page_token=token)
+    start = time.perf_counter()
+    for _ in range(queries):
+        store.page_memory(page_size=10, page_token=token)
+    print(f"  page_memory mid-store:  {(time.perf_counter() - start) / queries * 1e3:9.3f} ms/page")
+
+
+def bench_batch_ingest(sizes=(100_000, 1_000_000)) -> None:
+    """Compare per-item store_discovery/remove_discovery with the batch APIs."""
+    for size in sizes:
+        print(f"batch ingest (count={size})")
+        discoveries = [f"Pattern X{i}" for i in range(size)]
+        metadata = [{"sector": i % 97} for i in range(size)]
+
+        store = MemoryStore(max_size=size // 2)
+        start = time.perf_counter()
+        for discovery, item in zip(discoveries, metadata):
+            store.store_discovery(discovery, item)
+        per_item = time.perf_counter() - start
+
+        store = MemoryStore(max_size=size // 2)
+        start = time.perf_counter()
+        for offset in range(0, size, 10_000):
+            store.store_discoveries(discoveries[offset:offset + 10_000], metadata[offset:offset + 10_000])
+        batched = time.perf_counter() - start
+        print(f"  store_discovery:   {size / per_item:12,.0f} entries/s")
+        print(f"  store_discoveries: {size / batched:12,.0f} entries/s")
+
+        doomed = discoveries[-1000:]
+        start = time.perf_counter()
+        store.remove_discoveries(doomed)
+        print(f"  remove_discoveries({len(doomed)}): {(time.perf_counter() - start) * 1e3:8.1f} ms "
+              f"(remove_discovery would scan the store {len(doomed)} times)")
+
+
+def bench_eviction_policies(max_size: int = 100_000, inserts: int = 300_000) -> None:
+    """Compare the per-insert cost of each eviction policy, TTL expiry and the byte budget past capacity."""
+    print(f"eviction policies (max_size={max_size}, inserts={inserts})")
+    configurations = [
+        ("fifo", {}),
+        ("lru", {"eviction": "lru"}),
+        ("lfu", {"eviction": "lfu"}),
+        ("fifo + ttl", {"default_ttl": 3600}),
+        ("fifo + max_bytes", {"max_bytes": max_size * 400}),
+    ]
+    for name, options in configurations:
+        store = MemoryStore(max_size=max_size, indexed_keys=["bucket"], **options)
+        start = time.perf_counter()
+        for i in range(inserts):
+            store.store_discovery(f"Pattern X{i}", {"bucket": i % 1000})
+            if i % 100 == 0:
+                store.find(bucket=i % 1000)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:18s} {elapsed / inserts * 1e6:.2f} us/insert")
+
+
+def bench_indexed_find(size: int = 200_000, categories: int = 1000, queries: int = 200) -> None:
+    """Compare an indexed equality lookup with the equivalent filter_func scan."""
+    store = MemoryStore(max_size=size, indexed_keys=["category"])
+    for i in range(size):
+        store.store_discovery(i, {"category": f"c{i % categories}"})
+
+    print(f"equality lookup (size={size}, {size // categories} matches/query)")
+    start = time.perf_counter()
+    for q in range(queries):
+        category = f"c{q % categories}"
+        store.retrieve_memory(lambda entry: entry['metadata'].get('category') == category)
+    scan = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    for q in range(queries):
+        store.find(category=f"c{q % categories}")
+    indexed = (time.perf_counter() - start) / queries
+    print(f"  filter_func scan: {scan * 1e3:.3f} ms/query")
+    print(f"  indexed find:     {indexed * 1e3:.3f} ms/query")
+
+
+def bench_search_knowledge(size: int = 200_000, queries: int = 200) -> None:
+    """Compare keyword search against a substring filter_func scan."""
+    store = MemoryStore(max_size=size)
+    for i in range(size):
+        store.store_discovery(f"Pattern X{i % 5000} in sector {i % 97}", {"category": "quantum"})
+    store.search_knowledge("warmup")
+
+    print(f"keyword search (size={size})")
+    start = time.perf_counter()
+    for q in range(queries):
+        term = f"x{q}"
+        store.retrieve_memory(lambda entry: term in entry['discovery'].casefold().split())
+    scan = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    for q in range(queries):
+        store.search_knowledge(f"x{q}", limit=10)
+    indexed = (time.perf_counter() - start) / queries
+    print(f"  filter_func scan:  {scan * 1e3:.3f} ms/query")
+    print(f"  search_knowledge:  {indexed * 1e3:.3f} ms/query")
+
+
+def bench_export_import(size: int = 200_000) -> None:
+    """Measure time and peak traced allocations of export/import per file format."""
+    store = MemoryStore(max_size=size)
+    for i in range(size):
+        store.store_discovery(f"Pattern X{i}", {"category": "quantum", "index": i})
+
+    print(f"export/import (size={size})")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ("memory.json", "memory.jsonl", "memory.jsonl.gz"):
+            path = os.path.join(tmpdir, name)
+            for action in ("export", "import"):
+                tracemalloc.start()
+                start = time.perf_counter()
+                if action == "export":
+                    store.export_memory(path)
+                else:
+                    MemoryStore(max_size=size).import_memory(path)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"  {action} {name:<16} {elapsed:7.2f} s  "
+                      f"peak {peak / 2**20:8.1f} MiB  file {os.path.getsize(path) / 2**20:7.1f} MiB")
+
+
+def bench_cold_start(size: int = 200_000) -> None:
+    """Compare loading a JSON Lines export with opening a memory-mapped snapshot."""
+    store = MemoryStore(max_size=size, indexed_keys=["category"])
+    for i in range(size):
+        store.store_discovery(f"Pattern X{i}", {"category": f"c{i % 1000}"})
+
+    print(f"cold start (size={size})")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        jsonl_path = os.path.join(tmpdir, "memory.jsonl")
+        snapshot_path = os.path.join(tmpdir, "memory.snap")
+        store.export_memory(jsonl_path)
+        store.save_snapshot(snapshot_path)
+
+        start = time.perf_counter()
+        loaded = MemoryStore(max_size=size, indexed_keys=["category"])
+        loaded.import_memory(jsonl_path)
+        loaded.find(category="c7")
+        print(f"  import_memory + find:  {(time.perf_counter() - start) * 1e3:9.2f} ms")
+
+        start = time.perf_counter()
+        with MemorySnapshot(snapshot_path) as snapshot:
+            opened = time.perf_counter() - start
+            snapshot.find(category="c7")
+            print(f"  MemorySnapshot open:   {opened * 1e3:9.2f} ms")
+            print(f"  MemorySnapshot + find: {(time.perf_counter() - start) * 1e3:9.2f} ms")
+
+
+def bench_durable_store(count: int = 200_000, max_size: int = 100_000) -> None:
+    """Measure store throughput with a write-ahead log at several group-commit sizes."""
+    print(f"durable store_discovery (count={count}, max_size={max_size})")
+    for sync_every in (1, 100, 1000):
+        n = count if sync_every > 1 else count // 100
+        with tempfile.TemporaryDirectory() as tmpdir:
+            wal = WriteAheadLog(tmpdir, sync_every=sync_every)
+            store = MemoryStore(max_size=max_size, wal=wal)
+            start = time.perf_counter()
+            for i in range(n):
+                store.store_discovery(f"Pattern X{i}", {"category": "quantum"})
+            store.close()
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            MemoryStore(max_size=max_size, wal=WriteAheadLog(tmpdir)).close()
+            recovery = time.perf_counter() - start
+        print(f"  sync_every={sync_every:<5} {n / elapsed:10.0f} stores/s  recovery {recovery:.2f} s")
+
+
+class _LockedMemoryStore:
+    """Baseline: a MemoryStore behind one global lock, copying on every read."""
+
+    def __init__(self, max_size: int):
+        self._store = MemoryStore(max_size=max_size)
+        self._lock = threading.Lock()
+
+    def store_discovery(self, discovery, metadata=None):
+        with self._lock:
+            self._store.store_discovery(discovery, metadata)
+
+    def retrieve_memory(self, filter_func=None):
+        with self._lock:
+            return self._store.retrieve_memory(filter_func)
+
+
+def bench_contention(max_size: int = 50_000, writes_per_thread: int = 20_000, reads_per_thread: int = 5) -> None:
+    """Measure mixed read/write throughput as writer and reader threads are added."""
+    print(f"contention (max_size={max_size}, {writes_per_thread} writes + "
+          f"{reads_per_thread} full reads per thread)")
+    for factory in (_LockedMemoryStore, ConcurrentMemoryStore):
+        for threads in (1, 2, 4, 8, 16):
+            store = factory(max_size)
+            for i in range(max_size):
+                store.store_discovery(i)
+            read_latencies = []
+            write_latencies = []
+
+            def worker(worker_id):
+                reads_every = writes_per_thread // reads_per_thread
+                slowest_write = 0.0
+                for i in range(writes_per_thread):
+                    start = time.perf_counter()
+                    store.store_discovery(i, {"worker": worker_id})
+                    slowest_write = max(slowest_write, time.perf_counter() - start)
+                    if i % reads_every == 0:
+                        start = time.perf_counter()
+                        store.retrieve_memory(lambda entry: entry['metadata'].get('worker') == worker_id)
+                        read_latencies.append(time.perf_counter() - start)
+                write_latencies.append(slowest_write)
+
+            workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            print(f"  {factory.__name__:<22} threads={threads:<3} "
+                  f"{threads * writes_per_thread / elapsed:10.0f} writes/s  "
+                  f"max write {max(write_latencies) * 1e3:7.1f} ms  "
+                  f"max read {max(read_latencies) * 1e3:7.1f} ms")
+
+
+def _expensive_filter(entry: dict) -> bool:
+    """A filter heavy enough that scanning dominates IPC (module-level so it pickles)."""
+    return sum(map(ord, entry['discovery'])) % 7 == 0
+
+
+def bench_sharded_filter(size: int = 400_000, queries: int = 5) -> None:
+    """Compare filter-heavy scans on one MemoryStore with ShardedMemoryStore at several shard counts."""
+    print(f"filter scan (size={size}, cpu_count={os.cpu_count()})")
+    store = MemoryStore(max_size=size)
+    for i in range(size):
+        store.store_discovery(f"Pattern X{i} in sector {i % 97}")
+    start = time.perf_counter()
+    for _ in range(queries):
+        store.retrieve_memory(_expensive_filter)
+    print(f"  MemoryStore           {(time.perf_counter() - start) / queries * 1e3:8.1f} ms/query")
+
+    for num_shards in (1, 2, 4, 8):
+        with ShardedMemoryStore(max_size=size, num_shards=num_shards) as sharded:
+            for i in range(size):
+                sharded.store_discovery(f"Pattern X{i} in sector {i % 97}")
+            sharded.flush()
+            start = time.perf_counter()
+            for _ in range(queries):
+                sharded.retrieve_memory(_expensive_filter)
+            elapsed = (time.perf_counter() - start) / queries
+            slowest = max(sharded.shard_timings)
+        print(f"  ShardedMemoryStore({num_shards}) {elapsed * 1e3:8.1f} ms/query  "
+              f"slowest shard {slowest * 1e3:8.1f} ms")
+
+
+def bench_similarity_search(size: int = 100_000, dim: int = 128, queries: int = 256) -> None:
+    """Compare a per-entry Python similarity scan with exact, batched and LSH search."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((size, dim)).astype(np.float32)
+    store = MemoryStore(max_size=size, embedding_dim=dim)
+    for i in range(size):
+        store.store_discovery(f"Pattern X{i}", embedding=vectors[i])
+    probes = vectors[rng.integers(0, size, queries)] + 0.1 * rng.standard_normal((queries, dim)).astype(np.float32)
+
+    print(f"similarity search (size={size}, dim={dim})")
+    lists = [vector.tolist() for vector in vectors[:size // 100]]
+    probe = probes[0].tolist()
+    start = time.perf_counter()
+    max(range(len(lists)), key=lambda i: sum(a * b for a, b in zip(lists[i], probe)))
+    scan = (time.perf_counter() - start) * 100
+    print(f"  python loop (extrapolated): {scan * 1e3:9.1f} ms/query")
+
+    start = time.perf_counter()
+    for probe in probes[:32]:
+        store.search_similar(probe, limit=10)
+    print(f"  exact, one at a time:       {(time.perf_counter() - start) / 32 * 1e3:9.3f} ms/query")
+
+    start = time.perf_counter()
+    store.search_similar_batch(probes, limit=10)
+    print(f"  exact, batched:             {(time.perf_counter() - start) / queries * 1e3:9.3f} ms/query")
+
+    store.enable_approximate_search(num_tables=8, num_bits=14, seed=0)
+    exact = store.search_similar_batch(probes, limit=10)
+    start = time.perf_counter()
+    approximate = store.search_similar_batch(probes, limit=10, approximate=True)
+    elapsed = (time.perf_counter() - start) / queries
+    # Random vectors have no meaningful neighbours beyond the probed one, so score the top hit
+    recall = np.mean([bool(a) and a[0]['discovery'] == b[0]['discovery'] for a, b in zip(approximate, exact)])
+    print(f"  LSH:                        {elapsed * 1e3:9.3f} ms/query  top-1 recall {recall:.2f}")
+
+
+if __name__ == "__main__":
+    bench_insert_past_capacity()
+    bench_eviction_policies()
+    bench_batch_ingest()
+    bench_entry_footprint()
+    bench_time_range()
+    bench_lazy_retrieval()
+    bench_indexed_find()
+    bench_search_knowledge()
+    bench_export_import()
+    bench_cold_start()
+    bench_durable_store()
+    bench_contention()
+    bench_sharded_filter()
+    bench_similarity_search()
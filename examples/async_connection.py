@@ -0,0 +1,44 @@
+import asyncio
+import random
+from mosaic.connection import AsyncConnector, ConnectionError, StandInServer, run_sessions
+
+
+async def simulate_operations(connector: AsyncConnector) -> int:
+    """
+    Run a few operations for one agent, checking the connection between them.
+
+    Sleeping with asyncio.sleep rather than time.sleep lets every other
+    agent's session make progress while this one waits.
+
+    Args:
+        connector (AsyncConnector): The active connector instance.
+
+    Returns:
+        int: Number of heartbeats that passed.
+    """
+    passed = 0
+    for _ in range(3):
+        await asyncio.sleep(random.uniform(0.05, 0.15))
+        if await connector.send_heartbeat(timeout=1):
+            passed += 1
+    return passed
+
+
+async def main() -> None:
+    # A local stand-in for the simulation server
+    async with StandInServer(latency=0.005) as server:
+        host, port = server.address
+
+        async with AsyncConnector("AI-Explorer-Async", host, port) as connector:
+            print(f"Agent '{connector.agent}' connection established: {connector.is_connected}")
+
+        agents = [f"AI-Explorer-{n}" for n in range(2_000)]
+        results = await run_sessions(agents, simulate_operations, host, port, concurrency=1_000,
+                                     return_exceptions=True)
+        failures = [result for result in results if isinstance(result, ConnectionError)]
+        print(f"{len(agents)} agents ran {sum(r for r in results if isinstance(r, int))} heartbeats "
+              f"with at most {server.peak} sessions open; {len(failures)} sessions failed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,9 @@
 from .connector import Connector, ConnectionError
+from .pool import ConnectorPool, PoolMetrics, PoolTimeoutError
+from .async_connector import AsyncConnector, run_sessions
+from .stand_in import StandInServer
 
-__all__ = ['Connector', 'ConnectionError']
\ No newline at end of file
+__all__ = [
+    'Connector', 'ConnectionError', 'ConnectorPool', 'PoolMetrics', 'PoolTimeoutError',
+    'AsyncConnector', 'run_sessions', 'StandInServer'
+]
@@ -0,0 +1,273 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from .connector import ConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Line protocol spoken with the simulation server: the client opens a session
+# with HELLO, checks it with PING and ends it with BYE; each request gets one reply line
+HELLO = b"HELLO"
+PING = b"PING\n"
+BYE = b"BYE\n"
+OK = b"OK\n"
+PONG = b"PONG\n"
+
+
+class AsyncConnector:
+    """
+    A non-blocking connection to the Infinite Backrooms simulation environment.
+
+    The asyncio counterpart of Connector: connect, heartbeat, disconnect and
+    reconnect are coroutines that never block the event loop, so a single
+    loop can keep thousands of agent sessions open at once. Every call is
+    bounded by a timeout, and a call that times out or loses the server
+    raises ConnectionError and leaves the connector disconnected.
+
+    Without a host the connection is simulated in-process, as Connector's
+    is; with a host and port it is a TCP session with the simulation
+    server. Calls on one connector are serialized, so several tasks may
+    share it.
+
+    Attributes:
+        agent (str): Identifier for the AI agent
+        host (str): Server host, or None for a simulated connection
+        port (int): Server port
+        timeout (float): Default timeout of each call in seconds
+        _connected (bool): Connection status flag
+        _reader (asyncio.StreamReader): Server stream, while connected to a server
+        _writer (asyncio.StreamWriter): Server stream, while connected to a server
+        _lock (asyncio.Lock): Serializes calls on the connection
+    """
+
+    def __init__(self, agent: str, host: Optional[str] = None, port: Optional[int] = None, timeout: float = 10.0):
+        """
+        Initialize the AsyncConnector with a specific AI agent.
+
+        Args:
+            agent: Unique identifier for the AI agent
+            host: Server host; None simulates the connection in-process
+            port: Server port, required with a host
+            timeout: Default timeout of each call in seconds
+
+        Raises:
+            ValueError: If agent is empty or not a string, a host is given without
+                a port, or timeout is not positive
+        """
+        if not agent or not isinstance(agent, str) or any(char.isspace() for char in agent):
+            raise ValueError("Agent must be a non-empty string without whitespace")
+        if host is not None and port is None:
+            raise ValueError("A port is required with a host")
+        self._check_timeout(timeout)
+
+        self.agent = agent
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._connected = False
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _check_timeout(timeout: Optional[float]) -> None:
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError("Timeout must be a positive number of seconds")
+
+    @property
+    def is_connected(self) -> bool:
+        """Return the current connection status"""
+        return self._connected
+
+    async def connect(self, timeout: Optional[float] = None) -> None:
+        """
+        Establish connection to the simulation environment.
+
+        Args:
+            timeout: Seconds to wait for the connection (default: self.timeout)
+
+        Raises:
+            ConnectionError: If the connection cannot be established in time
+        """
+        async with self._lock:
+            if self._connected:
+                logger.warning(f"{self.agent}: Already connected")
+                return
+            try:
+                self._check_timeout(timeout)
+                logger.debug(f"{self.agent}: Attempting connection...")
+                await asyncio.wait_for(self._open(), timeout or self.timeout)
+                self._connected = True
+                logger.debug(f"{self.agent}: Successfully connected to Infinite Backrooms")
+            except Exception as e:
+                self._close_streams()
+                logger.error(f"{self.agent}: Connection failed - {self._describe(e)}")
+                raise ConnectionError(f"Connection failed: {self._describe(e)}") from e
+
+    async def _open(self) -> None:
+        if self.host is None:
+            # Simulated connection logic; yield so callers never starve the loop
+            await asyncio.sleep(0)
+            return
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        await self._request(HELLO + b" " + self.agent.encode() + b"\n", OK)
+
+    async def _request(self, line: bytes, expected: bytes) -> None:
+        """Send one request line and check the server's reply"""
+        self._writer.write(line)
+        await self._writer.drain()
+        reply = await self._reader.readline()
+        if reply != expected:
+            raise ConnectionError(f"Unexpected reply {reply.decode(errors='replace').strip()!r}"
+                                  if reply else "Server closed the connection")
+
+    async def disconnect(self, timeout: Optional[float] = None) -> None:
+        """
+        Terminate the current connection gracefully.
+
+        Args:
+            timeout: Seconds to wait for the server to acknowledge (default: self.timeout)
+
+        Raises:
+            ConnectionError: If disconnection fails; the connector is disconnected regardless
+        """
+        async with self._lock:
+            if not self._connected:
+                logger.warning(f"{self.agent}: Not currently connected")
+                return
+            logger.debug(f"{self.agent}: Initiating disconnect...")
+            self._connected = False
+            try:
+                if self._writer is not None:
+                    self._check_timeout(timeout)
+                    await asyncio.wait_for(self._request(BYE, BYE), timeout or self.timeout)
+                logger.debug(f"{self.agent}: Disconnected from Infinite Backrooms")
+            except Exception as e:
+                logger.error(f"{self.agent}: Disconnection failed - {self._describe(e)}")
+                raise ConnectionError(f"Disconnection failed: {self._describe(e)}") from e
+            finally:
+                self._close_streams()
+
+    async def send_heartbeat(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send a heartbeat signal to verify the connection status.
+
+        Args:
+            timeout: Seconds to wait for the reply (default: self.timeout)
+
+        Returns:
+            bool: True if the connection is active and the heartbeat is successful.
+
+        Raises:
+            ConnectionError: If the connection is not active, or the heartbeat fails
+                or times out, after which the connector is disconnected.
+        """
+        async with self._lock:
+            if not self._connected:
+                logger.error(f"{self.agent}: Cannot send heartbeat. Not connected.")
+                raise ConnectionError("Cannot send heartbeat. Not connected.")
+            try:
+                self._check_timeout(timeout)
+                logger.debug(f"{self.agent}: Sending heartbeat...")
+                if self._writer is not None:
+                    await asyncio.wait_for(self._request(PING, PONG), timeout or self.timeout)
+                logger.debug(f"{self.agent}: Heartbeat successful")
+                return True
+            except Exception as e:
+                self._connected = False
+                self._close_streams()
+                logger.error(f"{self.agent}: Heartbeat failed - {self._describe(e)}")
+                raise ConnectionError(f"Heartbeat failed: {self._describe(e)}") from e
+
+    async def reconnect(self, timeout: Optional[float] = None) -> None:
+        """
+        Reconnect to the simulation environment.
+
+        A failure to end the old session cleanly does not prevent the new one.
+
+        Args:
+            timeout: Seconds each step may take (default: self.timeout)
+
+        Raises:
+            ConnectionError: If the reconnection fails.
+        """
+        try:
+            await self.disconnect(timeout)
+        except ConnectionError as e:
+            logger.warning(f"{self.agent}: Old session did not close cleanly - {str(e)}")
+        try:
+            await self.connect(timeout)
+            logger.info(f"{self.agent} reconnected successfully.")
+        except ConnectionError as e:
+            logger.error(f"Failed to reconnect: {str(e)}")
+            raise ConnectionError(f"Reconnection failed: {str(e)}") from e
+
+    def _close_streams(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    @staticmethod
+    def _describe(error: Exception) -> str:
+        if isinstance(error, asyncio.TimeoutError):
+            return "Timed out"
+        return str(error) or type(error).__name__
+
+    async def __aenter__(self):
+        """Async context manager entry point"""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit point"""
+        if self._connected:
+            await self.disconnect()
+
+    def __repr__(self) -> str:
+        """Official string representation of the AsyncConnector"""
+        return f"AsyncConnector(agent={self.agent}, connected={self._connected})"
+
+
+async def run_sessions(
+    agents: Iterable[str],
+    session: Callable[[AsyncConnector], Awaitable[Any]],
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    concurrency: int = 512,
+    timeout: float = 10.0,
+    return_exceptions: bool = False
+) -> List[Any]:
+    """
+    Run a session for each of many agents concurrently on the current event loop.
+
+    Each agent gets its own AsyncConnector, connected for the duration of
+    its session. At most concurrency sessions are open at once, which keeps
+    a burst of thousands of agents from overrunning the server's accept queue.
+
+    Args:
+        agents: Agents to run a session for
+        session: Coroutine function called with each connected connector
+        host: Server host; None simulates the connections in-process
+        port: Server port, required with a host
+        concurrency: Maximum number of sessions open at once
+        timeout: Timeout of each connector call in seconds
+        return_exceptions: Return a session's exception in its place instead of raising it
+
+    Returns:
+        The result of each agent's session, in the order of agents
+
+    Raises:
+        ValueError: If concurrency is not a positive integer
+        ConnectionError: If a session cannot connect, unless return_exceptions is set
+    """
+    if not isinstance(concurrency, int) or concurrency <= 0:
+        raise ValueError("concurrency must be a positive integer")
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(agent: str) -> Any:
+        async with slots:
+            async with AsyncConnector(agent, host, port, timeout) as connector:
+                return await session(connector)
+
+    return await asyncio.gather(*(run(agent) for agent in agents), return_exceptions=return_exceptions)
@@ -0,0 +1,537 @@
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .connector import Connector, ConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(ConnectionError):
+    """Raised when no connection becomes available before the checkout timeout"""
+    pass
+
+
+class PoolMetrics:
+    """
+    Counters of a ConnectorPool's activity since it was created.
+
+    Attributes:
+        checkouts (int): Connections handed out
+        created (int): Connections opened
+        reused (int): Checkouts served by an idle connection
+        discarded (int): Connections dropped because validation failed or a lease raised
+        pruned (int): Idle connections closed after idle_timeout
+        rebound (int): Reused checkouts served by another agent's idle connection
+        waits (int): Checkouts that had to queue for capacity
+        timeouts (int): Checkouts that gave up waiting
+        wait_seconds (float): Total time spent queueing
+        max_wait (float): Longest single wait
+        busy_seconds (float): Sum over time of the number of leased connections
+    """
+    __slots__ = ('checkouts', 'created', 'reused', 'discarded', 'pruned', 'rebound', 'waits', 'timeouts',
+                 'wait_seconds', 'max_wait', 'busy_seconds')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        self.busy_seconds = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """Mean queueing time of the checkouts that waited"""
+        return self.wait_seconds / self.waits if self.waits else 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of checkouts that reused an open connection"""
+        return self.reused / self.checkouts if self.checkouts else 0.0
+
+    def __repr__(self) -> str:
+        return (f"PoolMetrics(checkouts={self.checkouts}, created={self.created}, reused={self.reused}, "
+                f"waits={self.waits}, mean_wait={self.mean_wait:.4f}s)")
+
+
+class _Waiter:
+    """A checkout queued for capacity"""
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class ConnectorPool:
+    """
+    A thread-safe pool of open Connectors, leased to agents and reused across leases.
+
+    Idle connections are kept per agent. A checkout takes the agent's most
+    recently used idle connection if it has one; otherwise it rebinds the
+    least recently used idle connection of another agent, and only opens a
+    new connection when none is idle. At most max_size connections are open
+    at once. When all of them are leased, checkouts queue in FIFO order and
+    capacity freed by a release is handed straight to the longest-waiting
+    checkout, so a steady stream of new checkouts cannot starve it.
+
+    Idle connections are validated with send_heartbeat() on checkout and
+    replaced if it fails, and are closed once idle for idle_timeout seconds,
+    though never below min_size. Expired connections are pruned whenever the
+    pool is used and by a daemon reaper thread, so a pool that goes quiet
+    still closes them. warm() opens connections ahead of demand.
+
+    Attributes:
+        min_size (int): Idle connections kept open however long they idle
+        max_size (int): Maximum number of open connections
+        idle_timeout (float): Seconds an idle connection is kept, or None for no limit
+        max_per_agent (int): Maximum leased and queued checkouts per agent, or None for no limit
+        validate (bool): Whether idle connections are checked with a heartbeat on checkout
+        metrics (PoolMetrics): Activity counters
+        _factory (callable): Creates a Connector for an agent
+        _idle (OrderedDict): (agent, serial) to (connector, time released), least recently used first
+        _idle_by_agent (dict): Agent to the serials of its idle connections, most recent last
+        _leased (dict): id() of each leased connector to its agent
+        _leases (dict): Agent to its number of leased or queued checkouts
+        _waiters (deque): Checkouts queued for capacity, oldest first
+        _permits (int): Leases that can start without queueing
+        _opening (int): Connections being opened outside the lock
+        _reaper_stop (threading.Event): Set to stop the reaper thread
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Connector] = Connector,
+        min_size: int = 0,
+        max_size: int = 10,
+        idle_timeout: Optional[float] = 300.0,
+        max_per_agent: Optional[int] = None,
+        validate: bool = True,
+        connect_timeout: int = 10
+    ):
+        """
+        Args:
+            factory: Creates an unconnected Connector for an agent (default: Connector)
+            min_size: Idle connections kept open however long they idle
+            max_size: Maximum number of open connections
+            idle_timeout: Seconds an idle connection is kept, or None for no limit
+            max_per_agent: Maximum leased and queued checkouts per agent, or None for no limit
+            validate: Whether idle connections are checked with a heartbeat on checkout
+            connect_timeout: Timeout passed to Connector.connect()
+
+        Raises:
+            ValueError: If a size, limit or timeout is invalid
+        """
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        if not isinstance(min_size, int) or not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be an integer between 0 and max_size")
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("idle_timeout must be positive or None")
+        if max_per_agent is not None and (not isinstance(max_per_agent, int) or max_per_agent <= 0):
+            raise ValueError("max_per_agent must be a positive integer or None")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_per_agent = max_per_agent
+        self.validate = validate
+        self.metrics = PoolMetrics()
+        self._factory = factory
+        self._connect_timeout = connect_timeout
+        self._lock = threading.Lock()
+        self._idle: 'OrderedDict[Tuple[str, int], Tuple[Connector, float]]' = OrderedDict()
+        self._idle_by_agent: Dict[str, List[int]] = {}
+        self._leased: Dict[int, str] = {}
+        self._leases: Dict[str, int] = {}
+        self._waiters: Deque[_Waiter] = deque()
+        self._permits = max_size
+        self._opening = 0
+        self._serial = 0
+        self._closed = False
+        self._created_at = time.monotonic()
+        self._busy_since = self._created_at
+        self._reaper_stop = threading.Event()
+        if idle_timeout is not None:
+            # The reaper holds the pool weakly so an abandoned pool can still be collected
+            threading.Thread(
+                target=self._reap, args=(weakref.ref(self), self._reaper_stop, idle_timeout / 2),
+                name="ConnectorPool-reaper", daemon=True
+            ).start()
+        logger.info(f"ConnectorPool initialized with capacity {max_size}")
+
+    def acquire(self, agent: str, timeout: Optional[float] = None) -> Connector:
+        """
+        Check out a connected Connector for an agent.
+
+        Args:
+            agent: The agent the connection is for
+            timeout: Seconds to wait for capacity, or None to wait indefinitely
+
+        Returns:
+            A connected Connector; give it back with release()
+
+        Raises:
+            PoolTimeoutError: If no capacity became available in time
+            ConnectionError: If the pool is closed, the agent already holds or awaits
+                max_per_agent connections, or a new connection cannot be established
+        """
+        self._take_permit(agent, timeout)
+        try:
+            connector = self._checkout(agent)
+        except Exception:
+            with self._lock:
+                self._return_permit(agent)
+            raise
+        logger.debug(f"Leased a connection to {agent}")
+        return connector
+
+    def release(self, connector: Connector, discard: bool = False) -> None:
+        """
+        Return a leased Connector to the pool.
+
+        Args:
+            connector: A connector returned by acquire()
+            discard: Close the connection instead of keeping it for reuse
+
+        Raises:
+            ValueError: If the connector is not leased from this pool
+        """
+        with self._lock:
+            self._account_busy()
+            agent = self._leased.pop(id(connector), None)
+            if agent is None:
+                raise ValueError("Connector is not leased from this pool")
+            keep = not discard and not self._closed and connector.is_connected
+            if keep:
+                self._serial += 1
+                self._idle[(agent, self._serial)] = (connector, time.monotonic())
+                self._idle_by_agent.setdefault(agent, []).append(self._serial)
+            else:
+                self.metrics.discarded += discard
+            self._return_permit(agent)
+            stale = self._prune_idle()
+        if not keep:
+            stale.append(connector)
+        self._close_all(stale)
+        logger.debug(f"Released a connection of {agent}")
+
+    @contextmanager
+    def lease(self, agent: str, timeout: Optional[float] = None) -> Iterator[Connector]:
+        """
+        Lease a connection for the duration of a with block.
+
+        A connection whose block raises ConnectionError is discarded rather
+        than reused.
+
+        Args:
+            agent: The agent the connection is for
+            timeout: Seconds to wait for capacity, or None to wait indefinitely
+
+        Yields:
+            A connected Connector
+        """
+        connector = self.acquire(agent, timeout)
+        try:
+            yield connector
+        except ConnectionError:
+            self.release(connector, discard=True)
+            raise
+        except BaseException:
+            self.release(connector)
+            raise
+        self.release(connector)
+
+    def warm(self, agents: List[str]) -> int:
+        """
+        Open idle connections ahead of demand, one per agent, while there is room.
+
+        Args:
+            agents: Agents to open a connection for
+
+        Returns:
+            Number of connections opened
+
+        Raises:
+            ConnectionError: If the pool is closed or a connection cannot be established
+        """
+        self.prune()
+        opened = 0
+        for agent in agents:
+            with self._lock:
+                if self._closed:
+                    raise ConnectionError("Connector pool is closed")
+                if not self._permits or self._waiters or self.size >= self.max_size:
+                    break
+                self._permits -= 1
+                self._start_lease(agent)
+                self._opening += 1
+            try:
+                connector = self._open(agent)
+            except Exception:
+                with self._lock:
+                    self._return_permit(agent)
+                raise
+            self.release(connector)
+            opened += 1
+        return opened
+
+    def close(self) -> None:
+        """Close idle connections and stop handing out new ones; leased ones close on release"""
+        self._reaper_stop.set()
+        with self._lock:
+            self._closed = True
+            idle = [connector for connector, _ in self._idle.values()]
+            self._idle.clear()
+            self._idle_by_agent.clear()
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for waiter in waiters:
+            waiter.event.set()
+        self._close_all(idle)
+        logger.info("ConnectorPool closed")
+
+    def prune(self) -> int:
+        """
+        Close the idle connections that have been idle for idle_timeout, keeping min_size.
+
+        Returns:
+            Number of connections closed
+        """
+        with self._lock:
+            stale = self._prune_idle()
+        self._close_all(stale)
+        return len(stale)
+
+    @staticmethod
+    def _reap(pool_ref: 'weakref.ref', stop: threading.Event, interval: float) -> None:
+        """Reaper thread: prune the pool every interval seconds until it is closed or collected"""
+        while not stop.wait(interval):
+            pool = pool_ref()
+            if pool is None:
+                return
+            pool.prune()
+            del pool
+
+    def __enter__(self):
+        """Context manager entry point"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point"""
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, leased, idle or being opened"""
+        return len(self._idle) + len(self._leased) + self._opening
+
+    @property
+    def in_use(self) -> int:
+        """Number of leased connections"""
+        return len(self._leased)
+
+    @property
+    def idle(self) -> int:
+        """Number of idle connections"""
+        return len(self._idle)
+
+    @property
+    def waiting(self) -> int:
+        """Number of checkouts queued for capacity"""
+        return len(self._waiters)
+
+    def utilisation(self) -> float:
+        """Return the mean fraction of max_size leased since the pool was created"""
+        with self._lock:
+            self._account_busy()
+            elapsed = time.monotonic() - self._created_at
+            return self.metrics.busy_seconds / (elapsed * self.max_size) if elapsed else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Return the pool's current occupancy with its wait and utilisation metrics"""
+        self.prune()
+        utilisation = self.utilisation()
+        metrics = self.metrics
+        return {
+            'size': self.size,
+            'in_use': self.in_use,
+            'idle': self.idle,
+            'waiting': self.waiting,
+            'checkouts': metrics.checkouts,
+            'created': metrics.created,
+            'reuse_ratio': metrics.reuse_ratio,
+            'waits': metrics.waits,
+            'timeouts': metrics.timeouts,
+            'mean_wait': metrics.mean_wait,
+            'max_wait': metrics.max_wait,
+            'utilisation': utilisation
+        }
+
+    def _take_permit(self, agent: str, timeout: Optional[float]) -> None:
+        """Claim capacity for one lease, queueing fairly if there is none"""
+        with self._lock:
+            if self._closed:
+                raise ConnectionError("Connector pool is closed")
+            if self.max_per_agent is not None and self._leases.get(agent, 0) >= self.max_per_agent:
+                raise ConnectionError(f"{agent} already holds or awaits {self.max_per_agent} connections")
+            # Counted from now, so queued checkouts of one agent cannot together exceed max_per_agent
+            self._start_lease(agent)
+            if self._permits and not self._waiters:
+                self._permits -= 1
+                return
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+            self.metrics.waits += 1
+
+        start = time.monotonic()
+        waiter.event.wait(timeout)
+        waited = time.monotonic() - start
+        with self._lock:
+            self.metrics.wait_seconds += waited
+            self.metrics.max_wait = max(self.metrics.max_wait, waited)
+            if not waiter.granted:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._end_lease(agent)
+                if self._closed:
+                    raise ConnectionError("Connector pool is closed")
+                self.metrics.timeouts += 1
+                logger.warning(f"{agent}: No pooled connection available after {waited:.3f}s")
+                raise PoolTimeoutError(f"No connection available within {timeout} seconds")
+
+    def _start_lease(self, agent: str) -> None:
+        self._leases[agent] = self._leases.get(agent, 0) + 1
+
+    def _end_lease(self, agent: str) -> None:
+        remaining = self._leases[agent] - 1
+        if remaining:
+            self._leases[agent] = remaining
+        else:
+            del self._leases[agent]
+
+    def _return_permit(self, agent: str) -> None:
+        """Give back one lease's capacity, to the oldest waiter if there is one"""
+        self._end_lease(agent)
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            waiter.event.set()
+        else:
+            self._permits += 1
+
+    def _checkout(self, agent: str) -> Connector:
+        """Find or open a connection for a lease that already holds capacity"""
+        while True:
+            with self._lock:
+                stale = self._prune_idle()
+                connector = self._pop_idle(agent)
+                if connector is None:
+                    # Holding a permit guarantees room for one more connection
+                    # once no idle one is left; count it while it opens
+                    self._opening += 1
+                    break
+                # Reserve it before validating outside the lock
+                self._account_busy()
+                self._leased[id(connector)] = agent
+            self._close_all(stale)
+            if not self.validate or self._healthy(connector):
+                with self._lock:
+                    self.metrics.checkouts += 1
+                    self.metrics.reused += 1
+                    if connector.agent != agent:
+                        self.metrics.rebound += 1
+                        connector.agent = agent
+                return connector
+            with self._lock:
+                self._account_busy()
+                del self._leased[id(connector)]
+                self.metrics.discarded += 1
+            self._close_all([connector])
+        self._close_all(stale)
+        return self._open(agent)
+
+    def _open(self, agent: str) -> Connector:
+        """Open a new leased connection; _opening must already count it"""
+        try:
+            connector = self._factory(agent)
+            connector.connect(self._connect_timeout)
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+            raise
+        with self._lock:
+            self._opening -= 1
+            self._account_busy()
+            self._leased[id(connector)] = agent
+            self.metrics.checkouts += 1
+            self.metrics.created += 1
+        return connector
+
+    def _pop_idle(self, agent: str) -> Optional[Connector]:
+        """Take the agent's most recently used idle connection, else the least recently used of any agent"""
+        serials = self._idle_by_agent.get(agent)
+        if serials:
+            key = (agent, serials[-1])
+        elif self._idle:
+            key = next(iter(self._idle))
+        else:
+            return None
+        self._forget_idle(key)
+        connector, _ = self._idle.pop(key)
+        return connector
+
+    def _forget_idle(self, key: Tuple[str, int]) -> None:
+        agent, serial = key
+        serials = self._idle_by_agent[agent]
+        serials.remove(serial)
+        if not serials:
+            del self._idle_by_agent[agent]
+
+    def _prune_idle(self) -> List[Connector]:
+        """Remove idle connections past idle_timeout, keeping min_size; return them for closing"""
+        if self.idle_timeout is None:
+            return []
+        deadline = time.monotonic() - self.idle_timeout
+        stale = []
+        idle = self._idle
+        while len(idle) > self.min_size:
+            key, (connector, released) = next(iter(idle.items()))
+            if released > deadline:
+                break
+            del idle[key]
+            self._forget_idle(key)
+            stale.append(connector)
+        self.metrics.pruned += len(stale)
+        return stale
+
+    def _account_busy(self) -> None:
+        """Add the leases held since the last change to busy_seconds"""
+        now = time.monotonic()
+        self.metrics.busy_seconds += len(self._leased) * (now - self._busy_since)
+        self._busy_since = now
+
+    @staticmethod
+    def _healthy(connector: Connector) -> bool:
+        try:
+            return connector.is_connected and connector.send_heartbeat()
+        except ConnectionError:
+            logger.warning(f"{connector.agent}: Pooled connection failed validation")
+            return False
+
+    @staticmethod
+    def _close_all(connectors: List[Connector]) -> None:
+        for connector in connectors:
+            try:
+                connector.disconnect()
+            except ConnectionError as e:
+                logger.warning(f"{connector.agent}: Failed to close pooled connection - {str(e)}")
+
+    def __repr__(self) -> str:
+        """Official string representation of the ConnectorPool"""
+        return (f"ConnectorPool(size={self.size}, in_use={self.in_use}, idle={self.idle}, "
+                f"max_size={self.max_size})")
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+from .async_connector import BYE, HELLO, OK, PING, PONG
+
+logger = logging.getLogger(__name__)
+
+
+class StandInServer:
+    """
+    A local asyncio server that speaks the simulation's session protocol.
+
+    Stands in for the simulation environment in tests and benchmarks:
+    it accepts sessions from AsyncConnector, answers heartbeats and counts
+    what it served. An optional latency delays every reply to model a
+    round trip to a remote server.
+
+    Attributes:
+        host (str): Interface to listen on
+        port (int): Port to listen on; 0 picks a free one, available from address once started
+        latency (float): Seconds each reply is delayed
+        backlog (int): Connections the listening socket queues before accepting
+        accepted (int): Sessions opened so far
+        heartbeats (int): Heartbeats answered so far
+        peak (int): Most sessions open at once
+        _sessions (dict): Agent to the stream of its open session; a new session of an agent replaces the old
+        _writers (set): Streams of open connections, closed when the server stops
+        _server (asyncio.base_events.Server): The listening server, while running
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, backlog: int = 4096):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one
+            latency: Seconds each reply is delayed
+            backlog: Connections the listening socket queues before accepting
+
+        Raises:
+            ValueError: If latency is negative
+        """
+        if latency < 0:
+            raise ValueError("latency must be non-negative")
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.backlog = backlog
+        self.accepted = 0
+        self.heartbeats = 0
+        self.peak = 0
+        self._sessions: Dict[str, asyncio.StreamWriter] = {}
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Return the (host, port) the server listens on"""
+        return self.host, self.port
+
+    @property
+    def sessions(self) -> int:
+        """Number of sessions open now"""
+        return len(self._sessions)
+
+    async def start(self) -> None:
+        """Start listening; the port is resolved if it was 0"""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port, backlog=self.backlog)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Stand-in simulation server listening on {self.host}:{self.port}")
+
+    async def close(self) -> None:
+        """Stop listening and drop every open connection"""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+        logger.info("Stand-in simulation server stopped")
+
+    async def __aenter__(self):
+        """Async context manager entry point"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit point"""
+        await self.close()
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: bytes) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(line)
+        await writer.drain()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle one connection: a HELLO, then heartbeats until BYE or end of stream"""
+        self._writers.add(writer)
+        agent = None
+        try:
+            hello = await reader.readline()
+            command, _, name = hello.strip().partition(b" ")
+            if command != HELLO or not name:
+                await self._reply(writer, b"ERR expected HELLO <agent>\n")
+                return
+            agent = name.decode()
+            previous = self._sessions.get(agent)
+            if previous is not None:
+                # A client that timed out reconnects before its old session
+                # is noticed as gone; the new session takes over
+                previous.close()
+            self._sessions[agent] = writer
+            self.accepted += 1
+            self.peak = max(self.peak, len(self._sessions))
+            await self._reply(writer, OK)
+            while True:
+                line = await reader.readline()
+                if line == PING:
+                    self.heartbeats += 1
+                    await self._reply(writer, PONG)
+                elif line == BYE:
+                    await self._reply(writer, BYE)
+                    return
+                elif not line:
+                    return
+                else:
+                    await self._reply(writer, b"ERR unknown command\n")
+        except OSError:
+            # The client went away mid-session
+            pass
+        except asyncio.CancelledError:
+            # The loop is shutting down; returning rather than re-raising
+            # keeps Python 3.11 from reporting the handler as failed
+            pass
+        finally:
+            if agent is not None and self._sessions.get(agent) is writer:
+                del self._sessions[agent]
+            self._writers.discard(writer)
+            writer.close()
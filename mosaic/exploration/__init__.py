@@ -1,3 +1,18 @@
-from .navigator import Navigator, ExplorationMode, NavigationError
+from .navigator import Navigator, ExplorationMode, Direction, NavigationError
+from .graph import ExplorationGraph, GraphView
+from .fleet import NavigatorFleet, NavigatorView
+from .spatial import SpatialGrid
+from .inventory import Inventory, Item, ItemTable, ItemType
+from .session import ExplorationSession, make_rng, spawn_seeds
+from .runner import ExplorationRunner, RunnerMetrics
+from .symbols import SymbolTable
+from .history import CountMinSketch, HistoryView, VisitCounter
+from .planner import FrontierPlanner, ModeWeights, Planner, PlanStats, RandomPlanner
 
-__all__ = ['Navigator', 'ExplorationMode', 'NavigationError']
\ No newline at end of file
+__all__ = [
+    'Navigator', 'ExplorationMode', 'Direction', 'NavigationError', 'ExplorationGraph',
+    'NavigatorFleet', 'NavigatorView', 'SpatialGrid', 'ExplorationSession', 'make_rng', 'spawn_seeds',
+    'Inventory', 'Item', 'ItemTable', 'ItemType', 'ExplorationRunner', 'RunnerMetrics',
+    'SymbolTable', 'Planner', 'FrontierPlanner', 'RandomPlanner', 'ModeWeights', 'PlanStats',
+    'GraphView', 'CountMinSketch', 'HistoryView', 'VisitCounter'
+]
\ No newline at end of file
@@ -0,0 +1,3 @@
+class NavigationError(Exception):
+    """Custom exception for navigation-related errors."""
+    pass
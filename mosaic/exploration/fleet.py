@@ -0,0 +1,766 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .errors import NavigationError
+from .graph import ExplorationGraph, GraphView
+from .history import HistoryView, VisitCounter
+from .inventory import Item
+from .navigator import DIRECTION_STEPS, Direction, ExplorationMode, Navigator
+from .session import ExplorationSession, SeedLike, make_rng
+from .spatial import SpatialGrid
+from .symbols import SymbolTable
+
+logger = logging.getLogger(__name__)
+
+_MODES = tuple(ExplorationMode)
+
+# Visits pack (agent, location) and edges pack (agent, from, to) into one int64 key
+_LOCATION_BITS = 20
+_LOCATION_MASK = (1 << _LOCATION_BITS) - 1
+MAX_LOCATIONS = 1 << _LOCATION_BITS
+MAX_FLEET_SIZE = 1 << (63 - 2 * _LOCATION_BITS)
+
+# Keys buffered by a _KeyCounter beyond its merged size before it merges
+_MIN_MERGE = 1 << 16
+
+# Navigators to act on: None for all, an index, a slice, indices or a boolean mask
+Agents = Union[None, int, slice, Sequence[int], np.ndarray]
+
+# Where to explore: None or one direction for everyone, one direction per
+# navigator, or an integer array of location IDs from realm_id()
+Directions = Union[None, str, Sequence[Optional[str]], np.ndarray]
+
+
+class _KeyCounter:
+    """
+    Occurrence counts of int64 keys, added in batches.
+
+    Batches are buffered and merged into one sorted array of distinct keys
+    once they outnumber it, so adding costs amortised O(log n) per key and
+    lookups binary-search the merged array.
+    """
+
+    def __init__(self):
+        self._keys = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._pending: List[np.ndarray] = []
+        self._pending_size = 0
+
+    def add(self, keys: np.ndarray) -> None:
+        """Count one occurrence of each key"""
+        self._pending.append(keys)
+        self._pending_size += len(keys)
+        if self._pending_size > len(self._keys) + _MIN_MERGE:
+            self._merge()
+
+    def range(self, low: int, high: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the distinct keys with low <= key < high and their counts"""
+        if self._pending:
+            self._merge()
+        first, last = np.searchsorted(self._keys, (low, high))
+        return self._keys[first:last], self._counts[first:last]
+
+    def _merge(self) -> None:
+        """Fold the buffered batches into the sorted distinct keys"""
+        # Only the batches need sorting; they are then spliced into the merged keys
+        keys, counts = np.unique(np.concatenate(self._pending), return_counts=True)
+        positions = np.searchsorted(self._keys, keys)
+        found = positions < len(self._keys)
+        found[found] = self._keys[positions[found]] == keys[found]
+        self._counts[positions[found]] += counts[found]
+        new = ~found
+        self._keys = np.insert(self._keys, positions[new], keys[new])
+        self._counts = np.insert(self._counts, positions[new], counts[new])
+        self._pending = []
+        self._pending_size = 0
+
+
+class NavigatorFleet:
+    """
+    Many navigators simulated together with NumPy.
+
+    Energy, current location and exploration mode of every navigator live
+    in one array each, and explore(), rest() and step() update the whole
+    fleet, or a selection of it, with a handful of vectorized operations
+    under the same energy rules as Navigator. Locations are interned to
+    integer IDs in a SymbolTable, which may be shared with other fleets or
+    navigators. Visit counts and the moves each
+    navigator made are appended as packed integer keys and merged lazily,
+    so a tick never touches per-navigator Python objects.
+
+    With find_items set, every navigator that explores rolls for an item as
+    Navigator(find_items=True) does, drawing from the fleet's own random
+    stream. Items are kept as one count per navigator and ITEM_TABLE entry.
+
+    Coordinate-mode positions are kept in one array as well; the spatial
+    index of a navigator's visited cells is created the first time the
+    navigator uses coordinate mode.
+
+    Indexing the fleet gives a NavigatorView of one navigator, which offers
+    the Navigator API on top of the fleet arrays.
+
+    Attributes:
+        MAX_ENERGY (int): Maximum energy level, as for Navigator.
+        ENERGY_COST (int): Energy consumed per exploration, as for Navigator.
+        RESTORE_ENERGY (int): Energy restored when resting, as for Navigator.
+        ITEM_FIND_CHANCE (float): Chance of finding an item per exploration, as for Navigator.
+        ITEM_TABLE (ItemTable): The items that can be found, as for Navigator.
+        _symbols (SymbolTable): Location IDs and the realm each direction leads to.
+        _locations (np.ndarray): Current location ID of each navigator.
+        _energy (np.ndarray): Remaining energy of each navigator.
+        _modes (np.ndarray): Index into ExplorationMode of each navigator's mode.
+        _visits (_KeyCounter): Visit counts keyed by (navigator, location).
+        _edges (_KeyCounter): Moves keyed by (navigator, from, to).
+        _items (np.ndarray): Count of each ITEM_TABLE item held by each navigator.
+        _find_items (bool): Whether exploring also rolls for an item.
+        _rng (np.random.Generator): The fleet's random number stream.
+        _positions (np.ndarray): The (x, y) grid cell of each navigator in coordinate mode.
+        _grids (dict): Navigator index to its SpatialGrid, for navigators that used coordinate mode.
+        _max_spatial_chunks (int): Chunk limit of each navigator's SpatialGrid, or None.
+    """
+    MAX_ENERGY = Navigator.MAX_ENERGY
+    ENERGY_COST = Navigator.ENERGY_COST
+    RESTORE_ENERGY = Navigator.RESTORE_ENERGY
+    ITEM_FIND_CHANCE = Navigator.ITEM_FIND_CHANCE
+    ITEM_TABLE = Navigator.ITEM_TABLE
+    # Case-folded item name to its column in _items
+    _ITEM_COLUMNS = {item.name.casefold(): column for column, item in enumerate(ITEM_TABLE.items)}
+
+    def __init__(self, size: int, start_location: str = "Starting Point", symbols: Optional[SymbolTable] = None,
+                 find_items: bool = False, seed: SeedLike = None, max_spatial_chunks: Optional[int] = None):
+        """
+        Initialize a fleet with every navigator at the starting location.
+
+        Args:
+            size (int): Number of navigators.
+            start_location (str): The initial location of every navigator.
+            symbols (SymbolTable, optional): Table to intern locations in; defaults
+                to a new table of the fleet's own.
+            find_items (bool): Whether navigators that explore also roll for an item.
+            seed (optional): Seed of the fleet's random number stream, as for Navigator.
+            max_spatial_chunks (int, optional): Chunk limit of each navigator's spatial
+                index, as for Navigator.
+
+        Raises:
+            ValueError: If size is out of range, start_location is not a valid string
+                or max_spatial_chunks is invalid.
+            NavigationError: If the table already holds MAX_LOCATIONS names.
+        """
+        try:
+            if not isinstance(size, int) or not 0 < size <= MAX_FLEET_SIZE:
+                raise ValueError(f"Fleet size must be an integer between 1 and {MAX_FLEET_SIZE}")
+            if not start_location or not isinstance(start_location, str):
+                raise ValueError("Start location must be a non-empty string")
+            if max_spatial_chunks is not None and (not isinstance(max_spatial_chunks, int)
+                                                   or max_spatial_chunks <= 0):
+                raise ValueError("max_spatial_chunks must be a positive integer or None")
+
+            self._symbols = symbols if symbols is not None else SymbolTable()
+            start = self._check_location(self._symbols.intern(start_location))
+            self._all = np.arange(size, dtype=np.int64)
+            self._locations = np.full(size, start, dtype=np.int64)
+            self._energy = np.full(size, self.MAX_ENERGY, dtype=np.int64)
+            self._modes = np.full(size, _MODES.index(ExplorationMode.SAFE), dtype=np.int8)
+            self._visits = _KeyCounter()
+            self._visits.add((self._all << _LOCATION_BITS) | start)
+            self._edges = _KeyCounter()
+            self._items = np.zeros((size, len(self.ITEM_TABLE)), dtype=np.int32)
+            self._find_items = bool(find_items)
+            self._rng = make_rng(seed)
+            self._positions = np.zeros((size, 2), dtype=np.int64)
+            self._grids: Dict[int, SpatialGrid] = {}
+            self._max_spatial_chunks = max_spatial_chunks
+
+            logger.info(f"Fleet of {size} navigators initialized at {start_location}")
+        except ValueError as e:
+            logger.error(f"Fleet initialization failed: {str(e)}")
+            raise
+
+    def __len__(self) -> int:
+        """Return the number of navigators"""
+        return len(self._all)
+
+    def __getitem__(self, index: int) -> 'NavigatorView':
+        """Return a Navigator-compatible view of one navigator"""
+        if not -len(self._all) <= index < len(self._all):
+            raise IndexError("Navigator index out of range")
+        return NavigatorView(self, index % len(self._all))
+
+    def realm_id(self, direction: Optional[str] = None) -> int:
+        """
+        Get the location ID exploring in a direction leads to.
+
+        Passing an array of these IDs to explore() or step() skips the
+        per-navigator direction lookup.
+
+        Args:
+            direction (str, optional): The direction for exploration.
+
+        Returns:
+            int: The location ID of the realm.
+
+        Raises:
+            ValueError: If direction is not a valid string.
+            NavigationError: If the realm's ID is too large for the fleet.
+        """
+        return self._check_location(self._symbols.realm(direction))
+
+    def location_name(self, location: int) -> str:
+        """Return the name of a location ID"""
+        return self._symbols.name(location)
+
+    def get_symbols(self) -> SymbolTable:
+        """Return the table the fleet's location IDs come from"""
+        return self._symbols
+
+    def set_exploration_mode(self, mode: ExplorationMode, agents: Agents = None) -> None:
+        """
+        Set the exploration strategy of navigators.
+
+        Args:
+            mode (ExplorationMode): The exploration mode from the ExplorationMode enum.
+            agents: The navigators to update; all of them by default.
+
+        Raises:
+            ValueError: If an invalid mode is provided.
+        """
+        try:
+            if not isinstance(mode, ExplorationMode):
+                raise ValueError("Invalid exploration mode")
+            self._modes[self._select(agents)] = _MODES.index(mode)
+            logger.info(f"Fleet exploration mode set to {mode.name}")
+        except ValueError as e:
+            logger.error(f"Failed to set fleet exploration mode: {str(e)}")
+            raise
+
+    def explore(self, directions: Directions = None, agents: Agents = None) -> np.ndarray:
+        """
+        Move navigators to the realms in the given directions.
+
+        Navigators without enough energy stay where they are instead of
+        raising, so one exhausted navigator does not stop the fleet.
+
+        Args:
+            directions: None or one direction for every selected navigator,
+                one direction per selected navigator, or an array of location
+                IDs from realm_id().
+            agents: The navigators to move; all of them by default. Indices must be distinct.
+
+        Returns:
+            np.ndarray: Boolean mask over the selected navigators of those that moved.
+
+        Raises:
+            ValueError: If a direction or navigator index is invalid.
+        """
+        try:
+            index = self._select(agents)
+            targets = self._targets(directions, len(index))
+            moved = self._energy[index] >= self.ENERGY_COST
+            self._move(index[moved], targets[moved])
+            logger.info(f"Fleet explored: {np.count_nonzero(moved)} of {len(index)} navigators moved")
+            return moved
+        except ValueError as e:
+            logger.error(f"Fleet exploration failed: {str(e)}")
+            raise
+
+    def rest(self, agents: Agents = None) -> None:
+        """
+        Restore energy of navigators after resting.
+
+        Args:
+            agents: The navigators that rest; all of them by default.
+        """
+        if agents is None:
+            np.minimum(self._energy + self.RESTORE_ENERGY, self.MAX_ENERGY, out=self._energy)
+        else:
+            index = self._select(agents)
+            self._energy[index] = np.minimum(self._energy[index] + self.RESTORE_ENERGY, self.MAX_ENERGY)
+        logger.info("Fleet rested")
+
+    def step(self, directions: Directions = None) -> np.ndarray:
+        """
+        Advance every navigator by one tick.
+
+        Navigators with enough energy explore; the others rest.
+
+        Args:
+            directions: As for explore(), with one entry per navigator if per-navigator.
+
+        Returns:
+            np.ndarray: Boolean mask of the navigators that explored.
+
+        Raises:
+            ValueError: If a direction is invalid.
+        """
+        targets = self._targets(directions, len(self._all))
+        moved = self._energy >= self.ENERGY_COST
+        resting = ~moved
+        self._move(self._all[moved], targets[moved])
+        self._energy[resting] = np.minimum(self._energy[resting] + self.RESTORE_ENERGY, self.MAX_ENERGY)
+        logger.info(f"Fleet step: {np.count_nonzero(moved)} explored, {np.count_nonzero(resting)} rested")
+        return moved
+
+    def get_energy(self) -> np.ndarray:
+        """Return a read-only view of every navigator's energy level"""
+        return self._read_only(self._energy)
+
+    def get_locations(self) -> np.ndarray:
+        """Return a read-only view of every navigator's current location ID"""
+        return self._read_only(self._locations)
+
+    def get_exploration_modes(self) -> List[ExplorationMode]:
+        """Return every navigator's exploration mode"""
+        return [_MODES[mode] for mode in self._modes.tolist()]
+
+    def get_item_counts(self) -> np.ndarray:
+        """Return a read-only (navigators, items) view of item counts; columns follow ITEM_TABLE.items"""
+        return self._read_only(self._items)
+
+    def _select(self, agents: Agents) -> np.ndarray:
+        """Resolve a navigator selection to an array of indices"""
+        if agents is None:
+            return self._all
+        if isinstance(agents, slice):
+            return self._all[agents]
+        index = np.asarray(agents)
+        if index.dtype == bool:
+            if index.shape != self._all.shape:
+                raise ValueError("Navigator mask must have one entry per navigator")
+            return np.flatnonzero(index)
+        if index.dtype.kind not in 'iu':
+            raise ValueError("Navigators must be selected by integer index, slice or boolean mask")
+        index = np.atleast_1d(index).astype(np.int64, copy=False)
+        if len(index) and (index.min() < 0 or index.max() >= len(self._all)):
+            raise ValueError("Navigator index out of range")
+        return index
+
+    def _targets(self, directions: Directions, count: int) -> np.ndarray:
+        """Resolve directions to one target location ID per selected navigator"""
+        if directions is None or isinstance(directions, str):
+            return np.full(count, self.realm_id(directions), dtype=np.int64)
+        if isinstance(directions, np.ndarray) and directions.dtype.kind in 'iu':
+            targets = directions.astype(np.int64, copy=False)
+            if len(targets) and (targets.min() < 0 or targets.max() >= min(len(self._symbols), MAX_LOCATIONS)):
+                raise ValueError("Unknown location ID")
+        elif isinstance(directions, (list, tuple, np.ndarray)):
+            realm_id = self.realm_id
+            targets = np.fromiter((realm_id(direction) for direction in directions),
+                                  dtype=np.int64, count=len(directions))
+        else:
+            raise ValueError("Direction must be a string or None")
+        if targets.shape != (count,):
+            raise ValueError("Directions must have one entry per selected navigator")
+        return targets
+
+    def _move(self, index: np.ndarray, targets: np.ndarray) -> None:
+        """Move navigators that have enough energy and record the visits and moves"""
+        sources = self._locations[index]
+        self._locations[index] = targets
+        self._energy[index] -= self.ENERGY_COST
+        agents = index << _LOCATION_BITS
+        self._visits.add(agents | targets)
+        self._edges.add((((agents | sources) << _LOCATION_BITS) | targets))
+        if self._find_items:
+            finders = index[self._rng.random(len(index)) < self.ITEM_FIND_CHANCE]
+            np.add.at(self._items, (finders, self.ITEM_TABLE.sample_many(self._rng, len(finders))), 1)
+
+    @staticmethod
+    def _check_location(location: int) -> int:
+        """Return a location ID if it fits in a packed key"""
+        if location >= MAX_LOCATIONS:
+            raise NavigationError(f"A fleet can only use location IDs below {MAX_LOCATIONS}")
+        return location
+
+    def _history(self, agent: int) -> Dict[str, int]:
+        """Return the visit counts of one navigator"""
+        keys, counts = self._visits.range(agent << _LOCATION_BITS, (agent + 1) << _LOCATION_BITS)
+        name = self._symbols.name
+        return {name(key & _LOCATION_MASK): count for key, count in zip(keys.tolist(), counts.tolist())}
+
+    def _visit_count(self, agent: int, location: int) -> int:
+        """Return how many times one navigator visited a location ID"""
+        key = (agent << _LOCATION_BITS) | location
+        _, counts = self._visits.range(key, key + 1)
+        return int(counts[0]) if len(counts) else 0
+
+    def _grid(self, agent: int) -> SpatialGrid:
+        """Return one navigator's spatial index, starting it at cell (0, 0) on first use"""
+        grid = self._grids.get(agent)
+        if grid is None:
+            grid = self._grids[agent] = SpatialGrid(self._max_spatial_chunks)
+            grid.visit(0, 0)
+        return grid
+
+    def _moves(self, agent: int) -> List[Tuple[str, str]]:
+        """Return the distinct (from, to) moves of one navigator"""
+        shift = 2 * _LOCATION_BITS
+        keys, _ = self._edges.range(agent << shift, (agent + 1) << shift)
+        name = self._symbols.name
+        return [(name((key >> _LOCATION_BITS) & _LOCATION_MASK), name(key & _LOCATION_MASK))
+                for key in keys.tolist()]
+
+    @staticmethod
+    def _read_only(values: np.ndarray) -> np.ndarray:
+        """Return a view of an array that cannot be written through"""
+        view = values.view()
+        view.flags.writeable = False
+        return view
+
+    def __repr__(self) -> str:
+        return (f"NavigatorFleet(size={len(self._all)}, locations={len(self._symbols)}, "
+                f"mean_energy={self._energy.mean():.1f})")
+
+
+class NavigatorView:
+    """
+    One navigator of a NavigatorFleet, with the Navigator API.
+
+    The view holds no state of its own: every call reads or updates the
+    fleet arrays, so views are cheap to create and always current, and a
+    view can stand in for a Navigator, for instance to be driven by a
+    FrontierPlanner. Every public Navigator method is offered except
+    replay(), since fleets do not record sessions; get_session() always
+    returns None. Maps, graphs and history views are built from the fleet
+    arrays on each call, so they cost time in proportion to the
+    navigator's history and do not follow later exploration.
+    """
+    __slots__ = ('_fleet', '_index')
+
+    MAX_ENERGY = NavigatorFleet.MAX_ENERGY
+    ENERGY_COST = NavigatorFleet.ENERGY_COST
+    RESTORE_ENERGY = NavigatorFleet.RESTORE_ENERGY
+    ITEM_FIND_CHANCE = NavigatorFleet.ITEM_FIND_CHANCE
+    ITEM_TABLE = NavigatorFleet.ITEM_TABLE
+    POSSIBLE_ITEMS = ITEM_TABLE.items
+
+    def __init__(self, fleet: NavigatorFleet, index: int):
+        self._fleet = fleet
+        self._index = index
+
+    @property
+    def current_location(self) -> str:
+        """The current location of the navigator"""
+        fleet = self._fleet
+        return fleet._symbols.name(int(fleet._locations[self._index]))
+
+    @property
+    def _exploration_mode(self) -> ExplorationMode:
+        return _MODES[self._fleet._modes[self._index]]
+
+    @property
+    def _energy(self) -> int:
+        return int(self._fleet._energy[self._index])
+
+    @_energy.setter
+    def _energy(self, value: int) -> None:
+        self._fleet._energy[self._index] = value
+
+    def set_exploration_mode(self, mode: ExplorationMode) -> None:
+        """
+        Set the exploration strategy.
+
+        Args:
+            mode (ExplorationMode): The exploration mode from the ExplorationMode enum.
+
+        Raises:
+            ValueError: If an invalid mode is provided.
+        """
+        self._fleet.set_exploration_mode(mode, self._index)
+
+    def explore(self, direction: Optional[str] = None) -> str:
+        """
+        Explore new areas in the simulation.
+
+        Args:
+            direction (str, optional): The direction for exploration.
+
+        Returns:
+            str: The identifier of the new location.
+
+        Raises:
+            NavigationError: If exploration fails due to lack of energy.
+            ValueError: If direction is not a valid string.
+        """
+        try:
+            if self._energy < self.ENERGY_COST:
+                raise NavigationError("Not enough energy to explore. Please rest.")
+            if direction and not isinstance(direction, str):
+                raise ValueError("Direction must be a string or None")
+        except (NavigationError, ValueError) as e:
+            logger.error(f"Exploration failed: {str(e)}")
+            raise
+        self._fleet.explore(direction or None, self._index)
+        return self.current_location
+
+    def rest(self) -> None:
+        """Restore energy after resting."""
+        self._fleet.rest(self._index)
+
+    def get_current_location(self) -> str:
+        """Return the current location."""
+        return self.current_location
+
+    def get_energy(self) -> int:
+        """Returns the current energy level."""
+        return self._energy
+
+    def get_exploration_history(self) -> Dict[str, int]:
+        """
+        Get the complete exploration history.
+
+        Returns:
+            dict: A dictionary mapping locations to visit counts.
+        """
+        return self._fleet._history(self._index)
+
+    def get_history_view(self) -> HistoryView:
+        """
+        Get a read-only snapshot of the exploration history.
+
+        Returns:
+            HistoryView: A mapping like get_exploration_history()'s, fixed at the time of the call.
+        """
+        fleet, agent = self._fleet, self._index
+        keys, counts = fleet._visits.range(agent << _LOCATION_BITS, (agent + 1) << _LOCATION_BITS)
+        counter = VisitCounter.from_counts((keys & _LOCATION_MASK).tolist(), counts.tolist())
+        return HistoryView(counter.snapshot(), fleet._symbols, self.get_exploration_map_view())
+
+    def get_visit_count(self, location: str) -> int:
+        """
+        Get how many times a location has been visited.
+
+        Args:
+            location (str): The location name.
+
+        Returns:
+            int: The visit count; 0 for locations never visited.
+        """
+        symbol = self._fleet._symbols.get(location)
+        if symbol is None or symbol >= MAX_LOCATIONS:
+            return 0
+        return self._fleet._visit_count(self._index, symbol)
+
+    def get_exploration_map(self) -> Dict[str, list]:
+        """
+        Get the exploration map.
+
+        Returns:
+            dict: A dictionary mapping locations to the list of connected locations.
+        """
+        exploration_map = {location: [] for location in self.get_exploration_history()}
+        for source, target in self._fleet._moves(self._index):
+            exploration_map[source].append(target)
+        return exploration_map
+
+    def get_exploration_map_view(self) -> GraphView:
+        """
+        Get a read-only snapshot of the exploration map.
+
+        Returns:
+            GraphView: A mapping like get_exploration_map()'s, fixed at the time of the call.
+        """
+        return self.get_exploration_graph().view()
+
+    def get_exploration_graph(self) -> ExplorationGraph:
+        """
+        Get the exploration graph.
+
+        Unlike Navigator's, the graph is built on each call and does not
+        follow later exploration.
+
+        Returns:
+            ExplorationGraph: The graph of explored locations.
+        """
+        graph = ExplorationGraph()
+        for location in self.get_exploration_history():
+            graph.add_location(location)
+        for source, target in self._fleet._moves(self._index):
+            graph.add_edge(source, target, self.ENERGY_COST)
+        return graph
+
+    def find_route(self, destination: str, origin: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Find the shortest known route between two explored locations.
+
+        Args:
+            destination (str): The location to reach.
+            origin (str, optional): The location to start from; defaults to the current location.
+
+        Returns:
+            list: Location names from origin to destination inclusive, or None if
+            the destination cannot be reached along explored paths.
+
+        Raises:
+            NavigationError: If either location has not been explored.
+        """
+        if origin is None:
+            origin = self.current_location
+        return self.get_exploration_graph().shortest_path(origin, destination)
+
+    def get_symbols(self) -> SymbolTable:
+        """Return the table the fleet's location IDs come from"""
+        return self._fleet._symbols
+
+    def get_session(self) -> Optional[ExplorationSession]:
+        """Return None: fleet navigators are never recorded"""
+        return None
+
+    def get_inventory(self) -> List[Item]:
+        """
+        Get the items the navigator carries.
+
+        Returns:
+            list: One entry per item held; stacked items appear once per unit.
+        """
+        counts = self._fleet._items[self._index].tolist()
+        return [item for item, count in zip(self.ITEM_TABLE.items, counts) for _ in range(count)]
+
+    def get_inventory_counts(self) -> Dict[str, int]:
+        """
+        Get how many of each item the navigator carries.
+
+        Returns:
+            dict: A dictionary mapping item names to counts, in ITEM_TABLE order.
+        """
+        counts = self._fleet._items[self._index].tolist()
+        return {item.name: count for item, count in zip(self.ITEM_TABLE.items, counts) if count}
+
+    def use_item(self, item_name: str) -> Optional[Item]:
+        """
+        Use one item from the inventory, applying its effect.
+
+        Args:
+            item_name (str): The name of the item to use, in any case.
+
+        Returns:
+            Optional[Item]: The item used, or None if it is not in the inventory.
+        """
+        column = self._held_column(item_name)
+        if column is None:
+            logger.warning(f"Item '{item_name}' not found in inventory.")
+            return None
+        self._fleet._items[self._index, column] -= 1
+        item = self.ITEM_TABLE.items[column]
+        if item.energy:
+            self._energy = min(self._energy + item.energy, self.MAX_ENERGY)
+        logger.info(f"Used item: {item.name}")
+        return item
+
+    def discard_item(self, item_name: str):
+        """
+        Remove an item from the inventory.
+
+        Args:
+            item_name (str): The name of the item to discard.
+
+        Raises:
+            ValueError: If the item is not found in the inventory.
+        """
+        column = self._held_column(item_name)
+        if column is None:
+            logger.warning(f"Item '{item_name}' not found in inventory.")
+            raise ValueError("Item not found in inventory.")
+        self._fleet._items[self._index, column] -= 1
+        logger.info(f"Discarded item: {self.ITEM_TABLE.items[column].name}")
+
+    def find_random_item(self) -> Optional[Item]:
+        """
+        Attempt to find a random item, drawing from the fleet's random stream.
+
+        Returns:
+            Optional[Item]: The found item, or None if no item is found.
+        """
+        rng = self._fleet._rng
+        if rng.random() < self.ITEM_FIND_CHANCE:
+            column = int(self.ITEM_TABLE.sample_many(rng, 1)[0])
+            self._fleet._items[self._index, column] += 1
+            found_item = self.ITEM_TABLE.items[column]
+            logger.info(f"Found an item: {found_item.name}")
+            return found_item
+        logger.info("No item found this time.")
+        return None
+
+    def navigate_to_random_location(self) -> Tuple[int, int]:
+        """
+        Navigate to a random grid cell within the exploration environment.
+
+        Returns:
+            tuple: The new (x, y) position.
+        """
+        fleet = self._fleet
+        x, y = fleet._rng.integers(-100, 101, size=2).tolist()
+        fleet._positions[self._index] = (x, y)
+        fleet._grid(self._index).visit(x, y)
+        logger.info(f"Navigated to random location: {(x, y)}")
+        return x, y
+
+    def navigate(self, direction: Direction, steps: int) -> Tuple[int, int]:
+        """
+        Navigate in a specified direction by a certain number of steps.
+
+        Args:
+            direction (Direction): The direction to navigate.
+            steps (int): The number of steps to take in the specified direction.
+
+        Returns:
+            tuple: The new (x, y) position.
+
+        Raises:
+            ValueError: If direction is not a Direction or steps is not a non-negative integer.
+        """
+        try:
+            if not isinstance(direction, Direction):
+                raise ValueError("Invalid direction")
+            if not isinstance(steps, int) or steps < 0:
+                raise ValueError("Steps must be a non-negative integer")
+        except ValueError as e:
+            logger.error(f"Navigation failed: {str(e)}")
+            raise
+
+        fleet = self._fleet
+        position = fleet._grid(self._index).visit_line(*self.get_position(), *DIRECTION_STEPS[direction], steps)
+        fleet._positions[self._index] = position
+        logger.info(f"Navigated {direction.name} by {steps} steps to {position}")
+        return position
+
+    def get_position(self) -> Tuple[int, int]:
+        """Return the current (x, y) grid cell."""
+        x, y = self._fleet._positions[self._index].tolist()
+        return x, y
+
+    def get_spatial_index(self) -> SpatialGrid:
+        """
+        Get the live spatial index of visited grid cells.
+
+        Returns:
+            SpatialGrid: Visit counts for nearest-cell, radius and heatmap queries.
+        """
+        return self._fleet._grid(self._index)
+
+    def nearest_visited(self, exclude_current: bool = True) -> Optional[Tuple[int, int]]:
+        """
+        Find the visited grid cell closest to the current position.
+
+        Args:
+            exclude_current (bool): Whether to skip the current cell itself.
+
+        Returns:
+            tuple: The (x, y) of the closest visited cell, or None if there is none.
+        """
+        return self.get_spatial_index().nearest(*self.get_position(), exclude_origin=exclude_current)
+
+    def _held_column(self, item_name: str) -> Optional[int]:
+        """Return the _items column of an item the navigator holds, or None"""
+        column = NavigatorFleet._ITEM_COLUMNS.get(item_name.casefold())
+        if column is None or not self._fleet._items[self._index, column]:
+            return None
+        return column
+
+    def __repr__(self) -> str:
+        """Official string representation of the Navigator."""
+        return (f"Navigator(current_location={self.current_location}, "
+                f"mode={self._exploration_mode.name}, "
+                f"energy={self._energy}, "
+                f"visited={len(self.get_exploration_history())} locations)")
@@ -0,0 +1,567 @@
+import heapq
+import logging
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .errors import NavigationError
+
+logger = logging.getLogger(__name__)
+
+# Estimates the remaining cost from a location to the goal; must never overestimate
+Heuristic = Callable[[str, str], float]
+
+_INFINITY = float('inf')
+
+# Graphs smaller than this are searched edge by edge in Python, where NumPy's
+# per-call overhead would outweigh vectorizing each frontier
+_FRONTIER_MIN_LOCATIONS = 2048
+
+# Edges added since the last CSR build that searches handle separately before
+# the CSR is rebuilt, on top of a quarter of the edges it already covers
+_PENDING_EDGES = 1024
+
+
+class ExplorationGraph:
+    """
+    Directed graph of explored locations with route queries.
+
+    Location names are interned to dense integer node IDs the first time they
+    are seen, and every per-node structure is an array indexed by that ID.
+    Edges are stored as a forward star: flat typed arrays hold each edge's
+    target, weight and the next edge leaving the same node, and each node
+    holds the index of its most recent edge. Adding an edge appends to the
+    arrays, and there is no per-node or per-edge Python object beyond the
+    interned name.
+
+    Breadth-first searches over large graphs run against a compressed sparse
+    row (CSR) copy of the edges in NumPy arrays and expand a whole frontier
+    level per step. The CSR is built on first use and only rebuilt once the
+    edges added since outnumber a quarter of it; until then those newer
+    edges are scanned alongside it, so interleaving exploration with queries
+    stays cheap. Weakly connected components are maintained incrementally
+    with a union-find as edges are added, so component queries never walk
+    the graph, and searches only touch the nodes they actually explore.
+
+    The graph only grows: exploration history is never forgotten.
+
+    Attributes:
+        _ids (dict): Location name to node ID
+        _names (list): Node ID to location name
+        _head (array): Node ID to its most recently added edge, or -1
+        _source (array): Edge index to source node ID
+        _target (array): Edge index to target node ID
+        _weight (array): Edge index to edge weight
+        _next (array): Edge index to the previous edge leaving the same node, or -1
+        _parent (array): Union-find parent of each node
+        _size (array): Union-find component size, valid at component roots
+        _component_count (int): Number of weakly connected components
+        _csr (tuple): (offsets, targets, edge count) of the last CSR build, or None
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._head = array('q')
+        self._source = array('q')
+        self._target = array('q')
+        self._weight = array('d')
+        self._next = array('q')
+        self._parent = array('q')
+        self._size = array('q')
+        self._component_count = 0
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+
+    def __len__(self) -> int:
+        """Return the number of locations"""
+        return len(self._names)
+
+    def __contains__(self, location: str) -> bool:
+        return location in self._ids
+
+    @property
+    def edge_count(self) -> int:
+        """Number of distinct edges"""
+        return len(self._target)
+
+    @property
+    def component_count(self) -> int:
+        """Number of weakly connected components"""
+        return self._component_count
+
+    def add_location(self, location: str) -> int:
+        """
+        Add a location if it is not in the graph yet.
+
+        Args:
+            location: The location name
+
+        Returns:
+            The node ID of the location
+        """
+        node = self._ids.get(location)
+        if node is None:
+            node = len(self._names)
+            self._ids[location] = node
+            self._names.append(location)
+            self._head.append(-1)
+            self._parent.append(node)
+            self._size.append(1)
+            self._component_count += 1
+        return node
+
+    def add_edge(self, source: str, target: str, weight: float = 1.0) -> bool:
+        """
+        Record that target can be reached from source.
+
+        Adding an edge that already exists keeps the lower of the two weights.
+
+        Args:
+            source: Location the edge starts at
+            target: Location the edge leads to
+            weight: Non-negative cost of following the edge
+
+        Returns:
+            True if the edge is new, False if it already existed
+
+        Raises:
+            ValueError: If the weight is negative
+        """
+        return self.add_node_edge(self.add_location(source), self.add_location(target), weight)
+
+    def add_node_edge(self, u: int, v: int, weight: float = 1.0) -> bool:
+        """
+        Like add_edge(), for node IDs returned by add_location().
+
+        Callers that keep node IDs add edges without hashing location names.
+
+        Args:
+            u: Node ID the edge starts at
+            v: Node ID the edge leads to
+            weight: Non-negative cost of following the edge
+
+        Returns:
+            True if the edge is new, False if it already existed
+
+        Raises:
+            ValueError: If the weight is negative
+        """
+        if weight < 0:
+            raise ValueError("Edge weight must be non-negative")
+        targets, following = self._target, self._next
+        edge = self._head[u]
+        while edge != -1:
+            if targets[edge] == v:
+                if weight < self._weight[edge]:
+                    self._weight[edge] = weight
+                return False
+            edge = following[edge]
+        following.append(self._head[u])
+        self._head[u] = len(targets)
+        self._source.append(u)
+        targets.append(v)
+        self._weight.append(weight)
+        self._union(u, v)
+        return True
+
+    def locations(self) -> Iterator[str]:
+        """Iterate over location names in the order they were added"""
+        return iter(self._names)
+
+    def neighbors(self, location: str) -> List[str]:
+        """
+        Get the locations directly reachable from a location.
+
+        Args:
+            location: The location name
+
+        Returns:
+            Successor names in the order their edges were added
+
+        Raises:
+            NavigationError: If the location is unknown
+        """
+        names = self._names
+        return [names[v] for v in self._successors(self._node(location))]
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Return the whole graph as a dict mapping each location to its successors"""
+        names = self._names
+        return {name: [names[v] for v in self._successors(u)] for u, name in enumerate(names)}
+
+    def view(self) -> 'GraphView':
+        """
+        Take a read-only snapshot of the graph in O(1).
+
+        Locations and edges are only ever appended, so the view just
+        remembers how many of each existed and ignores any added later.
+
+        Returns:
+            A mapping of each location to its successors, as to_dict() would have returned now
+        """
+        return GraphView(self, len(self._names), len(self._target))
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """
+        Find a path with the fewest edges using breadth-first search.
+
+        Args:
+            source: Start location
+            target: Destination location
+
+        Returns:
+            Location names from source to target inclusive, or None if target is unreachable
+
+        Raises:
+            NavigationError: If either location is unknown
+        """
+        start, goal = self._node(source), self._node(target)
+        if start == goal:
+            return [source]
+        if len(self._names) >= _FRONTIER_MIN_LOCATIONS:
+            parent = self._frontier_search(start, goal)
+            if parent[goal] < 0:
+                return None
+            names = self._names
+            path = [target]
+            node = goal
+            while node != start:
+                node = int(parent[node])
+                path.append(names[node])
+            path.reverse()
+            return path
+        head, targets, following = self._head, self._target, self._next
+        previous = {start: -1}
+        queue = deque((start,))
+        while queue:
+            u = queue.popleft()
+            edge = head[u]
+            while edge != -1:
+                v = targets[edge]
+                if v not in previous:
+                    previous[v] = u
+                    if v == goal:
+                        return self._path(previous, goal)
+                    queue.append(v)
+                edge = following[edge]
+        return None
+
+    def dijkstra(self, source: str, target: str) -> Optional[Tuple[float, List[str]]]:
+        """
+        Find a path with the lowest total edge weight.
+
+        Args:
+            source: Start location
+            target: Destination location
+
+        Returns:
+            (cost, path) where path lists location names from source to target
+            inclusive, or None if target is unreachable
+
+        Raises:
+            NavigationError: If either location is unknown
+        """
+        return self.astar(source, target)
+
+    def astar(self, source: str, target: str,
+              heuristic: Optional[Heuristic] = None) -> Optional[Tuple[float, List[str]]]:
+        """
+        Find a path with the lowest total edge weight using A* search.
+
+        Without a heuristic this is Dijkstra's algorithm. The heuristic is
+        called as heuristic(location, target) and must never overestimate
+        the remaining cost, or the returned path may not be the cheapest.
+
+        Args:
+            source: Start location
+            target: Destination location
+            heuristic: Estimate of the remaining cost from a location to target
+
+        Returns:
+            (cost, path) where path lists location names from source to target
+            inclusive, or None if target is unreachable
+
+        Raises:
+            NavigationError: If either location is unknown
+        """
+        start, goal = self._node(source), self._node(target)
+        names, head, targets, weights, following = (
+            self._names, self._head, self._target, self._weight, self._next)
+        costs = {start: 0.0}
+        previous = {start: -1}
+        settled = set()
+        heap = [(heuristic(source, target) if heuristic else 0.0, 0.0, start)]
+        while heap:
+            _, cost, u = heapq.heappop(heap)
+            if u == goal:
+                return cost, self._path(previous, goal)
+            if u in settled:
+                continue
+            settled.add(u)
+            edge = head[u]
+            while edge != -1:
+                v = targets[edge]
+                new_cost = cost + weights[edge]
+                if v not in settled and new_cost < costs.get(v, _INFINITY):
+                    costs[v] = new_cost
+                    previous[v] = u
+                    estimate = new_cost + heuristic(names[v], target) if heuristic else new_cost
+                    heapq.heappush(heap, (estimate, new_cost, v))
+                edge = following[edge]
+        return None
+
+    def reachable(self, source: str) -> Set[str]:
+        """
+        Get every location reachable from a location, including itself.
+
+        Args:
+            source: Start location
+
+        Returns:
+            Set of reachable location names
+
+        Raises:
+            NavigationError: If the location is unknown
+        """
+        start = self._node(source)
+        names = self._names
+        if len(names) >= _FRONTIER_MIN_LOCATIONS:
+            return {names[node] for node in np.flatnonzero(self._frontier_search(start) >= 0).tolist()}
+        head, targets, following = self._head, self._target, self._next
+        seen = {start}
+        stack = [start]
+        while stack:
+            edge = head[stack.pop()]
+            while edge != -1:
+                v = targets[edge]
+                if v not in seen:
+                    seen.add(v)
+                    stack.append(v)
+                edge = following[edge]
+        return {names[u] for u in seen}
+
+    def is_reachable(self, source: str, target: str) -> bool:
+        """
+        Check whether target can be reached from source by following edges.
+
+        Locations in different weakly connected components are rejected
+        without searching.
+
+        Raises:
+            NavigationError: If either location is unknown
+        """
+        start, goal = self._node(source), self._node(target)
+        if self._find(start) != self._find(goal):
+            return False
+        return self.shortest_path(source, target) is not None
+
+    def connected(self, first: str, second: str) -> bool:
+        """
+        Check whether two locations are in the same weakly connected component.
+
+        Raises:
+            NavigationError: If either location is unknown
+        """
+        return self._find(self._node(first)) == self._find(self._node(second))
+
+    def component_size(self, location: str) -> int:
+        """
+        Get the number of locations in the weakly connected component of a location.
+
+        Raises:
+            NavigationError: If the location is unknown
+        """
+        return self._size[self._find(self._node(location))]
+
+    def components(self) -> List[List[str]]:
+        """
+        Group locations into weakly connected components.
+
+        Returns:
+            One list of location names per component, largest first
+        """
+        names = self._names
+        if not names:
+            return []
+        # Resolve every node's root at once by pointer jumping
+        roots = np.frombuffer(self._parent, dtype=np.int64).copy()
+        while True:
+            jumped = roots[roots]
+            if np.array_equal(jumped, roots):
+                break
+            roots = jumped
+        order = np.argsort(roots, kind='stable')
+        boundaries = np.flatnonzero(np.diff(roots[order])) + 1
+        groups = [[names[node] for node in group.tolist()] for group in np.split(order, boundaries)]
+        return sorted(groups, key=len, reverse=True)
+
+    def _node(self, location: str) -> int:
+        """Resolve a location name to its node ID"""
+        node = self._ids.get(location)
+        if node is None:
+            logger.error(f"Unknown location: {location}")
+            raise NavigationError(f"Unknown location: {location}")
+        return node
+
+    def _snapshot(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the CSR edges and the edges added since it was built.
+
+        Returns:
+            (offsets, targets, pending_sources, pending_targets): the targets of
+            node u's CSR edges are targets[offsets[u]:offsets[u + 1]] for nodes
+            that existed at build time; the pending arrays list newer edges
+        """
+        edge_count = len(self._target)
+        if self._csr is None or edge_count - self._csr[2] > self._csr[2] // 4 + _PENDING_EDGES:
+            # Copies, so the arrays can keep growing while the CSR is in use
+            sources = np.frombuffer(self._source, dtype=np.int64).copy()
+            order = np.argsort(sources, kind='stable')
+            offsets = np.zeros(len(self._names) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(sources, minlength=len(self._names)), out=offsets[1:])
+            self._csr = (offsets, np.frombuffer(self._target, dtype=np.int64)[order], edge_count)
+        offsets, targets, built = self._csr
+        pending_sources = np.frombuffer(self._source[built:], dtype=np.int64)
+        pending_targets = np.frombuffer(self._target[built:], dtype=np.int64)
+        return offsets, targets, pending_sources, pending_targets
+
+    def _frontier_search(self, start: int, goal: int = -1) -> np.ndarray:
+        """
+        Breadth-first search expanding one whole frontier level per step.
+
+        Args:
+            start: Node ID to search from
+            goal: Node ID whose level ends the search, or -1 to search everything reachable
+
+        Returns:
+            Parent array: each reached node's predecessor on a shortest path
+            from start, start itself for start, and -1 for nodes not reached
+        """
+        offsets, targets, pending_sources, pending_targets = self._snapshot()
+        size = len(self._names)
+        csr_size = len(offsets) - 1
+        parent = np.full(size, -1, dtype=np.int64)
+        parent[start] = start
+        on_frontier = np.zeros(size, dtype=bool) if len(pending_sources) else None
+        frontier = np.array([start], dtype=np.int64)
+        while len(frontier):
+            inside = frontier[frontier < csr_size]
+            begins = offsets[inside]
+            counts = offsets[inside + 1] - begins
+            # Index of every CSR edge leaving the frontier, grouped by source
+            edges = np.repeat(begins - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            sources = np.repeat(inside, counts)
+            reached = targets[edges]
+            if on_frontier is not None:
+                on_frontier[frontier] = True
+                hit = on_frontier[pending_sources]
+                on_frontier[frontier] = False
+                sources = np.concatenate((sources, pending_sources[hit]))
+                reached = np.concatenate((reached, pending_targets[hit]))
+            fresh = parent[reached] < 0
+            reached = reached[fresh]
+            parent[reached] = sources[fresh]
+            if goal >= 0 and parent[goal] >= 0:
+                break
+            frontier = np.unique(reached)
+        return parent
+
+    def _successors(self, node: int) -> List[int]:
+        """Return the successor IDs of a node in the order their edges were added"""
+        targets, following = self._target, self._next
+        successors = []
+        edge = self._head[node]
+        while edge != -1:
+            successors.append(targets[edge])
+            edge = following[edge]
+        successors.reverse()
+        return successors
+
+    def _path(self, previous: Dict[int, int], goal: int) -> List[str]:
+        """Walk predecessor links back from goal and return the names in travel order"""
+        names = self._names
+        path = []
+        node = goal
+        while node != -1:
+            path.append(names[node])
+            node = previous[node]
+        path.reverse()
+        return path
+
+    def _find(self, node: int) -> int:
+        """Return the union-find root of a node, halving the path on the way"""
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, first: int, second: int) -> None:
+        """Merge the components of two nodes, attaching the smaller under the larger"""
+        first, second = self._find(first), self._find(second)
+        if first == second:
+            return
+        size = self._size
+        if size[first] < size[second]:
+            first, second = second, first
+        self._parent[second] = first
+        size[first] += size[second]
+        self._component_count -= 1
+
+    def __repr__(self) -> str:
+        return (f"ExplorationGraph(locations={len(self._names)}, edges={len(self._target)}, "
+                f"components={self._component_count})")
+
+
+class GraphView(Mapping):
+    """
+    An ExplorationGraph as it was when the view was taken.
+
+    The view shares the graph's arrays and copies nothing; successor lists
+    are built on lookup, skipping edges added after the view.
+    """
+    __slots__ = ('_graph', '_locations', '_edges')
+
+    def __init__(self, graph: ExplorationGraph, locations: int, edges: int):
+        self._graph = graph
+        self._locations = locations
+        self._edges = edges
+
+    def __len__(self) -> int:
+        """Return the number of locations in the view"""
+        return self._locations
+
+    def __iter__(self) -> Iterator[str]:
+        return islice(self._graph._names, self._locations)
+
+    def __contains__(self, location: object) -> bool:
+        node = self._graph._ids.get(location)
+        return node is not None and node < self._locations
+
+    def __getitem__(self, location: str) -> List[str]:
+        """Return the successors of a location in the order their edges were added"""
+        graph = self._graph
+        node = graph._ids.get(location)
+        if node is None or node >= self._locations:
+            raise KeyError(location)
+        names, targets, following = graph._names, graph._target, graph._next
+        successors = []
+        edge = graph._head[node]
+        while edge != -1:
+            if edge < self._edges:
+                successors.append(names[targets[edge]])
+            edge = following[edge]
+        successors.reverse()
+        return successors
+
+    @property
+    def edge_count(self) -> int:
+        """Number of distinct edges in the view"""
+        return self._edges
+
+    def __repr__(self) -> str:
+        return f"GraphView(locations={self._locations}, edges={self._edges})"
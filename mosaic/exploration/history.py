@@ -0,0 +1,355 @@
+import logging
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .graph import GraphView
+from .symbols import SymbolTable
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """
+    Approximate counts of integer keys in a fixed amount of memory.
+
+    Each of depth rows hashes a key to one of width counters with its own
+    multiply-shift hash, and a key's estimate is the smallest of its
+    counters. Estimates never undercount; they overcount by at most
+    e/width of the total count with probability 1 - exp(-depth).
+
+    Attributes:
+        width (int): Counters per row, a power of two
+        depth (int): Number of rows
+        total (int): Sum of all counts added
+        _table (array): depth rows of width int64 counters, row after row
+        _multipliers (list): Odd 64-bit multiplier of each row's hash
+        _increments (list): 64-bit increment of each row's hash
+        _shift (int): Right shift that keeps the top log2(width) bits of a hash
+    """
+
+    def __init__(self, width: int = 4096, depth: int = 4, seed: int = 0):
+        """
+        Args:
+            width: Counters per row; must be a power of two
+            depth: Number of rows
+            seed: Seed of the row hashes
+
+        Raises:
+            ValueError: If width is not a power of two or depth is not positive
+        """
+        if not isinstance(width, int) or width < 2 or width & (width - 1):
+            raise ValueError("width must be a power of two of at least 2")
+        if not isinstance(depth, int) or depth <= 0:
+            raise ValueError("depth must be a positive integer")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        # A flat array keeps single lookups free of NumPy scalar overhead;
+        # batch updates work on a NumPy view of the same memory
+        self._table = array('q', bytes(8 * depth * width))
+        rng = np.random.default_rng(seed)
+        salts = rng.integers(0, 1 << 63, size=(2, depth), dtype=np.int64).astype(np.uint64)
+        self._multipliers = [(int(value) << 1 | 1) & _MASK64 for value in salts[0]]
+        self._increments = [int(value) << 1 & _MASK64 for value in salts[1]]
+        self._shift = 64 - (width.bit_length() - 1)
+
+    def _cells(self, key: int) -> List[int]:
+        """Return the index in _table of the key's counter in each row"""
+        shift, width = self._shift, self.width
+        return [row * width + (((multiplier * key + increment) & _MASK64) >> shift)
+                for row, (multiplier, increment) in enumerate(zip(self._multipliers, self._increments))]
+
+    def add(self, key: int, count: int = 1) -> None:
+        """Add to the count of a key"""
+        table = self._table
+        for cell in self._cells(key):
+            table[cell] += count
+        self.total += count
+
+    def add_many(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        """Add to the counts of several keys at once"""
+        counts = np.asarray(counts, dtype=np.int64)
+        # Flat indexes and repeated counts rather than broadcasting, which
+        # np.add.at has mishandled in some NumPy releases
+        np.add.at(np.frombuffer(self._table, dtype=np.int64), self._cells_many(keys).ravel(),
+                  np.tile(counts, self.depth))
+        self.total += int(counts.sum())
+
+    def estimate(self, key: int) -> int:
+        """Return an upper bound of a key's count; 0 means it was never added"""
+        table = self._table
+        return min([table[cell] for cell in self._cells(key)])
+
+    def estimate_many(self, keys: Sequence[int]) -> np.ndarray:
+        """Return the estimates of several keys at once"""
+        return np.frombuffer(self._table, dtype=np.int64)[self._cells_many(keys)].min(axis=0)
+
+    def _cells_many(self, keys: Sequence[int]) -> np.ndarray:
+        """Return a (depth, len(keys)) array of the keys' counter indexes in _table"""
+        keys = np.asarray(keys, dtype=np.int64).astype(np.uint64)
+        shift = np.uint64(self._shift)
+        cells = np.empty((self.depth, len(keys)), dtype=np.intp)
+        for row, (multiplier, increment) in enumerate(zip(self._multipliers, self._increments)):
+            cells[row] = ((keys * np.uint64(multiplier) + np.uint64(increment)) >> shift).astype(np.intp)
+            cells[row] += row * self.width
+        return cells
+
+    def copy(self) -> 'CountMinSketch':
+        """Return an independent sketch with the same hashes and counts"""
+        other = CountMinSketch.__new__(CountMinSketch)
+        other.width, other.depth, other.total = self.width, self.depth, self.total
+        other._table = array('q', self._table)
+        other._multipliers, other._increments, other._shift = self._multipliers, self._increments, self._shift
+        return other
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the counters"""
+        return self._table.itemsize * len(self._table)
+
+    def __repr__(self) -> str:
+        return f"CountMinSketch(width={self.width}, depth={self.depth}, total={self.total})"
+
+
+class VisitCounter:
+    """
+    Visit counts keyed by location symbol ID, exact up to a limit.
+
+    Counts are kept exactly in a dict. With an exact_limit, once the dict
+    grows past it, a compaction folds the least-visited half of its entries
+    into a CountMinSketch and drops them, so memory stays bounded however
+    many locations are visited. Later visits to a folded location are
+    counted in the sketch, while new locations start out exact again; the
+    most-visited locations therefore stay exact. A sketch cannot tell
+    whether a key was ever added, so which IDs were folded is tracked
+    exactly in a bitmap of one bit per symbol ID.
+
+    snapshot() is O(1): the snapshot shares the dict and sketch, and the
+    counter copies them before its next change (copy-on-write), so any
+    number of snapshots taken between two visits cost one copy in total.
+
+    Attributes:
+        exact_limit (int): Exact entries allowed before compaction, or None for no limit
+        compactions (int): Compactions run so far
+        _exact (dict): Symbol ID to exact visit count
+        _sketch (CountMinSketch): Counts of folded locations, or None before the first compaction
+        _folded (bytearray): Bit i is set once symbol ID i has been folded into the sketch
+        _shared (bool): Whether a snapshot shares _exact and _sketch
+        _frozen (bool): Whether this counter is a snapshot, which cannot change
+    """
+
+    def __init__(self, exact_limit: Optional[int] = None, sketch_width: int = 4096, sketch_depth: int = 4):
+        """
+        Args:
+            exact_limit: Exact entries allowed before compaction; None keeps every count exact
+            sketch_width: Counters per row of the sketch, a power of two
+            sketch_depth: Rows of the sketch
+
+        Raises:
+            ValueError: If exact_limit is not an integer of at least 2
+        """
+        if exact_limit is not None and (not isinstance(exact_limit, int) or exact_limit < 2):
+            raise ValueError("exact_limit must be an integer of at least 2")
+        self.exact_limit = exact_limit
+        self.compactions = 0
+        self._sketch_shape = (sketch_width, sketch_depth)
+        self._exact: Dict[int, int] = {}
+        self._sketch: Optional[CountMinSketch] = None
+        self._folded = bytearray()
+        self._shared = False
+        self._frozen = False
+
+    @classmethod
+    def from_counts(cls, keys: Sequence[int], counts: Sequence[int]) -> 'VisitCounter':
+        """
+        Build an unlimited counter holding the given exact counts.
+
+        Args:
+            keys: Location symbol IDs
+            counts: Visit count of each location
+        """
+        counter = cls()
+        counter._exact = dict(zip(keys, counts))
+        return counter
+
+    def add(self, key: int) -> None:
+        """
+        Count a visit to a location.
+
+        Args:
+            key: The location's symbol ID
+
+        Raises:
+            TypeError: If the counter is a snapshot
+        """
+        if self._shared:
+            self._unshare()
+        exact = self._exact
+        count = exact.get(key)
+        if count is not None:
+            exact[key] = count + 1
+        elif self._is_folded(key):
+            self._sketch.add(key)
+        else:
+            exact[key] = 1
+            if self.exact_limit is not None and len(exact) > self.exact_limit:
+                self.compact()
+
+    def count(self, key: int) -> int:
+        """Return the visits of a location: exact, or an upper bound once folded into the sketch"""
+        count = self._exact.get(key)
+        if count is not None:
+            return count
+        if self._is_folded(key):
+            return self._sketch.estimate(key)
+        return 0
+
+    def counts(self, keys: Sequence[int]) -> List[int]:
+        """Return the visits of several locations, estimating folded ones in one batch"""
+        exact = self._exact
+        counts = [exact.get(key) for key in keys]
+        if self._sketch is None:
+            return [count or 0 for count in counts]
+        is_folded = self._is_folded
+        missing = []
+        for index, count in enumerate(counts):
+            if count is None:
+                counts[index] = 0
+                if is_folded(keys[index]):
+                    missing.append(index)
+        if missing:
+            estimates = self._sketch.estimate_many([keys[index] for index in missing]).tolist()
+            for index, estimate in zip(missing, estimates):
+                counts[index] = estimate
+        return counts
+
+    def _is_folded(self, key: int) -> bool:
+        """Return whether a location's count was folded into the sketch"""
+        byte = key >> 3
+        return byte < len(self._folded) and bool(self._folded[byte] >> (key & 7) & 1)
+
+    def is_exact(self, key: int) -> bool:
+        """Return whether a location's count is kept exactly"""
+        return key in self._exact
+
+    def compact(self) -> int:
+        """
+        Fold the least-visited half of the exact counts into the sketch.
+
+        Returns:
+            Number of locations folded
+
+        Raises:
+            TypeError: If the counter is a snapshot
+        """
+        if self._shared:
+            self._unshare()
+        exact = self._exact
+        if len(exact) < 2:
+            return 0
+        keys = np.fromiter(exact.keys(), dtype=np.int64, count=len(exact))
+        counts = np.fromiter(exact.values(), dtype=np.int64, count=len(exact))
+        folded = np.argpartition(counts, len(exact) // 2)[:len(exact) // 2]
+        if self._sketch is None:
+            width, depth = self._sketch_shape
+            self._sketch = CountMinSketch(width, depth)
+        self._sketch.add_many(keys[folded], counts[folded])
+        bitmap = self._folded
+        folded_keys = keys[folded].tolist()
+        highest = max(folded_keys) >> 3
+        if highest >= len(bitmap):
+            bitmap.extend(bytes(highest + 1 - len(bitmap)))
+        for key in folded_keys:
+            del exact[key]
+            bitmap[key >> 3] |= 1 << (key & 7)
+        # Rebuild so the dict's table shrinks back to its live entries
+        self._exact = dict(exact)
+        self.compactions += 1
+        logger.debug(f"Folded {len(folded)} visit counts into the sketch")
+        return len(folded)
+
+    def snapshot(self) -> 'VisitCounter':
+        """
+        Take a read-only copy of the counts in O(1).
+
+        Returns:
+            A counter that keeps the current counts while this one changes
+        """
+        snapshot = VisitCounter.__new__(VisitCounter)
+        snapshot.exact_limit = self.exact_limit
+        snapshot.compactions = self.compactions
+        snapshot._sketch_shape = self._sketch_shape
+        snapshot._exact = self._exact
+        snapshot._sketch = self._sketch
+        snapshot._folded = self._folded
+        snapshot._shared = True
+        snapshot._frozen = True
+        self._shared = True
+        return snapshot
+
+    def _unshare(self) -> None:
+        """Copy the structures a snapshot shares before changing them"""
+        if self._frozen:
+            raise TypeError("A visit counter snapshot cannot be changed")
+        self._exact = self._exact.copy()
+        if self._sketch is not None:
+            self._sketch = self._sketch.copy()
+        self._folded = bytearray(self._folded)
+        self._shared = False
+
+    @property
+    def exact_size(self) -> int:
+        """Number of locations counted exactly"""
+        return len(self._exact)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the sketch's counters and the folded-ID bitmap"""
+        return len(self._folded) + (0 if self._sketch is None else self._sketch.nbytes)
+
+    def __repr__(self) -> str:
+        return (f"VisitCounter(exact={len(self._exact)}, exact_limit={self.exact_limit}, "
+                f"sketched={self._sketch is not None})")
+
+
+class HistoryView(Mapping):
+    """
+    A navigator's exploration history as it was when the view was taken.
+
+    Behaves like the dict get_exploration_history() returns, mapping
+    location names to visit counts, but takes O(1) to create: it pairs a
+    snapshot of the visit counts with a view of the exploration graph,
+    which lists every visited location.
+    """
+    __slots__ = ('_counts', '_symbols', '_locations')
+
+    def __init__(self, counts: VisitCounter, symbols: SymbolTable, locations: GraphView):
+        self._counts = counts
+        self._symbols = symbols
+        self._locations = locations
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._locations)
+
+    def __contains__(self, location: object) -> bool:
+        return location in self._locations
+
+    def __getitem__(self, location: str) -> int:
+        if location not in self._locations:
+            raise KeyError(location)
+        return self._counts.count(self._symbols.get(location))
+
+    def is_exact(self, location: str) -> bool:
+        """Return whether a location's count is exact rather than an upper bound"""
+        return self._counts.is_exact(self._symbols.get(location))
+
+    def __repr__(self) -> str:
+        return f"HistoryView(locations={len(self._locations)})"
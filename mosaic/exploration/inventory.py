@@ -0,0 +1,277 @@
+import logging
+from enum import Enum, auto
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ItemType(Enum):
+    """Enumeration of item categories."""
+    FOOD = auto()
+    TOOL = auto()
+    ARTIFACT = auto()
+
+
+class Item:
+    """
+    An item a navigator can carry.
+
+    Items are immutable and compare by value, so equal items stack in an
+    inventory.
+
+    Attributes:
+        name (str): Display name; inventories look items up by its case-folded form.
+        item_type (ItemType): The item's category.
+        description (str): What the item does.
+        energy (int): Energy restored when the item is used.
+    """
+    __slots__ = ('name', 'item_type', 'description', 'energy')
+
+    def __init__(self, name: str, item_type: ItemType, description: str = "", energy: int = 0):
+        if not name or not isinstance(name, str):
+            raise ValueError("Item name must be a non-empty string")
+        if not isinstance(item_type, ItemType):
+            raise ValueError("Invalid item type")
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'item_type', item_type)
+        object.__setattr__(self, 'description', description)
+        object.__setattr__(self, 'energy', energy)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Item is immutable")
+
+    def _key(self) -> tuple:
+        return (self.name, self.item_type, self.description, self.energy)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Item):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __reduce__(self):
+        return Item, self._key()
+
+    def __repr__(self) -> str:
+        return (f"Item(name={self.name!r}, item_type={self.item_type.name}, "
+                f"description={self.description!r}, energy={self.energy})")
+
+
+class Inventory:
+    """
+    Items carried by a navigator, stacked by name.
+
+    Each stack is found through a dict keyed by the case-folded item name,
+    and a per-type index lists the stacks of each ItemType, so adding,
+    using and discarding items are O(1) regardless of inventory size.
+    Adding an item whose name matches a stack of a different item keeps
+    them as one stack of the first item.
+
+    Attributes:
+        _stacks (dict): Case-folded name to [item, count]
+        _by_type (dict): ItemType to an insertion-ordered dict of case-folded names
+        _size (int): Total number of items across stacks
+    """
+
+    def __init__(self, items: Sequence[Item] = ()):
+        self._stacks: Dict[str, list] = {}
+        self._by_type: Dict[ItemType, Dict[str, None]] = {}
+        self._size = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        """Return the total number of items"""
+        return self._size
+
+    def __iter__(self) -> Iterator[Item]:
+        """Iterate over the items, once per unit of each stack"""
+        for item, count in self._stacks.values():
+            for _ in range(count):
+                yield item
+
+    def __contains__(self, item: Union[Item, str]) -> bool:
+        if isinstance(item, str):
+            return item.casefold() in self._stacks
+        stack = self._stacks.get(item.name.casefold())
+        return stack is not None and stack[0] == item
+
+    def add(self, item: Item, count: int = 1) -> int:
+        """
+        Add items to their stack.
+
+        Args:
+            item: The item to add
+            count: How many to add
+
+        Returns:
+            The stack's new count
+
+        Raises:
+            ValueError: If item is not an Item or count is not positive
+        """
+        if not isinstance(item, Item):
+            raise ValueError("Only Item instances can be added to an inventory")
+        if count <= 0:
+            raise ValueError("count must be positive")
+        key = item.name.casefold()
+        stack = self._stacks.get(key)
+        if stack is None:
+            stack = self._stacks[key] = [item, 0]
+            self._by_type.setdefault(item.item_type, {})[key] = None
+        stack[1] += count
+        self._size += count
+        return stack[1]
+
+    def append(self, item: Item) -> None:
+        """Add one item, like list.append"""
+        self.add(item)
+
+    def remove(self, name: str, count: int = 1) -> Item:
+        """
+        Take items off a stack by name, ignoring case.
+
+        Args:
+            name: The item name
+            count: How many to take; at most the stack's count
+
+        Returns:
+            The item taken
+
+        Raises:
+            KeyError: If no item has that name
+            ValueError: If count is not positive or exceeds the stack
+        """
+        if count <= 0:
+            raise ValueError("count must be positive")
+        key = name.casefold()
+        stack = self._stacks.get(key)
+        if stack is None:
+            raise KeyError(name)
+        item, held = stack
+        if count > held:
+            raise ValueError(f"Only {held} {item.name} in inventory")
+        if count == held:
+            del self._stacks[key]
+            of_type = self._by_type[item.item_type]
+            del of_type[key]
+            if not of_type:
+                del self._by_type[item.item_type]
+        else:
+            stack[1] = held - count
+        self._size -= count
+        return item
+
+    def get(self, name: str) -> Optional[Item]:
+        """Return the item with a name, ignoring case, or None"""
+        stack = self._stacks.get(name.casefold())
+        return None if stack is None else stack[0]
+
+    def count(self, name: str) -> int:
+        """Return how many of an item are held, ignoring case in the name"""
+        stack = self._stacks.get(name.casefold())
+        return 0 if stack is None else stack[1]
+
+    def of_type(self, item_type: ItemType) -> List[Tuple[Item, int]]:
+        """Return (item, count) for each stack of a type, oldest first"""
+        stacks = self._stacks
+        return [tuple(stacks[key]) for key in self._by_type.get(item_type, ())]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the count of each stack by item name"""
+        return {item.name: count for item, count in self._stacks.values()}
+
+    def clear(self) -> None:
+        """Remove all items"""
+        self._stacks.clear()
+        self._by_type.clear()
+        self._size = 0
+
+    def __repr__(self) -> str:
+        return f"Inventory(items={self._size}, stacks={len(self._stacks)})"
+
+
+class ItemTable:
+    """
+    Items with relative weights, sampled in O(1) with the alias method.
+
+    The probability and alias tables are built once (Vose's algorithm), so
+    each draw costs one uniform random number whatever the table size, and
+    sample_many draws any number of items with a few vectorized operations.
+
+    Attributes:
+        items (tuple): The items in table order
+        _probability (np.ndarray): Chance of keeping column i rather than taking its alias
+        _alias (np.ndarray): Index taken from column i otherwise
+        _columns (list): (probability, item, alias item) per column, for scalar draws
+    """
+
+    def __init__(self, weighted_items: Sequence[Tuple[Item, float]]):
+        """
+        Args:
+            weighted_items: (item, weight) pairs; weights need not sum to one
+
+        Raises:
+            ValueError: If the table is empty or a weight is negative or all are zero
+        """
+        if not weighted_items:
+            raise ValueError("An item table needs at least one item")
+        self.items = tuple(item for item, _ in weighted_items)
+        weights = np.array([weight for _, weight in weighted_items], dtype=np.float64)
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Item weights must be non-negative and not all zero")
+
+        size = len(weights)
+        scaled = weights * size / weights.sum()
+        probability = np.ones(size)
+        alias = np.arange(size)
+        small = [i for i in range(size) if scaled[i] < 1.0]
+        large = [i for i in range(size) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever remains is 1 up to rounding error
+        self._probability = probability
+        self._alias = alias
+        # Plain Python values, since NumPy scalar indexing dominates a single draw
+        self._columns = [(float(probability[i]), self.items[i], self.items[alias[i]]) for i in range(size)]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def sample(self, rng: np.random.Generator) -> Item:
+        """Draw one item"""
+        position = rng.random() * len(self._columns)
+        column = int(position)
+        probability, item, alias = self._columns[column]
+        return item if position - column < probability else alias
+
+    def sample_many(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """
+        Draw several items at once.
+
+        Args:
+            rng: Random number generator
+            size: Number of draws
+
+        Returns:
+            Indices into items, one per draw
+        """
+        position = rng.random(size) * len(self.items)
+        columns = position.astype(np.int64)
+        keep = position - columns < self._probability[columns]
+        return np.where(keep, columns, self._alias[columns])
+
+    def probabilities(self) -> np.ndarray:
+        """Return the chance of drawing each item, reconstructed from the alias tables"""
+        size = len(self.items)
+        chances = self._probability / size
+        np.add.at(chances, self._alias, (1.0 - self._probability) / size)
+        return chances
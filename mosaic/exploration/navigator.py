@@ -1,7 +1,16 @@
+import functools
 import logging
-from typing import Dict, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from enum import Enum, auto
-import random
+
+from .errors import NavigationError
+from .graph import ExplorationGraph, GraphView
+from .history import HistoryView, VisitCounter
+from .inventory import Inventory, Item, ItemTable, ItemType
+from .session import ExplorationSession, SeedLike, make_rng
+from .spatial import SpatialGrid
+from .symbols import SHARED_SYMBOLS, SymbolTable
 
 
 # Configure logging
@@ -13,11 +22,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class NavigationError(Exception):
-    """Custom exception for navigation-related errors."""
-    pass
-
-
 class ExplorationMode(Enum):
     """Enumeration of available exploration modes."""
     SAFE = auto()
@@ -32,6 +36,37 @@ class Direction(Enum):
     WEST = auto()
 
 
+# Cell offset of one step in each direction; north is +y
+DIRECTION_STEPS = {
+    Direction.NORTH: (0, 1),
+    Direction.SOUTH: (0, -1),
+    Direction.EAST: (1, 0),
+    Direction.WEST: (-1, 0),
+}
+
+
+def _recorded(method):
+    """Log calls to a Navigator method in the navigator's session, if it is recording"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        session = self._session
+        if session is None or session.busy:
+            return method(self, *args, **kwargs)
+        session.busy = True
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception as e:
+            session.record(name, args, kwargs, error=e)
+            raise
+        finally:
+            session.busy = False
+        session.record(name, args, kwargs, result)
+        return result
+    return wrapper
+
+
 class Navigator:
     """
     A class to manage exploration in the Infinite Backrooms simulation.
@@ -40,41 +75,96 @@ class Navigator:
         MAX_ENERGY (int): Maximum energy level.
         ENERGY_COST (int): Energy consumed per exploration.
         RESTORE_ENERGY (int): Energy restored when resting.
+        ITEM_FIND_CHANCE (float): Chance of finding an item on each exploration with find_items set.
+        ITEM_TABLE (ItemTable): The items that can be found, with their relative weights.
         current_location (str): The current location of the navigator.
-        _visited_locations (dict): A dictionary storing visited locations and their visit count.
+        _symbols (SymbolTable): Interned location names, shared with other navigators by default.
+        _location (int): The symbol ID of the current location.
+        _visits (VisitCounter): Visit count of each visited location, keyed by symbol ID.
         _exploration_mode (ExplorationMode): The current exploration strategy.
         _energy (int): The remaining energy level.
-        _exploration_map (dict): A dictionary tracking exploration paths.
+        _graph (ExplorationGraph): The graph of explored locations and the moves between them.
+        _nodes (dict): Symbol ID to graph node ID of each visited location.
+        _node (int): The graph node ID of the current location.
+        _position (tuple): The (x, y) grid cell of the navigator in coordinate mode.
+        _spatial (SpatialGrid): Visit counts of the grid cells the navigator has passed through.
+        _rng (np.random.Generator): The navigator's own random number stream.
+        _session (ExplorationSession): The log of calls being recorded, or None.
+        _inventory (Inventory): The items the navigator carries.
+        _find_items (bool): Whether explore() also tries to find an item.
     """
     MAX_ENERGY = 100
     ENERGY_COST = 10
     RESTORE_ENERGY = 30
+    ITEM_FIND_CHANCE = 0.4
+    ITEM_TABLE = ItemTable([
+        (Item("Energy Bar", ItemType.FOOD, "Restores 20 energy", energy=20), 5),
+        (Item("Almond Water", ItemType.FOOD, "Restores 30 energy", energy=30), 3),
+        (Item("Flashlight", ItemType.TOOL, "Lights up dark corridors"), 2),
+        (Item("Compass", ItemType.TOOL, "Points back to the starting point"), 2),
+        (Item("Map Fragment", ItemType.ARTIFACT, "A torn piece of a larger map"), 1),
+    ])
+    POSSIBLE_ITEMS = ITEM_TABLE.items
     
-    def __init__(self, start_location: str = "Starting Point"):
+    def __init__(self, start_location: str = "Starting Point", max_spatial_chunks: Optional[int] = None,
+                 seed: SeedLike = None, record: bool = False, symbols: Optional[SymbolTable] = None,
+                 max_exact_visits: Optional[int] = None, find_items: bool = False):
         """
         Initialize the Navigator with a starting location.
         
+        The navigator also starts at cell (0, 0) of the coordinate grid used
+        by navigate(); realm locations and grid cells are tracked separately.
+        
         Args:
             start_location (str): The initial location in the simulation.
+            max_spatial_chunks (int, optional): Maximum number of grid chunks whose
+                visit counts are kept; the least recently visited are dropped beyond it.
+            seed (optional): Seed of the navigator's random number stream: an int,
+                a SeedSequence from spawn_seeds(), or a Generator; None uses fresh entropy.
+            record (bool): Whether to log every call in an ExplorationSession for replay().
+            symbols (SymbolTable, optional): Table to intern location names in; defaults
+                to the table shared by all navigators.
+            max_exact_visits (int, optional): Locations whose visit counts are kept exactly;
+                beyond it the least-visited are counted approximately in bounded memory.
+            find_items (bool): Whether every successful explore() also calls
+                find_random_item(); otherwise items are only found by calling it.
         
         Raises:
-            ValueError: If start_location is not a valid string.
+            ValueError: If start_location is not a valid string, or max_spatial_chunks or
+                max_exact_visits is invalid.
         """
         try:
             if not start_location or not isinstance(start_location, str):
                 raise ValueError("Start location must be a non-empty string")
             
-            self.current_location = start_location
-            self._visited_locations = {start_location: 1}
+            self._symbols = symbols if symbols is not None else SHARED_SYMBOLS
+            self._location = self._symbols.intern(start_location)
+            self._visits = VisitCounter(max_exact_visits)
+            self._visits.add(self._location)
             self._exploration_mode = ExplorationMode.SAFE
             self._energy = self.MAX_ENERGY
-            self._exploration_map = {start_location: []}
+            self._graph = ExplorationGraph()
+            self._node = self._graph.add_location(start_location)
+            self._nodes = {self._location: self._node}
+            self._position = (0, 0)
+            self._spatial = SpatialGrid(max_spatial_chunks)
+            self._spatial.visit(0, 0)
+            self._rng = make_rng(seed)
+            self._session = None
+            self._inventory = Inventory()
+            self._find_items = bool(find_items)
+            if record:
+                self._session = ExplorationSession(start_location, self._rng.bit_generator.state,
+                                                   {'max_spatial_chunks': max_spatial_chunks,
+                                                    'max_exact_visits': max_exact_visits,
+                                                    'find_items': self._find_items})
             
             logger.info(f"Navigator initialized at {start_location}")
         except ValueError as e:
             logger.error(f"Initialization failed: {str(e)}")
             raise
     
+    @_recorded
     def set_exploration_mode(self, mode: ExplorationMode) -> None:
         """
         Set the exploration strategy.
@@ -95,6 +185,7 @@ class Navigator:
             logger.error(f"Failed to set exploration mode: {str(e)}")
             raise
     
+    @_recorded
     def explore(self, direction: Optional[str] = None) -> str:
         """
         Explore new areas in the simulation.
@@ -116,18 +207,21 @@ class Navigator:
             if direction and not isinstance(direction, str):
                 raise ValueError("Direction must be a string or None")
             
-            new_location = self._generate_new_location(direction)
+            symbols = self._symbols
+            location = symbols.realm(direction)
+            new_location = symbols.name(location)
             
-            self._visited_locations[new_location] = (
-                self._visited_locations.get(new_location, 0) + 1
-            )
-            self.current_location = new_location
+            self._visits.add(location)
+            # Update exploration map by node ID; the graph holds the table's own name strings
+            node = self._nodes.get(location)
+            if node is None:
+                node = self._nodes[location] = self._graph.add_location(new_location)
+            self._graph.add_node_edge(self._node, node, self.ENERGY_COST)
+            self._location = location
+            self._node = node
             self._energy -= self.ENERGY_COST
-            
-            # Update exploration map
-            if new_location not in self._exploration_map:
-                self._exploration_map[new_location] = []
-            self._exploration_map[self.current_location].append(new_location)
+            if self._find_items:
+                self.find_random_item()
             
             logger.info(f"Explored to {new_location} in {self._exploration_mode.name} mode")
             return new_location
@@ -135,6 +229,7 @@ class Navigator:
             logger.error(f"Exploration failed: {str(e)}")
             raise
     
+    @_recorded
     def rest(self):
         """
         Restore energy after resting.
@@ -146,6 +241,11 @@ class Navigator:
             logger.error(f"Failed to restore energy: {str(e)}")
             raise
     
+    @property
+    def current_location(self) -> str:
+        """The current location of the navigator."""
+        return self._symbols.name(self._location)
+    
     def get_current_location(self) -> str:
         """Return the current location."""
         return self.current_location
@@ -155,36 +255,139 @@ class Navigator:
         Get the complete exploration history.
         
         Returns:
-            dict: A dictionary mapping locations to visit counts.
+            dict: A dictionary mapping locations to visit counts. Counts of
+            locations past max_exact_visits are upper bounds.
         """
-        return self._visited_locations.copy()
+        locations = list(self._graph.locations())
+        symbol = self._symbols.get
+        return dict(zip(locations, self._visits.counts([symbol(location) for location in locations])))
+    
+    def get_history_view(self) -> HistoryView:
+        """
+        Get a read-only snapshot of the exploration history without copying it.
+        
+        Returns:
+            HistoryView: A mapping like get_exploration_history()'s, fixed at the time of the call.
+        """
+        return HistoryView(self._visits.snapshot(), self._symbols, self._graph.view())
+    
+    def get_visit_count(self, location: str) -> int:
+        """
+        Get how many times a location has been visited, without copying the history.
+        
+        Args:
+            location (str): The location name.
+        
+        Returns:
+            int: The visit count; 0 for locations never visited.
+        """
+        if location not in self._graph:
+            return 0
+        return self._visits.count(self._symbols.get(location))
     
     def get_exploration_map(self) -> Dict[str, list]:
         """
         Get the exploration map.
         
+        This builds a new dict of the whole map; use get_exploration_graph()
+        for route and reachability queries.
+        
         Returns:
             dict: A dictionary mapping locations to the list of connected locations.
         """
-        return self._exploration_map.copy()
+        return self._graph.to_dict()
     
-    def _generate_new_location(self, direction: Optional[str]) -> str:
+    def get_exploration_map_view(self) -> GraphView:
         """
-        Generate a new location based on exploration parameters.
+        Get a read-only snapshot of the exploration map without copying it.
+        
+        Returns:
+            GraphView: A mapping like get_exploration_map()'s, fixed at the time of the call.
+        """
+        return self._graph.view()
+    
+    def get_exploration_graph(self) -> ExplorationGraph:
+        """
+        Get the live exploration graph.
+        
+        Returns:
+            ExplorationGraph: The graph of explored locations, updated as the navigator explores.
+        """
+        return self._graph
+    
+    def find_route(self, destination: str, origin: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Find the shortest known route between two explored locations.
         
         Args:
-            direction (str, optional): The direction for exploration.
+            destination (str): The location to reach.
+            origin (str, optional): The location to start from; defaults to the current location.
+        
+        Returns:
+            list: Location names from origin to destination inclusive, or None if
+            the destination cannot be reached along explored paths.
+        
+        Raises:
+            NavigationError: If either location has not been explored.
+        """
+        if origin is None:
+            origin = self.current_location
+        return self._graph.shortest_path(origin, destination)
+    
+    def get_symbols(self) -> SymbolTable:
+        """
+        Get the table the navigator's location names are interned in.
         
         Returns:
-            str: The generated location identifier.
+            SymbolTable: The navigator's table, shared with other navigators unless one was passed in.
         """
-        try:
-            if direction:
-                return f"{direction.capitalize()} Realm"
-            return "New Realm"
-        except Exception as e:
-            logger.error(f"Failed to generate new location: {str(e)}")
-            raise NavigationError("Error in generating new location")
+        return self._symbols
+    
+    def get_session(self) -> Optional[ExplorationSession]:
+        """
+        Get the session recording this navigator's calls.
+        
+        Returns:
+            ExplorationSession: The live session, or None if the navigator was created with record=False.
+        """
+        return self._session
+    
+    @classmethod
+    def replay(cls, session: ExplorationSession, verify: bool = True) -> Tuple['Navigator', Dict[str, float]]:
+        """
+        Re-execute a recorded session on a fresh navigator.
+        
+        The new navigator's random number stream starts in the recorded
+        state, so the run repeats bit for bit.
+        
+        Args:
+            session (ExplorationSession): The session to replay.
+            verify (bool): Whether to check every result and error against the recording.
+        
+        Returns:
+            tuple: The navigator after the last call, and the total seconds spent in each method.
+        
+        Raises:
+            NavigationError: If verify is set and a call's outcome differs from the recording.
+        """
+        navigator = cls(session.start_location, **session.options)
+        navigator._rng = session.make_rng()
+        timings: Dict[str, float] = {}
+        for index, (name, args, kwargs, expected, expected_error) in enumerate(session.calls()):
+            method = getattr(navigator, name)
+            result, error = None, None
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                error = type(e).__name__
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+            if verify and (error != expected_error or
+                           (error is None and session.encode_result(result) != expected)):
+                logger.error(f"Replay diverged at call {index} ({name})")
+                raise NavigationError(f"Replay diverged at call {index} ({name})")
+        logger.info(f"Replayed {len(session)} calls")
+        return navigator, timings
     
     def get_energy(self) -> int:
         """Returns the current energy level."""
@@ -195,8 +398,48 @@ class Navigator:
         return (f"Navigator(current_location={self.current_location}, "
                 f"mode={self._exploration_mode.name}, "
                 f"energy={self._energy}, "
-                f"visited={len(self._visited_locations)} locations)")
+                f"visited={len(self._graph)} locations)")
+    
+    def get_inventory(self) -> List[Item]:
+        """
+        Get the items the navigator carries.
+        
+        Returns:
+            list: One entry per item held; stacked items appear once per unit.
+        """
+        return list(self._inventory)
+    
+    def get_inventory_counts(self) -> Dict[str, int]:
+        """
+        Get how many of each item the navigator carries.
+        
+        Returns:
+            dict: A dictionary mapping item names to counts.
+        """
+        return self._inventory.counts()
+    
+    @_recorded
+    def use_item(self, item_name: str) -> Optional[Item]:
+        """
+        Use one item from the inventory, applying its effect.
+        
+        Args:
+            item_name (str): The name of the item to use, in any case.
+        
+        Returns:
+            Optional[Item]: The item used, or None if it is not in the inventory.
+        """
+        try:
+            item = self._inventory.remove(item_name)
+        except KeyError:
+            logger.warning(f"Item '{item_name}' not found in inventory.")
+            return None
+        if item.energy:
+            self._energy = min(self._energy + item.energy, self.MAX_ENERGY)
+        logger.info(f"Used item: {item.name}")
+        return item
     
+    @_recorded
     def discard_item(self, item_name: str):
         """
         Remove an item from the inventory.
@@ -207,53 +450,99 @@ class Navigator:
         Raises:
             ValueError: If the item is not found in the inventory.
         """
-        for item in self._inventory:
-            if item.name.lower() == item_name.lower():
-                self._inventory.remove(item)
-                logger.info(f"Discarded item: {item.name}")
-                return
-        logger.warning(f"Item '{item_name}' not found in inventory.")
-        raise ValueError("Item not found in inventory.")
+        try:
+            item = self._inventory.remove(item_name)
+        except KeyError:
+            logger.warning(f"Item '{item_name}' not found in inventory.")
+            raise ValueError("Item not found in inventory.")
+        logger.info(f"Discarded item: {item.name}")
     
+    @_recorded
     def find_random_item(self):
         """
         Attempt to find a random item while exploring.
 
-        There is a 40% chance of finding an item.
+        There is an ITEM_FIND_CHANCE (40%) chance of finding an item, drawn
+        from ITEM_TABLE by weight.
 
         Returns:
             Optional[Item]: The found item, or None if no item is found.
         """
-        if random.random() < 0.4:  # 40% chance to find an item
-            found_item = random.choice(self.POSSIBLE_ITEMS)
+        if self._rng.random() < self.ITEM_FIND_CHANCE:
+            found_item = self.ITEM_TABLE.sample(self._rng)
             self._inventory.append(found_item)
             logger.info(f"Found an item: {found_item.name}")
             return found_item
         logger.info("No item found this time.")
         return None
 
-    def navigate_to_random_location(self) -> None:
+    @_recorded
+    def navigate_to_random_location(self) -> Tuple[int, int]:
         """
-        Navigate to a random location within the exploration environment.
+        Navigate to a random grid cell within the exploration environment.
+        
+        Returns:
+            tuple: The new (x, y) position.
         """
-        self.current_location["x"] = random.randint(-100, 100)
-        self.current_location["y"] = random.randint(-100, 100)
-        logger.info(f"Navigated to random location: {self.current_location}")
+        x, y = self._rng.integers(-100, 101, size=2).tolist()
+        self._position = (x, y)
+        self._spatial.visit(*self._position)
+        logger.info(f"Navigated to random location: {self._position}")
+        return self._position
 
-    def navigate(self, direction: Direction, steps: int) -> None:
+    @_recorded
+    def navigate(self, direction: Direction, steps: int) -> Tuple[int, int]:
         """
         Navigate in a specified direction by a certain number of steps.
         
+        Every grid cell passed through is recorded in the spatial index, in
+        bounded batches so long paths do not allocate in proportion to their
+        length.
+        
         Args:
             direction (Direction): The direction to navigate.
             steps (int): The number of steps to take in the specified direction.
+        
+        Returns:
+            tuple: The new (x, y) position.
+        
+        Raises:
+            ValueError: If direction is not a Direction or steps is not a non-negative integer.
+        """
+        try:
+            if not isinstance(direction, Direction):
+                raise ValueError("Invalid direction")
+            if not isinstance(steps, int) or steps < 0:
+                raise ValueError("Steps must be a non-negative integer")
+        except ValueError as e:
+            logger.error(f"Navigation failed: {str(e)}")
+            raise
+        
+        self._position = self._spatial.visit_line(*self._position, *DIRECTION_STEPS[direction], steps)
+        logger.info(f"Navigated {direction.name} by {steps} steps to {self._position}")
+        return self._position
+    
+    def get_position(self) -> Tuple[int, int]:
+        """Return the current (x, y) grid cell."""
+        return self._position
+    
+    def get_spatial_index(self) -> SpatialGrid:
+        """
+        Get the live spatial index of visited grid cells.
+        
+        Returns:
+            SpatialGrid: Visit counts for nearest-cell, radius and heatmap queries.
+        """
+        return self._spatial
+    
+    def nearest_visited(self, exclude_current: bool = True) -> Optional[Tuple[int, int]]:
+        """
+        Find the visited grid cell closest to the current position.
+        
+        Args:
+            exclude_current (bool): Whether to skip the current cell itself.
+        
+        Returns:
+            tuple: The (x, y) of the closest visited cell, or None if there is none.
         """
-        if direction == Direction.NORTH:
-            self.current_location["y"] += steps
-        elif direction == Direction.SOUTH:
-            self.current_location["y"] -= steps
-        elif direction == Direction.EAST:
-            self.current_location["x"] += steps
-        elif direction == Direction.WEST:
-            self.current_location["x"] -= steps
-        logger.info(f"Navigated {direction.name} by {steps} steps to {self.current_location}")
+        return self._spatial.nearest(*self._position, exclude_origin=exclude_current)
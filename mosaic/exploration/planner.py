@@ -0,0 +1,272 @@
+import heapq
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .navigator import ExplorationMode, Navigator
+from .session import SeedLike, make_rng
+
+logger = logging.getLogger(__name__)
+
+
+class ModeWeights:
+    """
+    How an exploration mode steers a planner.
+
+    A mode only changes how much energy is kept back and how much chance
+    enters the order realms are tried in. Every exploration costs the same
+    ENERGY_COST, so energy never distinguishes one realm from another, and
+    realms are always ranked by their visit count.
+
+    Attributes:
+        jitter (float): Scale of the random amount added to each visit count, to vary the order of near ties
+        reserve (int): Energy kept back on top of the cost of the next exploration
+    """
+    __slots__ = ('jitter', 'reserve')
+
+    def __init__(self, jitter: float = 0.0, reserve: int = 0):
+        if jitter < 0:
+            raise ValueError("jitter must be non-negative")
+        if not 0 <= reserve <= Navigator.MAX_ENERGY - Navigator.ENERGY_COST - Navigator.RESTORE_ENERGY:
+            raise ValueError("reserve must leave room for an exploration and a full rest below MAX_ENERGY")
+        self.jitter = jitter
+        self.reserve = reserve
+
+    def __repr__(self) -> str:
+        return f"ModeWeights(jitter={self.jitter}, reserve={self.reserve})"
+
+
+class PlanStats:
+    """
+    What a planner's run achieved and what it cost.
+
+    Attributes:
+        explores (int): Explorations made
+        rests (int): Rests taken
+        new_realms (int): Realms visited for the first time
+        energy_spent (int): Energy used exploring
+        cpu_seconds (float): Processor time of the run
+    """
+    __slots__ = ('explores', 'rests', 'new_realms', 'energy_spent', 'cpu_seconds')
+
+    def __init__(self):
+        self.explores = 0
+        self.rests = 0
+        self.new_realms = 0
+        self.energy_spent = 0
+        self.cpu_seconds = 0.0
+
+    @property
+    def realms_per_energy(self) -> float:
+        """New realms per 100 energy spent"""
+        return 100 * self.new_realms / self.energy_spent if self.energy_spent else 0.0
+
+    @property
+    def realms_per_second(self) -> float:
+        """New realms per CPU second"""
+        return self.new_realms / self.cpu_seconds if self.cpu_seconds else 0.0
+
+    def __repr__(self) -> str:
+        return (f"PlanStats(explores={self.explores}, rests={self.rests}, new_realms={self.new_realms}, "
+                f"energy_spent={self.energy_spent})")
+
+
+class Planner:
+    """
+    Drives a navigator towards realms reachable through a set of directions.
+
+    Subclasses choose the direction of each exploration; the planner rests
+    the navigator whenever exploring would leave it below the mode's energy
+    reserve. Rests are only taken when needed, and ModeWeights keeps the
+    reserve low enough that no rest is cut short by the energy cap.
+
+    Attributes:
+        MODE_WEIGHTS (dict): ModeWeights of each ExplorationMode
+        navigator (Navigator): The navigator being driven
+        directions (tuple): Directions the planner chooses between
+    """
+    MODE_WEIGHTS: Dict[ExplorationMode, ModeWeights] = {
+        ExplorationMode.SAFE: ModeWeights(reserve=Navigator.RESTORE_ENERGY),
+        ExplorationMode.AGGRESSIVE: ModeWeights(),
+        ExplorationMode.STEALTH: ModeWeights(jitter=0.9, reserve=Navigator.ENERGY_COST),
+    }
+
+    def __init__(self, navigator: Navigator, directions: Sequence[str]):
+        """
+        Args:
+            navigator: The navigator to drive
+            directions: Directions to choose between
+
+        Raises:
+            ValueError: If directions is empty or holds anything but non-empty strings
+        """
+        directions = tuple(directions)
+        if not directions or not all(isinstance(direction, str) and direction for direction in directions):
+            raise ValueError("directions must be non-empty strings")
+        self.navigator = navigator
+        self.directions = directions
+
+    def weights(self) -> ModeWeights:
+        """Return the weights of the navigator's current mode"""
+        return self.MODE_WEIGHTS[self.navigator._exploration_mode]
+
+    def choose(self) -> str:
+        """Return the direction to explore next"""
+        raise NotImplementedError
+
+    def needs_rest(self) -> bool:
+        """Return whether the navigator should rest before exploring again"""
+        navigator = self.navigator
+        return navigator.get_energy() < navigator.ENERGY_COST + self.weights().reserve
+
+    def step(self) -> Optional[str]:
+        """
+        Rest or explore once.
+
+        Returns:
+            The location explored to, or None if the navigator rested
+        """
+        if self.needs_rest():
+            self.navigator.rest()
+            return None
+        return self.navigator.explore(self.choose())
+
+    def run(self, energy_budget: int) -> PlanStats:
+        """
+        Explore until a budget of energy has been spent.
+
+        Args:
+            energy_budget: Energy to spend exploring; rests do not count against it
+
+        Returns:
+            Counts of explorations, rests and new realms, and the cost of the run
+
+        Raises:
+            ValueError: If energy_budget is negative
+        """
+        if not isinstance(energy_budget, int) or energy_budget < 0:
+            raise ValueError("energy_budget must be a non-negative integer")
+        navigator = self.navigator
+        stats = PlanStats()
+        start = time.process_time()
+        while stats.energy_spent + navigator.ENERGY_COST <= energy_budget:
+            location = self.step()
+            if location is None:
+                stats.rests += 1
+                continue
+            stats.explores += 1
+            stats.energy_spent += navigator.ENERGY_COST
+            if navigator.get_visit_count(location) == 1:
+                stats.new_realms += 1
+        stats.cpu_seconds = time.process_time() - start
+        logger.info(f"{type(self).__name__} finished: {stats!r}")
+        return stats
+
+
+class RandomPlanner(Planner):
+    """Explores in uniformly random directions, as navigators are driven without a planner."""
+
+    def __init__(self, navigator: Navigator, directions: Sequence[str], seed: SeedLike = None):
+        """
+        Args:
+            navigator: The navigator to drive
+            directions: Directions to choose between
+            seed: Seed of the planner's random choices; None uses fresh entropy
+        """
+        super().__init__(navigator, directions)
+        self._rng = make_rng(seed)
+
+    def choose(self) -> str:
+        return self.directions[self._rng.integers(len(self.directions))]
+
+
+class FrontierPlanner(Planner):
+    """
+    Explores the least-visited realm first.
+
+    The frontier is a min-heap of realms scored by their visit count plus
+    the mode's jitter, if any, with ties broken by direction order. Visit
+    counts only grow, so a heap entry can only be stale by scoring too low:
+    the top entry is checked against the navigator's current count and
+    re-scored in place if it changed, and each choice costs O(log n)
+    however many realms there are. Directions that lead to the same realm
+    are merged. Changing the navigator's mode re-scores the whole frontier.
+
+    Attributes:
+        _realms (list): Realm name of each frontier entry
+        _choices (list): Direction leading to each frontier entry
+        _heap (list): (score, order, entry, visit count when scored)
+        _mode (ExplorationMode): Mode the heap was scored for
+        _rng (np.random.Generator): Source of jitter
+    """
+
+    def __init__(self, navigator: Navigator, directions: Sequence[str], seed: SeedLike = None):
+        """
+        Args:
+            navigator: The navigator to drive
+            directions: Directions to choose between
+            seed: Seed of the jitter some modes add to scores; None uses fresh entropy
+        """
+        super().__init__(navigator, directions)
+        symbols = navigator.get_symbols()
+        self._realms: List[str] = []
+        self._choices: List[str] = []
+        seen = set()
+        for direction in self.directions:
+            realm = symbols.name(symbols.realm(direction))
+            if realm not in seen:
+                seen.add(realm)
+                self._realms.append(realm)
+                self._choices.append(direction)
+        self._rng = make_rng(seed)
+        self._heap: List[Tuple[float, int, int, int]] = []
+        self._mode: Optional[ExplorationMode] = None
+
+    def __len__(self) -> int:
+        """Return the number of distinct realms on the frontier"""
+        return len(self._realms)
+
+    def _score(self, visits: int, weights: ModeWeights) -> float:
+        score = float(visits)
+        if weights.jitter:
+            score += weights.jitter * self._rng.random()
+        return score
+
+    def _rebuild(self) -> None:
+        """Score every realm for the navigator's current mode"""
+        weights = self.weights()
+        count = self.navigator.get_visit_count
+        self._heap = [(self._score(visits, weights), entry, entry, visits)
+                      for entry, visits in enumerate(count(realm) for realm in self._realms)]
+        heapq.heapify(self._heap)
+        self._mode = self.navigator._exploration_mode
+
+    def choose(self) -> str:
+        if self._mode is not self.navigator._exploration_mode:
+            self._rebuild()
+        heap = self._heap
+        count = self.navigator.get_visit_count
+        weights = None
+        while True:
+            _, order, entry, scored = heap[0]
+            visits = count(self._realms[entry])
+            if visits == scored:
+                return self._choices[entry]
+            weights = weights or self.weights()
+            heapq.heapreplace(heap, (self._score(visits, weights), order, entry, visits))
+
+    def frontier(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Return the least-visited realms, with their visit counts.
+
+        Jitter is ignored, so ties are listed in direction order.
+
+        Args:
+            limit: Maximum number of realms to return
+
+        Returns:
+            (realm, visit count) pairs, best first
+        """
+        count = self.navigator.get_visit_count
+        ranked = heapq.nsmallest(limit, ((count(realm), entry, realm) for entry, realm in enumerate(self._realms)))
+        return [(realm, visits) for visits, _, realm in ranked]
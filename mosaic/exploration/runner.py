@@ -0,0 +1,320 @@
+import logging
+import multiprocessing
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from ..learning import MemoryStore
+from .graph import ExplorationGraph
+from .navigator import Navigator
+from .session import SeedLike, spawn_seeds
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTIONS = ("north", "south", "east", "west")
+
+
+class _Delta:
+    """
+    What one chunk of navigators discovered, in a compact picklable form.
+
+    Location names are sent once per chunk; visits and moves refer to them
+    by position, so the payload grows with the number of distinct
+    locations and moves rather than with the number of steps taken.
+
+    Attributes:
+        first_navigator (int): Index of the chunk's first navigator in the run
+        names (tuple): Distinct locations visited by the chunk
+        visits (np.ndarray): Visit count of each name, summed over the chunk
+        first_seen (np.ndarray): Offset within the chunk of the first navigator to visit each name
+        moves (np.ndarray): (n, 2) int32 name positions of each distinct move
+        steps (int): Calls made on the chunk's navigators
+        busy (float): CPU seconds the worker spent on the chunk
+        pid (int): Process id of the worker
+    """
+    __slots__ = ('first_navigator', 'names', 'visits', 'first_seen', 'moves', 'steps', 'busy', 'pid')
+
+    def __init__(self, first_navigator: int, names: tuple, visits: np.ndarray, first_seen: np.ndarray,
+                 moves: np.ndarray, steps: int, busy: float, pid: int):
+        self.first_navigator = first_navigator
+        self.names = names
+        self.visits = visits
+        self.first_seen = first_seen
+        self.moves = moves
+        self.steps = steps
+        self.busy = busy
+        self.pid = pid
+
+
+def _init_worker(log_level: int) -> None:
+    """Pool initializer: quieten per-step navigator logging in a worker process"""
+    logging.getLogger(__package__).setLevel(log_level)
+
+
+def _drive(navigator: Navigator, steps: int, directions: Sequence[str]) -> int:
+    """
+    Explore in random directions for a number of steps, resting whenever out of energy.
+
+    Returns:
+        Number of calls made on the navigator
+    """
+    choices = navigator._rng.integers(len(directions), size=steps).tolist()
+    calls = 0
+    for choice in choices:
+        if navigator.get_energy() < navigator.ENERGY_COST:
+            navigator.rest()
+            calls += 1
+        navigator.explore(directions[choice])
+        calls += 1
+    return calls
+
+
+def _explore_chunk(task: tuple) -> _Delta:
+    """Run a chunk of navigators and reduce what they found to one delta"""
+    first_navigator, seeds, steps, start_location, directions = task
+    start = time.process_time()
+    positions: Dict[str, int] = {}
+    visits: List[int] = []
+    first_seen: List[int] = []
+    moves = set()
+    calls = 0
+    for offset, seed in enumerate(seeds):
+        navigator = Navigator(start_location, seed=seed)
+        calls += _drive(navigator, steps, directions)
+        for name, count in navigator.get_exploration_history().items():
+            position = positions.get(name)
+            if position is None:
+                position = positions[name] = len(visits)
+                visits.append(0)
+                first_seen.append(offset)
+            visits[position] += count
+        for source, targets in navigator.get_exploration_map().items():
+            for target in targets:
+                moves.add((positions[source], positions[target]))
+    return _Delta(
+        first_navigator,
+        tuple(positions),
+        np.array(visits, dtype=np.int64),
+        np.array(first_seen, dtype=np.int64),
+        np.array(sorted(moves), dtype=np.int32).reshape(-1, 2),
+        calls,
+        time.process_time() - start,
+        os.getpid()
+    )
+
+
+class RunnerMetrics:
+    """
+    Throughput and cost figures of one ExplorationRunner.run() call.
+
+    Attributes:
+        navigators (int): Navigators run
+        steps (int): Calls made on them (explores and rests)
+        chunks (int): Task batches processed
+        workers (int): Worker processes used; 0 when run in-process
+        elapsed (float): Wall-clock seconds of the whole run
+        merge_seconds (float): Seconds spent merging deltas into the store and graph
+        worker_busy (dict): CPU seconds of navigator work done by each worker process id
+    """
+    __slots__ = ('navigators', 'steps', 'chunks', 'workers', 'elapsed', 'merge_seconds', 'worker_busy')
+
+    def __init__(self, navigators: int, workers: int):
+        self.navigators = navigators
+        self.steps = 0
+        self.chunks = 0
+        self.workers = workers
+        self.elapsed = 0.0
+        self.merge_seconds = 0.0
+        self.worker_busy: Dict[int, float] = {}
+
+    @property
+    def throughput(self) -> float:
+        """Navigator calls per wall-clock second"""
+        return self.steps / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def utilisation(self) -> float:
+        """Fraction of the workers' wall-clock time spent running navigators on a CPU"""
+        capacity = self.elapsed * max(self.workers, 1)
+        return sum(self.worker_busy.values()) / capacity if capacity else 0.0
+
+    @property
+    def merge_share(self) -> float:
+        """Fraction of the wall-clock time the parent spent merging"""
+        return self.merge_seconds / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Return the metrics, including the derived rates, as a plain dict"""
+        return {
+            'navigators': self.navigators,
+            'steps': self.steps,
+            'chunks': self.chunks,
+            'workers': self.workers,
+            'elapsed': self.elapsed,
+            'merge_seconds': self.merge_seconds,
+            'throughput': self.throughput,
+            'utilisation': self.utilisation,
+            'merge_share': self.merge_share
+        }
+
+    def __repr__(self) -> str:
+        return (f"RunnerMetrics(navigators={self.navigators}, steps={self.steps}, "
+                f"throughput={self.throughput:.0f}/s, utilisation={self.utilisation:.0%}, "
+                f"merge_share={self.merge_share:.1%})")
+
+
+class ExplorationRunner:
+    """
+    Runs exploration campaigns of many navigators across a process pool.
+
+    Navigators are split into chunks of chunk_size, and each chunk is one
+    pool task. A worker runs its chunk's navigators to completion and sends
+    back a single delta of the locations and moves they found. The parent
+    merges deltas as they stream in, in chunk order: visit counts go into
+    the runner's totals, moves into a shared ExplorationGraph, and each
+    location seen for the first time is stored in the MemoryStore as a
+    discovery. Every navigator gets its own seed spawned from the run's
+    seed, so a seeded campaign gives the same results with any number of
+    workers.
+
+    Attributes:
+        store (MemoryStore): Receives one discovery per newly found location
+        num_workers (int): Worker processes; 0 runs every chunk in this process
+        chunk_size (int): Navigators per task batch
+        start_location (str): Where every navigator starts
+        directions (tuple): Directions navigators choose between at random
+        worker_log_level (int): Log level of the exploration loggers in worker processes
+        _graph (ExplorationGraph): Every move made by any navigator
+        _visits (dict): Total visits of each location
+        _navigators (int): Navigators run so far, so indices stay unique across runs
+    """
+
+    def __init__(
+        self,
+        store: Optional[MemoryStore] = None,
+        num_workers: Optional[int] = None,
+        chunk_size: int = 64,
+        start_location: str = "Starting Point",
+        directions: Sequence[str] = DEFAULT_DIRECTIONS,
+        worker_log_level: int = logging.WARNING
+    ):
+        """
+        Args:
+            store: Where discoveries are stored (default: a new MemoryStore)
+            num_workers: Worker processes (default: CPU count); 0 runs in-process
+            chunk_size: Navigators per task batch
+            start_location: Where every navigator starts
+            directions: Directions navigators choose between at random
+            worker_log_level: Log level of the exploration loggers in worker processes
+
+        Raises:
+            ValueError: If num_workers, chunk_size or directions is invalid
+        """
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if not isinstance(num_workers, int) or num_workers < 0:
+            raise ValueError("num_workers must be a non-negative integer")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        directions = tuple(directions)
+        if not directions or not all(isinstance(direction, str) and direction for direction in directions):
+            raise ValueError("directions must be non-empty strings")
+
+        self.store = store if store is not None else MemoryStore()
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.start_location = start_location
+        self.directions = directions
+        self.worker_log_level = worker_log_level
+        self._graph = ExplorationGraph()
+        self._graph.add_location(start_location)
+        self._visits: Dict[str, int] = {}
+        self._navigators = 0
+
+    def run(self, num_navigators: int, steps: int, seed: SeedLike = None) -> RunnerMetrics:
+        """
+        Run a campaign and merge its results.
+
+        Args:
+            num_navigators: Navigators to run
+            steps: Explorations each navigator makes; it rests when out of energy
+            seed: Root seed the navigators' seeds are spawned from; None uses fresh entropy
+
+        Returns:
+            Throughput, utilisation and merge cost of the run
+
+        Raises:
+            ValueError: If num_navigators or steps is invalid
+            MemoryError: If storing discoveries fails
+        """
+        for name, value in (('num_navigators', num_navigators), ('steps', steps)):
+            if not isinstance(value, int) or value < 0:
+                raise ValueError(f"{name} must be a non-negative integer")
+
+        metrics = RunnerMetrics(num_navigators, self.num_workers)
+        start = time.perf_counter()
+        try:
+            for delta in self._deltas(self._tasks(num_navigators, steps, seed)):
+                self._merge(delta, metrics)
+        except Exception as e:
+            logger.error(f"Exploration run failed: {str(e)}")
+            raise
+        finally:
+            self._navigators += num_navigators
+        metrics.elapsed = time.perf_counter() - start
+        logger.info(f"Ran {num_navigators} navigators: {metrics!r}")
+        return metrics
+
+    def _tasks(self, num_navigators: int, steps: int, seed: SeedLike) -> Iterator[tuple]:
+        """Split the navigators and their seeds into chunk tasks"""
+        seeds = spawn_seeds(seed, num_navigators)
+        for first in range(0, num_navigators, self.chunk_size):
+            yield (self._navigators + first, seeds[first:first + self.chunk_size], steps,
+                   self.start_location, self.directions)
+
+    def _deltas(self, tasks: Iterator[tuple]) -> Iterator[_Delta]:
+        """Execute chunk tasks, yielding each delta as soon as it is next in order"""
+        if self.num_workers == 0:
+            for task in tasks:
+                yield _explore_chunk(task)
+            return
+        with multiprocessing.Pool(self.num_workers, _init_worker, (self.worker_log_level,)) as pool:
+            yield from pool.imap(_explore_chunk, tasks)
+
+    def _merge(self, delta: _Delta, metrics: RunnerMetrics) -> None:
+        """Fold one chunk's delta into the visit totals, graph and store"""
+        start = time.perf_counter()
+        names = delta.names
+        visits = self._visits
+        new_names = []
+        new_metadata = []
+        for name, count, offset in zip(names, delta.visits.tolist(), delta.first_seen.tolist()):
+            if name not in visits:
+                visits[name] = 0
+                new_names.append(name)
+                new_metadata.append({'type': 'location', 'navigator': delta.first_navigator + offset})
+            visits[name] += count
+        graph = self._graph
+        for source, target in delta.moves.tolist():
+            graph.add_edge(names[source], names[target], Navigator.ENERGY_COST)
+        if new_names:
+            self.store.store_discoveries(new_names, new_metadata)
+
+        metrics.chunks += 1
+        metrics.steps += delta.steps
+        metrics.worker_busy[delta.pid] = metrics.worker_busy.get(delta.pid, 0.0) + delta.busy
+        metrics.merge_seconds += time.perf_counter() - start
+
+    def get_exploration_graph(self) -> ExplorationGraph:
+        """Return the live graph of every move made in the runner's campaigns"""
+        return self._graph
+
+    def get_visit_counts(self) -> Dict[str, int]:
+        """Return the total visits of each location across the runner's campaigns"""
+        return self._visits.copy()
+
+    def __repr__(self) -> str:
+        return (f"ExplorationRunner(workers={self.num_workers}, chunk_size={self.chunk_size}, "
+                f"navigators={self._navigators}, locations={len(self._visits)})")
@@ -0,0 +1,201 @@
+import importlib
+import json
+import logging
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Anything np.random.default_rng accepts as a seed
+SeedLike = Union[None, int, Sequence[int], np.random.SeedSequence, np.random.Generator]
+
+_FORMAT_VERSION = 1
+
+
+def make_rng(seed: SeedLike = None) -> np.random.Generator:
+    """
+    Create an independent random number generator.
+
+    Args:
+        seed: An int, a SeedSequence (e.g. from spawn_seeds), an existing
+            Generator to use as-is, or None for fresh OS entropy
+
+    Returns:
+        The generator
+    """
+    return np.random.default_rng(seed)
+
+
+def spawn_seeds(seed: SeedLike, count: int) -> List[np.random.SeedSequence]:
+    """
+    Split one seed into independent child seeds, e.g. one per navigator or process.
+
+    The children are statistically independent streams, and the same seed
+    always yields the same children. SeedSequences pickle, so they can be
+    handed to worker processes.
+
+    Args:
+        seed: Root seed; None draws fresh OS entropy
+        count: Number of child seeds
+
+    Returns:
+        The child SeedSequences
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(count)
+
+
+def _encode(value: Any) -> Any:
+    """Convert a call argument or result into a JSON-ready value"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        cls = type(value)
+        return {'enum': f"{cls.__module__}:{cls.__qualname__}", 'name': value.name}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return {'repr': repr(value)}
+
+
+def _decode(value: Any) -> Any:
+    """Turn an encoded call argument back into the value passed"""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict) and 'enum' in value:
+        module, name = value['enum'].split(':')
+        return getattr(importlib.import_module(module), name)[value['name']]
+    return value
+
+
+class ExplorationSession:
+    """
+    A log of everything needed to re-run a navigator bit for bit.
+
+    The session holds the navigator's constructor arguments, the state of
+    its random number generator when it was created, and every
+    state-changing call made on it with its result or the type of error it
+    raised. Navigator.replay() re-executes the calls on a fresh navigator
+    whose generator starts from the same state, so a slow run can be
+    profiled or timed again exactly.
+
+    Attributes:
+        start_location (str): The navigator's starting location
+        options (dict): Other constructor keyword arguments
+        rng_state (dict): The generator's bit_generator.state at creation
+        busy (bool): Whether a recorded call is in progress, so that calls it
+            makes internally are not recorded twice
+        _events (list): Encoded (method, args, kwargs, result, error) records
+    """
+
+    def __init__(self, start_location: str, rng_state: Dict[str, Any], options: Optional[Dict[str, Any]] = None):
+        self.start_location = start_location
+        self.options = dict(options or {})
+        self.rng_state = rng_state
+        self.busy = False
+        self._events: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        """Return the number of recorded calls"""
+        return len(self._events)
+
+    def record(self, method: str, args: tuple, kwargs: Dict[str, Any],
+               result: Any = None, error: Optional[BaseException] = None) -> None:
+        """
+        Append a call to the log.
+
+        Args:
+            method: Name of the Navigator method
+            args: Positional arguments
+            kwargs: Keyword arguments
+            result: The value returned
+            error: The exception raised, if any
+        """
+        self._events.append({
+            'method': method,
+            'args': _encode(args),
+            'kwargs': {key: _encode(value) for key, value in kwargs.items()},
+            'result': None if error is not None else _encode(result),
+            'error': None if error is None else type(error).__name__
+        })
+
+    def calls(self) -> Iterator[Tuple[str, list, Dict[str, Any], Any, Optional[str]]]:
+        """
+        Iterate over the recorded calls with their arguments decoded.
+
+        Yields:
+            (method, args, kwargs, encoded result, error type name)
+        """
+        for event in self._events:
+            yield (event['method'], _decode(event['args']),
+                   {key: _decode(value) for key, value in event['kwargs'].items()},
+                   event['result'], event['error'])
+
+    def make_rng(self) -> np.random.Generator:
+        """Create a generator in the state the recorded navigator's started in"""
+        bit_generator = getattr(np.random, self.rng_state['bit_generator'])()
+        bit_generator.state = self.rng_state
+        return np.random.Generator(bit_generator)
+
+    @staticmethod
+    def encode_result(result: Any) -> Any:
+        """Encode a call result the way record() does, for comparison with a recorded one"""
+        return _encode(result)
+
+    def save(self, path: str) -> None:
+        """
+        Write the session as JSON Lines: a header, then one line per call.
+
+        Args:
+            path: File to write
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        header = {
+            'version': _FORMAT_VERSION,
+            'start_location': self.start_location,
+            'options': self.options,
+            'rng_state': self.rng_state
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header) + "\n")
+            for event in self._events:
+                f.write(json.dumps(event) + "\n")
+        logger.info(f"Saved session with {len(self._events)} calls to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'ExplorationSession':
+        """
+        Read a session written by save().
+
+        Args:
+            path: File to read
+
+        Returns:
+            The session
+
+        Raises:
+            ValueError: If the file is not a session log
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                header = json.loads(f.readline())
+                if header.get('version') != _FORMAT_VERSION:
+                    raise ValueError(f"Unsupported session format version: {header.get('version')}")
+                session = cls(header['start_location'], header['rng_state'], header['options'])
+                session._events = [json.loads(line) for line in f if line.strip()]
+            except (json.JSONDecodeError, KeyError, AttributeError) as e:
+                logger.error(f"Failed to load session from {path}: {str(e)}")
+                raise ValueError(f"Invalid session file: {path}") from e
+        logger.info(f"Loaded session with {len(session._events)} calls from {path}")
+        return session
+
+    def __repr__(self) -> str:
+        return f"ExplorationSession(start_location={self.start_location!r}, calls={len(self._events)})"
@@ -0,0 +1,353 @@
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Chunks are CHUNK_SIZE x CHUNK_SIZE cells; must be a power of two
+_CHUNK_BITS = 6
+CHUNK_SIZE = 1 << _CHUNK_BITS
+_CELL_MASK = CHUNK_SIZE - 1
+
+# Chunk coordinates are offset to be non-negative and packed into the two
+# 32-bit halves of one int64 key, so cells must lie within +/-2**36
+_KEY_OFFSET = 1 << 30
+_KEY_MASK = (1 << 32) - 1
+
+_INFINITY = float('inf')
+
+# Squared distance given to an excluded cell so it is never the closest
+_EXCLUDED = np.iinfo(np.int64).max
+
+# Cells of a visit_line() path counted per visit_many() batch
+_LINE_SLICE = 1 << 16
+
+
+def _chunk_key(chunk_x, chunk_y):
+    """Pack chunk coordinates (ints or int64 arrays) into dict keys"""
+    return ((chunk_x + _KEY_OFFSET) << 32) | (chunk_y + _KEY_OFFSET)
+
+
+class SpatialGrid:
+    """
+    Visit counts over an unbounded 2D grid of integer cells.
+
+    Cells are grouped into square chunks of CHUNK_SIZE x CHUNK_SIZE counts
+    held in one NumPy array each, and only chunks that contain a visited
+    cell exist, so memory grows with the area actually explored rather
+    than its bounding box. With max_chunks set, the least recently visited
+    chunk is dropped once the limit is exceeded, which caps memory at
+    max_chunks * CHUNK_SIZE**2 * 4 bytes for agents that wander forever.
+
+    Nearest-cell and radius queries rank chunks by their distance from the
+    query point with vectorized bounds and only open chunks that can still
+    hold a closer or matching cell.
+
+    Attributes:
+        _chunks (OrderedDict): Packed chunk key to a (CHUNK_SIZE, CHUNK_SIZE)
+            int32 array indexed [y, x], least recently visited first
+        _max_chunks (int): Maximum number of chunks kept, or None for no limit
+        _visited (int): Number of cells with a non-zero count
+        _layout (tuple): Cached (keys, chunk_xs, chunk_ys) arrays of the chunks, or None
+    """
+
+    def __init__(self, max_chunks: Optional[int] = None):
+        """
+        Args:
+            max_chunks: Maximum number of chunks to keep, or None for no limit
+
+        Raises:
+            ValueError: If max_chunks is not a positive integer
+        """
+        if max_chunks is not None and (not isinstance(max_chunks, int) or max_chunks <= 0):
+            raise ValueError("max_chunks must be a positive integer or None")
+        self._chunks: 'OrderedDict[int, np.ndarray]' = OrderedDict()
+        self._max_chunks = max_chunks
+        self._visited = 0
+        self._layout: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        """Return the number of visited cells"""
+        return self._visited
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        return self.visits(*cell) > 0
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of allocated chunks"""
+        return len(self._chunks)
+
+    @property
+    def max_chunks(self) -> Optional[int]:
+        """Maximum number of chunks kept, or None for no limit"""
+        return self._max_chunks
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by chunk arrays"""
+        return len(self._chunks) * CHUNK_SIZE * CHUNK_SIZE * 4
+
+    def visit(self, x: int, y: int) -> int:
+        """
+        Count a visit to a cell.
+
+        Args:
+            x: Cell column
+            y: Cell row
+
+        Returns:
+            The cell's visit count after this visit
+        """
+        chunk = self._chunk(_chunk_key(x >> _CHUNK_BITS, y >> _CHUNK_BITS))
+        row, column = y & _CELL_MASK, x & _CELL_MASK
+        count = int(chunk[row, column]) + 1
+        chunk[row, column] = count
+        if count == 1:
+            self._visited += 1
+        if self._trim():
+            logger.info(f"Spatial grid at capacity, trimmed to {self._max_chunks} chunks")
+        return count
+
+    def visit_many(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        """
+        Count one visit per (x, y) pair; repeated cells are counted each time.
+
+        Chunks are updated in the order the pairs last visit them, so the
+        chunks kept and their recency match visiting the pairs one by one.
+        With max_chunks set, only the chunks that survive the batch are
+        touched, and chunks are trimmed as they are added, so memory never
+        exceeds the limit by more than one chunk. A surviving chunk counts
+        all of its visits in the batch, even where one-by-one visits would
+        have dropped and re-created it part-way.
+
+        Args:
+            xs: Cell columns
+            ys: Cell rows, parallel to xs
+
+        Raises:
+            ValueError: If xs and ys differ in shape
+        """
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        ys = np.asarray(ys, dtype=np.int64).ravel()
+        if xs.shape != ys.shape:
+            raise ValueError("xs and ys must have the same shape")
+        if not len(xs):
+            return
+        keys = _chunk_key(xs >> _CHUNK_BITS, ys >> _CHUNK_BITS)
+        order = np.argsort(keys, kind='stable')
+        keys, rows, columns = keys[order], ys[order] & _CELL_MASK, xs[order] & _CELL_MASK
+        starts = np.flatnonzero(np.diff(keys)) + 1
+        ends = np.append(starts, len(keys))
+        starts = np.insert(starts, 0, 0)
+        # Within a group the stable sort keeps pairs in input order
+        groups = np.argsort(order[ends - 1], kind='stable')
+        if self._max_chunks is not None:
+            groups = groups[-self._max_chunks:]
+        dropped = 0
+        for group in groups.tolist():
+            start, end = int(starts[group]), int(ends[group])
+            chunk = self._chunk(int(keys[start]))
+            before = np.count_nonzero(chunk)
+            np.add.at(chunk, (rows[start:end], columns[start:end]), 1)
+            self._visited += np.count_nonzero(chunk) - before
+            dropped += self._trim()
+        if dropped:
+            logger.info(f"Spatial grid at capacity, trimmed to {self._max_chunks} chunks")
+
+    def visit_line(self, x: int, y: int, step_x: int, step_y: int, steps: int) -> Tuple[int, int]:
+        """
+        Count one visit to each cell of a straight path, excluding its start.
+
+        The path is counted in bounded batches, so long paths do not allocate
+        in proportion to their length. With max_chunks set, steps that can
+        only reach chunks the grid would drop again are skipped: a path with
+        steps of at most one cell per axis spends at most CHUNK_SIZE steps
+        in any chunk.
+
+        Args:
+            x: Start column
+            y: Start row
+            step_x: Column offset of one step, -1, 0 or 1
+            step_y: Row offset of one step, -1, 0 or 1
+            steps: Number of steps
+
+        Returns:
+            (x, y) of the last cell of the path
+        """
+        first = 1
+        if self._max_chunks is not None:
+            first = max(1, steps - self._max_chunks * CHUNK_SIZE + 1)
+        for start in range(first, steps + 1, _LINE_SLICE):
+            offsets = np.arange(start, min(start + _LINE_SLICE, steps + 1))
+            self.visit_many(x + step_x * offsets, y + step_y * offsets)
+        return x + step_x * steps, y + step_y * steps
+
+    def visits(self, x: int, y: int) -> int:
+        """Return the visit count of a cell"""
+        chunk = self._chunks.get(_chunk_key(x >> _CHUNK_BITS, y >> _CHUNK_BITS))
+        if chunk is None:
+            return 0
+        return int(chunk[y & _CELL_MASK, x & _CELL_MASK])
+
+    def clear(self) -> None:
+        """Forget all visits"""
+        self._chunks.clear()
+        self._visited = 0
+        self._layout = None
+
+    def nearest(self, x: int, y: int, max_distance: Optional[float] = None,
+                exclude_origin: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        Find the visited cell closest to a point by Euclidean distance.
+
+        Args:
+            x: Query column
+            y: Query row
+            max_distance: Ignore cells farther than this
+            exclude_origin: Skip the query cell itself even if visited
+
+        Returns:
+            (x, y) of the closest visited cell, the point itself if visited
+            and not excluded, or None if no visited cell is in range
+        """
+        keys, bounds, origins_x, origins_y = self._ranked(x, y)
+        best, best_cell = (_INFINITY if max_distance is None else max_distance ** 2), None
+        for index in np.argsort(bounds, kind='stable').tolist():
+            if bounds[index] > best:
+                break
+            rows, columns = np.nonzero(self._chunks[int(keys[index])])
+            if not len(rows):
+                continue
+            cell_xs, cell_ys = columns + origins_x[index], rows + origins_y[index]
+            distances = (cell_xs - x) ** 2 + (cell_ys - y) ** 2
+            if exclude_origin:
+                distances[distances == 0] = _EXCLUDED
+            closest = int(np.argmin(distances))
+            distance = int(distances[closest])
+            if distance == _EXCLUDED:
+                continue
+            if distance < best or (best_cell is None and distance == best):
+                best, best_cell = distance, (int(cell_xs[closest]), int(cell_ys[closest]))
+        return best_cell
+
+    def within(self, x: int, y: int, radius: float) -> np.ndarray:
+        """
+        Find the visited cells within a Euclidean radius of a point.
+
+        Args:
+            x: Query column
+            y: Query row
+            radius: Inclusive search radius
+
+        Returns:
+            Array of shape (n, 2) with the (x, y) of each matching cell
+
+        Raises:
+            ValueError: If radius is negative
+        """
+        if radius < 0:
+            raise ValueError("radius must be non-negative")
+        keys, bounds, origins_x, origins_y = self._ranked(x, y)
+        limit = radius * radius
+        found = []
+        for index in np.flatnonzero(bounds <= limit).tolist():
+            rows, columns = np.nonzero(self._chunks[int(keys[index])])
+            cell_xs, cell_ys = columns + origins_x[index], rows + origins_y[index]
+            inside = (cell_xs - x) ** 2 + (cell_ys - y) ** 2 <= limit
+            found.append(np.column_stack((cell_xs[inside], cell_ys[inside])))
+        if not found:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.concatenate(found)
+
+    def heatmap(self, min_x: int, min_y: int, max_x: int, max_y: int, cell_size: int = 1) -> np.ndarray:
+        """
+        Visit counts over a rectangle, optionally summed over square blocks.
+
+        Args:
+            min_x: First column, inclusive
+            min_y: First row, inclusive
+            max_x: Last column, exclusive
+            max_y: Last row, exclusive
+            cell_size: Side of the square block of cells summed into each pixel
+
+        Returns:
+            int64 array indexed [row, column] of shape
+            (ceil(height / cell_size), ceil(width / cell_size))
+
+        Raises:
+            ValueError: If the rectangle is empty or cell_size is not positive
+        """
+        if max_x <= min_x or max_y <= min_y:
+            raise ValueError("heatmap rectangle must not be empty")
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        width = -(-(max_x - min_x) // cell_size) * cell_size
+        height = -(-(max_y - min_y) // cell_size) * cell_size
+        window = np.zeros((height, width), dtype=np.int64)
+        for chunk_y in range(min_y >> _CHUNK_BITS, ((max_y - 1) >> _CHUNK_BITS) + 1):
+            for chunk_x in range(min_x >> _CHUNK_BITS, ((max_x - 1) >> _CHUNK_BITS) + 1):
+                chunk = self._chunks.get(_chunk_key(chunk_x, chunk_y))
+                if chunk is None:
+                    continue
+                left, top = chunk_x << _CHUNK_BITS, chunk_y << _CHUNK_BITS
+                x0, x1 = max(left, min_x), min(left + CHUNK_SIZE, max_x)
+                y0, y1 = max(top, min_y), min(top + CHUNK_SIZE, max_y)
+                window[y0 - min_y:y1 - min_y, x0 - min_x:x1 - min_x] = chunk[y0 - top:y1 - top, x0 - left:x1 - left]
+        if cell_size == 1:
+            return window
+        return window.reshape(height // cell_size, cell_size, width // cell_size, cell_size).sum(axis=(1, 3))
+
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """Return (min_x, min_y, max_x, max_y) of the allocated chunks, max exclusive, or None if empty"""
+        if not self._chunks:
+            return None
+        _, chunk_xs, chunk_ys = self._chunk_layout()
+        return (int(chunk_xs.min()) << _CHUNK_BITS, int(chunk_ys.min()) << _CHUNK_BITS,
+                (int(chunk_xs.max()) + 1) << _CHUNK_BITS, (int(chunk_ys.max()) + 1) << _CHUNK_BITS)
+
+    def _chunk(self, key: int) -> np.ndarray:
+        """Return the chunk for a key, creating it if needed, and mark it most recently visited"""
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = np.zeros((CHUNK_SIZE, CHUNK_SIZE), dtype=np.int32)
+            self._chunks[key] = chunk
+            self._layout = None
+        elif self._max_chunks is not None:
+            self._chunks.move_to_end(key)
+        return chunk
+
+    def _trim(self) -> int:
+        """Drop the least recently visited chunks beyond max_chunks and return how many were dropped"""
+        if self._max_chunks is None or len(self._chunks) <= self._max_chunks:
+            return 0
+        dropped = 0
+        while len(self._chunks) > self._max_chunks:
+            _, chunk = self._chunks.popitem(last=False)
+            self._visited -= np.count_nonzero(chunk)
+            dropped += 1
+        self._layout = None
+        return dropped
+
+    def _chunk_layout(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the chunk keys and chunk coordinates as arrays, rebuilt after chunks change"""
+        if self._layout is None:
+            keys = np.fromiter(self._chunks, dtype=np.int64, count=len(self._chunks))
+            chunk_xs = (keys >> 32) - _KEY_OFFSET
+            chunk_ys = (keys & _KEY_MASK) - _KEY_OFFSET
+            self._layout = (keys, chunk_xs, chunk_ys)
+        return self._layout
+
+    def _ranked(self, x: int, y: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return each chunk's key, a lower bound on the squared distance from
+        (x, y) to any of its cells, and its origin cell.
+        """
+        keys, chunk_xs, chunk_ys = self._chunk_layout()
+        origins_x, origins_y = chunk_xs << _CHUNK_BITS, chunk_ys << _CHUNK_BITS
+        dx = np.maximum(0, np.maximum(origins_x - x, x - (origins_x + _CELL_MASK)))
+        dy = np.maximum(0, np.maximum(origins_y - y, y - (origins_y + _CELL_MASK)))
+        return keys, dx * dx + dy * dy, origins_x, origins_y
+
@@ -0,0 +1,128 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def realm_name(direction: Optional[str]) -> str:
+    """Return the name of the realm exploring in a direction leads to"""
+    if direction:
+        return f"{direction.capitalize()} Realm"
+    return "New Realm"
+
+
+class SymbolTable:
+    """
+    Interns location names to dense integer IDs.
+
+    Each distinct name is stored once and given the next ID; navigators
+    keep IDs in their per-step state and resolve names only when they are
+    asked for one. The realm each exploration direction leads to is
+    memoized, so exploring in a known direction builds no string at all.
+    A table can be shared by any number of navigators, and IDs are never
+    reused or removed.
+
+    A table only grows: every distinct location name stays interned for the
+    table's lifetime. Directions are memoized by the spelling the caller
+    passed, so a known spelling costs one dict lookup; a new spelling is
+    capitalized once, so "north" and "NORTH" lead to the same realm, but
+    each spelling adds a memo entry and each new direction adds a name. Give navigators that explore caller-supplied directions
+    their own table so those names are freed with it.
+
+    Lookups are lock-free; adding a name takes a lock so that threads
+    sharing a table never give one name two IDs.
+
+    Attributes:
+        _names (list): ID to location name
+        _ids (dict): Location name to ID
+        _realms (dict): Direction as passed, and its capitalized form (None for no
+            direction), to the ID of its realm
+        _lock (threading.Lock): Serializes additions
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._realms: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+        for name in names:
+            self.intern(name)
+
+    def __len__(self) -> int:
+        """Return the number of interned names"""
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def intern(self, name: str) -> int:
+        """
+        Get the ID of a location name, adding the name if it is new.
+
+        Args:
+            name: The location name
+
+        Returns:
+            The name's ID
+        """
+        symbol = self._ids.get(name)
+        if symbol is None:
+            with self._lock:
+                symbol = self._ids.get(name)
+                if symbol is None:
+                    symbol = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = symbol
+        return symbol
+
+    def get(self, name: str) -> Optional[int]:
+        """Return the ID of a location name, or None if it was never interned"""
+        return self._ids.get(name)
+
+    def name(self, symbol: int) -> str:
+        """
+        Resolve an ID to its location name.
+
+        Raises:
+            IndexError: If the ID was not issued by this table
+        """
+        if symbol < 0:
+            raise IndexError("Symbol IDs are non-negative")
+        return self._names[symbol]
+
+    def names(self, symbols: Iterable[int]) -> List[str]:
+        """Resolve several IDs to their location names"""
+        names = self._names
+        return [names[symbol] for symbol in symbols]
+
+    def realm(self, direction: Optional[str] = None) -> int:
+        """
+        Get the ID of the realm exploring in a direction leads to.
+
+        Args:
+            direction: The direction for exploration; None or "" for no direction
+
+        Returns:
+            The realm's ID
+
+        Raises:
+            ValueError: If direction is not a string or None
+        """
+        if direction is not None and not isinstance(direction, str):
+            raise ValueError("Direction must be a string or None")
+        symbol = self._realms.get(direction)
+        if symbol is None:
+            key = direction.capitalize() if direction else None
+            symbol = self._realms.get(key)
+            if symbol is None:
+                symbol = self._realms[key] = self.intern(realm_name(key))
+            self._realms[direction] = symbol
+        return symbol
+
+    def __repr__(self) -> str:
+        return f"SymbolTable(names={len(self._names)}, realms={len(self._realms)})"
+
+
+# Table used by every Navigator not given its own; it is never cleared
+SHARED_SYMBOLS = SymbolTable()
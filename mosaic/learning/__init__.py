@@ -1,4 +1,8 @@
 from .memory_store import MemoryStore, MemoryError
+from .concurrent_store import ConcurrentMemoryStore
+from .sharded_store import ShardedMemoryStore
 from .memory_operation import MemoryOperations
+from .snapshot import MemorySnapshot
+from .wal import WriteAheadLog
 
-__all__ = ['MemoryStore', 'MemoryError', 'MemoryOperation', 'logger']
\ No newline at end of file
+__all__ = ['MemoryStore', 'MemoryError', 'ConcurrentMemoryStore', 'ShardedMemoryStore', 'MemorySnapshot', 'WriteAheadLog', 'MemoryOperation', 'logger']
\ No newline at end of file
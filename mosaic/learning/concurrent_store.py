@@ -0,0 +1,370 @@
+import logging
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional
+
+from .errors import MemoryError
+
+logger = logging.getLogger(__name__)
+
+# Slots per chunk of the append log
+CHUNK_SIZE = 1024
+
+
+class _Slot:
+    """A stored entry and the epoch at which it was removed, if any"""
+    __slots__ = ('entry', 'removed_at')
+
+    def __init__(self, entry: dict):
+        self.entry = entry
+        self.removed_at: Optional[int] = None
+
+
+class StoreSnapshot:
+    """
+    A point-in-time view of a ConcurrentMemoryStore.
+
+    Taking a snapshot captures a few integers and a reference to the chunk
+    list; iteration runs without any lock and ignores stores, removals and
+    evictions that happen after the snapshot was taken.
+    """
+    __slots__ = ('_chunks', '_base', '_head', '_tail', '_epoch', '_generation')
+
+    def __init__(self, chunks: List[List[_Slot]], base: int, head: int, tail: int, epoch: int,
+                 generation: int = 0):
+        self._chunks = chunks
+        self._base = base
+        self._head = head
+        self._tail = tail
+        self._epoch = epoch
+        self._generation = generation
+
+    def slots(self) -> Iterator[_Slot]:
+        """Iterate over the slots live at the snapshot epoch, oldest first"""
+        epoch = self._epoch
+        start = self._head - self._base
+        end = self._tail - self._base
+        for number in range(start // CHUNK_SIZE, (end + CHUNK_SIZE - 1) // CHUNK_SIZE):
+            offset = number * CHUNK_SIZE
+            for slot in islice(self._chunks[number], max(start - offset, 0), end - offset):
+                removed_at = slot.removed_at
+                if removed_at is None or removed_at > epoch:
+                    yield slot
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate over the entries live at the snapshot epoch, oldest first"""
+        return (slot.entry for slot in self.slots())
+
+
+class ConcurrentMemoryStore:
+    """
+    A thread-safe MemoryStore variant for many concurrent writers and readers.
+
+    Entries live in an append-only log of fixed-size chunks. Writers hold a
+    single lock only for bookkeeping: placing a slot and advancing the
+    eviction head, stamping the removal epoch of each slot a removal matched,
+    or swapping in another chunk list. Entry construction, logging and the
+    scans behind retrieval and removal run outside the lock. Readers never
+    lock while iterating: they take a snapshot of the log bounds and the
+    current epoch and skip slots removed after it (multi-version
+    visibility), so results are consistent without copying the store.
+
+    Nothing under the lock walks the whole store. Clearing swaps in an empty
+    log and starts a new generation, which makes removals matched before the
+    clear no-ops instead of stamping every slot. Compaction copies the live
+    slots of a snapshot into a new chunk list without the lock and then, under
+    it, only appends the slots stored in the meantime before swapping the
+    new list in.
+
+    Attributes:
+        _chunks (List[List[_Slot]]): Append-only chunks of slots
+        _base (int): Log position of the first slot in _chunks
+        _head (int): Log position of the oldest slot that may still be live
+        _tail (int): Log position of the next slot
+        _live (int): Number of live entries
+        _epoch (int): Mutation counter used for snapshot visibility
+        _generation (int): Number of times the store was cleared
+        _compacting (bool): Whether a thread is building a compacted log
+        _lock (threading.Lock): Guards the bookkeeping above
+        _max_size (int): Maximum number of discoveries to store
+    """
+
+    def __init__(self, max_size: int = 1000):
+        """
+        Initialize the ConcurrentMemoryStore with a maximum capacity.
+
+        Args:
+            max_size: Maximum number of discoveries to store
+
+        Raises:
+            ValueError: If max_size is not a positive integer
+        """
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+
+        self._chunks: List[List[_Slot]] = []
+        self._base = 0
+        self._head = 0
+        self._tail = 0
+        self._live = 0
+        self._epoch = 0
+        self._generation = 0
+        self._compacting = False
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        logger.info(f"ConcurrentMemoryStore initialized with capacity {max_size}")
+
+    def __len__(self) -> int:
+        """Return the number of live entries"""
+        return self._live
+
+    def snapshot(self) -> StoreSnapshot:
+        """
+        Capture a consistent point-in-time view of the store.
+
+        Returns:
+            A snapshot that can be iterated without locking
+        """
+        with self._lock:
+            return StoreSnapshot(self._chunks, self._base, self._head, self._tail, self._epoch,
+                                 self._generation)
+
+    def store_discovery(self, discovery: Any, metadata: Optional[dict] = None) -> None:
+        """
+        Store a new discovery with optional metadata.
+
+        Args:
+            discovery: The discovery to store (any type)
+            metadata: Optional metadata about the discovery
+
+        Raises:
+            MemoryError: If storage fails
+        """
+        try:
+            slot = _Slot({
+                'timestamp': datetime.now().isoformat(),
+                'discovery': discovery,
+                'metadata': metadata or {}
+            })
+
+            with self._lock:
+                evicted = self._evict_oldest() if self._live >= self._max_size else None
+                position = self._tail - self._base
+                if position % CHUNK_SIZE == 0:
+                    self._chunks.append([])
+                self._chunks[position // CHUNK_SIZE].append(slot)
+                self._tail += 1
+                self._live += 1
+                self._epoch += 1
+
+            if evicted is not None:
+                logger.warning(
+                    f"Memory capacity reached, removed oldest entry: "
+                    f"{self._truncate_repr(evicted['discovery'])}"
+                )
+            logger.info(f"Stored discovery: {self._truncate_repr(discovery)}")
+
+        except Exception as e:
+            logger.error(f"Failed to store discovery: {str(e)}")
+            raise MemoryError(f"Storage failed: {str(e)}") from e
+
+    def retrieve_memory(self, filter_func: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """
+        Retrieve stored discoveries from a consistent snapshot, optionally filtered.
+
+        Args:
+            filter_func: Optional function to filter discoveries
+
+        Returns:
+            List of discovery entries with metadata
+
+        Raises:
+            MemoryError: If retrieval fails
+        """
+        try:
+            if filter_func:
+                if not callable(filter_func):
+                    raise ValueError("filter_func must be callable")
+                return [entry for entry in self.snapshot() if filter_func(entry)]
+            return list(self.snapshot())
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve memory: {str(e)}")
+            raise MemoryError(f"Retrieval failed: {str(e)}") from e
+
+    def find(self, **criteria: Any) -> List[dict]:
+        """
+        Retrieve discoveries whose metadata equals all of the given values.
+
+        Args:
+            **criteria: Metadata key-value pairs to match
+
+        Returns:
+            List of matching discovery entries, oldest first
+
+        Raises:
+            MemoryError: If the query fails
+        """
+        return self.retrieve_memory(
+            lambda entry: all(
+                key in entry['metadata'] and entry['metadata'][key] == value
+                for key, value in criteria.items()
+            )
+        )
+
+    def remove_discovery(
+        self,
+        discovery: Optional[str] = None,
+        metadata_key: Optional[str] = None,
+        metadata_value: Optional[Any] = None
+    ) -> None:
+        """
+        Remove discoveries based on specific criteria.
+
+        Matches are found by scanning a snapshot without the lock; they are
+        then removed under the lock unless another thread removed them first
+        or the store was cleared since.
+
+        Args:
+            discovery: The value of the discovery to remove.
+            metadata_key: The metadata key to match.
+            metadata_value: The metadata value to match.
+
+        Raises:
+            ValueError: If no valid criteria are provided.
+            MemoryError: If removal fails.
+        """
+        try:
+            if not discovery and not (metadata_key and metadata_value):
+                raise ValueError("Must provide either discovery or metadata key-value pair")
+
+            snapshot = self.snapshot()
+            matches = [
+                slot for slot in snapshot.slots()
+                if (discovery and slot.entry["discovery"] == discovery) or (
+                    metadata_key and metadata_value
+                    and slot.entry["metadata"].get(metadata_key) == metadata_value
+                )
+            ]
+
+            removed = []
+            with self._lock:
+                if snapshot._generation != self._generation:
+                    # Everything the snapshot held was cleared
+                    matches = []
+                epoch = self._epoch + 1
+                for slot in matches:
+                    if slot.removed_at is None:
+                        slot.removed_at = epoch
+                        self._live -= 1
+                        removed.append(slot.entry)
+                self._epoch = epoch
+                compact = self._compaction_due()
+
+            if compact:
+                self._compact()
+            for entry in removed:
+                logger.info(f"Removed discovery: {self._truncate_repr(entry['discovery'])}")
+
+        except Exception as e:
+            logger.error(f"Failed to remove discovery: {str(e)}")
+            raise MemoryError(f"Removal failed: {str(e)}") from e
+
+    def clear_memory(self) -> None:
+        """
+        Clear all stored discoveries.
+
+        The old log is swapped for an empty one in O(1); snapshots taken
+        before the clear keep seeing it.
+        """
+        with self._lock:
+            old_chunks = self._chunks
+            self._chunks = []
+            self._base = self._head = self._tail = 0
+            self._live = 0
+            self._epoch += 1
+            self._generation += 1
+        # Free the old log, unless a snapshot still holds it, without the lock
+        del old_chunks
+        logger.info("Memory store cleared")
+
+    def _evict_oldest(self) -> dict:
+        """Mark the oldest live slot removed; the lock must be held"""
+        while True:
+            position = self._head - self._base
+            slot = self._chunks[position // CHUNK_SIZE][position % CHUNK_SIZE]
+            self._head += 1
+            if slot.removed_at is None:
+                break
+        slot.removed_at = self._epoch + 1
+        self._live -= 1
+
+        # Release chunks the head has moved past; snapshots keep their own reference
+        dead_chunks = (self._head - self._base) // CHUNK_SIZE
+        if dead_chunks >= 16:
+            self._chunks = self._chunks[dead_chunks:]
+            self._base += dead_chunks * CHUNK_SIZE
+        return slot.entry
+
+    def _compaction_due(self) -> bool:
+        """
+        Check whether removed slots dominate the log and claim the compaction if so.
+
+        The lock must be held; a True result must be followed by _compact().
+        """
+        span = self._tail - self._head
+        if self._compacting or span <= CHUNK_SIZE or self._live * 2 > span:
+            return False
+        self._compacting = True
+        return True
+
+    def _compact(self) -> None:
+        """
+        Rewrite the log without removed slots.
+
+        The live slots of a snapshot are copied without the lock. Under the
+        lock, the slots stored since are appended and the new chunk list
+        replaces the old one. Slots removed or evicted in the meantime keep
+        their removal stamp, so they stay hidden and the eviction head can
+        restart at the front. A clear in the meantime abandons the copy.
+        """
+        try:
+            snapshot = self.snapshot()
+            chunks: List[List[_Slot]] = []
+            size = 0
+            for slot in snapshot.slots():
+                if size % CHUNK_SIZE == 0:
+                    chunks.append([])
+                chunks[-1].append(slot)
+                size += 1
+
+            with self._lock:
+                if snapshot._generation != self._generation:
+                    return
+                # Slots before the eviction head are all removed already
+                start = max(snapshot._tail, self._head)
+                newer = StoreSnapshot(self._chunks, self._base, start, self._tail, self._epoch)
+                for slot in newer.slots():
+                    if size % CHUNK_SIZE == 0:
+                        chunks.append([])
+                    chunks[-1].append(slot)
+                    size += 1
+                self._chunks = chunks
+                self._base = self._head = 0
+                self._tail = size
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def _truncate_repr(self, obj: Any, max_len: int = 100) -> str:
+        """Create truncated string representation of an object"""
+        s = str(obj)
+        return s[:max_len] + ('...' if len(s) > max_len else '')
+
+    def __repr__(self) -> str:
+        """Official string representation of the ConcurrentMemoryStore"""
+        oldest = next(iter(self.snapshot()), None)
+        return (f"ConcurrentMemoryStore(size={self._live}/"
+                f"{self._max_size}, "
+                f"oldest={oldest['timestamp'] if oldest else 'None'})")
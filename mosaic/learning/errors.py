@@ -0,0 +1,3 @@
+class MemoryError(Exception):
+    """Custom exception for memory-related errors"""
+    pass
@@ -0,0 +1,220 @@
+import heapq
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class EvictionPolicy:
+    """
+    Chooses which entry a MemoryStore evicts when it is full.
+
+    The store reports every insertion, read and removal by sequence number;
+    the policy keeps whatever bookkeeping it needs to name a victim in O(1).
+    Subclass this to plug in a custom policy.
+    """
+
+    #: Whether the store should report reads via touch()
+    tracks_access = False
+
+    def add(self, seq: int) -> None:
+        """Record a newly stored entry"""
+        raise NotImplementedError
+
+    def touch(self, seq: int) -> None:
+        """Record a read of an entry"""
+
+    def remove(self, seq: int) -> None:
+        """Forget an entry that was removed, evicted or expired"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Forget all entries"""
+        raise NotImplementedError
+
+    def victim(self) -> Optional[int]:
+        """Return the sequence number to evict next, or None if empty"""
+        raise NotImplementedError
+
+
+class FIFOPolicy(EvictionPolicy):
+    """Evict the oldest stored entry"""
+
+    def __init__(self):
+        self._seqs: 'OrderedDict[int, None]' = OrderedDict()
+
+    def add(self, seq: int) -> None:
+        self._seqs[seq] = None
+
+    def remove(self, seq: int) -> None:
+        self._seqs.pop(seq, None)
+
+    def clear(self) -> None:
+        self._seqs.clear()
+
+    def victim(self) -> Optional[int]:
+        return next(iter(self._seqs), None)
+
+
+class LRUPolicy(FIFOPolicy):
+    """Evict the entry least recently stored or returned by a read"""
+
+    tracks_access = True
+
+    def touch(self, seq: int) -> None:
+        if seq in self._seqs:
+            self._seqs.move_to_end(seq)
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Evict the entry read least often, oldest first among ties.
+
+    Entries are grouped in insertion-ordered buckets by read count, so
+    reads, removals and victim selection are all O(1).
+    """
+
+    tracks_access = True
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._buckets: Dict[int, 'OrderedDict[int, None]'] = {}
+        self._min_count = 0
+
+    def add(self, seq: int) -> None:
+        self._counts[seq] = 0
+        self._buckets.setdefault(0, OrderedDict())[seq] = None
+        self._min_count = 0
+
+    def touch(self, seq: int) -> None:
+        count = self._counts.get(seq)
+        if count is None:
+            return
+        self._unlink(seq, count)
+        self._counts[seq] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[seq] = None
+        if self._min_count not in self._buckets:
+            self._min_count = count + 1
+
+    def remove(self, seq: int) -> None:
+        count = self._counts.pop(seq, None)
+        if count is not None:
+            self._unlink(seq, count)
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+    def victim(self) -> Optional[int]:
+        if not self._counts:
+            return None
+        if self._min_count not in self._buckets:
+            # Only reached after a removal emptied the lowest bucket
+            self._min_count = min(self._buckets)
+        return next(iter(self._buckets[self._min_count]))
+
+    def _unlink(self, seq: int, count: int) -> None:
+        """Take an entry out of its read-count bucket"""
+        bucket = self._buckets[count]
+        del bucket[seq]
+        if not bucket:
+            del self._buckets[count]
+
+
+POLICIES = {'fifo': FIFOPolicy, 'lru': LRUPolicy, 'lfu': LFUPolicy}
+
+
+def make_policy(policy: Union[str, EvictionPolicy]) -> EvictionPolicy:
+    """
+    Resolve an eviction policy name or instance.
+
+    Args:
+        policy: 'fifo', 'lru', 'lfu' or an EvictionPolicy instance
+
+    Returns:
+        The policy instance
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f"eviction must be one of {tuple(POLICIES)} or an EvictionPolicy")
+    return POLICIES[policy]()
+
+
+class ExpiryQueue:
+    """
+    Deadlines of entries stored with a time to live.
+
+    Deadlines sit in a min-heap, so finding what has expired only looks at
+    the top of the heap. Removing an entry leaves its heap item behind; stale
+    items are skipped when popped and dropped in bulk once they outnumber
+    the live deadlines.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        self._deadlines: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        """Return the number of entries with a deadline"""
+        return len(self._deadlines)
+
+    def add(self, seq: int, ttl: float) -> None:
+        """Expire an entry ttl seconds from now"""
+        deadline = time.monotonic() + ttl
+        self._deadlines[seq] = deadline
+        heapq.heappush(self._heap, (deadline, seq))
+
+    def remove(self, seq: int) -> None:
+        """Forget the deadline of an entry, if any"""
+        if self._deadlines.pop(seq, None) is not None and len(self._heap) > 2 * len(self._deadlines) + 32:
+            self._heap = [(deadline, seq) for seq, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def clear(self) -> None:
+        """Forget all deadlines"""
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def expired(self) -> List[int]:
+        """Pop and return the entries whose deadline has passed"""
+        now = time.monotonic()
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, seq = heapq.heappop(self._heap)
+            if self._deadlines.get(seq) == deadline:
+                del self._deadlines[seq]
+                expired.append(seq)
+        return expired
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estimate the memory held by a discovery or metadata value in bytes.
+
+    Containers and the attributes of __slots__ objects are walked
+    recursively; objects shared between entries are counted for each entry
+    that holds them.
+
+    Args:
+        obj: The value to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key) + estimate_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in obj)
+    else:
+        for cls in type(obj).__mro__:
+            slots = getattr(cls, '__slots__', ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name != '__weakref__' and hasattr(obj, name):
+                    size += estimate_size(getattr(obj, name))
+    return size
@@ -1,8 +1,21 @@
 import logging
-from typing import Any, List, Optional
-from datetime import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import json  # Added for JSON serialization/deserialization
 
+from .errors import MemoryError
+from .eviction import EvictionPolicy, ExpiryQueue, estimate_size, make_policy
+from .record import Record, datetime_micros, now_micros
+from .serialization import read_entries, write_entries
+from .snapshot import NO_TIMESTAMP, MemorySnapshot, write_snapshot
+from .text_index import InvertedIndex, query_terms
+from .time_index import TimeIndex
+from .vector_index import VectorIndex
+from .wal import OP_CLEAR, OP_REMOVE, OP_STORE, WriteAheadLog
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -10,10 +23,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-
-class MemoryError(Exception):
-    """Custom exception for memory-related errors"""
-    pass
+# Entries decoded per batch when importing
+_IMPORT_BATCH_SIZE = 4096
 
 
 class MemoryStore:
@@ -21,55 +32,220 @@ class MemoryStore:
     A class to manage storage and retrieval of discoveries in the simulation.
     
     Attributes:
-        _memory (List[dict]): List of stored discoveries with metadata
+        _memory (Dict[int, Record]): Stored discoveries with metadata, keyed by
+            sequence number in insertion order. Records are converted to the
+            public entry dict only when returned.
+        _seqs (array): Ascending sequence numbers for cursor iteration. Removed
+            entries leave stale numbers behind until they are skipped or compacted.
         _max_size (int): Maximum number of discoveries to store
+        _max_bytes (Optional[int]): Budget for the estimated size of all entries
+        _policy (EvictionPolicy): Chooses the entry evicted when the store is full
+        _expiry (ExpiryQueue): Deadlines of entries stored with a time to live
+        _sizes (Dict[int, int]): Estimated size of each entry in byte-budget mode
+        _bytes (int): Estimated size of all entries in byte-budget mode
+        _indexes (Dict[str, Dict[Any, Dict[int, None]]]): Hash indexes mapping
+            an indexed metadata key to its values and the sequence numbers
+            of the entries holding them
+        _text_index (Optional[InvertedIndex]): Full-text index over discovery text
+            and string metadata values, built on the first search
+        _wal (Optional[WriteAheadLog]): Log that mutations are appended to in durable mode
+        _vectors (Optional[VectorIndex]): Embeddings of discoveries stored with one
+        _times (TimeIndex): Sequence numbers ordered by timestamp for range queries
     """
     
-    def __init__(self, max_size: int = 1000):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        indexed_keys: Optional[Iterable[str]] = None,
+        wal: Optional[WriteAheadLog] = None,
+        embedding_dim: Optional[int] = None,
+        eviction: Union[str, EvictionPolicy] = 'fifo',
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None
+    ):
         """
         Initialize the MemoryStore with a maximum capacity.
         
         Args:
             max_size: Maximum number of discoveries to store
+            indexed_keys: Optional metadata keys to maintain hash indexes for
+            wal: Optional write-ahead log for durable mode. Its snapshot and log
+                 are replayed on open, and every store, removal, eviction and
+                 clear is appended to it afterwards.
+            embedding_dim: Optional embedding dimension. When set, discoveries
+                           can be stored with an embedding and recalled by
+                           similarity. Embeddings are held in memory only and
+                           are not exported, snapshotted or logged.
+            eviction: 'fifo', 'lru', 'lfu' or an EvictionPolicy instance. LRU and
+                      LFU count entries returned by retrieve_memory, find and
+                      the search methods as reads.
+            max_bytes: Optional budget for the estimated in-memory size of all
+                       discoveries and metadata; entries are evicted until a new
+                       one fits. max_size still applies.
+            default_ttl: Optional time to live in seconds for entries stored
+                         without their own. Deadlines are not persisted.
             
         Raises:
-            ValueError: If max_size is not a positive integer
+            ValueError: If max_size, max_bytes, default_ttl or eviction is invalid
+            MemoryError: If recovering from the write-ahead log fails
         """
         if not isinstance(max_size, int) or max_size <= 0:
             raise ValueError("max_size must be a positive integer")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+            raise ValueError("max_bytes must be a positive integer")
+        if default_ttl is not None:
+            self._check_ttl(default_ttl)
             
-        self._memory = []
+        self._memory: Dict[int, Record] = {}
+        self._seqs = array('q')
+        self._next_seq = 0
         self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._policy = make_policy(eviction)
+        self._expiry = ExpiryQueue()
+        self._sizes: Dict[int, int] = {}
+        self._bytes = 0
+        self._indexes: Dict[str, Dict[Any, Dict[int, None]]] = {}
+        self._text_index: Optional[InvertedIndex] = None
+        self._wal: Optional[WriteAheadLog] = None
+        self._vectors: Optional[VectorIndex] = None
+        self._times = TimeIndex()
+        if embedding_dim is not None:
+            self._vectors = VectorIndex(embedding_dim, max_rows=max_size)
+        for key in indexed_keys or ():
+            self.create_index(key)
+        if wal is not None:
+            self._recover(wal)
         logger.info(f"MemoryStore initialized with capacity {max_size}")
 
-    def store_discovery(self, discovery: Any, metadata: Optional[dict] = None) -> None:
+    def _recover(self, wal: WriteAheadLog) -> None:
+        """Rebuild the store from a write-ahead log, then start logging to it"""
+        try:
+            if wal.has_snapshot():
+                with MemorySnapshot(wal.snapshot_path()) as snapshot:
+                    for number, entry in enumerate(snapshot):
+                        self._insert(snapshot.sequence_number(number), entry)
+
+            replayed = 0
+            for op, seq, entry in wal.replay():
+                if op == OP_STORE:
+                    self._insert(seq, entry)
+                elif op == OP_REMOVE:
+                    if seq in self._memory:
+                        self._discard(seq)
+                elif op == OP_CLEAR:
+                    self.clear_memory()
+                replayed += 1
+
+            self._wal = wal
+            while self._memory and self._over_capacity(incoming=0):
+                self._handle_capacity_limit()
+            logger.info(f"Recovered {len(self._memory)} discoveries "
+                        f"({replayed} log records) from {wal.directory}")
+        except Exception as e:
+            logger.error(f"Failed to recover memory: {str(e)}")
+            raise MemoryError(f"Recovery failed: {str(e)}") from e
+
+    def create_index(self, metadata_key: str) -> None:
+        """
+        Maintain a hash index on a metadata key.
+        
+        Existing entries are indexed immediately. Entries whose value for the
+        key is unhashable are left out of the index.
+        
+        Args:
+            metadata_key: The metadata key to index
+            
+        Raises:
+            ValueError: If metadata_key is not a non-empty string
+        """
+        if not metadata_key or not isinstance(metadata_key, str):
+            raise ValueError("metadata_key must be a non-empty string")
+        if metadata_key in self._indexes:
+            return
+
+        self._indexes[metadata_key] = {}
+        for seq, entry in self._memory.items():
+            self._index_value(metadata_key, seq, entry)
+        logger.info(f"Created index on metadata key '{metadata_key}'")
+
+    def store_discovery(
+        self,
+        discovery: Any,
+        metadata: Optional[dict] = None,
+        embedding: Optional[Any] = None,
+        ttl: Optional[float] = None
+    ) -> None:
         """
         Store a new discovery with optional metadata.
         
         Args:
             discovery: The discovery to store (any type)
             metadata: Optional metadata about the discovery
+            embedding: Optional vector of length embedding_dim for similarity search
+            ttl: Optional seconds after which the discovery expires (default: default_ttl)
             
         Raises:
             MemoryError: If storage fails or capacity is reached
         """
         try:
-            if len(self._memory) >= self._max_size:
-                self._handle_capacity_limit()
-                
-            entry = {
-                'timestamp': datetime.now().isoformat(),
-                'discovery': discovery,
-                'metadata': metadata or {}
-            }
-            
-            self._memory.append(entry)
+            self._append_entry(Record(now_micros(), discovery, metadata), embedding, ttl)
             logger.info(f"Stored discovery: {self._truncate_repr(discovery)}")
             
         except Exception as e:
             logger.error(f"Failed to store discovery: {str(e)}")
             raise MemoryError(f"Storage failed: {str(e)}") from e
 
+    def store_discoveries(
+        self,
+        discoveries: Iterable[Any],
+        metadata: Optional[Iterable[Optional[dict]]] = None,
+        ttl: Optional[float] = None
+    ) -> int:
+        """
+        Store a batch of discoveries in one pass.
+        
+        The whole batch is validated before anything is stored, shares one
+        timestamp, makes room with a single round of eviction and is logged
+        once. Discoveries that the batch itself would push out of the store
+        are skipped rather than stored and evicted.
+        
+        Args:
+            discoveries: The discoveries to store, oldest first
+            metadata: Optional metadata for each discovery, in the same order
+            ttl: Optional seconds after which the discoveries expire (default: default_ttl)
+            
+        Returns:
+            Number of discoveries stored
+            
+        Raises:
+            MemoryError: If validation or storage fails
+        """
+        try:
+            discoveries = list(discoveries)
+            if metadata is None:
+                metadata = [None] * len(discoveries)
+            else:
+                metadata = list(metadata)
+                if len(metadata) != len(discoveries):
+                    raise ValueError("metadata must have one item per discovery")
+            for item in metadata:
+                if item is not None and not isinstance(item, dict):
+                    raise ValueError("metadata items must be dicts or None")
+
+            micros = now_micros()
+            count = self._append_entries(
+                [Record(micros, discovery, item) for discovery, item in zip(discoveries, metadata)],
+                ttl
+            )
+            logger.info(f"Stored {count} discoveries")
+            return count
+            
+        except Exception as e:
+            logger.error(f"Failed to store discoveries: {str(e)}")
+            raise MemoryError(f"Batch storage failed: {str(e)}") from e
+
     def retrieve_memory(self, filter_func: Optional[callable] = None) -> List[dict]:
         """
         Retrieve stored discoveries, optionally filtered.
@@ -84,33 +260,659 @@ class MemoryStore:
             MemoryError: If retrieval fails
         """
         try:
+            if filter_func and not callable(filter_func):
+                raise ValueError("filter_func must be callable")
+            self._expire()
+            if self._policy.tracks_access:
+                return self._touched(
+                    seq for seq, entry in self._memory.items()
+                    if not filter_func or filter_func(entry)
+                )
             if filter_func:
-                if not callable(filter_func):
-                    raise ValueError("filter_func must be callable")
-                return [entry for entry in self._memory if filter_func(entry)]
+                return [entry.to_dict() for entry in self._memory.values() if filter_func(entry)]
                 
-            return self._memory.copy()
+            return [entry.to_dict() for entry in self._memory.values()]
             
         except Exception as e:
             logger.error(f"Failed to retrieve memory: {str(e)}")
             raise MemoryError(f"Retrieval failed: {str(e)}") from e
 
+    def iter_memory(
+        self,
+        filter_func: Optional[callable] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False
+    ) -> Iterator[dict]:
+        """
+        Lazily iterate over stored discoveries without copying the store.
+        
+        Entries are produced one at a time, so stopping early costs only the
+        entries consumed. Iteration is safe while the store changes: it covers
+        the entries present when it started, skips any removed or evicted
+        since, and never includes entries stored afterwards.
+        
+        Args:
+            filter_func: Optional function to filter discoveries
+            limit: Optional maximum number of entries to yield
+            reverse: If True, iterate newest first
+            
+        Returns:
+            Iterator over discovery entries
+            
+        Raises:
+            MemoryError: If the arguments are invalid
+        """
+        try:
+            self._check_iteration(filter_func, limit)
+            self._expire()
+        except Exception as e:
+            logger.error(f"Failed to iterate memory: {str(e)}")
+            raise MemoryError(f"Iteration failed: {str(e)}") from e
+        seqs = self._filtered(self._scan(reverse), filter_func)
+        return self._iter_seqs(seqs if limit is None else islice(seqs, limit))
+
+    def page_memory(
+        self,
+        page_size: int = 100,
+        page_token: Optional[str] = None,
+        filter_func: Optional[callable] = None,
+        reverse: bool = False
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Retrieve one page of discoveries and a token for the next page.
+        
+        Tokens name the last entry of a page, so paging is stable across
+        stores and evictions: later pages neither repeat nor skip entries that
+        are still stored. Paging forward also reaches entries stored after the
+        first page was fetched.
+        
+        Args:
+            page_size: Maximum number of entries per page
+            page_token: Token returned with the previous page, or None for the first page
+            filter_func: Optional function to filter discoveries; pass the same one for every page
+            reverse: If True, page newest first; must match the token's direction
+            
+        Returns:
+            The page of discovery entries and the token for the next page,
+            or None if there are no more entries
+            
+        Raises:
+            MemoryError: If the arguments or the token are invalid
+        """
+        try:
+            self._check_iteration(filter_func, page_size)
+            after = None
+            if page_token is not None:
+                direction, _, seq = str(page_token).partition(':')
+                if direction != ('r' if reverse else 'f') or not seq.isdigit():
+                    raise ValueError(f"invalid page token {page_token!r}")
+                after = int(seq)
+            self._expire()
+
+            seqs = list(islice(self._filtered(self._scan(reverse, after), filter_func), page_size + 1))
+            token = None
+            if len(seqs) > page_size:
+                seqs.pop()
+                token = f"{'r' if reverse else 'f'}:{seqs[-1]}"
+            return list(self._iter_seqs(seqs)), token
+            
+        except Exception as e:
+            logger.error(f"Failed to page memory: {str(e)}")
+            raise MemoryError(f"Paging failed: {str(e)}") from e
+
+    @staticmethod
+    def _check_iteration(filter_func: Optional[callable], limit: Optional[int]) -> None:
+        """Validate the filter and limit of an iteration"""
+        if filter_func is not None and not callable(filter_func):
+            raise ValueError("filter_func must be callable")
+        if limit is not None and (not isinstance(limit, int) or limit <= 0):
+            raise ValueError("limit must be a positive integer")
+
+    def _scan(self, reverse: bool = False, after: Optional[int] = None) -> Iterator[int]:
+        """
+        Lazily yield live sequence numbers in insertion order, starting past a cursor.
+        
+        The array and the scan's bounds are captured when this is called, not
+        at the first next(), so entries stored in between are never included.
+        Compaction replaces the array rather than modifying it, so the scan is
+        unaffected by concurrent changes.
+        """
+        seqs = self._seqs
+        if reverse:
+            return self._scan_backward(seqs, len(seqs) if after is None else bisect_left(seqs, after))
+        return self._scan_forward(seqs, 0 if after is None else bisect_right(seqs, after), self._next_seq)
+
+    def _scan_forward(self, seqs: array, position: int, stop: int) -> Iterator[int]:
+        """Yield live sequence numbers from a position of seqs, ending before seq stop"""
+        while position < len(seqs):
+            seq = seqs[position]
+            if seq >= stop:
+                break
+            if seq in self._memory:
+                yield seq
+            position += 1
+
+    def _scan_backward(self, seqs: array, position: int) -> Iterator[int]:
+        """Yield live sequence numbers of seqs newest first, from just before a position"""
+        while position > 0:
+            position -= 1
+            seq = seqs[position]
+            if seq in self._memory:
+                yield seq
+
+    def _filtered(self, seqs: Iterator[int], filter_func: Optional[callable]) -> Iterator[int]:
+        """Lazily keep the sequence numbers whose entries pass a filter"""
+        if filter_func is None:
+            return seqs
+        return (seq for seq in seqs if seq in self._memory and filter_func(self._memory[seq]))
+
+    def find(self, **criteria: Any) -> List[dict]:
+        """
+        Retrieve discoveries whose metadata equals all of the given values.
+        
+        Criteria on indexed keys are answered from the hash index, starting
+        with the smallest matching bucket; only those candidates are checked
+        against the remaining criteria.
+        
+        Args:
+            **criteria: Metadata key-value pairs to match
+            
+        Returns:
+            List of matching discovery entries, oldest first
+            
+        Raises:
+            MemoryError: If the query fails
+        """
+        try:
+            self._expire()
+            if not criteria:
+                return self.retrieve_memory()
+
+            buckets = [
+                bucket for bucket in (
+                    self._lookup(key, value) for key, value in criteria.items()
+                )
+                if bucket is not None
+            ]
+            if buckets:
+                candidates = ((seq, self._memory[seq]) for seq in min(buckets, key=len))
+            else:
+                candidates = iter(self._memory.items())
+
+            matches = [
+                (seq, entry) for seq, entry in candidates
+                if all(
+                    key in entry.metadata and entry.metadata[key] == value
+                    for key, value in criteria.items()
+                )
+            ]
+            if self._policy.tracks_access:
+                return self._touched(seq for seq, _ in matches)
+            return [entry.to_dict() for _, entry in matches]
+
+        except Exception as e:
+            logger.error(f"Failed to find discoveries: {str(e)}")
+            raise MemoryError(f"Find failed: {str(e)}") from e
+
+    def search_knowledge(self, query: str, match_all: bool = True, limit: int = 10) -> List[dict]:
+        """
+        Search discoveries and string metadata values by keyword.
+        
+        Matching is case-insensitive on whole words; a trailing '*' turns a
+        term into a prefix query (e.g. "quant*"). The full-text index is built
+        on the first call and maintained incrementally afterwards.
+        
+        Args:
+            query: Whitespace-separated search terms
+            match_all: If True, entries must contain every term; otherwise any term
+            limit: Maximum number of results to return
+            
+        Returns:
+            List of discovery entries ranked by relevance, best first
+            
+        Raises:
+            MemoryError: If the search fails
+        """
+        try:
+            results = [entry for _, entry in self._ranked_search(query, match_all, limit)]
+            logger.info(f"Search for '{self._truncate_repr(query)}' matched {len(results)} discoveries")
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to search memory: {str(e)}")
+            raise MemoryError(f"Search failed: {str(e)}") from e
+
+    def _ranked_search(self, query: str, match_all: bool, limit: int) -> List[Tuple[float, dict]]:
+        """Return (score, entry) pairs for a search, best first"""
+        if not isinstance(query, str):
+            raise ValueError("query must be a string")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit must be a positive integer")
+
+        self._expire()
+        if self._text_index is None:
+            self._text_index = InvertedIndex()
+            for seq, entry in self._memory.items():
+                self._text_index.add(seq, self._text_fields(entry))
+
+        ranked = self._text_index.search(query_terms(query), match_all, limit)
+        if self._policy.tracks_access:
+            for _, seq in ranked:
+                self._policy.touch(seq)
+        return [(score, self._memory[seq].to_dict()) for score, seq in ranked]
+
+    def retrieve_range(self, start: Any = None, end: Any = None) -> List[dict]:
+        """
+        Retrieve discoveries stored in a time range, oldest first.
+        
+        The range is found by binary search over a timestamp index rather than
+        a scan. Entries imported with timestamps that are not naive ISO-8601
+        strings are not part of any range.
+        
+        Args:
+            start: Inclusive lower bound as a datetime or ISO-8601 string (default: unbounded)
+            end: Exclusive upper bound as a datetime or ISO-8601 string (default: unbounded)
+            
+        Returns:
+            List of discovery entries with start <= timestamp < end
+            
+        Raises:
+            MemoryError: If the bounds are invalid or retrieval fails
+        """
+        try:
+            lower = self._time_bound(start, -(1 << 63) + 1)
+            upper = self._time_bound(end, (1 << 63) - 1)
+            self._expire()
+            seqs = self._times.range(lower, upper, self._memory.__contains__)
+            if self._policy.tracks_access:
+                return self._touched(seqs)
+            return [self._memory[seq].to_dict() for seq in seqs]
+            
+        except Exception as e:
+            logger.error(f"Failed to retrieve time range: {str(e)}")
+            raise MemoryError(f"Range retrieval failed: {str(e)}") from e
+
+    def iter_since(self, since: Any) -> Iterator[dict]:
+        """
+        Lazily iterate over discoveries stored at or after a point in time, oldest first.
+        
+        Args:
+            since: A datetime, an ISO-8601 string, or a timedelta meaning that
+                   long before now (e.g. timedelta(minutes=5))
+            
+        Returns:
+            Iterator over discovery entries in timestamp order. Entries
+            removed while iterating are skipped.
+            
+        Raises:
+            MemoryError: If the bound is invalid
+        """
+        try:
+            if isinstance(since, timedelta):
+                since = datetime.now() - since
+            lower = self._time_bound(since, None)
+            self._expire()
+        except Exception as e:
+            logger.error(f"Failed to iterate since {since}: {str(e)}")
+            raise MemoryError(f"Range iteration failed: {str(e)}") from e
+        return self._iter_seqs(self._times.range(lower, (1 << 63) - 1, self._memory.__contains__))
+
+    def _iter_seqs(self, seqs: Iterable[int]) -> Iterator[dict]:
+        """Lazily produce the entries for sequence numbers, reporting reads to the policy"""
+        for seq in seqs:
+            if self._policy.tracks_access:
+                self._policy.touch(seq)
+            yield self._memory[seq].to_dict()
+
+    @staticmethod
+    def _time_bound(value: Any, default: Optional[int]) -> int:
+        """Convert a datetime or ISO-8601 bound to microseconds since the epoch"""
+        if value is None and default is not None:
+            return default
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if not isinstance(value, datetime):
+            raise ValueError(f"time bound must be a datetime or ISO-8601 string, got {value!r}")
+        if value.tzinfo is not None:
+            # Stored timestamps are naive local time
+            value = value.astimezone().replace(tzinfo=None)
+        return datetime_micros(value)
+
+    def search_similar(
+        self,
+        embedding: Any,
+        limit: int = 10,
+        metric: str = 'cosine',
+        approximate: bool = False
+    ) -> List[dict]:
+        """
+        Recall the discoveries whose embeddings are most similar to a vector.
+        
+        Args:
+            embedding: Query vector of length embedding_dim
+            limit: Maximum number of results to return
+            metric: 'cosine' or 'dot'
+            approximate: Use the LSH index built by enable_approximate_search
+            
+        Returns:
+            List of discovery entries, most similar first
+            
+        Raises:
+            MemoryError: If the search fails
+        """
+        try:
+            return self._similar([embedding], limit, metric, approximate)[0]
+        except Exception as e:
+            logger.error(f"Failed to search similar discoveries: {str(e)}")
+            raise MemoryError(f"Similarity search failed: {str(e)}") from e
+
+    def search_similar_batch(
+        self,
+        embeddings: Any,
+        limit: int = 10,
+        metric: str = 'cosine',
+        approximate: bool = False
+    ) -> List[List[dict]]:
+        """
+        Run similarity searches for many query vectors in one matrix multiplication.
+        
+        Args:
+            embeddings: Query matrix of shape (m, embedding_dim)
+            limit: Maximum number of results per query
+            metric: 'cosine' or 'dot'
+            approximate: Use the LSH index built by enable_approximate_search
+            
+        Returns:
+            One list of discovery entries per query, most similar first
+            
+        Raises:
+            MemoryError: If the search fails
+        """
+        try:
+            return self._similar(embeddings, limit, metric, approximate)
+        except Exception as e:
+            logger.error(f"Failed to search similar discoveries: {str(e)}")
+            raise MemoryError(f"Similarity search failed: {str(e)}") from e
+
+    def enable_approximate_search(self, num_tables: int = 8, num_bits: int = 12, seed: Optional[int] = None) -> None:
+        """
+        Maintain a random-projection LSH index for approximate similarity search.
+        
+        Args:
+            num_tables: Number of independent hash tables
+            num_bits: Hyperplanes per table
+            seed: Optional seed for the random hyperplanes
+            
+        Raises:
+            MemoryError: If the store has no embeddings or the parameters are invalid
+        """
+        try:
+            if self._vectors is None:
+                raise ValueError("approximate search requires a store created with embedding_dim")
+            self._vectors.enable_lsh(num_tables, num_bits, seed)
+            logger.info(f"Enabled approximate search with {num_tables} tables of {num_bits} bits")
+        except Exception as e:
+            logger.error(f"Failed to enable approximate search: {str(e)}")
+            raise MemoryError(f"Enabling approximate search failed: {str(e)}") from e
+
+    def _similar(self, embeddings: Any, limit: int, metric: str, approximate: bool) -> List[List[dict]]:
+        """Map vector search results back to entries"""
+        if self._vectors is None:
+            raise ValueError("similarity search requires a store created with embedding_dim")
+        self._expire()
+        ranked = self._vectors.search(embeddings, limit, metric, approximate)
+        if self._policy.tracks_access:
+            return [self._touched(seq for _, seq in results) for results in ranked]
+        return [[self._memory[seq].to_dict() for _, seq in results] for results in ranked]
+
     def clear_memory(self) -> None:
         """Clear all stored discoveries"""
+        if self._wal is not None:
+            self._wal.append_clear()
         self._memory.clear()
+        self._policy.clear()
+        self._expiry.clear()
+        self._sizes.clear()
+        self._bytes = 0
+        self._seqs = array('q')
+        self._times.clear()
+        for index in self._indexes.values():
+            index.clear()
+        if self._text_index is not None:
+            self._text_index.clear()
+        if self._vectors is not None:
+            self._vectors.clear()
+        self._maybe_compact()
         logger.info("Memory store cleared")
 
+    def _append_entry(self, entry: Record, embedding: Optional[Any] = None, ttl: Optional[float] = None) -> None:
+        """Append an entry, evicting first until it fits"""
+        if embedding is not None:
+            if self._vectors is None:
+                raise ValueError("embeddings require a store created with embedding_dim")
+            embedding = self._vectors.coerce(embedding)
+        if ttl is not None:
+            self._check_ttl(ttl)
+        size = 0
+        if self._max_bytes is not None:
+            size = estimate_size(entry)
+            if size > self._max_bytes:
+                raise ValueError(f"entry of about {size} bytes exceeds max_bytes={self._max_bytes}")
+        body = None
+        if self._wal is not None:
+            # Encoded before anything is evicted, so an unserializable entry changes nothing
+            body = self._wal.encode_store(entry)
+
+        self._expire()
+        while self._over_capacity(incoming_bytes=size):
+            self._handle_capacity_limit()
+
+        seq = self._next_seq
+        if self._wal is not None:
+            self._wal.append_store(seq, entry, body)
+        if embedding is not None:
+            self._vectors.add(seq, embedding)
+        self._insert(seq, entry, ttl, size)
+        self._maybe_compact()
+
+    def _append_entries(self, entries: List[Any], ttl: Optional[float] = None) -> int:
+        """Append a batch of records or entry dicts, evicting once up front; return the number stored"""
+        if ttl is not None:
+            self._check_ttl(ttl)
+        # Entries the batch itself would evict are never stored
+        skipped = max(0, len(entries) - self._max_size)
+        entries = [Record.from_entry(entry) for entry in entries[skipped:]]
+        sizes = [0] * len(entries)
+        if self._max_bytes is not None:
+            sizes = [estimate_size(entry) for entry in entries]
+            largest = max(sizes, default=0)
+            if largest > self._max_bytes:
+                raise ValueError(f"entry of about {largest} bytes exceeds max_bytes={self._max_bytes}")
+        bodies = [None] * len(entries)
+        if self._wal is not None:
+            # Encoded before anything is evicted or stored, so a bad entry leaves the store unchanged
+            bodies = [self._wal.encode_store(entry) for entry in entries]
+
+        self._expire()
+        evicted = 0
+        while self._memory and len(self._memory) + len(entries) > self._max_size:
+            self._evict()
+            evicted += 1
+        for entry, size, body in zip(entries, sizes, bodies):
+            while self._over_capacity(incoming_bytes=size):
+                self._evict()
+                evicted += 1
+            seq = self._next_seq
+            if self._wal is not None:
+                self._wal.append_store(seq, entry, body)
+            self._insert(seq, entry, ttl, size)
+        self._maybe_compact()
+
+        if evicted or skipped:
+            logger.warning(f"Memory capacity reached, evicted {evicted} entries "
+                           f"and skipped {skipped} of the batch")
+        return len(entries)
+
+    def _insert(self, seq: int, entry: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> None:
+        """Add a record or entry dict under a sequence number and index it"""
+        entry = Record.from_entry(entry)
+        self._next_seq = max(self._next_seq, seq + 1)
+        self._memory[seq] = entry
+        self._seqs.append(seq)
+        self._policy.add(seq)
+        if entry.micros != NO_TIMESTAMP:
+            self._times.add(entry.micros, seq)
+        ttl = self._default_ttl if ttl is None else ttl
+        if ttl is not None:
+            self._expiry.add(seq, ttl)
+        if self._max_bytes is not None:
+            size = estimate_size(entry) if size is None else size
+            self._sizes[seq] = size
+            self._bytes += size
+        for key in self._indexes:
+            self._index_value(key, seq, entry)
+        if self._text_index is not None:
+            self._text_index.add(seq, self._text_fields(entry))
+
+    def _discard(self, seq: int) -> Record:
+        """Remove an entry by sequence number and drop it from the indexes"""
+        if self._wal is not None:
+            self._wal.append_remove(seq)
+        entry = self._memory.pop(seq)
+        self._policy.remove(seq)
+        self._expiry.remove(seq)
+        if self._max_bytes is not None:
+            self._bytes -= self._sizes.pop(seq)
+        for key in self._indexes:
+            self._unindex_value(key, seq, entry)
+        if self._text_index is not None:
+            self._text_index.remove(seq, self._text_fields(entry))
+        if self._vectors is not None:
+            self._vectors.remove(seq)
+
+        # Removed entries stay in the cursor and time indexes until they outnumber the live ones
+        if len(self._seqs) > 2 * len(self._memory) + 32:
+            self._seqs = array('q', self._memory)
+        if len(self._times) > 2 * len(self._memory) + 32:
+            self._times.rebuild(
+                (entry.micros, seq) for seq, entry in self._memory.items()
+                if entry.micros != NO_TIMESTAMP
+            )
+        return entry
+
+    def _maybe_compact(self) -> None:
+        """Compact the write-ahead log into a snapshot once it is due"""
+        if self._wal is None or not self._wal.needs_compaction():
+            return
+        self._wal.compact(
+            lambda path: write_snapshot(
+                path, self._memory.values(), list(self._indexes), self._memory.keys()
+            )
+        )
+
+    def flush(self) -> None:
+        """
+        Write and fsync any log records still buffered for group commit.
+        
+        Raises:
+            MemoryError: If the flush fails
+        """
+        if self._wal is None:
+            return
+        try:
+            self._wal.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush write-ahead log: {str(e)}")
+            raise MemoryError(f"Flush failed: {str(e)}") from e
+
+    def close(self) -> None:
+        """Flush and close the write-ahead log, if any"""
+        if self._wal is not None:
+            self.flush()
+            self._wal.close()
+
+    def _index_value(self, key: str, seq: int, entry: Record) -> None:
+        """Add an entry's value for an indexed key to its bucket"""
+        metadata = entry.metadata
+        if key not in metadata:
+            return
+        try:
+            self._indexes[key].setdefault(metadata[key], {})[seq] = None
+        except TypeError:
+            # Unhashable values cannot be indexed
+            pass
+
+    def _unindex_value(self, key: str, seq: int, entry: Record) -> None:
+        """Remove an entry's value for an indexed key from its bucket"""
+        metadata = entry.metadata
+        if key not in metadata:
+            return
+        try:
+            bucket = self._indexes[key].get(metadata[key])
+        except TypeError:
+            return
+        if bucket is not None:
+            bucket.pop(seq, None)
+            if not bucket:
+                del self._indexes[key][metadata[key]]
+
+    @staticmethod
+    def _text_fields(entry: Record) -> List[str]:
+        """Return the searchable text of an entry"""
+        discovery = entry.discovery
+        fields = [discovery if isinstance(discovery, str) else str(discovery)]
+        fields.extend(value for value in entry.metadata.values() if isinstance(value, str))
+        return fields
+
+    def _lookup(self, key: str, value: Any) -> Optional[Dict[int, None]]:
+        """Return the index bucket for a value, or None if it cannot be answered from an index"""
+        index = self._indexes.get(key)
+        if index is None:
+            return None
+        try:
+            return index.get(value, {})
+        except TypeError:
+            return None
+
+    def _touched(self, seqs: Iterable[int]) -> List[dict]:
+        """Return the entries for sequence numbers, reporting each read to the policy"""
+        entries = []
+        for seq in seqs:
+            self._policy.touch(seq)
+            entries.append(self._memory[seq].to_dict())
+        return entries
+
+    def _expire(self) -> None:
+        """Remove entries whose time to live has passed"""
+        expired = self._expiry.expired()
+        for seq in expired:
+            self._discard(seq)
+        if expired:
+            logger.info(f"Expired {len(expired)} discoveries")
+
+    @staticmethod
+    def _check_ttl(ttl: float) -> None:
+        """Reject a time to live that is not a positive number"""
+        if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds")
+
+    def _over_capacity(self, incoming: int = 1, incoming_bytes: int = 0) -> bool:
+        """Check whether the store must evict before holding the incoming entries"""
+        if len(self._memory) + incoming > self._max_size:
+            return True
+        return self._max_bytes is not None and self._bytes + incoming_bytes > self._max_bytes
+
+    def _evict(self) -> Record:
+        """Discard the entry chosen by the eviction policy"""
+        return self._discard(self._policy.victim())
+
     def _handle_capacity_limit(self) -> None:
         """Handle memory capacity limit"""
-        # Implement your preferred strategy:
-        # 1. Remove oldest entries
-        # 2. Throw error
-        # 3. Compress data
-        # Here we use FIFO removal
-        removed = self._memory.pop(0)
+        # The eviction policy picks the victim in O(1): FIFO, LRU or LFU
+        removed = self._evict()
         logger.warning(
-            f"Memory capacity reached, removed oldest entry: "
-            f"{self._truncate_repr(removed['discovery'])}"
+            f"Memory capacity reached, evicted entry: "
+            f"{self._truncate_repr(removed.discovery)}"
         )
 
     def _truncate_repr(self, obj: Any, max_len: int = 100) -> str:
@@ -140,25 +942,116 @@ class MemoryStore:
             if not discovery and not (metadata_key and metadata_value):
                 raise ValueError("Must provide either discovery or metadata key-value pair")
 
-            # Create a copy of the memory to avoid modifying it during iteration
-            memory_copy = self._memory.copy()
+            matches: Dict[int, None] = {}
+            if discovery:
+                for seq, entry in self._memory.items():
+                    if entry.discovery == discovery:
+                        matches[seq] = None
+            if metadata_key and metadata_value:
+                bucket = self._lookup(metadata_key, metadata_value)
+                if bucket is not None:
+                    matches.update(bucket)
+                else:
+                    for seq, entry in self._memory.items():
+                        if entry.metadata.get(metadata_key) == metadata_value:
+                            matches[seq] = None
 
-            # Remove entries that match the criteria
-            for entry in memory_copy:
-                if (discovery and entry["discovery"] == discovery) or (
-                    metadata_key and metadata_value
-                    and entry["metadata"].get(metadata_key) == metadata_value
-                ):
-                    self._memory.remove(entry)
-                    logger.info(f"Removed discovery: {self._truncate_repr(entry['discovery'])}")
+            for seq in matches:
+                entry = self._discard(seq)
+                logger.info(f"Removed discovery: {self._truncate_repr(entry.discovery)}")
+            self._maybe_compact()
 
         except Exception as e:
             logger.error(f"Failed to remove discovery: {str(e)}")
             raise MemoryError(f"Removal failed: {str(e)}") from e
 
+    def remove_discoveries(
+        self,
+        discoveries: Optional[Iterable[Any]] = None,
+        metadata_key: Optional[str] = None,
+        metadata_values: Optional[Iterable[Any]] = None
+    ) -> int:
+        """
+        Remove every discovery matching any of a batch of values in one pass.
+        
+        Discoveries are matched with a single scan of the store instead of one
+        scan per value; metadata values on an indexed key are looked up in
+        the index. Removals are logged once for the batch.
+
+        Args:
+            discoveries: Discovery values to remove.
+            metadata_key: The metadata key to match.
+            metadata_values: Metadata values to match on metadata_key.
+
+        Returns:
+            Number of discoveries removed
+
+        Raises:
+            ValueError: If no valid criteria are provided.
+            MemoryError: If removal fails.
+        """
+        try:
+            if discoveries is None and not (metadata_key and metadata_values is not None):
+                raise ValueError("Must provide either discoveries or a metadata key and values")
+
+            matches: Dict[int, None] = {}
+            if discoveries is not None:
+                wanted = self._match_set(discoveries)
+                for seq, entry in self._memory.items():
+                    if self._matches(entry.discovery, wanted):
+                        matches[seq] = None
+            if metadata_key and metadata_values is not None:
+                values = list(metadata_values)
+                buckets = [self._lookup(metadata_key, value) for value in values]
+                if values and all(bucket is not None for bucket in buckets):
+                    for bucket in buckets:
+                        matches.update(bucket)
+                else:
+                    wanted = self._match_set(values)
+                    for seq, entry in self._memory.items():
+                        if metadata_key in entry.metadata and self._matches(entry.metadata[metadata_key], wanted):
+                            matches[seq] = None
+
+            for seq in matches:
+                self._discard(seq)
+            self._maybe_compact()
+            logger.info(f"Removed {len(matches)} discoveries")
+            return len(matches)
+
+        except Exception as e:
+            logger.error(f"Failed to remove discoveries: {str(e)}")
+            raise MemoryError(f"Batch removal failed: {str(e)}") from e
+
+    @staticmethod
+    def _match_set(values: Iterable[Any]) -> Tuple[set, list]:
+        """Split values into a set of the hashable ones and a list of the rest"""
+        hashable, unhashable = set(), []
+        for value in values:
+            try:
+                hashable.add(value)
+            except TypeError:
+                unhashable.append(value)
+        return hashable, unhashable
+
+    @staticmethod
+    def _matches(value: Any, wanted: Tuple[set, list]) -> bool:
+        """Check a value against a split produced by _match_set"""
+        hashable, unhashable = wanted
+        try:
+            if value in hashable:
+                return True
+        except TypeError:
+            pass
+        return any(value == other for other in unhashable)
+
     def export_memory(self, filepath: str) -> None:
         """
-        Export the current memory store to a JSON file.
+        Export the current memory store to a JSON or JSON Lines file.
+        
+        Entries are streamed one at a time. Paths ending in .jsonl or .ndjson
+        are written as JSON Lines; anything else as a JSON array. A trailing
+        .gz or .zst suffix compresses the output (.zst needs the optional
+        zstandard package).
         
         Args:
             filepath: The path to the file where the memory store will be saved.
@@ -167,9 +1060,9 @@ class MemoryStore:
             MemoryError: If exporting fails.
         """
         try:
-            with open(filepath, 'w') as f:
-                json.dump(self._memory, f, indent=4)
-            logger.info(f"Memory store exported to {filepath}")
+            self._expire()
+            count = write_entries(filepath, (entry.to_dict() for entry in self._memory.values()))
+            logger.info(f"Memory store exported to {filepath} ({count} entries)")
         except FileNotFoundError as e:
             logger.error(f"File not found: {str(e)}")
             raise MemoryError(f"Export failed: File not found {str(e)}") from e
@@ -183,9 +1076,40 @@ class MemoryStore:
             logger.error(f"Failed to export memory: {str(e)}")
             raise MemoryError(f"Export failed: {str(e)}") from e
 
+    def save_snapshot(self, filepath: str, indexed_keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Save the memory store as a binary snapshot.
+        
+        The snapshot can be opened read-only with MemorySnapshot, which maps the
+        file and decodes entries on access, or loaded back with import_memory.
+        
+        Args:
+            filepath: The path to the snapshot file.
+            indexed_keys: Metadata keys to index in the snapshot. Defaults to the
+                          keys indexed in this store.
+        
+        Raises:
+            MemoryError: If saving fails.
+        """
+        try:
+            self._expire()
+            if indexed_keys is None:
+                indexed_keys = list(self._indexes)
+            count = write_snapshot(filepath, self._memory.values(), indexed_keys)
+            logger.info(f"Memory store saved to snapshot {filepath} ({count} entries)")
+        except Exception as e:
+            logger.error(f"Failed to save snapshot: {str(e)}")
+            raise MemoryError(f"Snapshot failed: {str(e)}") from e
+
     def import_memory(self, filepath: str, merge: bool = False) -> None:
         """
-        Import discoveries from a JSON file into the memory store.
+        Import discoveries from a JSON or JSON Lines file into the memory store.
+        
+        Entries are decoded and stored one at a time, applying the capacity
+        limit as they arrive, so memory use is bounded by the store rather
+        than the file. The format and any gzip/zstd compression are detected
+        from the file contents; binary snapshots are accepted too. If a malformed entry is found part-way
+        through, the entries before it remain imported.
         
         Args:
             filepath: The path to the JSON file to import from.
@@ -196,20 +1120,16 @@ class MemoryStore:
             MemoryError: If importing fails.
         """
         try:
-            with open(filepath, 'r') as f:
-                imported_data = json.load(f)
-            
-            if not isinstance(imported_data, list):
-                raise ValueError("Imported data must be a list of discovery entries")
-
-            if not merge:
-                self.clear_memory()
-            
-            # Ensure capacity is not exceeded when merging
-            for entry in imported_data:
-                if len(self._memory) >= self._max_size:
-                    self._handle_capacity_limit()
-                self._memory.append(entry)
+            with read_entries(filepath) as entries:
+                if not merge:
+                    self.clear_memory()
+                
+                # Stored in batches; capacity is enforced as each batch arrives
+                while True:
+                    batch = list(islice(entries, _IMPORT_BATCH_SIZE))
+                    if not batch:
+                        break
+                    self._append_entries(batch)
             
             logger.info(f"Memory store imported from {filepath}")
         except Exception as e:
@@ -218,6 +1138,7 @@ class MemoryStore:
 
     def __repr__(self) -> str:
         """Official string representation of the MemoryStore"""
+        oldest = next(iter(self._memory.values()), None)
         return (f"MemoryStore(size={len(self._memory)}/"
                 f"{self._max_size}, "
-                f"oldest={self._memory[0]['timestamp'] if self._memory else 'None'})")
+                f"oldest={oldest.timestamp if oldest is not None else 'None'})")
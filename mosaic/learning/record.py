@@ -0,0 +1,154 @@
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Iterator
+
+from .snapshot import EPOCH, NO_TIMESTAMP, pack_timestamp
+
+# Shared by every record stored without metadata
+NO_METADATA = MappingProxyType({})
+
+_KEYS = ('timestamp', 'discovery', 'metadata')
+
+
+def datetime_micros(value: datetime) -> int:
+    """Convert a naive datetime to microseconds since 1970-01-01T00:00:00"""
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def now_micros() -> int:
+    """Return the current local time in microseconds since 1970-01-01T00:00:00"""
+    return datetime_micros(datetime.now())
+
+
+@lru_cache(maxsize=4096)
+def _iso_second(seconds: int) -> str:
+    """Format whole seconds since the epoch; entries stored close together share the result"""
+    return (EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+def format_micros(micros: int) -> str:
+    """
+    Format microseconds since the epoch as the ISO-8601 string datetime.isoformat() gives.
+
+    Args:
+        micros: Microseconds since 1970-01-01T00:00:00
+
+    Returns:
+        The naive ISO-8601 timestamp
+    """
+    seconds, fraction = divmod(micros, 1_000_000)
+    if fraction:
+        return _iso_second(seconds) + '.' + str(fraction).zfill(6)
+    return _iso_second(seconds)
+
+
+class Record(Mapping):
+    """
+    Compact internal form of a stored discovery entry.
+
+    A record holds the timestamp as integer microseconds since the epoch
+    instead of an ISO-8601 string and shares one empty mapping between
+    entries without metadata, which makes it several times smaller than the
+    equivalent dict. It reads like the public entry dict, so filters can be
+    run against it directly; to_dict() produces the public dict shape. The
+    ISO-8601 string is formatted the first time it is read and kept, so
+    repeated scans pay for it once.
+
+    The record copies the caller's metadata once when it is built. Filters
+    reading entry['metadata'] get a read-only view of that copy, and
+    to_dict() hands out a fresh dict, so no caller can change the metadata
+    the store's indexes were built from.
+
+    Attributes:
+        micros (int): Timestamp in microseconds since 1970-01-01T00:00:00
+        discovery (Any): The stored discovery
+        metadata (Mapping): Metadata about the discovery
+        _timestamp (Optional[str]): The formatted timestamp, once it has been read
+    """
+    __slots__ = ('micros', 'discovery', 'metadata', '_timestamp')
+
+    def __init__(self, micros: int, discovery: Any, metadata: Any = None):
+        self.micros = micros
+        self.discovery = discovery
+        self.metadata = dict(metadata) if metadata else NO_METADATA
+        self._timestamp = None
+
+    @classmethod
+    def from_entry(cls, entry: Mapping) -> 'Record':
+        """
+        Build a record from an entry dict.
+
+        Timestamps that are not naive ISO-8601 strings which round-trip
+        exactly are kept verbatim.
+
+        Args:
+            entry: Mapping with 'timestamp', 'discovery' and 'metadata' keys
+
+        Returns:
+            The record
+        """
+        if isinstance(entry, Record):
+            return entry
+        timestamp = entry['timestamp']
+        micros = pack_timestamp(timestamp)
+        if micros == NO_TIMESTAMP:
+            return _RawTimestampRecord(timestamp, entry['discovery'], entry['metadata'])
+        return cls(micros, entry['discovery'], entry['metadata'])
+
+    @property
+    def timestamp(self) -> Any:
+        """The ISO-8601 timestamp of the entry"""
+        timestamp = self._timestamp
+        if timestamp is None:
+            timestamp = self._timestamp = format_micros(self.micros)
+        return timestamp
+
+    def to_dict(self) -> dict:
+        """Return the entry in its public dict shape"""
+        metadata = self.metadata
+        return {
+            'timestamp': self._timestamp or self.timestamp,
+            'discovery': self.discovery,
+            'metadata': dict(metadata) if metadata else {}
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'discovery':
+            return self.discovery
+        if key == 'metadata':
+            metadata = self.metadata
+            return MappingProxyType(metadata) if metadata else metadata
+        if key == 'timestamp':
+            return self._timestamp or self.timestamp
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return 3
+
+    def __reduce__(self):
+        return Record, (self.micros, self.discovery, self.metadata or None)
+
+    def __repr__(self) -> str:
+        return f"Record({self.to_dict()!r})"
+
+
+class _RawTimestampRecord(Record):
+    """A record whose timestamp could not be packed and is kept as given"""
+    __slots__ = ()
+
+    def __init__(self, timestamp: Any, discovery: Any, metadata: Any = None):
+        super().__init__(NO_TIMESTAMP, discovery, metadata)
+        self._timestamp = timestamp
+
+    @property
+    def timestamp(self) -> Any:
+        return self._timestamp
+
+    def __reduce__(self):
+        return _RawTimestampRecord, (self._timestamp, self.discovery, self.metadata or None)
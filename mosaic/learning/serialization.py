@@ -0,0 +1,203 @@
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, Optional
+
+from .snapshot import SNAPSHOT_MAGIC, MemorySnapshot
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+_CHUNK_SIZE = 1 << 16
+
+
+def _split_compression(path: str):
+    """Return the path without its compression suffix and the compression name"""
+    for suffix, compression in _COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return path[:-len(suffix)], compression
+    return path, None
+
+
+def _zstandard():
+    """Import the optional zstandard package"""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("The 'zstandard' package is required for .zst files") from e
+    return zstandard
+
+
+def _open_text(path: str, mode: str, compression: Optional[str]) -> IO[str]:
+    """Open a possibly compressed file in text mode"""
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if compression == 'zstd':
+        zstandard = _zstandard()
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def is_json_lines(path: str) -> bool:
+    """
+    Check whether a path names a JSON Lines file.
+
+    Args:
+        path: File path, optionally with a .gz or .zst suffix
+
+    Returns:
+        True for .jsonl and .ndjson files
+    """
+    return _split_compression(path)[0].endswith(JSON_LINES_SUFFIXES)
+
+
+def write_entries(path: str, entries: Iterable[dict]) -> int:
+    """
+    Stream entries to a file one at a time.
+
+    Files ending in .jsonl or .ndjson are written as JSON Lines; anything
+    else is written as a JSON array with one entry per line. A trailing .gz
+    or .zst suffix compresses the output.
+
+    Args:
+        path: Destination file path
+        entries: The entries to write
+
+    Returns:
+        Number of entries written
+    """
+    base, compression = _split_compression(path)
+    json_lines = base.endswith(JSON_LINES_SUFFIXES)
+    count = 0
+    with _open_text(path, 'w', compression) as f:
+        if not json_lines:
+            f.write('[')
+        for entry in entries:
+            if not json_lines:
+                f.write(',\n' if count else '\n')
+            f.write(json.dumps(entry, separators=(',', ':')))
+            if json_lines:
+                f.write('\n')
+            count += 1
+        if not json_lines:
+            f.write('\n]\n')
+    return count
+
+
+@contextmanager
+def read_entries(path: str) -> Iterator[Iterator[dict]]:
+    """
+    Open a file of entries and yield an iterator that decodes them lazily.
+
+    The format is sniffed from the content rather than the file name:
+    binary snapshots, gzip and zstd compression are detected from their
+    magic bytes, and a leading '[' selects the JSON array format, anything
+    else JSON Lines.
+    The file is opened before the context is entered, so a missing or
+    unreadable file fails before the caller changes any state.
+
+    Args:
+        path: Source file path
+
+    Yields:
+        Iterator over the decoded entries
+    """
+    with open(path, 'rb') as raw:
+        magic = raw.read(len(SNAPSHOT_MAGIC))
+    if magic == SNAPSHOT_MAGIC:
+        with MemorySnapshot(path) as snapshot:
+            yield iter(snapshot)
+        return
+    if magic.startswith(_GZIP_MAGIC):
+        compression = 'gzip'
+    elif magic.startswith(_ZSTD_MAGIC):
+        compression = 'zstd'
+    else:
+        compression = None
+
+    with _open_text(path, 'r', compression) as f:
+        head = f.read(_CHUNK_SIZE)
+        stripped = head.lstrip()
+        if stripped.startswith('['):
+            yield _iter_json_array(f, stripped[1:])
+        else:
+            yield _iter_json_lines(f, head)
+
+
+def _check_entry(entry) -> dict:
+    """Reject values that are not discovery entries"""
+    if not isinstance(entry, dict):
+        raise ValueError("Imported data must be a list of discovery entries")
+    return entry
+
+
+def _iter_json_lines(f: IO[str], head: str) -> Iterator[dict]:
+    """Decode one entry per non-blank line"""
+    buffer = head
+    while True:
+        lines = buffer.split('\n')
+        buffer = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield _check_entry(json.loads(line))
+        chunk = f.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+    if buffer.strip():
+        yield _check_entry(json.loads(buffer))
+
+
+def _iter_json_array(f: IO[str], buffer: str) -> Iterator[dict]:
+    """Incrementally decode the elements of a top-level JSON array"""
+    decoder = json.JSONDecoder()
+    position = 0
+    exhausted = False
+    expect_separator = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n':
+            position += 1
+        if position == len(buffer):
+            if exhausted:
+                raise ValueError("Unterminated JSON array")
+            chunk = f.read(_CHUNK_SIZE)
+            exhausted = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        char = buffer[position]
+        if char == ']':
+            return
+        if expect_separator:
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+            position += 1
+            expect_separator = False
+            continue
+
+        try:
+            entry, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise
+            chunk = f.read(_CHUNK_SIZE)
+            exhausted = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield _check_entry(entry)
+        position = end
+        expect_separator = True
+        if position > _CHUNK_SIZE:
+            buffer = buffer[position:]
+            position = 0
@@ -0,0 +1,491 @@
+import heapq
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import time
+import zlib
+from operator import itemgetter
+from typing import Any, Callable, Iterable, List, Optional
+
+from .errors import MemoryError
+from .memory_store import MemoryStore
+from .record import Record, now_micros
+from .serialization import read_entries, write_entries
+from .snapshot import pack_timestamp, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Store batches sent to a shard before waiting for their acknowledgements
+_MAX_UNACKED = 8
+
+
+def shard_of(discovery: Any, num_shards: int) -> int:
+    """
+    Pick the shard for a discovery with a hash that is stable across processes.
+
+    Args:
+        discovery: The discovery to place
+        num_shards: Number of shards
+
+    Returns:
+        Shard number in range(num_shards)
+    """
+    text = discovery if isinstance(discovery, str) else repr(discovery)
+    return zlib.crc32(text.encode('utf-8')) % num_shards
+
+
+def _handle(store: MemoryStore, method: str, args: tuple) -> Any:
+    """Run one request against a shard's MemoryStore"""
+    if method == 'store':
+        store._append_entries(args[0])
+        return None
+    if method == 'find':
+        return store.find(**args[0])
+    if method == 'search':
+        return store._ranked_search(*args)
+    if method == 'len':
+        return len(store._memory)
+    return getattr(store, method)(*args)
+
+
+def _run_shard(connection, max_size: int, indexed_keys: List[str]) -> None:
+    """Worker process loop serving requests for one shard"""
+    store = MemoryStore(max_size=max_size, indexed_keys=indexed_keys)
+    while True:
+        method, args = connection.recv()
+        if method is None:
+            break
+        start = time.perf_counter()
+        try:
+            result = (True, _handle(store, method, args))
+        except Exception as e:
+            result = (False, str(e))
+        connection.send(result + (time.perf_counter() - start,))
+    connection.close()
+
+
+class ShardedMemoryStore:
+    """
+    A MemoryStore facade that hash-partitions entries across worker processes.
+
+    Each worker process owns a MemoryStore shard. Stores are buffered per
+    shard and sent in batches; queries are scattered to every shard at once
+    and the results merged, so filter-heavy scans run on all cores. Removal
+    by a string discovery only contacts the shard that owns it.
+
+    Capacity is split evenly across shards and eviction is FIFO within each
+    shard. Filters passed to retrieve_memory must be picklable (module-level
+    functions rather than lambdas). Search scores use each shard's own term
+    statistics, which agree closely when entries are spread evenly.
+
+    Attributes:
+        num_shards (int): Number of worker processes
+        batch_size (int): Stores buffered per shard before they are sent
+        shard_timings (List[float]): Seconds each shard spent on the last request
+        _connections (list): Parent ends of the worker pipes
+        _processes (List[multiprocessing.Process]): Worker processes
+        _pending (List[list]): Buffered stores per shard
+        _unacked (List[int]): Store batches per shard awaiting acknowledgement
+        _indexed_keys (List[str]): Metadata keys every shard indexes
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        num_shards: Optional[int] = None,
+        indexed_keys: Optional[Iterable[str]] = None,
+        batch_size: int = 1000
+    ):
+        """
+        Start the shard worker processes.
+
+        Args:
+            max_size: Maximum number of discoveries across all shards
+            num_shards: Number of worker processes (default: CPU count)
+            indexed_keys: Optional metadata keys each shard indexes
+            batch_size: Stores buffered per shard before they are sent
+
+        Raises:
+            ValueError: If max_size, num_shards or batch_size is not a positive integer
+        """
+        num_shards = num_shards or os.cpu_count() or 1
+        for name, value in (('max_size', max_size), ('num_shards', num_shards), ('batch_size', batch_size)):
+            if not isinstance(value, int) or value <= 0:
+                raise ValueError(f"{name} must be a positive integer")
+
+        self.num_shards = num_shards
+        self.batch_size = batch_size
+        self.shard_timings: List[float] = [0.0] * num_shards
+        self._max_size = max_size
+        self._connections = []
+        self._processes = []
+        self._pending: List[list] = [[] for _ in range(num_shards)]
+        self._unacked = [0] * num_shards
+        self._indexed_keys = list(indexed_keys or ())
+
+        shard_size = math.ceil(max_size / num_shards)
+        for _ in range(num_shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_run_shard, args=(child, shard_size, self._indexed_keys), daemon=True
+            )
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        logger.info(f"ShardedMemoryStore started {num_shards} shards with capacity {max_size}")
+
+    def create_index(self, metadata_key: str) -> None:
+        """
+        Maintain a hash index on a metadata key in every shard.
+
+        Args:
+            metadata_key: The metadata key to index
+
+        Raises:
+            ValueError: If metadata_key is not a non-empty string
+            MemoryError: If a shard fails to build the index
+        """
+        if not metadata_key or not isinstance(metadata_key, str):
+            raise ValueError("metadata_key must be a non-empty string")
+        if metadata_key in self._indexed_keys:
+            return
+        try:
+            self._scatter('create_index', (metadata_key,))
+            self._indexed_keys.append(metadata_key)
+        except Exception as e:
+            logger.error(f"Failed to create index: {str(e)}")
+            raise MemoryError(f"Index creation failed: {str(e)}") from e
+
+    def store_discovery(self, discovery: Any, metadata: Optional[dict] = None) -> None:
+        """
+        Buffer a discovery for its shard, sending the batch once it is full.
+
+        The entry is timestamped here rather than when the shard applies the
+        batch, so merged results keep the order of store calls. Errors raised
+        by the shard, and entries that cannot be pickled, surface once on a
+        later call that sends the batch.
+
+        Args:
+            discovery: The discovery to store (any type)
+            metadata: Optional metadata about the discovery
+
+        Raises:
+            MemoryError: If storage fails
+        """
+        try:
+            shard = shard_of(discovery, self.num_shards)
+            self._pending[shard].append(Record(now_micros(), discovery, metadata))
+            if len(self._pending[shard]) >= self.batch_size:
+                self._send_pending(shard)
+                if self._unacked[shard] >= _MAX_UNACKED:
+                    self._collect_acks(shard)
+        except Exception as e:
+            logger.error(f"Failed to store discovery: {str(e)}")
+            raise MemoryError(f"Storage failed: {str(e)}") from e
+
+    def flush(self) -> None:
+        """
+        Send all buffered stores and wait until every shard has applied them.
+
+        Raises:
+            MemoryError: If a shard failed to store a batch
+        """
+        try:
+            for shard in range(self.num_shards):
+                self._send_pending(shard)
+            for shard in range(self.num_shards):
+                self._collect_acks(shard)
+        except Exception as e:
+            logger.error(f"Failed to flush shards: {str(e)}")
+            raise MemoryError(f"Flush failed: {str(e)}") from e
+
+    def retrieve_memory(self, filter_func: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """
+        Retrieve discoveries from every shard, merged oldest first.
+
+        Args:
+            filter_func: Optional picklable function to filter discoveries
+
+        Returns:
+            List of discovery entries with metadata
+
+        Raises:
+            MemoryError: If retrieval fails
+        """
+        try:
+            if filter_func is not None and not callable(filter_func):
+                raise ValueError("filter_func must be callable")
+            return self._merge_by_time(self._scatter('retrieve_memory', (filter_func,)))
+        except Exception as e:
+            logger.error(f"Failed to retrieve memory: {str(e)}")
+            raise MemoryError(f"Retrieval failed: {str(e)}") from e
+
+    def find(self, **criteria: Any) -> List[dict]:
+        """
+        Retrieve discoveries whose metadata equals all of the given values.
+
+        Args:
+            **criteria: Metadata key-value pairs to match
+
+        Returns:
+            List of matching discovery entries, oldest first
+
+        Raises:
+            MemoryError: If the query fails
+        """
+        try:
+            return self._merge_by_time(self._scatter('find', (criteria,)))
+        except Exception as e:
+            logger.error(f"Failed to find discoveries: {str(e)}")
+            raise MemoryError(f"Find failed: {str(e)}") from e
+
+    def search_knowledge(self, query: str, match_all: bool = True, limit: int = 10) -> List[dict]:
+        """
+        Search every shard by keyword and merge the ranked results.
+
+        Args:
+            query: Whitespace-separated search terms
+            match_all: If True, entries must contain every term; otherwise any term
+            limit: Maximum number of results to return
+
+        Returns:
+            List of discovery entries ranked by relevance, best first
+
+        Raises:
+            MemoryError: If the search fails
+        """
+        try:
+            ranked = heapq.nlargest(
+                limit,
+                (pair for results in self._scatter('search', (query, match_all, limit)) for pair in results),
+                key=lambda pair: pair[0]
+            )
+            return [entry for _, entry in ranked]
+        except Exception as e:
+            logger.error(f"Failed to search memory: {str(e)}")
+            raise MemoryError(f"Search failed: {str(e)}") from e
+
+    def remove_discovery(
+        self,
+        discovery: Optional[str] = None,
+        metadata_key: Optional[str] = None,
+        metadata_value: Optional[Any] = None
+    ) -> None:
+        """
+        Remove discoveries based on specific criteria.
+
+        Args:
+            discovery: The value of the discovery to remove.
+            metadata_key: The metadata key to match.
+            metadata_value: The metadata value to match.
+
+        Raises:
+            ValueError: If no valid criteria are provided.
+            MemoryError: If removal fails.
+        """
+        try:
+            if not discovery and not (metadata_key and metadata_value):
+                raise ValueError("Must provide either discovery or metadata key-value pair")
+            shards = None
+            if isinstance(discovery, str) and not (metadata_key and metadata_value):
+                shards = [shard_of(discovery, self.num_shards)]
+            self._scatter('remove_discovery', (discovery, metadata_key, metadata_value), shards=shards)
+        except Exception as e:
+            logger.error(f"Failed to remove discovery: {str(e)}")
+            raise MemoryError(f"Removal failed: {str(e)}") from e
+
+    def clear_memory(self) -> None:
+        """Clear all stored discoveries on every shard"""
+        for pending in self._pending:
+            pending.clear()
+        self._scatter('clear_memory', ())
+        logger.info("Sharded memory store cleared")
+
+    def export_memory(self, filepath: str) -> None:
+        """
+        Export all shards, merged oldest first, to a JSON or JSON Lines file.
+
+        Args:
+            filepath: The path to the file where the memory store will be saved.
+
+        Raises:
+            MemoryError: If exporting fails.
+        """
+        try:
+            count = write_entries(filepath, self.retrieve_memory())
+            logger.info(f"Sharded memory store exported to {filepath} ({count} entries)")
+        except Exception as e:
+            logger.error(f"Failed to export memory: {str(e)}")
+            raise MemoryError(f"Export failed: {str(e)}") from e
+
+    def save_snapshot(self, filepath: str, indexed_keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Save all shards, merged oldest first, as one binary snapshot.
+
+        Args:
+            filepath: The path to the snapshot file.
+            indexed_keys: Metadata keys to index in the snapshot. Defaults to the
+                          keys indexed by the shards.
+
+        Raises:
+            MemoryError: If saving fails.
+        """
+        try:
+            if indexed_keys is None:
+                indexed_keys = self._indexed_keys
+            count = write_snapshot(filepath, self.retrieve_memory(), list(indexed_keys))
+            logger.info(f"Sharded memory store saved to snapshot {filepath} ({count} entries)")
+        except Exception as e:
+            logger.error(f"Failed to save snapshot: {str(e)}")
+            raise MemoryError(f"Snapshot failed: {str(e)}") from e
+
+    def import_memory(self, filepath: str, merge: bool = False) -> None:
+        """
+        Import discoveries from a JSON, JSON Lines or snapshot file, scattered to their shards.
+
+        Entries keep their timestamps and go through the same batched
+        pipeline as store_discovery, so capacity is enforced per shard as
+        they arrive. If a malformed entry is found part-way through, the
+        entries before it remain imported.
+
+        Args:
+            filepath: The path to the file to import from.
+            merge: If True, merge the imported discoveries with the existing memory.
+                   If False, clear existing memory before importing.
+
+        Raises:
+            MemoryError: If importing fails.
+        """
+        try:
+            with read_entries(filepath) as entries:
+                if not merge:
+                    self.clear_memory()
+                for entry in entries:
+                    shard = shard_of(entry['discovery'], self.num_shards)
+                    self._pending[shard].append(Record.from_entry(entry))
+                    if len(self._pending[shard]) >= self.batch_size:
+                        self._send_pending(shard)
+                        if self._unacked[shard] >= _MAX_UNACKED:
+                            self._collect_acks(shard)
+            self.flush()
+            logger.info(f"Sharded memory store imported from {filepath}")
+        except Exception as e:
+            logger.error(f"Failed to import memory: {str(e)}")
+            raise MemoryError(f"Import failed: {str(e)}") from e
+
+    def __len__(self) -> int:
+        """Return the number of stored discoveries across shards"""
+        return sum(self._scatter('len', ()))
+
+    def close(self) -> None:
+        """Flush buffered stores and stop the worker processes"""
+        if not self._processes:
+            return
+        try:
+            self.flush()
+        finally:
+            for connection in self._connections:
+                connection.send((None, None))
+                connection.close()
+            for process in self._processes:
+                process.join()
+            self._processes = []
+            logger.info("ShardedMemoryStore shut down")
+
+    def __enter__(self):
+        """Context manager entry point"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point"""
+        self.close()
+
+    def _send_pending(self, shard: int) -> None:
+        """
+        Send a shard's buffered stores as one batch without waiting.
+
+        The buffer is swapped out before sending, so an entry that cannot be
+        pickled is reported once instead of failing every later call. The
+        rest of its batch is still sent.
+
+        Raises:
+            RuntimeError: If some buffered entries could not be pickled
+        """
+        batch = self._pending[shard]
+        if not batch:
+            return
+        self._pending[shard] = []
+        try:
+            self._connections[shard].send(('store', (batch,)))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            kept = []
+            for record in batch:
+                try:
+                    pickle.dumps(record)
+                except Exception:
+                    continue
+                kept.append(record)
+            if kept:
+                self._connections[shard].send(('store', (kept,)))
+                self._unacked[shard] += 1
+            raise RuntimeError(f"Shard {shard} dropped {len(batch) - len(kept)} "
+                               f"unpicklable stores: {str(e)}") from e
+        self._unacked[shard] += 1
+
+    def _collect_acks(self, shard: int) -> None:
+        """Wait for a shard to acknowledge its outstanding store batches"""
+        errors = []
+        while self._unacked[shard]:
+            ok, result, elapsed = self._connections[shard].recv()
+            self._unacked[shard] -= 1
+            self.shard_timings[shard] = elapsed
+            if not ok:
+                errors.append(result)
+        if errors:
+            raise RuntimeError(f"Shard {shard} failed to store a batch: {errors[0]}")
+
+    def _scatter(self, method: str, args: tuple, shards: Optional[List[int]] = None) -> List[Any]:
+        """Send a request to shards, then gather their results in shard order"""
+        shards = range(self.num_shards) if shards is None else shards
+        for shard in shards:
+            self._send_pending(shard)
+        for shard in shards:
+            self._collect_acks(shard)
+        for shard in shards:
+            self._connections[shard].send((method, args))
+
+        results = []
+        errors = []
+        for shard in shards:
+            ok, result, elapsed = self._connections[shard].recv()
+            self.shard_timings[shard] = elapsed
+            if ok:
+                results.append(result)
+            else:
+                errors.append(f"shard {shard}: {result}")
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return results
+
+    @staticmethod
+    def _merge_by_time(shard_results: List[List[dict]]) -> List[dict]:
+        """
+        Merge per-shard results oldest first.
+
+        Entries are keyed on microseconds since the epoch. A shard's results
+        are in insertion order, which imports can leave out of timestamp
+        order, so each list is sorted (stably, and cheaply when it is already
+        in order) before the merge. Timestamps that are missing or not naive
+        ISO-8601 sort first.
+        """
+        runs = [sorted(((pack_timestamp(entry['timestamp']), entry) for entry in results), key=itemgetter(0))
+                for results in shard_results]
+        return [entry for _, entry in heapq.merge(*runs, key=itemgetter(0))]
+
+    def __repr__(self) -> str:
+        """Official string representation of the ShardedMemoryStore"""
+        return (f"ShardedMemoryStore(shards={self.num_shards}, "
+                f"capacity={self._max_size})")
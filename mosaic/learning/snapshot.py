@@ -0,0 +1,363 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .errors import MemoryError
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"MOSNAP01"
+SNAPSHOT_VERSION = 1
+
+# magic, version, flags, reserved, count, offsets, timestamps, index directory
+_HEADER = struct.Struct('<8sHHIQQQQ')
+_OFFSET = struct.Struct('<Q')
+_TIMESTAMP = struct.Struct('<q')
+_LENGTH = struct.Struct('<I')
+
+# Header flag: an int64 column of store sequence numbers follows the timestamps
+FLAG_SEQUENCE_NUMBERS = 1
+
+# Timestamps that do not round-trip through naive ISO-8601 are kept in the record
+NO_TIMESTAMP = -(1 << 63)
+EPOCH = datetime(1970, 1, 1)
+
+
+def pack_timestamp(timestamp: Any) -> int:
+    """
+    Convert a naive ISO-8601 timestamp to microseconds since the epoch.
+
+    Args:
+        timestamp: The timestamp string of an entry
+
+    Returns:
+        Microseconds since 1970-01-01T00:00:00, or a sentinel if the value
+        would not round-trip exactly
+    """
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return NO_TIMESTAMP
+    if parsed.tzinfo is not None or parsed.isoformat() != timestamp:
+        return NO_TIMESTAMP
+    delta = parsed - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def unpack_timestamp(micros: int) -> str:
+    """Convert microseconds since the epoch back to the ISO-8601 string"""
+    return (EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+def _index_key(value: Any) -> Optional[str]:
+    """
+    Encode a metadata value as an index key.
+
+    Values that compare equal in Python map to the same key; lookups verify
+    candidates against the decoded entry, so collisions are harmless.
+    """
+    if isinstance(value, str):
+        return 's:' + value
+    if isinstance(value, (bool, int, float)):
+        return 'n:' + repr(float(value))
+    if value is None:
+        return 'null'
+    return None
+
+
+def _pad(f) -> int:
+    """Pad the file to an 8-byte boundary and return the position"""
+    position = f.tell()
+    padding = -position % 8
+    if padding:
+        f.write(b'\0' * padding)
+    return position + padding
+
+
+def write_snapshot(
+    filepath: str,
+    entries: Iterable[dict],
+    indexed_keys: Iterable[str] = (),
+    sequence_numbers: Optional[Iterable[int]] = None
+) -> int:
+    """
+    Write entries to a binary snapshot file.
+
+    Layout: a fixed header, the records (compact JSON of discovery and
+    metadata), an offset table, a packed int64 timestamp column, an
+    optional int64 sequence number column and a directory of per-key
+    metadata indexes. The file is written to a temporary path and renamed
+    into place.
+
+    Args:
+        filepath: Destination file path
+        entries: The entries to write, oldest first
+        indexed_keys: Metadata keys to build lookup indexes for
+        sequence_numbers: Optional store sequence numbers, one per entry
+
+    Returns:
+        Number of entries written
+    """
+    indexed_keys = list(indexed_keys)
+    offsets = array('Q')
+    timestamps = array('q')
+    indexes: Dict[str, Dict[str, List[int]]] = {key: {} for key in indexed_keys}
+    encoder = json.JSONEncoder(separators=(',', ':'))
+
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * _HEADER.size)
+        for number, entry in enumerate(entries):
+            metadata = entry['metadata']
+            if not isinstance(metadata, dict):
+                # Store records hand out read-only views
+                metadata = dict(metadata)
+            # Store records already carry the packed timestamp
+            packed = getattr(entry, 'micros', None)
+            if packed is None:
+                packed = pack_timestamp(entry['timestamp'])
+            record = [entry['discovery'], metadata]
+            if packed == NO_TIMESTAMP:
+                record.append(entry['timestamp'])
+            offsets.append(f.tell())
+            timestamps.append(packed)
+            f.write(encoder.encode(record).encode('utf-8'))
+
+            for key in indexed_keys:
+                if key in metadata:
+                    index_key = _index_key(metadata[key])
+                    if index_key is not None:
+                        indexes[key].setdefault(index_key, []).append(number)
+        offsets.append(f.tell())
+        count = len(timestamps)
+
+        flags = 0
+        columns = [offsets, timestamps]
+        if sequence_numbers is not None:
+            flags |= FLAG_SEQUENCE_NUMBERS
+            columns.append(array('q', sequence_numbers))
+            if len(columns[-1]) != count:
+                raise ValueError("sequence_numbers must match the number of entries")
+        if sys.byteorder != 'little':
+            for column in columns:
+                column.byteswap()
+        offsets_pos = _pad(f)
+        offsets.tofile(f)
+        timestamps_pos = _pad(f)
+        for column in columns[1:]:
+            column.tofile(f)
+
+        directory = {}
+        for key, index in indexes.items():
+            section = encoder.encode(index).encode('utf-8')
+            directory[key] = [f.tell(), len(section)]
+            f.write(section)
+        index_pos = f.tell()
+        encoded_directory = encoder.encode(directory).encode('utf-8')
+        f.write(_LENGTH.pack(len(encoded_directory)))
+        f.write(encoded_directory)
+
+        f.seek(0)
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, 0, count,
+                             offsets_pos, timestamps_pos, index_pos))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+    return count
+
+
+class MemorySnapshot:
+    """
+    A read-only, memory-mapped view of a binary MemoryStore snapshot.
+
+    Opening a snapshot only reads the header; entries are decoded on access,
+    so startup cost does not depend on the snapshot size and processes that
+    open the same file share its pages through the page cache.
+
+    Attributes:
+        filepath (str): Path of the snapshot file
+        _mmap (mmap.mmap): Read-only mapping of the file
+        _count (int): Number of entries
+        _indexes (Dict[str, Dict[str, List[int]]]): Metadata indexes decoded so far
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Open a snapshot file.
+
+        Args:
+            filepath: Path of the snapshot file
+
+        Raises:
+            MemoryError: If the file cannot be opened or is not a snapshot
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, version, self._flags, _, self._count, self._offsets_pos,
+             self._timestamps_pos, index_pos) = _HEADER.unpack_from(self._mmap, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError("Not a MemoryStore snapshot")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version}")
+
+            (length,) = _LENGTH.unpack_from(self._mmap, index_pos)
+            start = index_pos + _LENGTH.size
+            self._directory = json.loads(self._mmap[start:start + length])
+            self._indexes: Dict[str, Dict[str, List[int]]] = {}
+            self.filepath = filepath
+            logger.info(f"Opened snapshot {filepath} with {self._count} entries")
+        except Exception as e:
+            if hasattr(self, '_mmap'):
+                self._mmap.close()
+            logger.error(f"Failed to open snapshot: {str(e)}")
+            raise MemoryError(f"Snapshot open failed: {str(e)}") from e
+
+    def __len__(self) -> int:
+        """Return the number of entries"""
+        return self._count
+
+    def __getitem__(self, number: int) -> dict:
+        """
+        Decode a single entry.
+
+        Args:
+            number: Position of the entry, oldest first; negative values count from the end
+
+        Returns:
+            The discovery entry
+
+        Raises:
+            IndexError: If the position is out of range
+        """
+        if number < 0:
+            number += self._count
+        if not 0 <= number < self._count:
+            raise IndexError("snapshot index out of range")
+        return self._decode(number)
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate over entries, oldest first, decoding each on demand"""
+        for number in range(self._count):
+            yield self._decode(number)
+
+    def timestamp(self, number: int) -> str:
+        """Return the timestamp of an entry without decoding its record"""
+        packed = _TIMESTAMP.unpack_from(self._mmap, self._timestamps_pos + 8 * number)[0]
+        if packed == NO_TIMESTAMP:
+            return self._decode(number)['timestamp']
+        return unpack_timestamp(packed)
+
+    def sequence_number(self, number: int) -> int:
+        """Return the store sequence number saved for an entry, or its position if none were saved"""
+        if not self._flags & FLAG_SEQUENCE_NUMBERS:
+            return number
+        position = self._timestamps_pos + 8 * (self._count + number)
+        return _TIMESTAMP.unpack_from(self._mmap, position)[0]
+
+    def retrieve_memory(self, filter_func: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """
+        Retrieve entries, optionally filtered.
+
+        Args:
+            filter_func: Optional function to filter discoveries
+
+        Returns:
+            List of discovery entries with metadata
+
+        Raises:
+            MemoryError: If retrieval fails
+        """
+        try:
+            if filter_func:
+                if not callable(filter_func):
+                    raise ValueError("filter_func must be callable")
+                return [entry for entry in self if filter_func(entry)]
+            return list(self)
+        except Exception as e:
+            logger.error(f"Failed to retrieve snapshot memory: {str(e)}")
+            raise MemoryError(f"Retrieval failed: {str(e)}") from e
+
+    def find(self, **criteria: Any) -> List[dict]:
+        """
+        Retrieve entries whose metadata equals all of the given values.
+
+        Criteria on keys indexed in the snapshot only decode the candidate
+        entries from the smallest matching posting list.
+
+        Args:
+            **criteria: Metadata key-value pairs to match
+
+        Returns:
+            List of matching discovery entries, oldest first
+
+        Raises:
+            MemoryError: If the query fails
+        """
+        try:
+            postings = []
+            for key, value in criteria.items():
+                if key not in self._directory:
+                    continue
+                index_key = _index_key(value)
+                if index_key is not None:
+                    postings.append(self._index(key).get(index_key, []))
+            if postings:
+                candidates = (self._decode(number) for number in min(postings, key=len))
+            else:
+                candidates = iter(self)
+
+            return [
+                entry for entry in candidates
+                if all(
+                    key in entry['metadata'] and entry['metadata'][key] == value
+                    for key, value in criteria.items()
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Failed to find snapshot discoveries: {str(e)}")
+            raise MemoryError(f"Find failed: {str(e)}") from e
+
+    def close(self) -> None:
+        """Release the memory mapping"""
+        self._mmap.close()
+
+    def __enter__(self):
+        """Context manager entry point"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit point"""
+        self.close()
+
+    def _decode(self, number: int) -> dict:
+        """Decode the record at a position"""
+        position = self._offsets_pos + 8 * number
+        start = _OFFSET.unpack_from(self._mmap, position)[0]
+        end = _OFFSET.unpack_from(self._mmap, position + 8)[0]
+        record = json.loads(self._mmap[start:end])
+        if len(record) > 2:
+            timestamp = record[2]
+        else:
+            packed = _TIMESTAMP.unpack_from(self._mmap, self._timestamps_pos + 8 * number)[0]
+            timestamp = unpack_timestamp(packed)
+        return {'timestamp': timestamp, 'discovery': record[0], 'metadata': record[1]}
+
+    def _index(self, key: str) -> Dict[str, List[int]]:
+        """Decode a metadata index section on first use"""
+        index = self._indexes.get(key)
+        if index is None:
+            start, length = self._directory[key]
+            index = self._indexes[key] = json.loads(self._mmap[start:start + length])
+        return index
+
+    def __repr__(self) -> str:
+        """Official string representation of the MemorySnapshot"""
+        return (f"MemorySnapshot(size={self._count}, "
+                f"oldest={self.timestamp(0) if self._count else 'None'})")
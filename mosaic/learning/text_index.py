@@ -0,0 +1,168 @@
+import math
+import re
+import heapq
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_QUERY_PATTERN = re.compile(r"\w+\*?")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into case-folded word tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        List of lower-case tokens in order of appearance
+    """
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    Split a search query into case-folded terms, keeping trailing '*' prefix markers.
+
+    Args:
+        query: The search query
+
+    Returns:
+        List of query terms
+    """
+    return _QUERY_PATTERN.findall(query.casefold())
+
+
+class InvertedIndex:
+    """
+    An incrementally maintained inverted index over integer document ids.
+
+    Documents are not stored; callers pass the same text fields to remove()
+    that they passed to add(), which keeps the index free of a forward map.
+
+    Attributes:
+        _postings (Dict[str, Dict[int, int]]): Term to document id to term frequency
+        _terms (List[str]): Sorted vocabulary used for prefix expansion
+        _doc_count (int): Number of indexed documents
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._terms: List[str] = []
+        self._doc_count = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents"""
+        return self._doc_count
+
+    def add(self, doc_id: int, fields: Iterable[str]) -> None:
+        """
+        Index a document.
+
+        Args:
+            doc_id: Unique identifier of the document
+            fields: Text fields making up the document
+        """
+        for field in fields:
+            for term in tokenize(field):
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    insort(self._terms, term)
+                postings[doc_id] = postings.get(doc_id, 0) + 1
+        self._doc_count += 1
+
+    def remove(self, doc_id: int, fields: Iterable[str]) -> None:
+        """
+        Remove a document previously indexed with the same fields.
+
+        Args:
+            doc_id: Identifier of the document
+            fields: The text fields the document was indexed with
+        """
+        for field in fields:
+            for term in tokenize(field):
+                postings = self._postings.get(term)
+                if postings is None or postings.pop(doc_id, None) is None:
+                    continue
+                if not postings:
+                    del self._postings[term]
+                    del self._terms[bisect_left(self._terms, term)]
+        self._doc_count -= 1
+
+    def clear(self) -> None:
+        """Remove all documents"""
+        self._postings.clear()
+        self._terms.clear()
+        self._doc_count = 0
+
+    def expand(self, term: str) -> List[str]:
+        """
+        Return the indexed terms matching a query term.
+
+        A trailing '*' makes the term a prefix query.
+
+        Args:
+            term: Case-folded query term
+
+        Returns:
+            List of matching vocabulary terms
+        """
+        if not term.endswith('*'):
+            return [term] if term in self._postings else []
+
+        prefix = term.rstrip('*')
+        matches = []
+        position = bisect_left(self._terms, prefix)
+        while position < len(self._terms) and self._terms[position].startswith(prefix):
+            matches.append(self._terms[position])
+            position += 1
+        return matches
+
+    def search(self, terms: List[str], match_all: bool = True, limit: int = 10) -> List[Tuple[float, int]]:
+        """
+        Rank documents against query terms using TF-IDF scoring.
+
+        Args:
+            terms: Case-folded query terms, optionally ending in '*'
+            match_all: If True, documents must match every term (AND);
+                       otherwise any term (OR)
+            limit: Maximum number of results
+
+        Returns:
+            List of (score, doc_id) pairs, best first. Ties favour newer ids.
+        """
+        if not terms or limit <= 0:
+            return []
+
+        per_term: List[Dict[int, float]] = []
+        for term in terms:
+            scores: Dict[int, float] = {}
+            for match in self.expand(term):
+                postings = self._postings[match]
+                idf = math.log(1 + self._doc_count / len(postings))
+                for doc_id, frequency in postings.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + frequency * idf
+            if match_all and not scores:
+                return []
+            per_term.append(scores)
+
+        totals: Dict[int, float] = {}
+        if match_all:
+            per_term.sort(key=len)
+            totals.update(per_term[0])
+            for scores in per_term[1:]:
+                totals = {
+                    doc_id: score + scores[doc_id]
+                    for doc_id, score in totals.items() if doc_id in scores
+                }
+                if not totals:
+                    return []
+        else:
+            for scores in per_term:
+                for doc_id, score in scores.items():
+                    totals[doc_id] = totals.get(doc_id, 0.0) + score
+
+        return heapq.nlargest(limit, ((score, doc_id) for doc_id, score in totals.items()))
@@ -0,0 +1,76 @@
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterator, Tuple
+
+
+class TimeIndex:
+    """
+    Sequence numbers ordered by timestamp for range queries.
+
+    Timestamps and sequence numbers sit in two parallel int64 arrays sorted
+    by timestamp. Entries stored in time order are appended at the end, so
+    keeping the index current costs O(1) per insert. An entry older than the
+    newest one (e.g. from a merged import) marks the index unsorted, and the
+    next query sorts it once. Removed entries are left in place and skipped
+    by the caller until they outnumber the live ones, when the index is
+    rebuilt.
+
+    Attributes:
+        _micros (array): Timestamps in microseconds, ascending when sorted
+        _seqs (array): Sequence number for each timestamp
+        _sorted (bool): Whether _micros is in ascending order
+    """
+
+    def __init__(self):
+        self._micros = array('q')
+        self._seqs = array('q')
+        self._sorted = True
+
+    def __len__(self) -> int:
+        """Return the number of indexed entries, including removed ones not yet dropped"""
+        return len(self._seqs)
+
+    def add(self, micros: int, seq: int) -> None:
+        """Index an entry's timestamp"""
+        if self._micros and micros < self._micros[-1]:
+            self._sorted = False
+        self._micros.append(micros)
+        self._seqs.append(seq)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._micros = array('q')
+        self._seqs = array('q')
+        self._sorted = True
+
+    def rebuild(self, pairs: Iterator[Tuple[int, int]]) -> None:
+        """Replace the index with the given (micros, seq) pairs"""
+        pairs = sorted(pairs)
+        self._micros = array('q', (micros for micros, _ in pairs))
+        self._seqs = array('q', (seq for _, seq in pairs))
+        self._sorted = True
+
+    def range(self, start: int, end: int, is_live: Callable[[int], bool]) -> Iterator[int]:
+        """
+        Yield the sequence numbers of live entries with start <= timestamp < end, oldest first.
+
+        The arrays are captured when iteration starts, so a rebuild while the
+        caller is iterating does not disturb it.
+
+        Args:
+            start: Inclusive lower bound in microseconds
+            end: Exclusive upper bound in microseconds
+            is_live: Predicate telling whether a sequence number is still stored
+
+        Yields:
+            Sequence numbers in timestamp order
+        """
+        if not self._sorted:
+            self.rebuild(zip(self._micros, self._seqs))
+        micros, seqs = self._micros, self._seqs
+        position = bisect_left(micros, start)
+        while position < len(micros) and micros[position] < end:
+            seq = seqs[position]
+            if is_live(seq):
+                yield seq
+            position += 1
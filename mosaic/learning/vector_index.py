@@ -0,0 +1,287 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+METRICS = ('cosine', 'dot')
+
+
+class VectorIndex:
+    """
+    Embeddings for integer keys held in one contiguous float32 matrix.
+
+    Rows freed by removal go on a free list and are reused by later adds, so
+    eviction never moves other rows; the matrix only grows (by doubling, up
+    to max_rows) while every row is in use. Exact search is a single matrix
+    multiplication over the used rows. An optional random-projection LSH
+    index narrows large searches to candidate rows before exact re-ranking.
+
+    Attributes:
+        dim (int): Embedding dimension
+        max_rows (Optional[int]): Upper bound on rows the matrix grows to
+        _matrix (np.ndarray): Row-major float32 embeddings
+        _norms (np.ndarray): L2 norm of each row
+        _row_keys (np.ndarray): Key stored in each row, -1 for free rows
+        _key_rows (Dict[int, int]): Row holding each key
+        _free_rows (List[int]): Rows available for reuse
+        _high_water (int): Number of rows ever used
+    """
+
+    def __init__(self, dim: int, max_rows: Optional[int] = None, initial_rows: int = 1024):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Embedding dimension
+            max_rows: Optional upper bound on rows the matrix grows to
+            initial_rows: Rows allocated up front
+
+        Raises:
+            ValueError: If dim is not a positive integer
+        """
+        if not isinstance(dim, int) or dim <= 0:
+            raise ValueError("dim must be a positive integer")
+
+        self.dim = dim
+        self.max_rows = max_rows
+        rows = min(initial_rows, max_rows) if max_rows else initial_rows
+        self._matrix = np.zeros((rows, dim), dtype=np.float32)
+        self._norms = np.zeros(rows, dtype=np.float32)
+        self._row_keys = np.full(rows, -1, dtype=np.int64)
+        self._key_rows: Dict[int, int] = {}
+        self._free_rows: List[int] = []
+        self._high_water = 0
+        self._planes: Optional[np.ndarray] = None
+        self._buckets: List[Dict[int, Set[int]]] = []
+        self._row_buckets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        """Return the number of stored embeddings"""
+        return len(self._key_rows)
+
+    def __contains__(self, key: int) -> bool:
+        """Check whether a key has an embedding"""
+        return key in self._key_rows
+
+    def coerce(self, vector) -> np.ndarray:
+        """
+        Convert a vector to a float32 array of length dim.
+
+        Args:
+            vector: Sequence or array of length dim
+
+        Returns:
+            The vector as a float32 array
+
+        Raises:
+            ValueError: If the vector has the wrong shape
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dim,):
+            raise ValueError(f"embedding must have shape ({self.dim},), got {vector.shape}")
+        return vector
+
+    def add(self, key: int, vector) -> None:
+        """
+        Store the embedding for a key.
+
+        Args:
+            key: Non-negative integer key
+            vector: Sequence or array of length dim
+
+        Raises:
+            ValueError: If the vector has the wrong shape or the key is already present
+        """
+        vector = self.coerce(vector)
+        if key in self._key_rows:
+            raise ValueError(f"key {key} already has an embedding")
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            if self._high_water == len(self._matrix):
+                self._grow()
+            row = self._high_water
+            self._high_water += 1
+
+        self._matrix[row] = vector
+        self._norms[row] = np.linalg.norm(vector)
+        self._row_keys[row] = key
+        self._key_rows[key] = row
+        if self._planes is not None:
+            self._hash_rows(np.array([row]))
+
+    def remove(self, key: int) -> None:
+        """
+        Drop the embedding for a key, if any, and free its row.
+
+        Args:
+            key: The key to remove
+        """
+        row = self._key_rows.pop(key, None)
+        if row is None:
+            return
+        self._row_keys[row] = -1
+        self._free_rows.append(row)
+        if self._planes is not None:
+            for table, bucket in enumerate(self._row_buckets[row]):
+                rows = self._buckets[table].get(int(bucket))
+                if rows is not None:
+                    rows.discard(row)
+                    if not rows:
+                        del self._buckets[table][int(bucket)]
+
+    def clear(self) -> None:
+        """Remove all embeddings, keeping the allocated matrix"""
+        self._row_keys[:] = -1
+        self._key_rows.clear()
+        self._free_rows.clear()
+        self._high_water = 0
+        for buckets in self._buckets:
+            buckets.clear()
+
+    def enable_lsh(self, num_tables: int = 8, num_bits: int = 12, seed: Optional[int] = None) -> None:
+        """
+        Build a random-projection LSH index for approximate search.
+
+        Each table hashes a vector to the sign pattern of num_bits random
+        hyperplane projections; vectors at a small angle tend to share a
+        bucket in at least one table. Existing rows are hashed immediately
+        and later adds and removals keep the tables current.
+
+        Args:
+            num_tables: Number of independent hash tables
+            num_bits: Hyperplanes per table (at most 62)
+            seed: Optional seed for the random hyperplanes
+
+        Raises:
+            ValueError: If num_tables or num_bits is out of range
+        """
+        if not isinstance(num_tables, int) or num_tables <= 0:
+            raise ValueError("num_tables must be a positive integer")
+        if not isinstance(num_bits, int) or not 0 < num_bits <= 62:
+            raise ValueError("num_bits must be an integer between 1 and 62")
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((self.dim, num_tables * num_bits)).astype(np.float32)
+        self._num_bits = num_bits
+        self._bit_weights = (1 << np.arange(num_bits, dtype=np.int64))
+        self._buckets = [{} for _ in range(num_tables)]
+        self._row_buckets = np.zeros((len(self._matrix), num_tables), dtype=np.int64)
+        used = np.flatnonzero(self._row_keys[:self._high_water] >= 0)
+        if len(used):
+            self._hash_rows(used)
+
+    def search(
+        self,
+        queries,
+        limit: int = 10,
+        metric: str = 'cosine',
+        approximate: bool = False
+    ) -> List[List[Tuple[float, int]]]:
+        """
+        Find the most similar stored embeddings for a batch of queries.
+
+        Args:
+            queries: Array of shape (dim,) or (m, dim)
+            limit: Maximum number of results per query
+            metric: 'cosine' or 'dot'
+            approximate: Use the LSH index to pick candidates. Queries that
+                         yield fewer than limit candidates fall back to exact search.
+
+        Returns:
+            One list of (score, key) pairs per query, best first
+
+        Raises:
+            ValueError: If arguments are invalid or LSH is not enabled
+        """
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        if approximate and self._planes is None:
+            raise ValueError("approximate search requires enable_lsh()")
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if queries.ndim != 2 or queries.shape[1] != self.dim:
+            raise ValueError(f"queries must have shape (m, {self.dim})")
+        if not self._key_rows:
+            return [[] for _ in range(len(queries))]
+
+        if not approximate:
+            return self._exact(queries, None, limit, metric)
+
+        results = []
+        codes = self._hash(queries)
+        for query, query_codes in zip(queries, codes):
+            candidates: Set[int] = set()
+            for table, code in enumerate(query_codes):
+                candidates.update(self._buckets[table].get(int(code), ()))
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            if len(rows) < min(limit, len(self._key_rows)):
+                rows = None
+            results.extend(self._exact(query[None, :], rows, limit, metric))
+        return results
+
+    def _exact(self, queries: np.ndarray, rows: Optional[np.ndarray], limit: int,
+               metric: str) -> List[List[Tuple[float, int]]]:
+        """Score queries against the given rows (default: all used rows) and rank them"""
+        if rows is None:
+            matrix = self._matrix[:self._high_water]
+            norms = self._norms[:self._high_water]
+            keys = self._row_keys[:self._high_water]
+        else:
+            matrix = self._matrix[rows]
+            norms = self._norms[rows]
+            keys = self._row_keys[rows]
+
+        scores = matrix @ queries.T
+        if metric == 'cosine':
+            query_norms = np.linalg.norm(queries, axis=1)
+            denominator = norms[:, None] * query_norms[None, :]
+            np.divide(scores, denominator, out=scores, where=denominator > 0)
+            scores[denominator == 0] = 0.0
+        scores[keys < 0] = -np.inf
+
+        count = min(limit, int(np.count_nonzero(keys >= 0)))
+        if count == 0:
+            return [[] for _ in range(len(queries))]
+        top = np.argpartition(-scores, count - 1, axis=0)[:count]
+        results = []
+        for column in range(scores.shape[1]):
+            candidates = top[:, column]
+            ordered = candidates[np.argsort(-scores[candidates, column], kind='stable')]
+            results.append([(float(scores[i, column]), int(keys[i])) for i in ordered])
+        return results
+
+    def _grow(self) -> None:
+        """Double the matrix, up to max_rows"""
+        rows = len(self._matrix) * 2
+        if self.max_rows:
+            rows = max(min(rows, self.max_rows), self._high_water + 1)
+        used = len(self._matrix)
+        matrix = np.zeros((rows, self.dim), dtype=np.float32)
+        matrix[:used] = self._matrix
+        self._matrix = matrix
+        norms = np.zeros(rows, dtype=np.float32)
+        norms[:used] = self._norms
+        self._norms = norms
+        keys = np.full(rows, -1, dtype=np.int64)
+        keys[:used] = self._row_keys
+        self._row_keys = keys
+        if self._row_buckets is not None:
+            buckets = np.zeros((rows, self._row_buckets.shape[1]), dtype=np.int64)
+            buckets[:len(self._row_buckets)] = self._row_buckets
+            self._row_buckets = buckets
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Return the bucket code of each vector in each table"""
+        bits = (vectors @ self._planes) > 0
+        bits = bits.reshape(len(vectors), len(self._buckets), self._num_bits)
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def _hash_rows(self, rows: np.ndarray) -> None:
+        """Insert rows into the LSH tables"""
+        codes = self._hash(self._matrix[rows])
+        self._row_buckets[rows] = codes
+        for row, row_codes in zip(rows.tolist(), codes.tolist()):
+            for table, code in enumerate(row_codes):
+                self._buckets[table].setdefault(code, set()).add(row)
@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import re
+import struct
+import time
+import zlib
+from typing import Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OP_STORE = b'S'
+OP_REMOVE = b'R'
+OP_CLEAR = b'C'
+
+# payload length, crc32 of payload
+_FRAME = struct.Struct('<II')
+_SEQ = struct.Struct('<Q')
+_FILE_PATTERN = re.compile(r'^(log|snapshot)-(\d{8})\.(wal|snap)$')
+
+
+class WriteAheadLog:
+    """
+    An append-only log of MemoryStore mutations with group commit.
+
+    The log lives in a directory as numbered generations. Each generation
+    has an optional snapshot holding the state at the start of the
+    generation and a log of the records appended since. Compaction writes
+    the current state as the snapshot of the next generation, starts an empty
+    log for it and deletes the previous generation, so recovery never needs
+    more than one snapshot and one log.
+
+    Records are framed with their length and a CRC32; recovery stops at the
+    first torn or corrupt record and truncates the log there.
+
+    Attributes:
+        directory (str): Directory holding the log and snapshot files
+        sync_every (int): Records buffered before a write and fsync
+        sync_interval (float): Seconds after which buffered records are synced on the next append
+        compact_every (int): Records appended before compaction is due
+        _generation (int): Current generation number
+        _buffer (bytearray): Encoded records not yet written
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sync_every: int = 1000,
+        sync_interval: float = 1.0,
+        compact_every: int = 100_000
+    ):
+        """
+        Open the log directory, creating it if needed.
+
+        Args:
+            directory: Directory holding the log and snapshot files
+            sync_every: Records buffered before a write and fsync (1 syncs every record)
+            sync_interval: Seconds after which buffered records are synced on the next append
+            compact_every: Records appended before compaction is due
+
+        Raises:
+            ValueError: If any batching parameter is not positive
+        """
+        if not isinstance(sync_every, int) or sync_every <= 0:
+            raise ValueError("sync_every must be a positive integer")
+        if sync_interval <= 0:
+            raise ValueError("sync_interval must be positive")
+        if not isinstance(compact_every, int) or compact_every <= 0:
+            raise ValueError("compact_every must be a positive integer")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+        self._generation = self._latest_generation()
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._appended = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+        self._encoder = json.JSONEncoder(separators=(',', ':'))
+
+    def snapshot_path(self, generation: Optional[int] = None) -> str:
+        """Return the snapshot path of a generation (default: current)"""
+        generation = self._generation if generation is None else generation
+        return os.path.join(self.directory, f"snapshot-{generation:08d}.snap")
+
+    def log_path(self, generation: Optional[int] = None) -> str:
+        """Return the log path of a generation (default: current)"""
+        generation = self._generation if generation is None else generation
+        return os.path.join(self.directory, f"log-{generation:08d}.wal")
+
+    def has_snapshot(self) -> bool:
+        """Check whether the current generation starts from a snapshot"""
+        return os.path.exists(self.snapshot_path())
+
+    def replay(self) -> Iterator[Tuple[bytes, int, Optional[dict]]]:
+        """
+        Decode the records of the current generation's log.
+
+        Yields:
+            (op, seq, entry) tuples; seq and entry are None where the op has none
+        """
+        path = self.log_path()
+        if not os.path.exists(path):
+            return
+
+        good_end = 0
+        with open(path, 'rb') as f:
+            while True:
+                frame = f.read(_FRAME.size)
+                if len(frame) < _FRAME.size:
+                    break
+                length, crc = _FRAME.unpack(frame)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                good_end = f.tell()
+                self._appended += 1
+
+                op = payload[:1]
+                if op == OP_CLEAR:
+                    yield op, None, None
+                    continue
+                (seq,) = _SEQ.unpack_from(payload, 1)
+                if op == OP_STORE:
+                    timestamp, discovery, metadata = json.loads(payload[1 + _SEQ.size:])
+                    yield op, seq, {'timestamp': timestamp, 'discovery': discovery, 'metadata': metadata}
+                else:
+                    yield op, seq, None
+
+        if good_end < os.path.getsize(path):
+            logger.warning(f"Truncating torn write-ahead log tail at byte {good_end}")
+            with open(path, 'r+b') as f:
+                f.truncate(good_end)
+
+    def encode_store(self, entry: dict) -> bytes:
+        """
+        Encode an entry for append_store() without logging it.
+
+        Raises:
+            TypeError: If the entry cannot be serialized
+        """
+        metadata = entry['metadata']
+        if not isinstance(metadata, dict):
+            # Store records hand out read-only views
+            metadata = dict(metadata)
+        return self._encoder.encode([entry['timestamp'], entry['discovery'], metadata]).encode('utf-8')
+
+    def append_store(self, seq: int, entry: dict, body: Optional[bytes] = None) -> None:
+        """Log a stored entry, reusing its encode_store() body if one is given"""
+        if body is None:
+            body = self.encode_store(entry)
+        self._append(OP_STORE + _SEQ.pack(seq) + body)
+
+    def append_remove(self, seq: int) -> None:
+        """Log the removal or eviction of an entry"""
+        self._append(OP_REMOVE + _SEQ.pack(seq))
+
+    def append_clear(self) -> None:
+        """Log clearing the store"""
+        self._append(OP_CLEAR)
+
+    def needs_compaction(self) -> bool:
+        """Check whether enough records were appended to compact"""
+        return self._appended >= self.compact_every
+
+    def compact(self, write_snapshot: Callable[[str], None]) -> None:
+        """
+        Start a new generation from a snapshot of the current state.
+
+        Args:
+            write_snapshot: Callback that writes the current state to the given path
+        """
+        self.flush()
+        previous = self._generation
+        write_snapshot(self.snapshot_path(previous + 1))
+
+        self._close_file()
+        self._generation = previous + 1
+        self._appended = 0
+        for path in (self.log_path(previous), self.snapshot_path(previous)):
+            if os.path.exists(path):
+                os.remove(path)
+        logger.info(f"Compacted write-ahead log into generation {self._generation}")
+
+    def flush(self) -> None:
+        """Write buffered records and fsync the log"""
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = open(self.log_path(), 'ab')
+        self._file.write(self._buffer)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer.clear()
+        self._buffered = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Flush buffered records and close the log file"""
+        self.flush()
+        self._close_file()
+
+    def _append(self, payload: bytes) -> None:
+        """Frame a record and flush the buffer when the batch is due"""
+        self._buffer += _FRAME.pack(len(payload), zlib.crc32(payload))
+        self._buffer += payload
+        self._buffered += 1
+        self._appended += 1
+        if (self._buffered >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.flush()
+
+    def _close_file(self) -> None:
+        """Close the current log file if open"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _latest_generation(self) -> int:
+        """Find the newest generation and remove files of older ones"""
+        generations = {}
+        for name in os.listdir(self.directory):
+            match = _FILE_PATTERN.match(name)
+            if match:
+                generations.setdefault(int(match.group(2)), []).append(name)
+        if not generations:
+            return 0
+
+        # A snapshot completes a compaction, so it supersedes any older log
+        snapshots = [g for g, names in generations.items()
+                     if any(name.startswith('snapshot-') for name in names)]
+        latest = max(snapshots) if snapshots else min(generations)
+        for generation, names in generations.items():
+            if generation < latest:
+                for name in names:
+                    os.remove(os.path.join(self.directory, name))
+        return latest
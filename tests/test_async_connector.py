@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+from mosaic.connection import AsyncConnector, ConnectionError, StandInServer, run_sessions
+
+
+class TestAsyncConnector(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = StandInServer()
+        await self.server.start()
+        self.host, self.port = self.server.address
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_session_lifecycle(self):
+        async with AsyncConnector("alpha", self.host, self.port) as connector:
+            self.assertTrue(connector.is_connected)
+            self.assertTrue(await connector.send_heartbeat())
+            self.assertEqual(self.server.sessions, 1)
+        self.assertFalse(connector.is_connected)
+        await asyncio.sleep(0)
+        self.assertEqual((self.server.sessions, self.server.accepted, self.server.heartbeats), (0, 1, 1))
+
+    async def test_simulated_connection_without_host(self):
+        async with AsyncConnector("alpha") as connector:
+            self.assertTrue(await connector.send_heartbeat())
+        self.assertFalse(connector.is_connected)
+
+    async def test_heartbeat_requires_connection(self):
+        with self.assertRaises(ConnectionError):
+            await AsyncConnector("alpha", self.host, self.port).send_heartbeat()
+
+    async def test_connect_times_out(self):
+        self.server.latency = 0.5
+        connector = AsyncConnector("slow", self.host, self.port)
+        with self.assertRaises(ConnectionError):
+            await connector.connect(timeout=0.02)
+        self.assertFalse(connector.is_connected)
+
+    async def test_heartbeat_times_out_and_disconnects(self):
+        connector = AsyncConnector("alpha", self.host, self.port)
+        await connector.connect()
+        self.server.latency = 0.5
+        with self.assertRaises(ConnectionError):
+            await connector.send_heartbeat(timeout=0.02)
+        self.assertFalse(connector.is_connected)
+        self.server.latency = 0.0
+        await connector.reconnect()
+        self.assertTrue(await connector.send_heartbeat())
+        await connector.disconnect()
+
+    async def test_server_loss_fails_heartbeat(self):
+        connector = AsyncConnector("alpha", self.host, self.port)
+        await connector.connect()
+        await self.server.close()
+        with self.assertRaises(ConnectionError):
+            await connector.send_heartbeat(timeout=1)
+        with self.assertRaises(ConnectionError):
+            await connector.connect(timeout=1)
+
+    async def test_new_session_takes_over_agent(self):
+        old = AsyncConnector("alpha", self.host, self.port)
+        await old.connect()
+        async with AsyncConnector("alpha", self.host, self.port) as new:
+            self.assertTrue(await new.send_heartbeat())
+            with self.assertRaises(ConnectionError):
+                await old.send_heartbeat(timeout=1)
+            self.assertEqual(self.server.sessions, 1)
+
+    async def test_concurrent_heartbeats_share_a_connector(self):
+        async with AsyncConnector("alpha", self.host, self.port) as connector:
+            results = await asyncio.gather(*(connector.send_heartbeat() for _ in range(20)))
+        self.assertEqual(results, [True] * 20)
+        self.assertEqual(self.server.heartbeats, 20)
+
+    async def test_run_sessions_multiplexes_agents(self):
+        self.server.latency = 0.01
+
+        async def session(connector):
+            await connector.send_heartbeat()
+            return connector.agent
+
+        agents = [f"agent-{n}" for n in range(150)]
+        results = await run_sessions(agents, session, self.host, self.port, concurrency=50)
+        self.assertEqual(results, agents)
+        self.assertEqual((self.server.accepted, self.server.heartbeats), (150, 150))
+        self.assertLessEqual(self.server.peak, 50)
+        self.assertGreater(self.server.peak, 1)
+
+    async def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AsyncConnector("two words")
+        with self.assertRaises(ValueError):
+            AsyncConnector("alpha", self.host)
+        with self.assertRaises(ValueError):
+            AsyncConnector("alpha", timeout=0)
+        with self.assertRaises(ValueError):
+            await run_sessions(["alpha"], None, concurrency=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
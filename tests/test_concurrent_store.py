@@ -0,0 +1,93 @@
+import threading
+import unittest
+from unittest import mock
+from mosaic.learning.concurrent_store import ConcurrentMemoryStore, CHUNK_SIZE
+
+
+class TestConcurrentMemoryStore(unittest.TestCase):
+    def setUp(self):
+        self.memory_store = ConcurrentMemoryStore(max_size=3)
+
+    def test_fifo_eviction(self):
+        for i in range(5):
+            self.memory_store.store_discovery(f"Discovery {i}")
+        discoveries = [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+        self.assertEqual(discoveries, ["Discovery 2", "Discovery 3", "Discovery 4"])
+        self.assertEqual(len(self.memory_store), 3)
+
+    def test_snapshot_isolation(self):
+        self.memory_store.store_discovery("Old", {"category": "a"})
+        self.memory_store.store_discovery("Kept", {"category": "b"})
+        snapshot = self.memory_store.snapshot()
+        self.memory_store.remove_discovery("Old")
+        self.memory_store.store_discovery("New")
+        self.memory_store.store_discovery("Newer")
+        self.memory_store.clear_memory()
+        self.assertEqual([entry["discovery"] for entry in snapshot], ["Old", "Kept"])
+        self.assertEqual(self.memory_store.retrieve_memory(), [])
+
+    def test_remove_and_compaction(self):
+        memory_store = ConcurrentMemoryStore(max_size=4 * CHUNK_SIZE)
+        for i in range(3 * CHUNK_SIZE):
+            memory_store.store_discovery(i, {"parity": i % 4})
+        memory_store.remove_discovery(metadata_key="parity", metadata_value=1)
+        memory_store.remove_discovery(metadata_key="parity", metadata_value=2)
+        memory_store.remove_discovery(metadata_key="parity", metadata_value=3)
+        self.assertEqual(len(memory_store), 3 * CHUNK_SIZE // 4)
+        self.assertEqual(memory_store._tail, len(memory_store))
+        memory_store.store_discovery("After")
+        self.assertEqual(memory_store.retrieve_memory()[-1]["discovery"], "After")
+        self.assertEqual(len(memory_store.find(parity=0)), 3 * CHUNK_SIZE // 4)
+
+    def test_compaction_keeps_stores_made_during_the_copy(self):
+        memory_store = ConcurrentMemoryStore(max_size=4 * CHUNK_SIZE)
+        for i in range(2 * CHUNK_SIZE):
+            memory_store.store_discovery(i, {"parity": i % 2})
+        memory_store._compacting = True
+        memory_store.remove_discovery(metadata_key="parity", metadata_value=1)
+        copied = memory_store.snapshot()
+        memory_store.store_discovery("During")
+        memory_store.remove_discovery(2)
+        expected = memory_store.retrieve_memory()
+        memory_store._compacting = False
+        with mock.patch.object(memory_store, "snapshot", return_value=copied):
+            memory_store._compact()
+        self.assertEqual(memory_store.retrieve_memory(), expected)
+        self.assertEqual(memory_store._tail, CHUNK_SIZE + 1)
+        self.assertFalse(memory_store._compacting)
+
+    def test_removal_matched_before_a_clear_is_dropped(self):
+        memory_store = self.memory_store
+
+        class ClearsOnCompare:
+            def __eq__(self, other):
+                memory_store.clear_memory()
+                return True
+
+        memory_store.store_discovery("Old", {"tag": "x"})
+        memory_store.remove_discovery(metadata_key="tag", metadata_value=ClearsOnCompare())
+        self.assertEqual(len(memory_store), 0)
+        memory_store.store_discovery("New")
+        self.assertEqual([entry["discovery"] for entry in memory_store.retrieve_memory()], ["New"])
+
+    def test_concurrent_writers(self):
+        memory_store = ConcurrentMemoryStore(max_size=500)
+
+        def writer(worker):
+            for i in range(1000):
+                memory_store.store_discovery(i, {"worker": worker})
+                if i % 50 == 0:
+                    memory_store.remove_discovery(metadata_key="worker", metadata_value=worker)
+                    memory_store.retrieve_memory()
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(memory_store), len(memory_store.retrieve_memory()))
+        self.assertLessEqual(len(memory_store), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+import threading
+import time
+import unittest
+from mosaic.connection import Connector, ConnectionError, ConnectorPool, PoolTimeoutError
+
+
+class FakeServer:
+    """An in-process fake of the simulation server that only counts open sessions; no network is involved"""
+
+    def __init__(self, connect_delay=0.0):
+        self.connect_delay = connect_delay
+        self.lock = threading.Lock()
+        self.open = set()
+        self.peak = 0
+        self.connects = 0
+        self.dropped = set()
+
+    def connector(self, agent):
+        return FakeConnector(agent, self)
+
+    def drop(self, connector):
+        """Sever a session server-side, as a restart or network fault would"""
+        with self.lock:
+            self.open.discard(id(connector))
+            self.dropped.add(id(connector))
+
+
+class FakeConnector(Connector):
+    def __init__(self, agent, server):
+        super().__init__(agent)
+        self.server = server
+
+    def connect(self, timeout=10):
+        time.sleep(self.server.connect_delay)
+        super().connect(timeout)
+        with self.server.lock:
+            self.server.open.add(id(self))
+            self.server.connects += 1
+            self.server.peak = max(self.server.peak, len(self.server.open))
+
+    def disconnect(self):
+        super().disconnect()
+        with self.server.lock:
+            self.server.open.discard(id(self))
+
+    def send_heartbeat(self):
+        if id(self) in self.server.dropped:
+            raise ConnectionError("Session was closed by the server")
+        return super().send_heartbeat()
+
+
+class TestConnectorPool(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer()
+
+    def test_reuses_connections_within_and_across_agents(self):
+        pool = ConnectorPool(self.server.connector, max_size=4)
+        with pool.lease("alpha") as first:
+            self.assertTrue(first.is_connected)
+        with pool.lease("alpha") as again:
+            self.assertIs(again, first)
+        with pool.lease("beta") as other, pool.lease("alpha") as second:
+            self.assertIs(other, first)
+            self.assertEqual(other.agent, "beta")
+            self.assertIsNot(second, first)
+        with pool.lease("alpha") as again:
+            # Prefers the agent's own idle connection
+            self.assertIs(again, second)
+        self.assertEqual(self.server.connects, 2)
+        self.assertEqual((pool.idle, pool.in_use), (2, 0))
+        self.assertEqual((pool.metrics.reused, pool.metrics.rebound), (3, 1))
+        pool.close()
+        self.assertEqual(self.server.open, set())
+
+    def test_never_exceeds_max_size(self):
+        self.server.connect_delay = 0.002
+        pool = ConnectorPool(self.server.connector, max_size=3)
+
+        def work(agent):
+            for _ in range(10):
+                with pool.lease(agent):
+                    time.sleep(0.001)
+
+        threads = [threading.Thread(target=work, args=(f"agent-{n % 5}",)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(self.server.peak, 3)
+        self.assertEqual(pool.metrics.checkouts, 80)
+        self.assertGreater(pool.metrics.waits, 0)
+        self.assertLessEqual(pool.metrics.created, 3)
+        self.assertGreater(pool.metrics.rebound, 0)
+        self.assertEqual(pool.in_use, 0)
+        self.assertGreater(pool.utilisation(), 0)
+
+    def test_waiters_are_served_in_arrival_order(self):
+        pool = ConnectorPool(self.server.connector, max_size=1)
+        held = pool.acquire("holder")
+        order = []
+
+        def wait(agent):
+            with pool.lease(agent):
+                order.append(agent)
+
+        threads = []
+        for agent in ("first", "second", "third"):
+            thread = threading.Thread(target=wait, args=(agent,))
+            thread.start()
+            threads.append(thread)
+            while pool.waiting < len(threads):
+                time.sleep(0.001)
+        pool.release(held)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, ["first", "second", "third"])
+        self.assertEqual(pool.metrics.waits, 3)
+        self.assertGreater(pool.metrics.max_wait, 0)
+
+    def test_checkout_times_out(self):
+        pool = ConnectorPool(self.server.connector, max_size=1)
+        held = pool.acquire("holder")
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire("late", timeout=0.01)
+        self.assertEqual((pool.waiting, pool.metrics.timeouts), (0, 1))
+        pool.release(held)
+        pool.release(pool.acquire("late", timeout=0.01))
+
+    def test_replaces_connections_that_fail_heartbeat(self):
+        pool = ConnectorPool(self.server.connector, max_size=2)
+        connector = pool.acquire("alpha")
+        pool.release(connector)
+        self.server.drop(connector)
+        replacement = pool.acquire("alpha")
+        self.assertIsNot(replacement, connector)
+        self.assertFalse(connector.is_connected)
+        self.assertEqual(pool.metrics.discarded, 1)
+        pool.release(replacement)
+
+    def test_lease_discards_connection_on_connection_error(self):
+        pool = ConnectorPool(self.server.connector, max_size=2)
+        with self.assertRaises(ConnectionError):
+            with pool.lease("alpha") as connector:
+                raise ConnectionError("lost")
+        self.assertFalse(connector.is_connected)
+        self.assertEqual(pool.size, 0)
+
+    def test_prunes_idle_connections_down_to_min_size(self):
+        pool = ConnectorPool(self.server.connector, min_size=1, max_size=4, idle_timeout=0.01)
+        self.assertEqual(pool.warm(["a", "b", "c"]), 3)
+        time.sleep(0.02)
+        with pool.lease("d") as connector:
+            pass
+        # "d" rebound the oldest connection; the other two expired
+        self.assertEqual(pool.idle, 1)
+        self.assertEqual(pool.metrics.pruned, 2)
+        self.assertEqual(len(self.server.open), 1)
+        time.sleep(0.02)
+        with pool.lease("e") as again:
+            self.assertIs(again, connector)
+        self.assertEqual(pool.idle, 1)
+
+    def test_quiet_pool_closes_expired_connections(self):
+        pool = ConnectorPool(self.server.connector, max_size=4, idle_timeout=0.05)
+        self.assertEqual(pool.warm(["a", "b"]), 2)
+        time.sleep(0.2)
+        self.assertEqual(pool.idle, 0)
+        self.assertEqual(self.server.open, set())
+        pool.close()
+
+    def test_max_per_agent(self):
+        pool = ConnectorPool(self.server.connector, max_size=4, max_per_agent=1)
+        held = pool.acquire("alpha")
+        with self.assertRaises(ConnectionError):
+            pool.acquire("alpha")
+        pool.release(pool.acquire("beta"))
+        pool.release(held)
+
+    def test_max_per_agent_counts_queued_checkouts(self):
+        pool = ConnectorPool(self.server.connector, max_size=2, max_per_agent=1)
+        held = [pool.acquire("a"), pool.acquire("b")]
+        queued = []
+        thread = threading.Thread(target=lambda: queued.append(pool.acquire("x")))
+        thread.start()
+        while pool.waiting < 1:
+            time.sleep(0.001)
+        with self.assertRaises(ConnectionError):
+            pool.acquire("x", timeout=0.5)
+        self.assertEqual(pool.waiting, 1)
+        pool.release(held[0])
+        thread.join()
+        self.assertEqual(pool._leases["x"], 1)
+        pool.release(queued[0])
+        pool.release(held[1])
+        # A checkout that times out stops counting against its agent
+        held = [pool.acquire("y"), pool.acquire("z")]
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire("x", timeout=0.01)
+        self.assertNotIn("x", pool._leases)
+
+    def test_release_rejects_foreign_connector(self):
+        pool = ConnectorPool(self.server.connector)
+        with self.assertRaises(ValueError):
+            pool.release(Connector("stranger"))
+
+    def test_closed_pool_rejects_checkouts(self):
+        pool = ConnectorPool(self.server.connector, max_size=1)
+        held = pool.acquire("alpha")
+        pool.close()
+        with self.assertRaises(ConnectionError):
+            pool.acquire("beta")
+        pool.release(held)
+        self.assertFalse(held.is_connected)
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            ConnectorPool(max_size=0)
+        with self.assertRaises(ValueError):
+            ConnectorPool(min_size=3, max_size=2)
+        with self.assertRaises(ValueError):
+            ConnectorPool(idle_timeout=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
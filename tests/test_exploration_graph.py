@@ -0,0 +1,138 @@
+import unittest
+from unittest import mock
+from mosaic.exploration import ExplorationGraph, NavigationError, Navigator
+
+
+def grid_graph(width, height):
+    """Build a width x height grid with two-way unit edges, nodes named 'x,y'"""
+    graph = ExplorationGraph()
+    for x in range(width):
+        for y in range(height):
+            if x + 1 < width:
+                graph.add_edge(f"{x},{y}", f"{x + 1},{y}")
+                graph.add_edge(f"{x + 1},{y}", f"{x},{y}")
+            if y + 1 < height:
+                graph.add_edge(f"{x},{y}", f"{x},{y + 1}")
+                graph.add_edge(f"{x},{y + 1}", f"{x},{y}")
+    return graph
+
+
+def manhattan(location, target):
+    (x1, y1), (x2, y2) = (map(int, name.split(",")) for name in (location, target))
+    return abs(x1 - x2) + abs(y1 - y2)
+
+
+class TestExplorationGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = ExplorationGraph()
+        self.graph.add_edge("A", "B", 1)
+        self.graph.add_edge("B", "C", 1)
+        self.graph.add_edge("A", "C", 5)
+        self.graph.add_edge("C", "D", 1)
+        self.graph.add_edge("X", "Y", 1)
+
+    def test_interns_locations_and_deduplicates_edges(self):
+        self.assertEqual(len(self.graph), 6)
+        self.assertEqual(self.graph.edge_count, 5)
+        self.assertFalse(self.graph.add_edge("A", "B", 3))
+        self.assertEqual(self.graph.edge_count, 5)
+        self.assertEqual(self.graph.neighbors("A"), ["B", "C"])
+        self.assertIn("D", self.graph)
+        self.assertEqual(self.graph.to_dict()["D"], [])
+
+    def test_add_node_edge_matches_add_edge(self):
+        a, d = self.graph.add_location("A"), self.graph.add_location("D")
+        self.assertTrue(self.graph.add_node_edge(d, a, 2))
+        self.assertFalse(self.graph.add_node_edge(d, a, 1))
+        self.assertEqual(self.graph.neighbors("D"), ["A"])
+        self.assertEqual(self.graph.dijkstra("D", "A")[0], 1)
+        self.assertEqual(self.graph.component_count, 2)
+
+    def test_shortest_path_counts_edges(self):
+        self.assertEqual(self.graph.shortest_path("A", "D"), ["A", "C", "D"])
+        self.assertEqual(self.graph.shortest_path("A", "A"), ["A"])
+        self.assertIsNone(self.graph.shortest_path("D", "A"))
+
+    def test_dijkstra_uses_weights(self):
+        self.assertEqual(self.graph.dijkstra("A", "D"), (3.0, ["A", "B", "C", "D"]))
+        self.assertIsNone(self.graph.dijkstra("A", "Y"))
+
+    def test_lower_weight_replaces_existing_edge(self):
+        self.graph.add_edge("A", "C", 0.5)
+        self.assertEqual(self.graph.dijkstra("A", "D"), (1.5, ["A", "C", "D"]))
+
+    def test_astar_matches_dijkstra_on_grid(self):
+        graph = grid_graph(12, 12)
+        graph.add_edge("0,0", "5,5", 3)
+        cost, path = graph.astar("0,0", "11,11", manhattan)
+        self.assertEqual(cost, graph.dijkstra("0,0", "11,11")[0])
+        self.assertEqual(cost, 15.0)
+        self.assertEqual((path[0], path[1], path[-1]), ("0,0", "5,5", "11,11"))
+
+    def test_reachability(self):
+        self.assertEqual(self.graph.reachable("B"), {"B", "C", "D"})
+        self.assertTrue(self.graph.is_reachable("A", "D"))
+        self.assertFalse(self.graph.is_reachable("D", "A"))
+        self.assertFalse(self.graph.is_reachable("A", "Y"))
+
+    def test_components(self):
+        self.assertEqual(self.graph.component_count, 2)
+        self.assertEqual(self.graph.components(), [["A", "B", "C", "D"], ["X", "Y"]])
+        self.assertTrue(self.graph.connected("D", "A"))
+        self.assertFalse(self.graph.connected("A", "X"))
+        self.graph.add_edge("Y", "D")
+        self.assertEqual(self.graph.component_count, 1)
+        self.assertEqual(self.graph.component_size("X"), 6)
+
+    def test_unknown_location_and_bad_weight(self):
+        with self.assertRaises(NavigationError):
+            self.graph.shortest_path("A", "Nowhere")
+        with self.assertRaises(NavigationError):
+            self.graph.neighbors("Nowhere")
+        with self.assertRaises(ValueError):
+            self.graph.add_edge("A", "B", -1)
+
+
+class TestExplorationGraphFrontierSearch(TestExplorationGraph):
+    """Runs the graph tests with NumPy frontier search forced on for every graph size"""
+
+    def setUp(self):
+        patcher = mock.patch("mosaic.exploration.graph._FRONTIER_MIN_LOCATIONS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_edges_added_after_csr_build_are_searched(self):
+        graph = grid_graph(5, 5)
+        self.assertEqual(len(graph.shortest_path("0,0", "4,4")), 9)
+        graph.add_edge("0,0", "4,4")
+        graph.add_edge("4,4", "Beyond")
+        self.assertEqual(graph.shortest_path("0,0", "Beyond"), ["0,0", "4,4", "Beyond"])
+        self.assertIn("Beyond", graph.reachable("2,2"))
+        for i in range(100):
+            graph.add_edge(f"Beyond {i}", f"Beyond {i + 1}")
+        graph.add_edge("Beyond", "Beyond 0")
+        with mock.patch("mosaic.exploration.graph._PENDING_EDGES", 0):
+            self.assertEqual(len(graph.shortest_path("1,0", "Beyond 100")), 105)
+
+
+class TestNavigatorGraph(unittest.TestCase):
+    def test_explore_records_moves_between_locations(self):
+        navigator = Navigator()
+        navigator.explore("north")
+        navigator.explore("east")
+        navigator.explore("north")
+        self.assertEqual(navigator.get_exploration_map(), {
+            "Starting Point": ["North Realm"],
+            "North Realm": ["East Realm"],
+            "East Realm": ["North Realm"],
+        })
+        self.assertIs(navigator.get_exploration_graph(), navigator.get_exploration_graph())
+        self.assertEqual(navigator.find_route("East Realm"), ["North Realm", "East Realm"])
+        self.assertIsNone(navigator.find_route("Starting Point"))
+        self.assertEqual(navigator.get_exploration_graph().dijkstra("Starting Point", "East Realm")[0],
+                         2 * Navigator.ENERGY_COST)
+
+
+if __name__ == "__main__":
+    unittest.main()
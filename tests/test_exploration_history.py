@@ -0,0 +1,153 @@
+import unittest
+import numpy as np
+from mosaic.exploration import (
+    CountMinSketch, ExplorationGraph, ExplorationSession, Navigator, SymbolTable, VisitCounter
+)
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_estimates_never_undercount(self):
+        sketch = CountMinSketch(width=64, depth=3, seed=1)
+        counts = {key: key % 7 + 1 for key in range(0, 5000, 13)}
+        for key, count in counts.items():
+            sketch.add(key, count)
+        self.assertEqual(sketch.total, sum(counts.values()))
+        for key, count in counts.items():
+            self.assertGreaterEqual(sketch.estimate(key), count)
+
+    def test_add_many_matches_add(self):
+        keys = np.arange(0, 3000, 7)
+        counts = keys % 5 + 1
+        one, many = CountMinSketch(width=128), CountMinSketch(width=128)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            one.add(key, count)
+        many.add_many(keys, counts)
+        self.assertEqual([one.estimate(key) for key in keys.tolist()], [many.estimate(key) for key in keys.tolist()])
+        self.assertEqual(one.total, many.total)
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            CountMinSketch(width=100)
+        with self.assertRaises(ValueError):
+            CountMinSketch(depth=0)
+
+
+class TestVisitCounter(unittest.TestCase):
+    def test_compaction_keeps_frequent_locations_exact(self):
+        counter = VisitCounter(exact_limit=8, sketch_width=256)
+        for key in range(4):
+            for _ in range(10):
+                counter.add(key)
+        for key in range(4, 9):
+            counter.add(key)
+        self.assertEqual(counter.compactions, 1)
+        self.assertLessEqual(counter.exact_size, 8)
+        self.assertEqual([counter.count(key) for key in range(4)], [10] * 4)
+        self.assertTrue(all(counter.is_exact(key) for key in range(4)))
+        for key in range(4, 9):
+            self.assertGreaterEqual(counter.count(key), 1)
+        folded = next(key for key in range(4, 9) if not counter.is_exact(key))
+        before = counter.count(folded)
+        counter.add(folded)
+        self.assertGreaterEqual(counter.count(folded), before + 1)
+        self.assertFalse(counter.is_exact(folded))
+
+    def test_memory_stays_bounded(self):
+        counter = VisitCounter(exact_limit=100)
+        for key in range(10_000):
+            counter.add(key)
+        self.assertLessEqual(counter.exact_size, 100)
+        self.assertGreater(counter.nbytes, 0)
+
+    def test_new_locations_start_exact_with_saturated_sketch(self):
+        counter = VisitCounter(exact_limit=1_000, sketch_width=256)
+        for key in range(60_000):
+            counter.add(key)
+            counter.add(key)
+        counter.compact()
+        new_keys = list(range(100_000, 100_400))
+        self.assertEqual(counter.counts(new_keys), [0] * len(new_keys))
+        self.assertEqual(counter.count(new_keys[0]), 0)
+        for key in new_keys:
+            counter.add(key)
+        self.assertTrue(all(counter.is_exact(key) for key in new_keys))
+        self.assertEqual(counter.counts(new_keys), [1] * len(new_keys))
+        folded = next(key for key in range(60_000) if not counter.is_exact(key))
+        counter.add(folded)
+        self.assertFalse(counter.is_exact(folded))
+        self.assertGreaterEqual(counter.count(folded), 3)
+
+    def test_snapshot_is_copy_on_write(self):
+        counter = VisitCounter()
+        counter.add(1)
+        snapshot = counter.snapshot()
+        again = counter.snapshot()
+        self.assertIs(snapshot._exact, counter._exact)
+        counter.add(1)
+        counter.add(2)
+        self.assertEqual((snapshot.count(1), snapshot.count(2)), (1, 0))
+        self.assertEqual(again.count(1), 1)
+        self.assertEqual((counter.count(1), counter.count(2)), (2, 1))
+        with self.assertRaises(TypeError):
+            snapshot.add(1)
+        with self.assertRaises(ValueError):
+            VisitCounter(exact_limit=1)
+
+
+class TestNavigatorHistory(unittest.TestCase):
+    def test_bounded_history_matches_exact_for_frequent_locations(self):
+        navigator = Navigator(seed=0, symbols=SymbolTable(), max_exact_visits=4)
+        exact = Navigator(seed=0, symbols=SymbolTable())
+        directions = ["north"] * 5 + [f"corridor {i}" for i in range(10)]
+        for nav in (navigator, exact):
+            for direction in directions:
+                if nav.get_energy() < Navigator.ENERGY_COST:
+                    nav.rest()
+                nav.explore(direction)
+        history, expected = navigator.get_exploration_history(), exact.get_exploration_history()
+        self.assertEqual(list(history), list(expected))
+        self.assertEqual(history["North Realm"], 5)
+        for location, count in expected.items():
+            self.assertGreaterEqual(history[location], count)
+        self.assertEqual(navigator.get_visit_count("Nowhere"), 0)
+
+    def test_views_are_fixed_snapshots(self):
+        navigator = Navigator(seed=0, symbols=SymbolTable())
+        navigator.explore("north")
+        history = navigator.get_history_view()
+        exploration_map = navigator.get_exploration_map_view()
+        navigator.explore("north")
+        navigator.explore("east")
+
+        self.assertEqual(dict(history), {"Starting Point": 1, "North Realm": 1})
+        self.assertTrue(history.is_exact("North Realm"))
+        self.assertNotIn("East Realm", history)
+        with self.assertRaises(KeyError):
+            history["East Realm"]
+        self.assertEqual(dict(exploration_map), {"Starting Point": ["North Realm"], "North Realm": []})
+        self.assertEqual(navigator.get_exploration_history(),
+                         {"Starting Point": 1, "North Realm": 2, "East Realm": 1})
+        self.assertEqual(dict(navigator.get_exploration_map_view()), navigator.get_exploration_map())
+
+    def test_graph_view_skips_later_edges(self):
+        graph = ExplorationGraph()
+        graph.add_edge("a", "b")
+        view = graph.view()
+        graph.add_edge("a", "c")
+        graph.add_edge("b", "a")
+        self.assertEqual(dict(view), {"a": ["b"], "b": []})
+        self.assertEqual(view.edge_count, 1)
+        self.assertNotIn("c", view)
+
+    def test_bounded_navigator_replays(self):
+        navigator = Navigator(seed=3, record=True, max_exact_visits=2)
+        for direction in ["north", "east", "south", "west", "north"]:
+            navigator.explore(direction)
+        session = navigator.get_session()
+        self.assertEqual(session.options["max_exact_visits"], 2)
+        replayed, _ = Navigator.replay(session)
+        self.assertEqual(replayed.get_exploration_history(), navigator.get_exploration_history())
+
+
+if __name__ == "__main__":
+    unittest.main()
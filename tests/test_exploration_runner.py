@@ -0,0 +1,70 @@
+import unittest
+from mosaic.exploration import ExplorationRunner, Navigator, spawn_seeds
+from mosaic.exploration.runner import _drive
+from mosaic.learning import MemoryStore
+
+
+class TestExplorationRunner(unittest.TestCase):
+    def test_merges_locations_moves_and_discoveries(self):
+        store = MemoryStore()
+        runner = ExplorationRunner(store, num_workers=0, chunk_size=3)
+        metrics = runner.run(7, 20, seed=1)
+
+        expected_visits = {}
+        expected_moves = set()
+        for seed in spawn_seeds(1, 7):
+            navigator = Navigator(seed=seed)
+            _drive(navigator, 20, runner.directions)
+            for name, count in navigator.get_exploration_history().items():
+                expected_visits[name] = expected_visits.get(name, 0) + count
+            for source, targets in navigator.get_exploration_map().items():
+                expected_moves.update((source, target) for target in targets)
+
+        self.assertEqual(runner.get_visit_counts(), expected_visits)
+        graph = runner.get_exploration_graph()
+        self.assertEqual({(source, target) for source, targets in graph.to_dict().items() for target in targets},
+                         expected_moves)
+        discoveries = store.retrieve_memory()
+        self.assertEqual(sorted(entry['discovery'] for entry in discoveries), sorted(expected_visits))
+        self.assertEqual(discoveries[0]['metadata'], {'type': 'location', 'navigator': 0})
+
+        self.assertEqual(metrics.navigators, 7)
+        self.assertEqual(metrics.chunks, 3)
+        self.assertGreaterEqual(metrics.steps, 7 * 20)
+        self.assertGreater(metrics.throughput, 0)
+        self.assertLessEqual(metrics.merge_share, 1.0)
+
+    def test_worker_processes_match_in_process_run(self):
+        serial = ExplorationRunner(num_workers=0, chunk_size=4)
+        serial.run(10, 15, seed=5)
+        parallel = ExplorationRunner(num_workers=2, chunk_size=4)
+        metrics = parallel.run(10, 15, seed=5)
+
+        self.assertEqual(parallel.get_visit_counts(), serial.get_visit_counts())
+        self.assertEqual(parallel.get_exploration_graph().to_dict(), serial.get_exploration_graph().to_dict())
+        self.assertEqual([entry['metadata'] for entry in parallel.store.retrieve_memory()],
+                         [entry['metadata'] for entry in serial.store.retrieve_memory()])
+        self.assertEqual(metrics.workers, 2)
+        self.assertEqual(metrics.chunks, 3)
+        self.assertTrue(metrics.worker_busy)
+
+    def test_runs_accumulate(self):
+        runner = ExplorationRunner(num_workers=0, directions=["north"])
+        runner.run(2, 3, seed=0)
+        runner.run(2, 3, seed=0)
+        self.assertEqual(runner.get_visit_counts(), {"Starting Point": 4, "North Realm": 12})
+        self.assertEqual(len(runner.store.retrieve_memory()), 2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ExplorationRunner(num_workers=-1)
+        with self.assertRaises(ValueError):
+            ExplorationRunner(chunk_size=0)
+        with self.assertRaises(ValueError):
+            ExplorationRunner(directions=[])
+        with self.assertRaises(ValueError):
+            ExplorationRunner(num_workers=0).run(-1, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
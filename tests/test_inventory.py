@@ -0,0 +1,108 @@
+import pickle
+import unittest
+import numpy as np
+from mosaic.exploration import Inventory, Item, ItemTable, ItemType, Navigator
+
+BAR = Item("Energy Bar", ItemType.FOOD, "Restores 20 energy", energy=20)
+TORCH = Item("Flashlight", ItemType.TOOL, "Lights up dark corridors")
+WATER = Item("Almond Water", ItemType.FOOD, "Restores 30 energy", energy=30)
+
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory([BAR, TORCH, BAR])
+        self.inventory.add(WATER, 3)
+
+    def test_stacks_and_counts(self):
+        self.assertEqual(len(self.inventory), 6)
+        self.assertEqual(self.inventory.count("energy BAR"), 2)
+        self.assertEqual(self.inventory.counts(), {"Energy Bar": 2, "Flashlight": 1, "Almond Water": 3})
+        self.assertEqual(list(self.inventory).count(WATER), 3)
+        self.assertIn(BAR, self.inventory)
+        self.assertIn("flashlight", self.inventory)
+        self.assertNotIn(Item("Energy Bar", ItemType.FOOD), self.inventory)
+
+    def test_type_index(self):
+        self.assertEqual(self.inventory.of_type(ItemType.FOOD), [(BAR, 2), (WATER, 3)])
+        self.inventory.remove("FLASHLIGHT")
+        self.assertEqual(self.inventory.of_type(ItemType.TOOL), [])
+        self.inventory.remove("almond water", 2)
+        self.assertEqual(self.inventory.of_type(ItemType.FOOD), [(BAR, 2), (WATER, 1)])
+
+    def test_remove_errors(self):
+        with self.assertRaises(KeyError):
+            self.inventory.remove("Compass")
+        with self.assertRaises(ValueError):
+            self.inventory.remove("Energy Bar", 3)
+        with self.assertRaises(ValueError):
+            self.inventory.add("Energy Bar")
+
+    def test_items_are_immutable_values(self):
+        self.assertEqual(BAR, Item("Energy Bar", ItemType.FOOD, "Restores 20 energy", energy=20))
+        self.assertEqual(pickle.loads(pickle.dumps(BAR)), BAR)
+        with self.assertRaises(AttributeError):
+            BAR.energy = 100
+        with self.assertRaises(ValueError):
+            Item("Rock", "MINERAL")
+
+
+class TestItemTable(unittest.TestCase):
+    def setUp(self):
+        self.table = ItemTable([(BAR, 5), (TORCH, 0), (WATER, 3)])
+
+    def test_alias_tables_reproduce_weights(self):
+        np.testing.assert_allclose(self.table.probabilities(), [5 / 8, 0, 3 / 8])
+
+    def test_sampling_follows_weights(self):
+        rng = np.random.default_rng(0)
+        counts = np.bincount(self.table.sample_many(rng, 80_000), minlength=3) / 80_000
+        np.testing.assert_allclose(counts, [5 / 8, 0, 3 / 8], atol=0.01)
+        draws = [self.table.sample(rng) for _ in range(2000)]
+        self.assertNotIn(TORCH, draws)
+        self.assertAlmostEqual(draws.count(BAR) / 2000, 5 / 8, delta=0.04)
+
+    def test_invalid_weights(self):
+        with self.assertRaises(ValueError):
+            ItemTable([])
+        with self.assertRaises(ValueError):
+            ItemTable([(BAR, -1), (WATER, 2)])
+
+
+class TestNavigatorInventory(unittest.TestCase):
+    def setUp(self):
+        self.navigator = Navigator(seed=0)
+
+    def test_exploring_finds_items_reproducibly(self):
+        navigator, other = Navigator(seed=0, find_items=True), Navigator(seed=0, find_items=True)
+        for _ in range(10):
+            navigator.explore("north")
+            other.explore("north")
+        self.assertEqual(navigator.get_inventory_counts(), other.get_inventory_counts())
+        self.assertTrue(navigator.get_inventory())
+        self.assertEqual(len(navigator.get_inventory()), sum(navigator.get_inventory_counts().values()))
+
+    def test_exploring_finds_no_items_by_default(self):
+        state = self.navigator._rng.bit_generator.state
+        for _ in range(10):
+            self.navigator.explore("north")
+        self.assertEqual(self.navigator.get_inventory(), [])
+        self.assertEqual(self.navigator._rng.bit_generator.state, state)
+
+    def test_use_item_restores_energy(self):
+        self.navigator._inventory.append(BAR)
+        self.navigator._energy = 50
+        self.assertEqual(self.navigator.use_item("energy bar"), BAR)
+        self.assertEqual(self.navigator.get_energy(), 70)
+        self.assertIsNone(self.navigator.use_item("energy bar"))
+
+    def test_discard_item(self):
+        self.navigator._inventory.add(TORCH, 2)
+        self.navigator.discard_item("FLASHLIGHT")
+        self.assertEqual(self.navigator.get_inventory(), [TORCH])
+        self.navigator.discard_item("flashlight")
+        with self.assertRaises(ValueError):
+            self.navigator.discard_item("flashlight")
+
+
+if __name__ == "__main__":
+    unittest.main()
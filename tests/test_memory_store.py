@@ -0,0 +1,650 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+import numpy as np
+from mosaic.learning.eviction import estimate_size
+from mosaic.learning.memory_store import MemoryStore, MemoryError
+from mosaic.learning.record import Record
+from mosaic.learning.snapshot import MemorySnapshot
+from mosaic.learning.wal import WriteAheadLog
+
+
+class TestMemoryStore(unittest.TestCase):
+    def setUp(self):
+        self.memory_store = MemoryStore(max_size=3)
+
+    def test_fifo_eviction(self):
+        for i in range(5):
+            self.memory_store.store_discovery(f"Discovery {i}", {"index": i})
+        discoveries = [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+        self.assertEqual(discoveries, ["Discovery 2", "Discovery 3", "Discovery 4"])
+
+    def test_retrieve_returns_copy(self):
+        self.memory_store.store_discovery("Discovery")
+        memory = self.memory_store.retrieve_memory()
+        memory.clear()
+        self.assertEqual(len(self.memory_store.retrieve_memory()), 1)
+
+    def test_remove_discovery(self):
+        self.memory_store.store_discovery("Keep", {"category": "a"})
+        self.memory_store.store_discovery("Drop", {"category": "b"})
+        self.memory_store.store_discovery("Drop too", {"category": "b"})
+        self.memory_store.remove_discovery(metadata_key="category", metadata_value="b")
+        discoveries = [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+        self.assertEqual(discoveries, ["Keep"])
+
+    def test_repr_reports_oldest(self):
+        self.assertIn("oldest=None", repr(self.memory_store))
+        for i in range(4):
+            self.memory_store.store_discovery(i)
+        oldest = self.memory_store.retrieve_memory()[0]["timestamp"]
+        self.assertIn(f"oldest={oldest}", repr(self.memory_store))
+
+
+class TestRecord(unittest.TestCase):
+    def test_round_trip(self):
+        entry = {"timestamp": "2024-05-01T12:30:00.000250", "discovery": "D", "metadata": {"k": 1}}
+        record = Record.from_entry(entry)
+        self.assertEqual(record.to_dict(), entry)
+        self.assertEqual(dict(record), entry)
+        self.assertEqual(record["timestamp"], entry["timestamp"])
+        self.assertEqual(Record.from_entry(dict(entry, timestamp="2024-05-01T12:30:00")).to_dict()["timestamp"],
+                         "2024-05-01T12:30:00")
+
+    def test_timestamp_is_formatted_once(self):
+        record = Record(1_714_566_600_000_250, "D")
+        self.assertIsNone(record._timestamp)
+        self.assertEqual(record["timestamp"], "2024-05-01T12:30:00.000250")
+        self.assertIs(record.to_dict()["timestamp"], record["timestamp"])
+
+    def test_unpackable_timestamps_are_kept(self):
+        for timestamp in ("2024-05-01T12:30:00+02:00", "yesterday", None):
+            entry = {"timestamp": timestamp, "discovery": "D", "metadata": {}}
+            self.assertEqual(Record.from_entry(entry).to_dict(), entry)
+
+    def test_pickle(self):
+        for record in (Record(0, "D"), Record.from_entry({"timestamp": "x", "discovery": 1, "metadata": {"k": 2}})):
+            self.assertEqual(pickle.loads(pickle.dumps(record)).to_dict(), record.to_dict())
+
+    def test_smaller_than_entry_dict(self):
+        memory_store = MemoryStore()
+        memory_store.store_discovery(1)
+        entry = memory_store.retrieve_memory()[0]
+        self.assertLess(estimate_size(memory_store._memory[0]), estimate_size(entry) / 2)
+
+    def test_store_returns_fresh_dicts(self):
+        memory_store = MemoryStore()
+        memory_store.store_discovery("D")
+        memory_store.retrieve_memory()[0]["metadata"]["added"] = True
+        self.assertEqual(memory_store.retrieve_memory()[0]["metadata"], {})
+
+
+class TestMemoryStoreTimeRange(unittest.TestCase):
+    def _entry(self, timestamp, discovery):
+        return {"timestamp": timestamp, "discovery": discovery, "metadata": {}}
+
+    def _store(self, entries, max_size=100):
+        memory_store = MemoryStore(max_size=max_size)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "entries.jsonl")
+            with open(path, "w") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+            memory_store.import_memory(path, merge=True)
+        return memory_store
+
+    def _discoveries(self, entries):
+        return [entry["discovery"] for entry in entries]
+
+    def test_retrieve_range(self):
+        memory_store = self._store([self._entry(f"2024-01-01T00:0{i}:00", i) for i in range(6)])
+        self.assertEqual(self._discoveries(memory_store.retrieve_range("2024-01-01T00:02:00",
+                                                                      "2024-01-01T00:04:00")), [2, 3])
+        self.assertEqual(self._discoveries(memory_store.retrieve_range(end=datetime(2024, 1, 1, 0, 1))), [0])
+        self.assertEqual(self._discoveries(memory_store.retrieve_range(start="2024-01-01T00:04:30")), [5])
+
+    def test_out_of_order_import(self):
+        memory_store = self._store([self._entry("2024-01-01T00:05:00", "late"),
+                                    self._entry("2024-01-01T00:01:00", "early"),
+                                    self._entry("not a time", "raw")])
+        self.assertEqual(self._discoveries(memory_store.retrieve_range()), ["early", "late"])
+        memory_store.store_discovery("now")
+        self.assertEqual(self._discoveries(memory_store.retrieve_range(start="2024-01-01T00:02:00")),
+                         ["late", "now"])
+
+    def test_removed_and_evicted_entries_are_skipped(self):
+        memory_store = self._store([self._entry(f"2024-01-01T00:00:{i:02d}", i) for i in range(50)], max_size=10)
+        memory_store.remove_discoveries(range(40, 45))
+        self.assertEqual(self._discoveries(memory_store.retrieve_range()), [45, 46, 47, 48, 49])
+
+    def test_iter_since(self):
+        memory_store = MemoryStore()
+        memory_store.store_discovery("old")
+        old = memory_store.retrieve_memory()[0]["timestamp"]
+        memory_store.store_discovery("new")
+        iterator = memory_store.iter_since(old)
+        self.assertEqual(next(iterator)["discovery"], "old")
+        memory_store.remove_discovery("new")
+        self.assertEqual(list(iterator), [])
+        self.assertEqual(self._discoveries(memory_store.iter_since(timedelta(minutes=5))), ["old"])
+        with self.assertRaises(MemoryError):
+            memory_store.iter_since(42)
+
+
+class TestMemoryStoreIteration(unittest.TestCase):
+    def setUp(self):
+        self.memory_store = MemoryStore(max_size=10)
+        self.memory_store.store_discoveries(range(10))
+
+    def _discoveries(self, entries):
+        return [entry["discovery"] for entry in entries]
+
+    def test_iter_memory(self):
+        self.assertEqual(self._discoveries(self.memory_store.iter_memory(limit=3)), [0, 1, 2])
+        self.assertEqual(self._discoveries(self.memory_store.iter_memory(limit=2, reverse=True)), [9, 8])
+        odd = self.memory_store.iter_memory(lambda entry: entry["discovery"] % 2, limit=2)
+        self.assertEqual(self._discoveries(odd), [1, 3])
+        with self.assertRaises(MemoryError):
+            self.memory_store.iter_memory(limit=0)
+
+    def test_iteration_survives_stores_and_evictions(self):
+        iterator = self.memory_store.iter_memory()
+        self.assertEqual(next(iterator)["discovery"], 0)
+        self.memory_store.store_discoveries(range(10, 15))
+        self.assertEqual(self._discoveries(iterator), [5, 6, 7, 8, 9])
+
+    def test_iteration_bounds_are_fixed_when_called(self):
+        memory_store = MemoryStore(max_size=100)
+        memory_store.store_discoveries(range(3))
+        forward = memory_store.iter_memory()
+        backward = memory_store.iter_memory(reverse=True)
+        memory_store.store_discovery("later")
+        self.assertEqual(self._discoveries(forward), [0, 1, 2])
+        self.assertEqual(self._discoveries(backward), [2, 1, 0])
+
+    def test_iteration_survives_compaction(self):
+        memory_store = MemoryStore(max_size=100)
+        memory_store.store_discoveries(range(100))
+        iterator = memory_store.iter_memory()
+        next(iterator)
+        memory_store.remove_discoveries(range(1, 90))
+        self.assertEqual(self._discoveries(iterator), list(range(90, 100)))
+
+    def test_page_memory(self):
+        page, token = self.memory_store.page_memory(page_size=4)
+        self.assertEqual(self._discoveries(page), [0, 1, 2, 3])
+        self.memory_store.remove_discovery(4)
+        self.memory_store.store_discovery(10)
+        pages = []
+        while token:
+            page, token = self.memory_store.page_memory(page_size=4, page_token=token)
+            pages.append(self._discoveries(page))
+        self.assertEqual(pages, [[5, 6, 7, 8], [9, 10]])
+
+    def test_reverse_pages_and_bad_tokens(self):
+        page, token = self.memory_store.page_memory(page_size=6, reverse=True)
+        page, token = self.memory_store.page_memory(page_size=6, page_token=token, reverse=True)
+        self.assertEqual(self._discoveries(page), [3, 2, 1, 0])
+        self.assertIsNone(token)
+        _, token = self.memory_store.page_memory(page_size=2)
+        with self.assertRaises(MemoryError):
+            self.memory_store.page_memory(page_token=token, reverse=True)
+        with self.assertRaises(MemoryError):
+            self.memory_store.page_memory(page_token="garbage")
+
+
+class TestMemoryStoreBatch(unittest.TestCase):
+    def setUp(self):
+        self.memory_store = MemoryStore(max_size=5, indexed_keys=["sector"])
+
+    def _discoveries(self):
+        return [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+
+    def test_store_discoveries(self):
+        count = self.memory_store.store_discoveries(["A", "B"], [{"sector": 1}, None])
+        self.assertEqual(count, 2)
+        entries = self.memory_store.retrieve_memory()
+        self.assertEqual([entry["metadata"] for entry in entries], [{"sector": 1}, {}])
+        self.assertEqual(entries[0]["timestamp"], entries[1]["timestamp"])
+        self.assertEqual(len(self.memory_store.find(sector=1)), 1)
+
+    def test_batch_evicts_oldest_and_skips_overflow(self):
+        self.memory_store.store_discoveries(["A", "B", "C"])
+        self.memory_store.store_discoveries(["D", "E", "F"])
+        self.assertEqual(self._discoveries(), ["B", "C", "D", "E", "F"])
+        self.assertEqual(self.memory_store.store_discoveries(str(i) for i in range(8)), 5)
+        self.assertEqual(self._discoveries(), ["3", "4", "5", "6", "7"])
+
+    def test_invalid_batch_stores_nothing(self):
+        with self.assertRaises(MemoryError):
+            self.memory_store.store_discoveries(["A", "B"], [{"sector": 1}, "bad"])
+        with self.assertRaises(MemoryError):
+            self.memory_store.store_discoveries(["A", "B"], [{"sector": 1}])
+        self.assertEqual(self._discoveries(), [])
+
+    def test_remove_discoveries(self):
+        self.memory_store.store_discoveries(
+            ["A", "B", "C", ["unhashable"], "E"],
+            [{"sector": 1}, {"sector": 2}, {"sector": 3}, {"sector": 4}, {"sector": 1}]
+        )
+        self.assertEqual(self.memory_store.remove_discoveries(["B", ["unhashable"], "missing"]), 2)
+        self.assertEqual(self._discoveries(), ["A", "C", "E"])
+        self.assertEqual(self.memory_store.remove_discoveries(metadata_key="sector", metadata_values=[1]), 2)
+        self.assertEqual(self._discoveries(), ["C"])
+        with self.assertRaises(MemoryError):
+            self.memory_store.remove_discoveries()
+
+
+class TestMemoryStoreEviction(unittest.TestCase):
+    def _discoveries(self, memory_store):
+        return [entry["discovery"] for entry in memory_store.retrieve_memory()]
+
+    def test_lru_keeps_recently_read(self):
+        memory_store = MemoryStore(max_size=3, eviction="lru")
+        for name in ("A", "B", "C"):
+            memory_store.store_discovery(name, {"name": name})
+        memory_store.find(name="A")
+        memory_store.store_discovery("D")
+        self.assertEqual(sorted(self._discoveries(memory_store)), ["A", "C", "D"])
+
+    def test_lru_counts_search_reads(self):
+        memory_store = MemoryStore(max_size=2, eviction="lru")
+        memory_store.store_discovery("alpha signal")
+        memory_store.store_discovery("beta signal")
+        memory_store.search_knowledge("alpha")
+        memory_store.store_discovery("gamma signal")
+        self.assertEqual(sorted(self._discoveries(memory_store)), ["alpha signal", "gamma signal"])
+
+    def test_lfu_evicts_least_read(self):
+        memory_store = MemoryStore(max_size=3, eviction="lfu")
+        for name in ("A", "B", "C"):
+            memory_store.store_discovery(name, {"name": name})
+        memory_store.find(name="A")
+        memory_store.find(name="A")
+        memory_store.find(name="C")
+        memory_store.store_discovery("D")
+        self.assertNotIn("B", [entry["discovery"] for entry in memory_store.find()])
+        memory_store.store_discovery("E")
+        self.assertEqual(sorted(entry["discovery"] for entry in memory_store.find()), ["A", "C", "E"])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            MemoryStore(eviction="random")
+
+    def test_byte_budget(self):
+        memory_store = MemoryStore(max_size=100, max_bytes=5000)
+        memory_store.store_discovery("x" * 1500)
+        memory_store.store_discovery("y" * 1500)
+        memory_store.store_discovery("z" * 1500)
+        self.assertEqual([d[0] for d in self._discoveries(memory_store)], ["y", "z"])
+        for i in range(20):
+            memory_store.store_discovery(f"small {i}")
+        self.assertLessEqual(memory_store._bytes, 5000)
+        with self.assertRaises(MemoryError):
+            memory_store.store_discovery("w" * 6000)
+
+    def test_ttl_expiry(self):
+        clock = [100.0]
+        with mock.patch("mosaic.learning.eviction.time.monotonic", lambda: clock[0]):
+            memory_store = MemoryStore(max_size=10, default_ttl=60)
+            memory_store.store_discovery("Short", ttl=5)
+            memory_store.store_discovery("Default")
+            clock[0] += 10
+            self.assertEqual(self._discoveries(memory_store), ["Default"])
+            memory_store.store_discovery("Later")
+            clock[0] += 55
+            self.assertEqual(self._discoveries(memory_store), ["Later"])
+            with self.assertRaises(MemoryError):
+                memory_store.store_discovery("Bad", ttl=0)
+
+    def test_removed_entries_do_not_expire_later(self):
+        clock = [0.0]
+        with mock.patch("mosaic.learning.eviction.time.monotonic", lambda: clock[0]):
+            memory_store = MemoryStore(max_size=10)
+            memory_store.store_discovery("Gone", ttl=1)
+            memory_store.remove_discovery("Gone")
+            memory_store.store_discovery("Kept")
+            clock[0] += 2
+            self.assertEqual(self._discoveries(memory_store), ["Kept"])
+
+
+class TestMemoryStoreIndexes(unittest.TestCase):
+    def setUp(self):
+        self.memory_store = MemoryStore(max_size=4, indexed_keys=["category"])
+
+    def test_find_uses_index(self):
+        self.memory_store.store_discovery("Entanglement", {"category": "quantum", "level": 1})
+        self.memory_store.store_discovery("Black Hole", {"category": "astro", "level": 1})
+        self.memory_store.store_discovery("Tunnelling", {"category": "quantum", "level": 2})
+        found = self.memory_store.find(category="quantum")
+        self.assertEqual([entry["discovery"] for entry in found], ["Entanglement", "Tunnelling"])
+        found = self.memory_store.find(category="quantum", level=2)
+        self.assertEqual([entry["discovery"] for entry in found], ["Tunnelling"])
+        self.assertEqual(self.memory_store.find(category="missing"), [])
+
+    def test_find_on_unindexed_key(self):
+        self.memory_store.store_discovery("Entanglement", {"level": 1})
+        self.memory_store.store_discovery("Tunnelling", {"level": 2})
+        found = self.memory_store.find(level=2)
+        self.assertEqual([entry["discovery"] for entry in found], ["Tunnelling"])
+
+    def test_index_follows_eviction(self):
+        for i in range(6):
+            self.memory_store.store_discovery(i, {"category": "even" if i % 2 == 0 else "odd"})
+        self.assertEqual([entry["discovery"] for entry in self.memory_store.find(category="even")], [2, 4])
+        self.assertNotIn(0, self.memory_store._indexes["category"]["even"])
+
+    def test_remove_by_indexed_metadata(self):
+        self.memory_store.store_discovery("Keep", {"category": "a"})
+        self.memory_store.store_discovery("Drop", {"category": "b"})
+        self.memory_store.remove_discovery(metadata_key="category", metadata_value="b")
+        self.assertEqual(self.memory_store.find(category="b"), [])
+        self.assertNotIn("b", self.memory_store._indexes["category"])
+        self.assertEqual(len(self.memory_store.retrieve_memory()), 1)
+
+    def test_caller_metadata_changes_do_not_reach_index(self):
+        memory_store = MemoryStore(max_size=1, indexed_keys=["k"])
+        metadata = {"k": 1}
+        memory_store.store_discovery("a", metadata)
+        metadata["k"] = [1]
+        memory_store.retrieve_memory()[0]["metadata"]["k"] = [2]
+
+        def mutate(entry):
+            entry["metadata"]["k"] = [3]
+
+        with self.assertRaises(MemoryError):
+            memory_store.retrieve_memory(mutate)
+        self.assertEqual([entry["discovery"] for entry in memory_store.find(k=1)], ["a"])
+        memory_store.store_discovery("b", {"k": 2})
+        self.assertEqual(memory_store.find(k=1), [])
+        self.assertNotIn(1, memory_store._indexes["k"])
+
+    def test_create_index_on_existing_entries(self):
+        self.memory_store.store_discovery("Entanglement", {"level": 1})
+        self.memory_store.create_index("level")
+        self.assertEqual(len(self.memory_store.find(level=1)), 1)
+
+
+class TestMemoryStoreSearch(unittest.TestCase):
+    def setUp(self):
+        self.memory_store = MemoryStore(max_size=3)
+        self.memory_store.store_discovery("Pattern X23", {"category": "quantum"})
+        self.memory_store.store_discovery("Quantum Tunnel", {"category": "physics"})
+
+    def test_case_insensitive_term(self):
+        results = self.memory_store.search_knowledge("x23")
+        self.assertEqual([entry["discovery"] for entry in results], ["Pattern X23"])
+
+    def test_prefix_and_or(self):
+        results = self.memory_store.search_knowledge("quant*")
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.memory_store.search_knowledge("pattern tunnel"), [])
+        results = self.memory_store.search_knowledge("pattern tunnel", match_all=False)
+        self.assertEqual(len(results), 2)
+
+    def test_ranking_and_limit(self):
+        self.memory_store.store_discovery("Quantum quantum foam")
+        results = self.memory_store.search_knowledge("quantum", limit=1)
+        self.assertEqual([entry["discovery"] for entry in results], ["Quantum quantum foam"])
+
+    def test_index_follows_changes(self):
+        self.memory_store.search_knowledge("x23")
+        self.memory_store.store_discovery("Pattern Y7")
+        self.memory_store.store_discovery("Pattern Z9")
+        self.assertEqual(self.memory_store.search_knowledge("x23"), [])
+        self.memory_store.remove_discovery("Pattern Y7")
+        results = self.memory_store.search_knowledge("pattern")
+        self.assertEqual([entry["discovery"] for entry in results], ["Pattern Z9"])
+
+
+class TestMemoryStoreImportExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory_store = MemoryStore(max_size=3)
+        for i in range(3):
+            self.memory_store.store_discovery(f"Discovery {i}", {"index": i})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_round_trip_formats(self):
+        for name in ("memory.json", "memory.jsonl", "memory.jsonl.gz", "memory.json.gz"):
+            path = self._path(name)
+            self.memory_store.export_memory(path)
+            restored = MemoryStore(max_size=3)
+            restored.import_memory(path)
+            self.assertEqual(restored.retrieve_memory(), self.memory_store.retrieve_memory(), name)
+
+    def test_jsonl_has_one_entry_per_line(self):
+        path = self._path("memory.jsonl")
+        self.memory_store.export_memory(path)
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual([json.loads(line)["discovery"] for line in lines],
+                         ["Discovery 0", "Discovery 1", "Discovery 2"])
+
+    def test_import_legacy_indented_json(self):
+        path = self._path("legacy.json")
+        with open(path, "w") as f:
+            json.dump(self.memory_store.retrieve_memory(), f, indent=4)
+        restored = MemoryStore(max_size=2)
+        restored.import_memory(path)
+        self.assertEqual([entry["discovery"] for entry in restored.retrieve_memory()],
+                         ["Discovery 1", "Discovery 2"])
+
+    def test_import_rejects_non_entries(self):
+        path = self._path("bad.json")
+        with open(path, "w") as f:
+            json.dump([1, 2], f)
+        with self.assertRaises(MemoryError):
+            self.memory_store.import_memory(path)
+
+    def test_missing_file_keeps_memory(self):
+        with self.assertRaises(MemoryError):
+            self.memory_store.import_memory(self._path("missing.jsonl"))
+        self.assertEqual(len(self.memory_store.retrieve_memory()), 3)
+
+
+class TestMemorySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "memory.snap")
+        self.memory_store = MemoryStore(max_size=10, indexed_keys=["category"])
+        for i in range(6):
+            self.memory_store.store_discovery(f"Discovery {i}", {"category": "even" if i % 2 == 0 else "odd", "index": i})
+        self.memory_store.import_memory(self._legacy_entry_file(), merge=True)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _legacy_entry_file(self):
+        path = os.path.join(self.tmpdir.name, "legacy.json")
+        with open(path, "w") as f:
+            json.dump([{"timestamp": "2024-01-01T00:00:00+00:00", "discovery": [1, 2], "metadata": {}}], f)
+        return path
+
+    def test_snapshot_matches_store(self):
+        self.memory_store.save_snapshot(self.path)
+        with MemorySnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 7)
+            self.assertEqual(list(snapshot), self.memory_store.retrieve_memory())
+            self.assertEqual(snapshot[-1]["timestamp"], "2024-01-01T00:00:00+00:00")
+            self.assertEqual(snapshot.timestamp(0), self.memory_store.retrieve_memory()[0]["timestamp"])
+
+    def test_snapshot_find(self):
+        self.memory_store.save_snapshot(self.path)
+        with MemorySnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.find(category="odd"), self.memory_store.find(category="odd"))
+            self.assertEqual(snapshot.find(category="odd", index=3), self.memory_store.find(category="odd", index=3))
+            self.assertEqual(snapshot.find(index=4.0), self.memory_store.find(index=4))
+
+    def test_import_snapshot(self):
+        self.memory_store.save_snapshot(self.path)
+        restored = MemoryStore(max_size=10)
+        restored.import_memory(self.path)
+        self.assertEqual(restored.retrieve_memory(), self.memory_store.retrieve_memory())
+
+    def test_open_invalid_file(self):
+        with self.assertRaises(MemoryError):
+            MemorySnapshot(self._legacy_entry_file())
+
+
+class TestDurableMemoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.wal_dir = os.path.join(self.tmpdir.name, "wal")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _open(self, max_size=5, **kwargs):
+        return MemoryStore(max_size=max_size, indexed_keys=["category"],
+                           wal=WriteAheadLog(self.wal_dir, **kwargs))
+
+    def _discoveries(self, memory_store):
+        return [entry["discovery"] for entry in memory_store.retrieve_memory()]
+
+    def test_recovery_replays_log(self):
+        memory_store = self._open(sync_every=1)
+        for i in range(7):
+            memory_store.store_discovery(f"Discovery {i}", {"category": "odd" if i % 2 else "even"})
+        memory_store.remove_discovery("Discovery 4")
+        expected = memory_store.retrieve_memory()
+        memory_store.close()
+
+        recovered = self._open()
+        self.assertEqual(recovered.retrieve_memory(), expected)
+        self.assertEqual(self._discoveries(recovered), ["Discovery 2", "Discovery 3", "Discovery 5", "Discovery 6"])
+        self.assertEqual(len(recovered.find(category="odd")), 2)
+        recovered.close()
+
+    def test_clear_is_logged(self):
+        memory_store = self._open()
+        memory_store.store_discovery("Discovery")
+        memory_store.clear_memory()
+        memory_store.store_discovery("After clear")
+        memory_store.close()
+        self.assertEqual(self._discoveries(self._open()), ["After clear"])
+
+    def test_unserializable_entry_evicts_nothing(self):
+        memory_store = self._open(max_size=2, sync_every=1)
+        memory_store.store_discovery("a")
+        memory_store.store_discovery("b")
+        with self.assertRaises(MemoryError):
+            memory_store.store_discovery(object())
+        self.assertEqual(self._discoveries(memory_store), ["a", "b"])
+        memory_store.close()
+        self.assertEqual(self._discoveries(self._open()), ["a", "b"])
+
+    def test_unserializable_batch_stores_nothing(self):
+        memory_store = self._open(max_size=3, sync_every=1)
+        memory_store.store_discovery("a")
+        with self.assertRaises(MemoryError):
+            memory_store.store_discoveries(["x", "y", object(), "z"])
+        self.assertEqual(self._discoveries(memory_store), ["a"])
+        memory_store.close()
+        self.assertEqual(self._discoveries(self._open()), ["a"])
+
+    def test_unflushed_records_are_lost(self):
+        memory_store = self._open(sync_every=2)
+        memory_store.store_discovery("Synced 1")
+        memory_store.store_discovery("Synced 2")
+        memory_store.store_discovery("Buffered")
+        self.assertEqual(self._discoveries(self._open()), ["Synced 1", "Synced 2"])
+
+    def test_compaction(self):
+        memory_store = self._open(sync_every=1, compact_every=4)
+        for i in range(10):
+            memory_store.store_discovery(f"Discovery {i}")
+        memory_store.remove_discovery("Discovery 8")
+        expected = memory_store.retrieve_memory()
+        memory_store.close()
+        self.assertEqual(len([name for name in os.listdir(self.wal_dir) if name.endswith(".snap")]), 1)
+
+        recovered = self._open()
+        self.assertEqual(recovered.retrieve_memory(), expected)
+        recovered.store_discovery("Discovery 10")
+        recovered.remove_discovery("Discovery 9")
+        expected = recovered.retrieve_memory()
+        recovered.close()
+        self.assertEqual(self._open().retrieve_memory(), expected)
+
+    def test_torn_tail_is_truncated(self):
+        memory_store = self._open(sync_every=1)
+        memory_store.store_discovery("Complete")
+        memory_store.close()
+        log_path = WriteAheadLog(self.wal_dir).log_path()
+        with open(log_path, "ab") as f:
+            f.write(b"\x20\x00\x00\x00partial")
+
+        recovered = self._open(sync_every=1)
+        self.assertEqual(self._discoveries(recovered), ["Complete"])
+        recovered.store_discovery("Next")
+        recovered.close()
+        self.assertEqual(self._discoveries(self._open()), ["Complete", "Next"])
+
+
+class TestMemoryStoreSimilarity(unittest.TestCase):
+    def setUp(self):
+        self.memory_store = MemoryStore(max_size=3, embedding_dim=3)
+        self.memory_store.store_discovery("East", embedding=[1.0, 0.0, 0.0])
+        self.memory_store.store_discovery("North", embedding=[0.0, 1.0, 0.0])
+        self.memory_store.store_discovery("Up", embedding=[0.0, 0.0, 2.0])
+
+    def _discoveries(self, entries):
+        return [entry["discovery"] for entry in entries]
+
+    def test_search_similar_ranks_by_cosine(self):
+        results = self.memory_store.search_similar([0.9, 0.1, 0.0], limit=2)
+        self.assertEqual(self._discoveries(results), ["East", "North"])
+
+    def test_dot_metric_uses_magnitude(self):
+        results = self.memory_store.search_similar([1.0, 0.0, 1.0], limit=1, metric="dot")
+        self.assertEqual(self._discoveries(results), ["Up"])
+
+    def test_batch_search(self):
+        results = self.memory_store.search_similar_batch(np.eye(3), limit=1)
+        self.assertEqual([self._discoveries(r) for r in results], [["East"], ["North"], ["Up"]])
+
+    def test_eviction_and_removal_drop_embeddings(self):
+        self.memory_store.store_discovery("West", embedding=[-1.0, 0.0, 0.0])
+        self.memory_store.remove_discovery("North")
+        results = self.memory_store.search_similar([1.0, 0.0, 0.0], limit=5)
+        self.assertEqual(self._discoveries(results), ["Up", "West"])
+
+    def test_entries_without_embeddings_are_skipped(self):
+        self.memory_store.store_discovery("Plain")
+        results = self.memory_store.search_similar([0.0, 1.0, 0.0], limit=5)
+        self.assertNotIn("Plain", self._discoveries(results))
+
+    def test_approximate_search(self):
+        memory_store = MemoryStore(max_size=500, embedding_dim=16)
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((500, 16))
+        for i, vector in enumerate(vectors):
+            memory_store.store_discovery(f"Discovery {i}", embedding=vector)
+        memory_store.enable_approximate_search(num_tables=8, num_bits=4, seed=1)
+        results = memory_store.search_similar(vectors[42], limit=1, approximate=True)
+        self.assertEqual(self._discoveries(results), ["Discovery 42"])
+
+    def test_invalid_embeddings(self):
+        with self.assertRaises(MemoryError):
+            self.memory_store.store_discovery("Bad", embedding=[1.0, 2.0])
+        self.assertEqual(len(self.memory_store.retrieve_memory()), 3)
+        with self.assertRaises(MemoryError):
+            MemoryStore().store_discovery("No index", embedding=[1.0])
+        with self.assertRaises(MemoryError):
+            MemoryStore().search_similar([1.0])
+        with self.assertRaises(MemoryError):
+            self.memory_store.search_similar([1.0, 0.0, 0.0], approximate=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from navigator_with_items import Navigator, ExplorationMode, ItemType, Item, NavigationError
+from mosaic.exploration import Navigator, ExplorationMode, ItemType, Item, NavigationError
 
 class TestNavigator(unittest.TestCase):
     def setUp(self):
@@ -43,13 +43,14 @@ class TestNavigator(unittest.TestCase):
     
     def test_item_collection_during_exploration(self):
         """Test if items can be collected during exploration."""
-        initial_inventory_size = len(self.navigator.get_inventory())
+        navigator = Navigator(find_items=True)
+        initial_inventory_size = len(navigator.get_inventory())
         
         # Simulate multiple explorations to ensure an item is found
         for _ in range(10):
-            self.navigator.explore("West")
+            navigator.explore("West")
         
-        self.assertGreater(len(self.navigator.get_inventory()), initial_inventory_size)
+        self.assertGreater(len(navigator.get_inventory()), initial_inventory_size)
     
     def test_use_item(self):
         """Test using an item from inventory."""
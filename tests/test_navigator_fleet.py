@@ -0,0 +1,158 @@
+import unittest
+from unittest import mock
+import numpy as np
+from mosaic.exploration import (Direction, ExplorationMode, FrontierPlanner, NavigationError, Navigator,
+                                NavigatorFleet, NavigatorView)
+
+
+class TestNavigatorFleet(unittest.TestCase):
+    def setUp(self):
+        self.fleet = NavigatorFleet(4)
+
+    def test_initial_state(self):
+        self.assertEqual(len(self.fleet), 4)
+        self.assertEqual(self.fleet.get_energy().tolist(), [Navigator.MAX_ENERGY] * 4)
+        self.assertEqual(self.fleet[2].get_current_location(), "Starting Point")
+        self.assertEqual(self.fleet[-1].get_exploration_history(), {"Starting Point": 1})
+        self.assertEqual(self.fleet.get_exploration_modes(), [ExplorationMode.SAFE] * 4)
+
+    def test_matches_navigator_energy_rules(self):
+        navigator = Navigator()
+        directions = ["north", "east", None, "north", "west", "south", "east", "north", "up", "down", "north"]
+        for direction in directions:
+            moved = self.fleet.explore(direction)
+            try:
+                navigator.explore(direction)
+                self.assertTrue(moved.all())
+            except NavigationError:
+                self.assertFalse(moved.any())
+                navigator.rest()
+                self.fleet.rest()
+        view = self.fleet[3]
+        self.assertEqual(view.get_energy(), navigator.get_energy())
+        self.assertEqual(view.get_current_location(), navigator.get_current_location())
+        self.assertEqual(view.get_exploration_history(), navigator.get_exploration_history())
+        self.assertEqual({location: sorted(targets) for location, targets in view.get_exploration_map().items()},
+                         {location: sorted(targets) for location, targets in navigator.get_exploration_map().items()})
+
+    def test_per_navigator_directions_and_selection(self):
+        moved = self.fleet.explore(["north", "east"], agents=[1, 3])
+        self.assertEqual(moved.tolist(), [True, True])
+        self.assertEqual([view.get_current_location() for view in (self.fleet[i] for i in range(4))],
+                         ["Starting Point", "North Realm", "Starting Point", "East Realm"])
+        self.assertEqual(self.fleet.get_energy().tolist(), [100, 90, 100, 90])
+
+        north = self.fleet.realm_id("North")
+        self.fleet.explore(np.array([north] * 4))
+        self.assertEqual(self.fleet.location_name(self.fleet.get_locations()[0]), "North Realm")
+        self.assertEqual(self.fleet[3].find_route("North Realm", "Starting Point"),
+                         ["Starting Point", "East Realm", "North Realm"])
+
+        self.fleet.set_exploration_mode(ExplorationMode.STEALTH, agents=np.array([True, False, False, True]))
+        self.assertEqual(self.fleet[3]._exploration_mode, ExplorationMode.STEALTH)
+        self.assertEqual(self.fleet[1]._exploration_mode, ExplorationMode.SAFE)
+
+    def test_step_explores_or_rests(self):
+        self.fleet[0]._energy = 5
+        moved = self.fleet.step("north")
+        self.assertEqual(moved.tolist(), [False, True, True, True])
+        self.assertEqual(self.fleet.get_energy().tolist(), [35, 90, 90, 90])
+        self.assertEqual(self.fleet[0].get_current_location(), "Starting Point")
+
+    def test_items_follow_the_navigator_flag(self):
+        self.fleet.step("north")
+        self.assertEqual(self.fleet.get_item_counts().sum(), 0)
+        fleet = NavigatorFleet(1000, find_items=True, seed=0)
+        moved = fleet.explore("north", agents=slice(0, 500))
+        self.assertTrue(moved.all())
+        counts = fleet.get_item_counts()
+        self.assertEqual(counts.shape, (1000, len(Navigator.ITEM_TABLE)))
+        self.assertEqual(counts[500:].sum(), 0)
+        self.assertLessEqual(counts.sum(axis=1).max(), 1)
+        self.assertAlmostEqual(counts.sum() / 500, Navigator.ITEM_FIND_CHANCE, delta=0.08)
+
+    def test_view_explore_errors(self):
+        view = self.fleet[0]
+        view._energy = 0
+        with self.assertRaises(NavigationError):
+            view.explore("East")
+        view.rest()
+        with self.assertRaises(ValueError):
+            view.explore(42)
+        self.assertEqual(view.explore("east"), "East Realm")
+        self.assertEqual(self.fleet[1].get_current_location(), "Starting Point")
+
+    def test_view_offers_the_navigator_api(self):
+        def public(cls):
+            return {name for name in dir(cls) if not name.startswith('_')}
+        self.assertEqual(public(Navigator) - public(NavigatorView), {"replay"})
+
+    def test_view_matches_navigator(self):
+        navigator = Navigator(symbols=self.fleet.get_symbols())
+        view = self.fleet[2]
+        for target in (navigator, view):
+            target.explore("north")
+            target.explore("east")
+            target.navigate(Direction.EAST, 200)
+            target.navigate(Direction.NORTH, 3)
+        self.assertEqual(view.get_visit_count("North Realm"), navigator.get_visit_count("North Realm"))
+        self.assertEqual(view.get_visit_count("Nowhere"), 0)
+        self.assertEqual(dict(view.get_history_view()), dict(navigator.get_history_view()))
+        self.assertEqual(dict(view.get_exploration_map_view()), dict(navigator.get_exploration_map_view()))
+        self.assertEqual(view.get_position(), navigator.get_position())
+        self.assertEqual(view.nearest_visited(), navigator.nearest_visited())
+        self.assertEqual(len(view.get_spatial_index()), len(navigator.get_spatial_index()))
+        self.assertEqual(self.fleet[1].get_position(), (0, 0))
+        self.assertIsNone(view.get_session())
+
+    def test_view_inventory(self):
+        view = self.fleet[0]
+        self.fleet._items[0, 0] = 2
+        self.assertEqual(view.get_inventory_counts(), {"Energy Bar": 2})
+        self.assertEqual(view.get_inventory(), [Navigator.ITEM_TABLE.items[0]] * 2)
+        view._energy = 50
+        self.assertEqual(view.use_item("energy bar").name, "Energy Bar")
+        self.assertEqual(view.get_energy(), 70)
+        view.discard_item("Energy Bar")
+        self.assertEqual(view.get_inventory(), [])
+        self.assertIsNone(view.use_item("Energy Bar"))
+        with self.assertRaises(ValueError):
+            view.discard_item("Compass")
+
+    def test_planner_drives_a_view(self):
+        view = self.fleet[1]
+        stats = FrontierPlanner(view, ["north", "south", "east", "west"], seed=0).run(200)
+        self.assertEqual(stats.energy_spent, 200)
+        self.assertEqual(stats.new_realms, 4)
+        self.assertEqual(view.get_current_location(), self.fleet.location_name(int(self.fleet.get_locations()[1])))
+        self.assertEqual(self.fleet[0].get_exploration_history(), {"Starting Point": 1})
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            NavigatorFleet(0)
+        with self.assertRaises(ValueError):
+            NavigatorFleet(2, max_spatial_chunks=0)
+        with self.assertRaises(ValueError):
+            self.fleet.explore(["north"])
+        with self.assertRaises(ValueError):
+            self.fleet.explore(agents=[7])
+        with self.assertRaises(ValueError):
+            self.fleet.set_exploration_mode("SAFE")
+        with self.assertRaises(IndexError):
+            self.fleet[4]
+        with self.assertRaises(ValueError):
+            self.fleet.get_energy()[0] = 1
+
+
+class TestNavigatorFleetEagerMerge(TestNavigatorFleet):
+    """Runs the fleet tests with visit and move keys merged on every batch"""
+
+    def setUp(self):
+        patcher = mock.patch("mosaic.exploration.fleet._MIN_MERGE", -1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import random
+import tempfile
+import unittest
+from mosaic.exploration import (
+    Direction, ExplorationMode, ExplorationSession, NavigationError, Navigator, spawn_seeds
+)
+
+
+def positions(navigator, count=5):
+    result = []
+    for _ in range(count):
+        navigator.navigate_to_random_location()
+        result.append(navigator.get_position())
+    return result
+
+
+class TestNavigatorRandomStreams(unittest.TestCase):
+    def test_same_seed_same_run(self):
+        self.assertEqual(positions(Navigator(seed=7)), positions(Navigator(seed=7)))
+        self.assertNotEqual(positions(Navigator(seed=7)), positions(Navigator(seed=8)))
+
+    def test_spawned_seeds_are_independent_and_reproducible(self):
+        first, second = spawn_seeds(42, 2)
+        again = spawn_seeds(42, 2)
+        self.assertEqual(positions(Navigator(seed=first)), positions(Navigator(seed=again[0])))
+        self.assertNotEqual(positions(Navigator(seed=first)), positions(Navigator(seed=second)))
+
+    def test_global_random_state_is_untouched(self):
+        random.seed(3)
+        expected = random.random()
+        random.seed(3)
+        positions(Navigator(seed=1))
+        self.assertEqual(random.random(), expected)
+
+
+class TestExplorationSession(unittest.TestCase):
+    def setUp(self):
+        self.navigator = Navigator("Lobby", seed=11, record=True)
+        self.navigator.set_exploration_mode(ExplorationMode.STEALTH)
+        for direction in ["north", "east", None] * 4:
+            try:
+                self.navigator.explore(direction)
+            except NavigationError:
+                self.navigator.rest()
+        self.navigator.navigate(Direction.WEST, 3)
+        positions(self.navigator, 3)
+        self.session = self.navigator.get_session()
+
+    def test_records_every_call_including_errors(self):
+        self.assertIsNone(Navigator().get_session())
+        methods = [name for name, *_ in self.session.calls()]
+        self.assertEqual(methods[0], "set_exploration_mode")
+        self.assertEqual(methods.count("navigate_to_random_location"), 3)
+        errors = [error for *_, error in self.session.calls() if error]
+        self.assertEqual(errors, ["NavigationError"] * methods.count("rest"))
+
+    def test_replay_is_bit_for_bit(self):
+        replayed, timings = Navigator.replay(self.session)
+        self.assertEqual(replayed.get_position(), self.navigator.get_position())
+        self.assertEqual(replayed.get_exploration_history(), self.navigator.get_exploration_history())
+        self.assertEqual(replayed.get_energy(), self.navigator.get_energy())
+        self.assertEqual(replayed._exploration_mode, ExplorationMode.STEALTH)
+        self.assertEqual(positions(replayed), positions(self.navigator))
+        self.assertIn("explore", timings)
+
+    def test_save_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.jsonl")
+            self.session.save(path)
+            loaded = ExplorationSession.load(path)
+        self.assertEqual(len(loaded), len(self.session))
+        replayed, _ = Navigator.replay(loaded)
+        self.assertEqual(replayed.get_position(), self.navigator.get_position())
+        self.assertEqual(replayed.get_current_location(), self.navigator.get_current_location())
+
+    def test_divergence_is_detected(self):
+        self.session._events[1]['result'] = "Somewhere Else"
+        with self.assertRaises(NavigationError):
+            Navigator.replay(self.session)
+        Navigator.replay(self.session, verify=False)
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.jsonl")
+            with open(path, "w") as f:
+                f.write("not json\n")
+            with self.assertRaises(ValueError):
+                ExplorationSession.load(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
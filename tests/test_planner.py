@@ -0,0 +1,80 @@
+import unittest
+from mosaic.exploration import (
+    ExplorationMode, FrontierPlanner, ModeWeights, Navigator, RandomPlanner, SymbolTable
+)
+
+DIRECTIONS = [f"corridor {i}" for i in range(12)]
+
+
+class TestFrontierPlanner(unittest.TestCase):
+    def setUp(self):
+        self.navigator = Navigator(seed=0, symbols=SymbolTable())
+        self.navigator.set_exploration_mode(ExplorationMode.AGGRESSIVE)
+        self.planner = FrontierPlanner(self.navigator, DIRECTIONS + ["Corridor 0"], seed=0)
+
+    def test_visits_every_realm_before_revisiting(self):
+        self.assertEqual(len(self.planner), len(DIRECTIONS))
+        stats = self.planner.run(len(DIRECTIONS) * Navigator.ENERGY_COST)
+        self.assertEqual(stats.explores, len(DIRECTIONS))
+        self.assertEqual(stats.new_realms, len(DIRECTIONS))
+        self.assertEqual(stats.energy_spent, len(DIRECTIONS) * Navigator.ENERGY_COST)
+        self.assertEqual(stats.realms_per_energy, 10.0)
+        history = self.navigator.get_exploration_history()
+        self.assertEqual(sorted(history.values()), [1] * (len(DIRECTIONS) + 1))
+
+        self.planner.run(len(DIRECTIONS) * Navigator.ENERGY_COST)
+        self.assertEqual(set(self.navigator.get_exploration_history().values()), {1, 2})
+
+    def test_follows_visits_made_outside_the_planner(self):
+        self.navigator.explore("corridor 0")
+        self.navigator.explore("corridor 1")
+        self.assertEqual(self.planner.choose(), "corridor 2")
+        self.assertEqual(self.planner.frontier(2), [("Corridor 2 Realm", 0), ("Corridor 3 Realm", 0)])
+
+    def test_rest_schedule_respects_mode_reserve(self):
+        self.navigator.set_exploration_mode(ExplorationMode.SAFE)
+        reserve = FrontierPlanner.MODE_WEIGHTS[ExplorationMode.SAFE].reserve
+        stats = self.planner.run(300)
+        self.assertGreater(stats.rests, 0)
+        self.assertEqual(stats.energy_spent, 300)
+        self.navigator._energy = Navigator.ENERGY_COST + reserve - 1
+        self.assertTrue(self.planner.needs_rest())
+        self.assertIsNone(self.planner.step())
+        self.assertEqual(self.navigator.get_energy(), Navigator.ENERGY_COST + reserve - 1 + Navigator.RESTORE_ENERGY)
+        self.assertFalse(self.planner.needs_rest())
+
+    def test_stealth_jitter_varies_order_reproducibly(self):
+        def first_moves(seed):
+            navigator = Navigator(seed=0, symbols=SymbolTable())
+            navigator.set_exploration_mode(ExplorationMode.STEALTH)
+            planner = FrontierPlanner(navigator, DIRECTIONS, seed=seed)
+            return [move for move in (planner.step() for _ in range(len(DIRECTIONS))) if move]
+
+        moves = first_moves(1)
+        self.assertEqual(moves, first_moves(1))
+        self.assertNotEqual(moves, first_moves(2))
+        self.assertEqual(len(set(moves)), len(moves))
+
+    def test_beats_random_directions(self):
+        navigator = Navigator(seed=0, symbols=SymbolTable())
+        navigator.set_exploration_mode(ExplorationMode.AGGRESSIVE)
+        random_stats = RandomPlanner(navigator, DIRECTIONS, seed=3).run(120)
+        frontier_stats = self.planner.run(120)
+        self.assertEqual(frontier_stats.new_realms, len(DIRECTIONS))
+        self.assertLess(random_stats.new_realms, frontier_stats.new_realms)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            FrontierPlanner(self.navigator, [])
+        with self.assertRaises(ValueError):
+            RandomPlanner(self.navigator, ["north", None])
+        with self.assertRaises(ValueError):
+            self.planner.run(-1)
+        with self.assertRaises(ValueError):
+            ModeWeights(reserve=Navigator.MAX_ENERGY)
+        with self.assertRaises(ValueError):
+            ModeWeights(jitter=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from mosaic.learning.memory_store import MemoryError
+from mosaic.learning.snapshot import MemorySnapshot
+from mosaic.learning.sharded_store import ShardedMemoryStore, shard_of
+
+
+def is_quantum(entry):
+    return entry['metadata'].get('category') == 'quantum'
+
+
+class TestShardedMemoryStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.memory_store = ShardedMemoryStore(max_size=100, num_shards=3, indexed_keys=["category"], batch_size=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.memory_store.close()
+
+    def setUp(self):
+        self.memory_store.clear_memory()
+        for i in range(10):
+            self.memory_store.store_discovery(f"Pattern X{i}", {"category": "quantum" if i % 2 else "astro"})
+
+    def test_retrieve_merges_in_insertion_order(self):
+        discoveries = [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+        self.assertEqual(discoveries, [f"Pattern X{i}" for i in range(10)])
+        self.assertEqual(len(self.memory_store), 10)
+
+    def test_filter_find_and_search(self):
+        self.assertEqual(len(self.memory_store.retrieve_memory(is_quantum)), 5)
+        self.assertEqual(len(self.memory_store.find(category="astro")), 5)
+        results = self.memory_store.search_knowledge("x3")
+        self.assertEqual([entry["discovery"] for entry in results], ["Pattern X3"])
+        self.assertEqual(len(self.memory_store.shard_timings), 3)
+
+    def test_unpicklable_filter(self):
+        with self.assertRaises(MemoryError):
+            self.memory_store.retrieve_memory(lambda entry: True)
+
+    def test_remove(self):
+        self.memory_store.remove_discovery("Pattern X4")
+        self.memory_store.remove_discovery(metadata_key="category", metadata_value="quantum")
+        discoveries = [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+        self.assertEqual(discoveries, ["Pattern X0", "Pattern X2", "Pattern X6", "Pattern X8"])
+        with self.assertRaises(MemoryError):
+            self.memory_store.remove_discovery()
+
+    def test_snapshot_and_import_round_trip(self):
+        expected = self.memory_store.retrieve_memory()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memory.snap")
+            self.memory_store.save_snapshot(path)
+            with MemorySnapshot(path) as snapshot:
+                self.assertEqual(len(snapshot.find(category="quantum")), 5)
+            self.memory_store.clear_memory()
+            self.memory_store.import_memory(path)
+        self.assertEqual(self.memory_store.retrieve_memory(), expected)
+
+    def test_import_merges_out_of_order_and_missing_timestamps(self):
+        entries = [
+            {"timestamp": f"2024-01-01T00:00:{second:02d}", "discovery": f"Pattern T{second}", "metadata": {}}
+            for second in (30, 10, 50, 20, 40, 0)
+        ]
+        entries.append({"timestamp": None, "discovery": "Pattern Undated", "metadata": {}})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memory.json")
+            with open(path, "w") as f:
+                json.dump(entries, f)
+            self.memory_store.import_memory(path)
+        discoveries = [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+        self.assertEqual(discoveries, ["Pattern Undated"] + [f"Pattern T{second}" for second in range(0, 60, 10)])
+
+    def test_create_index(self):
+        self.memory_store.create_index("category")
+        self.memory_store.create_index("missing")
+        self.assertEqual(len(self.memory_store.find(category="quantum", missing=None)), 0)
+        self.assertEqual(len(self.memory_store.find(category="quantum")), 5)
+        with self.assertRaises(ValueError):
+            self.memory_store.create_index("")
+
+    def test_unpicklable_store_is_reported_once(self):
+        self.memory_store.store_discovery("Locked", {"lock": threading.Lock()})
+        with self.assertRaises(MemoryError):
+            self.memory_store.flush()
+        discoveries = [entry["discovery"] for entry in self.memory_store.retrieve_memory()]
+        self.assertEqual(discoveries, [f"Pattern X{i}" for i in range(10)])
+
+    def test_stable_partitioning(self):
+        self.assertEqual(shard_of("Pattern X1", 8), shard_of("Pattern X1", 8))
+        self.assertEqual(len({shard_of(f"Pattern X{i}", 4) for i in range(100)}), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
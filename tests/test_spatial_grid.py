@@ -0,0 +1,134 @@
+import unittest
+import numpy as np
+from mosaic.exploration import Direction, Navigator, SpatialGrid
+from mosaic.exploration.spatial import CHUNK_SIZE
+
+
+class TestSpatialGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = SpatialGrid()
+        for cell in [(0, 0), (3, 4), (-70, 5), (200, -200), (3, 4)]:
+            self.grid.visit(*cell)
+
+    def test_visits_are_counted_per_cell(self):
+        self.assertEqual(len(self.grid), 4)
+        self.assertEqual(self.grid.visits(3, 4), 2)
+        self.assertEqual(self.grid.visits(-70, 5), 1)
+        self.assertEqual(self.grid.visits(1, 1), 0)
+        self.assertIn((200, -200), self.grid)
+        self.assertEqual(self.grid.chunk_count, 3)
+
+    def test_visit_many_matches_visit(self):
+        rng = np.random.default_rng(0)
+        xs, ys = rng.integers(-300, 300, 2000), rng.integers(-300, 300, 2000)
+        batched, single = SpatialGrid(), SpatialGrid()
+        batched.visit_many(xs, ys)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            single.visit(x, y)
+        self.assertEqual(len(batched), len(single))
+        np.testing.assert_array_equal(batched.heatmap(-300, -300, 300, 300), single.heatmap(-300, -300, 300, 300))
+
+    def test_nearest(self):
+        self.assertEqual(self.grid.nearest(2, 2), (3, 4))
+        self.assertEqual(self.grid.nearest(0, 0), (0, 0))
+        self.assertEqual(self.grid.nearest(0, 0, exclude_origin=True), (3, 4))
+        self.assertEqual(self.grid.nearest(150, -150), (200, -200))
+        self.assertIsNone(self.grid.nearest(1000, 1000, max_distance=10))
+        self.assertIsNone(SpatialGrid().nearest(0, 0))
+
+    def test_nearest_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        cells = rng.integers(-1000, 1000, (300, 2))
+        grid = SpatialGrid()
+        grid.visit_many(cells[:, 0], cells[:, 1])
+        for x, y in rng.integers(-1200, 1200, (50, 2)).tolist():
+            nearest = grid.nearest(x, y)
+            best = ((cells - (x, y)) ** 2).sum(axis=1).min()
+            self.assertEqual((nearest[0] - x) ** 2 + (nearest[1] - y) ** 2, best)
+
+    def test_within(self):
+        cells = sorted(map(tuple, self.grid.within(0, 0, 5).tolist()))
+        self.assertEqual(cells, [(0, 0), (3, 4)])
+        self.assertEqual(len(self.grid.within(0, 0, 4.9)), 1)
+        self.assertEqual(self.grid.within(500, 500, 1).shape, (0, 2))
+        with self.assertRaises(ValueError):
+            self.grid.within(0, 0, -1)
+
+    def test_heatmap(self):
+        heatmap = self.grid.heatmap(-1, -1, 5, 5)
+        self.assertEqual(heatmap.shape, (6, 6))
+        self.assertEqual(heatmap[1, 1], 1)
+        self.assertEqual(heatmap[5, 4], 2)
+        self.assertEqual(self.grid.heatmap(0, 0, 6, 6, cell_size=4).tolist(), [[1, 0], [2, 0]])
+        self.assertEqual(self.grid.bounds(), (-2 * CHUNK_SIZE, -4 * CHUNK_SIZE, 4 * CHUNK_SIZE, CHUNK_SIZE))
+
+    def test_max_chunks_drops_least_recently_visited(self):
+        grid = SpatialGrid(max_chunks=2)
+        grid.visit(0, 0)
+        grid.visit(CHUNK_SIZE, 0)
+        grid.visit(0, 1)
+        grid.visit(2 * CHUNK_SIZE, 0)
+        self.assertEqual(grid.chunk_count, 2)
+        self.assertEqual(len(grid), 3)
+        self.assertEqual(grid.visits(CHUNK_SIZE, 0), 0)
+        self.assertEqual(grid.visits(0, 1), 1)
+        with self.assertRaises(ValueError):
+            SpatialGrid(max_chunks=0)
+
+    def test_bounded_visit_many_keeps_most_recent_chunks(self):
+        rng = np.random.default_rng(2)
+        xs, ys = rng.integers(-300, 300, 2000), rng.integers(-300, 300, 2000)
+        batched, single = SpatialGrid(max_chunks=5), SpatialGrid(max_chunks=5)
+        for grid in (batched, single):
+            grid.visit(1000, 1000)
+        batched.visit_many(xs, ys)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            single.visit(x, y)
+        self.assertEqual(list(batched._chunks), list(single._chunks))
+        self.assertEqual(batched.visits(1000, 1000), 0)
+        self.assertEqual(batched.visits(xs[-1], ys[-1]), np.count_nonzero((xs == xs[-1]) & (ys == ys[-1])))
+
+
+class TestNavigatorCoordinates(unittest.TestCase):
+    def test_navigate_records_path(self):
+        navigator = Navigator()
+        navigator.navigate(Direction.NORTH, 3)
+        navigator.navigate(Direction.EAST, 2)
+        self.assertEqual(navigator.get_position(), (2, 3))
+        self.assertEqual(navigator.get_current_location(), "Starting Point")
+        self.assertEqual(len(navigator.get_spatial_index()), 6)
+        self.assertEqual(navigator.nearest_visited(), (1, 3))
+        self.assertEqual(navigator.nearest_visited(exclude_current=False), (2, 3))
+
+    def test_long_paths_stay_within_max_chunks(self):
+        navigator = Navigator(max_spatial_chunks=4)
+        navigator.navigate(Direction.NORTH, 10)
+        navigator.navigate(Direction.EAST, 2_000_000)
+        grid = navigator.get_spatial_index()
+        self.assertEqual(navigator.get_position(), (2_000_000, 10))
+        self.assertEqual(grid.chunk_count, 4)
+        self.assertEqual(grid.visits(2_000_000, 10), 1)
+
+        reference = SpatialGrid(max_chunks=4)
+        for step in range(2_000_000 - 4 * CHUNK_SIZE, 2_000_001):
+            reference.visit(step, 10)
+        self.assertEqual(list(grid._chunks), list(reference._chunks))
+        self.assertEqual(len(grid), len(reference))
+
+    def test_navigate_to_random_location(self):
+        navigator = Navigator()
+        navigator.navigate_to_random_location()
+        x, y = navigator.get_position()
+        self.assertTrue(-100 <= x <= 100 and -100 <= y <= 100)
+        self.assertIn((x, y), navigator.get_spatial_index())
+
+    def test_navigate_validates_arguments(self):
+        navigator = Navigator()
+        with self.assertRaises(ValueError):
+            navigator.navigate("NORTH", 1)
+        with self.assertRaises(ValueError):
+            navigator.navigate(Direction.SOUTH, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import unittest
+from mosaic.exploration import Navigator, NavigatorFleet, SymbolTable
+
+
+class TestSymbolTable(unittest.TestCase):
+    def setUp(self):
+        self.symbols = SymbolTable(["Starting Point"])
+
+    def test_intern_and_resolve(self):
+        self.assertEqual(self.symbols.intern("Starting Point"), 0)
+        hall = self.symbols.intern("Hall")
+        self.assertEqual(hall, 1)
+        self.assertEqual(self.symbols.intern("Hall"), hall)
+        self.assertEqual(self.symbols.name(hall), "Hall")
+        self.assertEqual(self.symbols.names([1, 0]), ["Hall", "Starting Point"])
+        self.assertEqual(self.symbols.get("Hall"), 1)
+        self.assertIsNone(self.symbols.get("Attic"))
+        self.assertIn("Hall", self.symbols)
+        self.assertEqual(len(self.symbols), 2)
+        with self.assertRaises(IndexError):
+            self.symbols.name(-1)
+        with self.assertRaises(IndexError):
+            self.symbols.name(2)
+
+    def test_realms_are_memoized(self):
+        north = self.symbols.realm("north")
+        self.assertEqual(self.symbols.name(north), "North Realm")
+        self.assertEqual(self.symbols.realm("north"), north)
+        self.assertEqual(self.symbols.realm("NORTH"), north)
+        self.assertEqual(self.symbols.realm(None), self.symbols.realm(""))
+        self.assertEqual(self.symbols.name(self.symbols.realm()), "New Realm")
+        self.assertIs(self.symbols.name(north), self.symbols.name(self.symbols.realm("North")))
+        for direction in (42, ["north"]):
+            with self.assertRaises(ValueError):
+                self.symbols.realm(direction)
+
+    def test_direction_spellings_share_one_realm(self):
+        north = self.symbols.realm("north")
+        for direction in ("North", "NORTH", "nOrTh"):
+            self.assertEqual(self.symbols.realm(direction), north)
+        self.assertEqual(set(self.symbols._realms), {"north", "North", "NORTH", "nOrTh"})
+        self.assertEqual(len(self.symbols), 2)
+
+    def test_known_spelling_is_not_capitalized_again(self):
+        calls = []
+
+        class Spelling(str):
+            def capitalize(self):
+                calls.append(self)
+                return super().capitalize()
+
+        east = self.symbols.realm(Spelling("east"))
+        self.assertEqual(self.symbols.realm(Spelling("east")), east)
+        self.assertEqual(self.symbols.name(east), "East Realm")
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_interning_gives_one_id_per_name(self):
+        names = [f"Room {i}" for i in range(500)]
+        results = []
+
+        def intern_all():
+            results.append([self.symbols.intern(name) for name in names])
+
+        threads = [threading.Thread(target=intern_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len(self.symbols), len(names) + 1)
+
+    def test_navigators_and_fleets_share_a_table(self):
+        first = Navigator(symbols=self.symbols)
+        second = Navigator(symbols=self.symbols)
+        first.explore("east")
+        second.explore("east")
+        self.assertIs(first.get_symbols(), second.get_symbols())
+        self.assertEqual(first.get_exploration_history(), {"Starting Point": 1, "East Realm": 1})
+        self.assertIs(first.get_current_location(), second.get_current_location())
+
+        fleet = NavigatorFleet(2, "Hall", symbols=self.symbols)
+        self.assertEqual(fleet.realm_id("east"), self.symbols.get("East Realm"))
+        fleet.explore("east")
+        self.assertEqual(fleet[0].get_exploration_history(), {"Hall": 1, "East Realm": 1})
+        self.assertEqual(fleet[1].find_route("East Realm", "Hall"), ["Hall", "East Realm"])
+
+    def test_navigators_share_the_default_table(self):
+        self.assertIs(Navigator().get_symbols(), Navigator("Elsewhere").get_symbols())
+
+
+if __name__ == "__main__":
+    unittest.main()